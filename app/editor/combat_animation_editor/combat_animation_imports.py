@@ -252,19 +252,12 @@ def convert_gba(pixmap: QPixmap) -> QPixmap:
     return pixmap
 
 def get_palette(pixmap: QPixmap) -> list:
-    im = pixmap.toImage()
-    w = im.width()
+    w = pixmap.width()
     # Image is always an extra 8 pixels wide, to accomodate palette!
     assert w == 248 or w == 448
-    colors = []
-    for x in range(w - 8, w, -1):  # Reverse
-        for y in range(2):
-            color = im.pixel(x, y)
-            if color not in colors:
-                colors.append(color)
-    palette = [QColor(color) for color in colors]
-    palette = [(c.red(), c.green(), c.blue()) for c in palette]
-    return palette
+    # Reverse, so the rightmost column comes first
+    im = pixmap.copy(w - 8, 0, 8, 2).toImage().mirrored(True, False)
+    return editor_utilities.find_palette(im)
 
 def simple_crop(pixmap: QPixmap) -> QPixmap:
     if pixmap.width() == 248:
@@ -13,36 +13,32 @@ from app.data.database import DB
 from app.extensions.custom_gui import DeletionDialog
 from app.editor.base_database_gui import ResourceCollectionModel
 from app.editor.settings import MainSettingsController
-from app.utilities import str_utils
+from app.utilities import image_ops, str_utils
 import app.editor.utilities as editor_utilities
 
 def auto_frame_portrait(portrait: Portrait):
     width, height = 32, 16
 
-    def test_similarity(im1: QImage, im2: QImage) -> int:
-        diff = 0
-        for x in range(width):
-            for y in range(height):
-                color1 = im1.pixel(x, y)  # Returns QRgb
-                color2 = im2.pixel(x, y)
-                diff += color1 ^ color2
-        return diff
+    def get_pixels(pixmap: QPixmap) -> bytes:
+        im = editor_utilities.to_argb32(QImage(pixmap))
+        return bytes(editor_utilities.image_pixels(im))
 
     if not portrait.pixmap:
         portrait.pixmap = QPixmap(portrait.full_path)
     pixmap = portrait.pixmap
-    blink_frame1 = QImage(pixmap.copy(96, 48, 32, 16))
-    mouth_frame1 = QImage(pixmap.copy(96, 80, 32, 16))
-    main_frame = QImage(pixmap.copy(0, 0, 96, 80))
+    blink_frame1 = get_pixels(pixmap.copy(96, 48, 32, 16))
+    mouth_frame1 = get_pixels(pixmap.copy(96, 80, 32, 16))
+    main_frame = get_pixels(pixmap.copy(0, 0, 96, 80))
+    main_width, main_height = 96, 80
     best_blink_similarity = width * height * 128**3
     best_mouth_similarity = width * height * 128**3
     best_blink_pos = [0, 0]
     best_mouth_pos = [0, 0]
-    for x in range(0, main_frame.width() - width, 8):
-        for y in range(0, main_frame.height() - height, 8):
-            sub_frame = main_frame.copy(x, y, 32, 16)
-            blink_similarity = test_similarity(blink_frame1, sub_frame)
-            mouth_similarity = test_similarity(mouth_frame1, sub_frame)
+    for x in range(0, main_width - width, 8):
+        for y in range(0, main_height - height, 8):
+            sub_frame = image_ops.crop(main_frame, main_width, (x, y, width, height))
+            blink_similarity = image_ops.xor_difference(blink_frame1, sub_frame)
+            mouth_similarity = image_ops.xor_difference(mouth_frame1, sub_frame)
             if blink_similarity < best_blink_similarity:
                 best_blink_similarity = blink_similarity
                 best_blink_pos = [x, y]
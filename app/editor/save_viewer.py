@@ -1,11 +1,7 @@
-try:
-    import cPickle as pickle
-except ImportError:
-    import pickle
-
 from PyQt5.QtWidgets import QVBoxLayout, QDialog, QTextEdit
 from PyQt5.QtGui import QTextCursor
 from app.extensions.custom_gui import PropertyBox, ComboBox, Dialog
+from app.engine import save_container
 
 import logging
 
@@ -34,11 +30,7 @@ class SaveViewer(Dialog):
     def save_changed(self):
         try:
             save_loc = self.save_box.edit.currentText()
-            meta_loc = save_loc + 'meta'
-            with open(save_loc, 'rb') as fp:
-                s_dict = pickle.load(fp)
-            with open(meta_loc, 'rb') as fp:
-                meta_dict = pickle.load(fp)
+            s_dict, meta_dict = save_container.read(save_loc)
         except Exception as e:
             logging.error("Can not load %s save file: %s" % (save_loc, e))
             s_dict, meta_dict = None, None
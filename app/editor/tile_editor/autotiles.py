@@ -2,44 +2,64 @@ import glob
 from collections import OrderedDict
 
 from PyQt5.QtWidgets import QProgressDialog
-from PyQt5.QtCore import Qt
+from PyQt5.QtCore import Qt, QThread, QEventLoop, pyqtSignal
 from PyQt5.QtGui import QImage, QColor, QPainter, qRgb
 
 from app.editor import utilities as editor_utilities
+from app.utilities import image_ops
 
 from app.constants import TILEWIDTH, TILEHEIGHT, AUTOTILE_FRAMES
 
-def similar(p1, p2):
-    def similar(p1, p2):
-        return sum(i != j for i, j in zip(p1, p2))
-
-    def similar_fast(p1, p2):
-        return 0 if p1 == p2 else TILEWIDTH * TILEHEIGHT
-
-    return similar_fast(p1, p2)
-
 class Series(list):
     def is_present(self, test) -> bool:
-        test_palette = test.palette
-        all_palettes = [im.palette for im in self]
-        return any(similar(test_palette, palette) for palette in all_palettes)
+        """
+        Whether any frame of the series has exactly test's palette
+        """
+        return any(im.palette == test.palette for im in self)
 
     def get_frames_with_color(self, color: tuple) -> list:
-        return [im for im in self if color in im.colors]
+        return [im for im in self if color in im.uniques]
 
 class PaletteData():
-    def __init__(self, im: QImage):
+    def __init__(self, im: QImage, pixels=None):
+        """
+        pixels are im's pixels as QRgb, if they've already been cut out of a bigger image
+        im can be None if only the colors and palette are needed
+        """
         self.im: QImage = im
         self.new_im: QImage = None
-        self.colors: list = editor_utilities.get_full_palette(im)
-        # Sort by most
-        self.uniques: list = sorted(set(self.colors), key=lambda x: self.colors.count(x), reverse=True)
-        self.palette: list = self.colors[:]
-
-        for idx, pixel in enumerate(self.colors):
-            # Each pixel in the palette is assigned its color id
-            self.palette[idx] = self.uniques.index(pixel)
-            # So palette is a unique string of ints
+        if pixels is None:
+            im = editor_utilities.to_argb32(im)
+            pixels = editor_utilities.image_pixels(im)
+        qcolors = image_ops.column_major(pixels, TILEWIDTH)
+        rgb = {color: image_ops.to_rgb(color) for color in set(qcolors)}
+        self.colors: list = [rgb[color] for color in qcolors]
+        # In order of first appearance
+        self.uniques: list = list(dict.fromkeys(self.colors))
+        # Each pixel in the palette is assigned its color id
+        # So palette is a unique tuple of ints, and tiles drawn the same way
+        # have the same palette whatever their colors are
+        color_ids = {color: idx for idx, color in enumerate(self.uniques)}
+        self.palette: tuple = tuple(map(color_ids.__getitem__, self.colors))
+
+class AutotileWorker(QThread):
+    """
+    Runs AutotileMaker.generate off the main thread,
+    so the progress dialog stays responsive and can cancel it
+    """
+    progress = pyqtSignal(int)
+
+    def __init__(self, maker, parent=None):
+        super().__init__(parent)
+        self.maker = maker
+        self.canceled = False
+        self.result = (None, {})
+
+    def cancel(self):
+        self.canceled = True
+
+    def run(self):
+        self.result = self.maker.generate(self)
 
 class AutotileMaker():
     def __init__(self, parent=None):
@@ -47,6 +67,9 @@ class AutotileMaker():
 
         self.map_tiles = OrderedDict()
         self.books = []
+        self.frame_index = {}  # Key: palette, Value: (frame, series, book) of the first frame with it
+        self.tiles_by_palette = {}  # Key: palette, Value: first map tile with it
+        self.series_columns = {}  # Key: id of series, Value: its column in the final image
         self.autotile_column_idxs = {}
         self.recognized_series = []
         self.companion_autotile_im = None
@@ -60,10 +83,11 @@ class AutotileMaker():
         self.progress_dialog.setWindowFlag(Qt.WindowContextHelpButtonHint, False)
 
         self.autotile_templates = self.gather_templates()
-        self.should_run = self.load_autotile_templates()
 
     def clear(self):
         self.map_tiles.clear()
+        self.tiles_by_palette.clear()
+        self.series_columns.clear()
         self.autotile_column_idxs.clear()
         self.recognized_series.clear()
         self.companion_autotile_im = None
@@ -77,33 +101,56 @@ class AutotileMaker():
         self.color_change_flag = color_change_flag
         print("Color Change Flag: %s" % color_change_flag)
         self.clear()
-        # self.should_run = self.load_autotile_templates()
-        if not self.should_run:
-            return None, {}
-        self.progress_dialog.setValue(20)
         self.tileset = tileset
+        # Pixmaps can only be used on the main thread
         self.tileset_image = QImage(self.tileset.pixmap)
-        if self.progress_dialog.wasCanceled():
-            return None, {}
+
+        worker = AutotileWorker(self)
+        loop = QEventLoop()
+        worker.progress.connect(self.progress_dialog.setValue)
+        worker.finished.connect(loop.quit)
+        self.progress_dialog.canceled.connect(worker.cancel)
+        self.progress_dialog.setValue(0)
+        worker.start()
+        loop.exec_()
+        worker.wait()
+        self.progress_dialog.canceled.disconnect(worker.cancel)
+        self.progress_dialog.reset()
+        return worker.result
+
+    def generate(self, worker: AutotileWorker):
+        """
+        Runs on the worker's thread
+        """
+        if not self.books:
+            self.load_autotile_templates(worker)
+            if worker.canceled:
+                self.books.clear()
+                self.frame_index.clear()
+                return None, {}
+        worker.progress.emit(20)
         self.palettize_tileset()
-        self.progress_dialog.setValue(25)
-        if self.progress_dialog.wasCanceled():
+        worker.progress.emit(25)
+        if worker.canceled:
             return None, {}
 
+        progress = 25
         for idx, pos in enumerate(self.map_tiles):
-            if self.progress_dialog.wasCanceled():
+            if worker.canceled:
                 return None, {}
             self.create_autotiles_from_image(pos)
-            self.progress_dialog.setValue(25 + int(70 * idx / len(self.map_tiles)))
+            if 25 + int(70 * idx / len(self.map_tiles)) != progress:
+                progress = 25 + int(70 * idx / len(self.map_tiles))
+                worker.progress.emit(progress)
 
         if self.recognized_series:
             self.create_final_image()
-        self.progress_dialog.setValue(99)
-        if self.progress_dialog.wasCanceled():
+        worker.progress.emit(99)
+        if worker.canceled:
             return None, {}
 
         final_column_idxs = {k: v[0] for k, v in self.autotile_column_idxs.items()}
-        self.progress_dialog.setValue(100)
+        worker.progress.emit(100)
         return self.companion_autotile_im, final_column_idxs
 
     def gather_templates(self) -> list:
@@ -112,17 +159,18 @@ class AutotileMaker():
             templates.append(fn)
         return templates
 
-    def load_autotile_templates(self) -> bool:
+    def load_autotile_templates(self, worker: AutotileWorker):
         import time
         # Each autotile template becomes a book
         # A book contains a dictionary
         # Key: position
         # Value: Series
         for idx, template in enumerate(self.autotile_templates):
-            if self.progress_dialog.wasCanceled():
-                return False
+            if worker.canceled:
+                return
             print(template)
-            image = QImage(template)
+            image = editor_utilities.to_argb32(QImage(template))
+            pixels = editor_utilities.image_pixels(image)
             width = image.width() // AUTOTILE_FRAMES
             height = image.height()
             num_tiles_x = width // TILEWIDTH
@@ -132,35 +180,40 @@ class AutotileMaker():
 
             # There are 16 frames, stacked horizontally with one another
             time1 = time.time_ns() / 1e6
-            for frame in range(AUTOTILE_FRAMES):    
+            for frame in range(AUTOTILE_FRAMES):
                 x_offset = frame * width
                 for x in range(num_tiles_x):
                     for y in range(num_tiles_y):
                         rect = (x_offset + x * TILEWIDTH, y * TILEHEIGHT, TILEWIDTH, TILEHEIGHT)
                         palette = image.copy(*rect)  # crop
-                        d = PaletteData(palette)
+                        d = PaletteData(palette, image_ops.crop(pixels, image.width(), rect))
                         minitiles[x + y * num_tiles_x].append(d)
             time2 = time.time_ns() / 1e6
             print(time2 - time1)
 
             assert all(len(series) == AUTOTILE_FRAMES for series in minitiles)
             self.books.append(minitiles)
-            self.progress_dialog.setValue(20 * idx / len(self.autotile_templates))
-        return True
+            for series in minitiles:
+                for d in series:
+                    self.frame_index.setdefault(d.palette, (d, series, minitiles))
+            worker.progress.emit(int(20 * idx / len(self.autotile_templates)))
 
     def palettize_tileset(self):
         """
         Generates map tiles
         """
         self.map_tiles.clear()
+        self.tiles_by_palette.clear()
         print("Palettizing current tileset...")
 
+        image = editor_utilities.to_argb32(self.tileset_image)
+        pixels = editor_utilities.image_pixels(image)
         for x in range(self.tileset.width):
             for y in range(self.tileset.height):
                 rect = (x * TILEWIDTH, y * TILEHEIGHT, TILEWIDTH, TILEHEIGHT)
-                tile = self.tileset_image.copy(*rect)  # Crop
-                tile_palette = PaletteData(tile)
+                tile_palette = PaletteData(None, image_ops.crop(pixels, image.width(), rect))
                 self.map_tiles[(x, y)] = tile_palette
+                self.tiles_by_palette.setdefault(tile_palette.palette, tile_palette)
 
     def create_autotiles_from_image(self, pos):
         x, y = pos
@@ -170,30 +223,18 @@ class AutotileMaker():
         if len(tile_palette.uniques) < 2:
             return
 
-        closest_series = None
-        closest_frame = None
-        closest_book = None
-        min_sim = 16
-
-        for book_idx, book in enumerate(self.books):
-            for series_idx, series in enumerate(book):
-                for frame_idx, frame in enumerate(series):
-                    similarity = similar(frame.palette, tile_palette.palette)
-                    if similarity < min_sim:
-                        min_sim = similarity
-                        closest_series = series
-                        closest_frame = frame
-                        closest_book = book
-                        print("Similarity met for ", pos, book_idx, series_idx, frame_idx)
-
-        if closest_series:
-            if closest_series in self.recognized_series:
-                column_idx = self.recognized_series.index(closest_series)
+        match = self.frame_index.get(tile_palette.palette)
+        if match:
+            closest_frame, closest_series, closest_book = match
+            print("Similarity met for ", pos)
+            if id(closest_series) in self.series_columns:
+                column_idx = self.series_columns[id(closest_series)]
             else:
                 # Add series to autotile column list if it is not already
                 # If it's not added to autotile column image, make sure it uses the right colors
                 self.recognized_series.append(closest_series)
                 column_idx = len(self.recognized_series) - 1
+                self.series_columns[id(closest_series)] = column_idx
                 if self.color_change_flag:
                     self.color_change(tile_palette, closest_frame, closest_series, closest_book)
             print("Final column idx", column_idx)
@@ -213,16 +254,16 @@ class AutotileMaker():
             for series in closest_book:
                 frames_with_color = series.get_frames_with_color(color)
                 for f in frames_with_color:
-                    for map_tile in self.map_tiles.values():
-                        # If so, do those frames show up in the map sprite?
-                        if similar(f.palette, map_tile.palette):
-                            # If so, add to the color conversion
-                            color_idx = f.colors.index(color)
-                            new_color = map_tile.colors[color_idx]
-                            truecolor[color] = new_color
-                            color_conversion[qRgb(*color)] = qRgb(*new_color)
-                            print("%s has become %s" % (color, new_color))
-                            return
+                    # If so, do those frames show up in the map sprite?
+                    map_tile = self.tiles_by_palette.get(f.palette)
+                    if map_tile:
+                        # If so, add to the color conversion
+                        color_idx = f.colors.index(color)
+                        new_color = map_tile.colors[color_idx]
+                        truecolor[color] = new_color
+                        color_conversion[qRgb(*color)] = qRgb(*new_color)
+                        print("%s has become %s" % (color, new_color))
+                        return
 
         for palette_data in closest_series:
             for idx, color in enumerate(palette_data.colors):
@@ -0,0 +1,149 @@
+from app.resources.tiles import TileSprite
+
+"""
+Bulk edits to the layers of a TileMapPrefab
+
+A TileMapEdit writes its changes to one grid of one layer as they are made,
+and remembers what each coord held before, so a whole brush stroke, fill or
+replace all can be undone and redone as one step, and the editor knows exactly
+which coords it needs to redraw
+
+The fills are iterative scanline fills, so they are fine on maps of any size
+"""
+
+def _key(value):
+    if isinstance(value, TileSprite):
+        return (value.tileset_nid, tuple(value.tileset_position))
+    return value
+
+class TileMapEdit():
+    def __init__(self, layer, grid_name: str, name: str = ''):
+        """
+        grid_name is 'terrain_grid' or 'sprite_grid'
+        None as a value means nothing is there
+        """
+        self.layer = layer
+        self.grid_name = grid_name
+        self.name = name
+        self.before = {}
+        self.after = {}
+
+    @property
+    def grid(self) -> dict:
+        # Looked up each time, since resizing the map replaces the grids
+        return getattr(self.layer, self.grid_name)
+
+    @property
+    def coords(self):
+        return self.after.keys()
+
+    @property
+    def changed(self) -> bool:
+        return any(_key(self.before[coord]) != _key(value) for coord, value in self.after.items())
+
+    def set(self, coord, value):
+        grid = self.grid
+        current = grid.get(coord)
+        if coord not in self.before:
+            if _key(current) == _key(value):
+                return
+            self.before[coord] = current
+        self.after[coord] = value
+        self._write(grid, coord, value)
+
+    def erase(self, coord):
+        self.set(coord, None)
+
+    def set_sprite(self, coord, tileset_nid, tileset_coord):
+        self.set(coord, TileSprite(tileset_nid, tileset_coord, self.layer))
+
+    def paint(self, coords, value):
+        for coord in coords:
+            self.set(coord, value)
+
+    def undo(self):
+        grid = self.grid
+        for coord, value in self.before.items():
+            self._write(grid, coord, value)
+
+    def redo(self):
+        grid = self.grid
+        for coord, value in self.after.items():
+            self._write(grid, coord, value)
+
+    def _write(self, grid, coord, value):
+        if value is None:
+            grid.pop(coord, None)
+        else:
+            grid[coord] = value
+
+def rect_coords(pos1: tuple, pos2: tuple) -> list:
+    """
+    Returns:
+        list: every coord in the rectangle with pos1 and pos2 at opposite corners
+    """
+    left, right = sorted((pos1[0], pos2[0]))
+    top, bottom = sorted((pos1[1], pos2[1]))
+    return [(x, y) for x in range(left, right + 1) for y in range(top, bottom + 1)]
+
+def flood_fill(grid: dict, start: tuple, width: int, height: int) -> set:
+    """
+    Returns:
+        set: every coord connected to start that holds the same thing start does
+    """
+    target = _key(grid.get(start))
+    filled = set()
+
+    def matches(x, y):
+        return (x, y) not in filled and _key(grid.get((x, y))) == target
+
+    stack = [start]
+    while stack:
+        x, y = stack.pop()
+        if not matches(x, y):
+            continue
+        # Spread out as far as possible along the row
+        left = x
+        while left > 0 and matches(left - 1, y):
+            left -= 1
+        right = x
+        while right < width - 1 and matches(right + 1, y):
+            right += 1
+        filled.update((i, y) for i in range(left, right + 1))
+        # Then start a new span for each run of matches in the rows above and below
+        for next_y in (y - 1, y + 1):
+            if not 0 <= next_y < height:
+                continue
+            in_run = False
+            for i in range(left, right + 1):
+                if matches(i, next_y):
+                    if not in_run:
+                        stack.append((i, next_y))
+                        in_run = True
+                else:
+                    in_run = False
+    return filled
+
+def find_all(grid: dict, start: tuple, width: int, height: int) -> set:
+    """
+    Returns:
+        set: every coord on the map that holds the same thing start does
+    """
+    target = _key(grid.get(start))
+    if target is None:
+        return {(x, y) for x in range(width) for y in range(height) if (x, y) not in grid}
+    return {coord for coord, value in grid.items() if _key(value) == target and
+            0 <= coord[0] < width and 0 <= coord[1] < height}
+
+def pattern_fill(edit: TileMapEdit, coords, tileset_nid, pattern: set):
+    """
+    Fills coords with the tiles from the tileset's pattern coords,
+    repeated across the map from the map's topleft
+    """
+    topleft = min(pattern)
+    w = max(coord[0] for coord in pattern) - topleft[0] + 1
+    h = max(coord[1] for coord in pattern) - topleft[1] + 1
+    for x, y in coords:
+        tileset_coord = (x % w + topleft[0], y % h + topleft[1])
+        if tileset_coord in pattern:
+            edit.set_sprite((x, y), tileset_nid, tileset_coord)
@@ -5,17 +5,17 @@ from enum import IntEnum
 from PyQt5.QtWidgets import QSplitter, QFrame, QVBoxLayout, QDialogButtonBox, \
     QToolBar, QTabBar, QWidget, QDialog, QGroupBox, QFormLayout, QSpinBox, QAction, \
     QGraphicsView, QGraphicsScene, QAbstractItemView, QActionGroup, \
-    QDesktopWidget, QFileDialog, QMessageBox, QHBoxLayout
-from PyQt5.QtCore import Qt, QRect, QDateTime
-from PyQt5.QtGui import QImage, QPainter, QPixmap, QIcon, QColor, QPen
+    QDesktopWidget, QFileDialog, QMessageBox, QHBoxLayout, QUndoStack, QUndoCommand
+from PyQt5.QtCore import Qt, QRect, QRectF, QDateTime
+from PyQt5.QtGui import QImage, QPainter, QPixmap, QIcon, QColor, QPen, QKeySequence
 
-from app.constants import TILEWIDTH, TILEHEIGHT, WINWIDTH, WINHEIGHT
+from app.constants import TILEWIDTH, TILEHEIGHT, WINWIDTH, WINHEIGHT, AUTOTILE_FRAMES
 from app.resources.resources import RESOURCES
 from app.resources.tiles import LayerGrid
 from app.data.database import DB
 
 from app.editor import timer
-from app.editor.tile_editor import autotiles
+from app.editor.tile_editor import autotiles, tilemap_edits
 from app.editor.icon_editor.icon_view import IconView
 from app.editor.terrain_painter_menu import TerrainPainterMenu
 from app.editor.base_database_gui import ResourceCollectionModel
@@ -26,6 +26,17 @@ from app.utilities import str_utils
 
 import logging
 
+def get_tile_pixmap(tile_sprite, ms=0, autotile_fps=29):
+    tileset = RESOURCES.tilesets.get(tile_sprite.tileset_nid)
+    if not tileset:
+        logging.warning("Could not find tileset %s" % tile_sprite.tileset_nid)
+        return None
+    if not tileset.pixmap:
+        tileset.set_pixmap(QPixmap(tileset.full_path))
+    if not tileset.autotile_pixmap:
+        tileset.set_autotile_pixmap(QPixmap(tileset.autotile_full_path))
+    return tileset.get_pixmap(tile_sprite.tileset_position, ms, autotile_fps)
+
 def draw_tilemap(tilemap, autotile_fps=29):
     image = QImage(tilemap.width * TILEWIDTH,
                    tilemap.height * TILEHEIGHT,
@@ -38,22 +49,159 @@ def draw_tilemap(tilemap, autotile_fps=29):
     for layer in tilemap.layers:
         if layer.visible:
             for coord, tile_sprite in layer.sprite_grid.items():
-                tileset = RESOURCES.tilesets.get(tile_sprite.tileset_nid)
-                if not tileset:
-                    logging.warning("Could not find tileset %s" % tile_sprite.tileset_nid)
-                if not tileset.pixmap:
-                    tileset.set_pixmap(QPixmap(tileset.full_path))
-                if not tileset.autotile_pixmap:
-                    tileset.set_autotile_pixmap(QPixmap(tileset.autotile_full_path))
-
-                pix = tileset.get_pixmap(tile_sprite.tileset_position, ms, autotile_fps)
+                pix = get_tile_pixmap(tile_sprite, ms, autotile_fps)
                 if pix:
-                    painter.drawImage(coord[0] * TILEWIDTH,
-                                      coord[1] * TILEHEIGHT,
-                                      pix.toImage())
+                    painter.drawPixmap(coord[0] * TILEWIDTH,
+                                       coord[1] * TILEHEIGHT,
+                                       pix)
     painter.end()
     return image
 
+class MapImage():
+    """
+    An image of the whole tilemap that is kept up to date by redrawing
+    only the coords marked dirty, instead of every tile every frame
+    Changes that aren't marked, like resizing the map or reordering
+    or hiding layers, change the key, which redraws everything
+    """
+    def __init__(self):
+        self.image: QImage = None
+        self.key = None
+        self.dirty = set()
+
+    def mark_dirty(self, coords):
+        self.dirty.update(coords)
+
+    def invalidate(self):
+        self.key = None
+
+    def get_key(self, tilemap, setting) -> tuple:
+        raise NotImplementedError
+
+    def get_all_coords(self, tilemap) -> set:
+        raise NotImplementedError
+
+    def get_animated_coords(self, setting) -> set:
+        return set()
+
+    def draw_coord(self, painter, tilemap, coord, setting):
+        raise NotImplementedError
+
+    def update(self, tilemap, setting) -> QImage:
+        key = self.get_key(tilemap, setting)
+        if key != self.key:
+            self.key = key
+            self.image = QImage(tilemap.width * TILEWIDTH,
+                                tilemap.height * TILEHEIGHT,
+                                QImage.Format_ARGB32)
+            self.image.fill(QColor(0, 0, 0, 0))
+            self.dirty = self.get_all_coords(tilemap)
+        coords, self.dirty = self.dirty, set()
+        coords |= self.get_animated_coords(setting)
+        if coords:
+            painter = QPainter()
+            painter.begin(self.image)
+            for coord in coords:
+                if tilemap.check_bounds(coord):
+                    x, y = coord[0] * TILEWIDTH, coord[1] * TILEHEIGHT
+                    painter.setCompositionMode(QPainter.CompositionMode_Source)
+                    painter.fillRect(x, y, TILEWIDTH, TILEHEIGHT, QColor(0, 0, 0, 0))
+                    painter.setCompositionMode(QPainter.CompositionMode_SourceOver)
+                    self.draw_coord(painter, tilemap, coord, setting)
+            painter.end()
+        return self.image
+
+class TileMapImage(MapImage):
+    """
+    setting is the autotile fps, or 0 to not animate autotiles
+    Autotiles are redrawn whenever their frame turns over
+    """
+    def __init__(self):
+        super().__init__()
+        self.autotile_coords = set()
+        self.autotile_frame = None
+        self.ms = 0
+
+    def get_key(self, tilemap, autotile_fps) -> tuple:
+        return (id(tilemap), tilemap.width, tilemap.height, autotile_fps,
+                tuple((id(layer), layer.visible, id(layer.sprite_grid)) for layer in tilemap.layers))
+
+    def get_all_coords(self, tilemap) -> set:
+        self.autotile_coords.clear()
+        coords = set()
+        for layer in tilemap.layers:
+            if layer.visible:
+                coords.update(layer.sprite_grid)
+        return coords
+
+    def get_animated_coords(self, autotile_fps) -> set:
+        self.ms = QDateTime.currentMSecsSinceEpoch()
+        frame = (self.ms // int(autotile_fps * 16.66)) % AUTOTILE_FRAMES if autotile_fps else 0
+        if frame != self.autotile_frame:
+            self.autotile_frame = frame
+            return set(self.autotile_coords)
+        return set()
+
+    def draw_coord(self, painter, tilemap, coord, autotile_fps):
+        self.autotile_coords.discard(coord)
+        for layer in tilemap.layers:
+            tile_sprite = layer.sprite_grid.get(coord) if layer.visible else None
+            if tile_sprite:
+                pix = get_tile_pixmap(tile_sprite, self.ms, autotile_fps)
+                if pix:
+                    painter.drawPixmap(coord[0] * TILEWIDTH, coord[1] * TILEHEIGHT, pix)
+                tileset = RESOURCES.tilesets.get(tile_sprite.tileset_nid)
+                if autotile_fps and tileset and tile_sprite.tileset_position in tileset.autotiles:
+                    self.autotile_coords.add(coord)
+
+class TerrainImage(MapImage):
+    """
+    The terrain overlay drawn in terrain mode, with each coord showing
+    the terrain of the topmost visible layer that has any there
+    setting is the alpha of the overlay
+    """
+    def get_key(self, tilemap, alpha) -> tuple:
+        return (id(tilemap), tilemap.width, tilemap.height, alpha,
+                tuple((id(layer), layer.visible, id(layer.terrain_grid)) for layer in tilemap.layers))
+
+    def get_all_coords(self, tilemap) -> set:
+        coords = set()
+        for layer in tilemap.layers:
+            if layer.visible:
+                coords.update(layer.terrain_grid)
+        return coords
+
+    def draw_coord(self, painter, tilemap, coord, alpha):
+        for layer in reversed(tilemap.layers):
+            if layer.visible and coord in layer.terrain_grid:
+                terrain = DB.terrain.get(layer.terrain_grid[coord])
+                if terrain:
+                    color = terrain.color
+                    write_color = QColor(color[0], color[1], color[2])
+                    write_color.setAlpha(alpha)
+                    painter.fillRect(coord[0] * TILEWIDTH, coord[1] * TILEHEIGHT, TILEWIDTH, TILEHEIGHT, write_color)
+                # Don't draw the one's below...
+                return
+
+class TileMapEditCommand(QUndoCommand):
+    """
+    A bulk edit, as one step on the undo stack
+    The edit has already been made by the time it is pushed,
+    so the first redo just writes the same values again
+    """
+    def __init__(self, edit: tilemap_edits.TileMapEdit, view):
+        super().__init__(edit.name)
+        self.edit = edit
+        self.view = view
+
+    def redo(self):
+        self.edit.redo()
+        self.view.mark_dirty(self.edit.grid_name, self.edit.coords)
+
+    def undo(self):
+        self.edit.undo()
+        self.view.mark_dirty(self.edit.grid_name, self.edit.coords)
+
 class PaintTool(IntEnum):
     NoTool = 0
     Brush = 1
@@ -89,6 +237,10 @@ class MapEditorView(QGraphicsView):
         self.draw_autotiles = True
         self.draw_gridlines = True
 
+        self.tile_image = TileMapImage()
+        self.terrain_image = TerrainImage()
+        self.current_edit = None  # The brush stroke in progress
+
         timer.get_timer().tick_elapsed.connect(self.tick)
 
     def tick(self):
@@ -97,28 +249,45 @@ class MapEditorView(QGraphicsView):
 
     def set_current(self, current):
         self.tilemap = current
+        self.current_edit = None
+        self.tile_image.invalidate()
+        self.terrain_image.invalidate()
         self.update_view()
 
     def clear_scene(self):
         self.scene.clear()
 
     def update_view(self):
-        if self.tilemap:
-            pixmap = QPixmap.fromImage(self.get_map_image())
-            self.working_image = pixmap
-        else:
+        if not self.tilemap:
             return
-        if self.window.terrain_mode:
-            self.draw_terrain()
-        self.show_map()
-
-    def get_map_image(self):
         if self.draw_autotiles:
-            image = draw_tilemap(self.tilemap, autotile_fps=self.tilemap.autotile_fps)
+            self.tile_image.update(self.tilemap, self.tilemap.autotile_fps)
         else:
-            image = draw_tilemap(self.tilemap, autotile_fps=0)
-        painter = QPainter()
-        painter.begin(image)
+            self.tile_image.update(self.tilemap, 0)
+        if self.window.terrain_mode:
+            self.terrain_image.update(self.tilemap, self.window.terrain_painter_menu.get_alpha())
+        map_rect = QRectF(0, 0, self.tilemap.width * TILEWIDTH, self.tilemap.height * TILEHEIGHT)
+        if self.scene.sceneRect() != map_rect:
+            self.scene.setSceneRect(map_rect)
+        # Only what's on screen is repainted
+        self.viewport().update()
+
+    def mark_dirty(self, grid_name, coords):
+        if grid_name == 'sprite_grid':
+            self.tile_image.mark_dirty(coords)
+        else:
+            self.terrain_image.mark_dirty(coords)
+
+    def drawBackground(self, painter, rect):
+        super().drawBackground(painter, rect)
+        if self.tilemap and self.tile_image.image:
+            image = self.tile_image.image
+            target = rect.intersected(QRectF(image.rect()))
+            painter.drawImage(target, image, target)
+
+    def drawForeground(self, painter, rect):
+        if not self.tilemap:
+            return
         # Draw grid lines
         if self.draw_gridlines:
             painter.setPen(QPen(QColor(0, 0, 0, 128), 1, Qt.DotLine))
@@ -139,33 +308,10 @@ class MapEditorView(QGraphicsView):
                 # Currently drawing with a tileset area
                 self.draw_normal_cursor(painter)
 
-        painter.end()
-        return image
-
-    def draw_terrain(self):
-        if self.working_image:
-            painter = QPainter()
-            painter.begin(self.working_image)
-            alpha = self.window.terrain_painter_menu.get_alpha()
-            explored_coords = set()
-            for layer in reversed(self.tilemap.layers):
-                if layer.visible:
-                    for coord, terrain_nid in layer.terrain_grid.items():
-                        # Don't draw the one's below...
-                        if coord in explored_coords:
-                            continue
-                        explored_coords.add(coord)
-                        terrain = DB.terrain.get(terrain_nid)
-                        if terrain:
-                            color = terrain.color
-                            write_color = QColor(color[0], color[1], color[2])
-                            write_color.setAlpha(alpha)
-                            painter.fillRect(coord[0] * TILEWIDTH, coord[1] * TILEHEIGHT, TILEWIDTH, TILEHEIGHT, write_color)
-            painter.end()
-
-    def show_map(self):
-        self.clear_scene()
-        self.scene.addPixmap(self.working_image)
+        if self.window.terrain_mode and self.terrain_image.image:
+            image = self.terrain_image.image
+            target = rect.intersected(QRectF(image.rect()))
+            painter.drawImage(target, image, target)
 
     def draw_normal_cursor(self, painter):
         tileset, coords = self.window.get_tileset_coords()
@@ -173,12 +319,12 @@ class MapEditorView(QGraphicsView):
             mouse_pos = self.current_mouse_position
             topleft = min(coords)
             for coord in coords:
-                im = tileset.subpixmaps[coord].toImage()
+                pix = tileset.subpixmaps[coord]
                 rel_coord = coord[0] - topleft[0], coord[1] - topleft[1]
-                true_pos = mouse_pos[0] + rel_coord[0], mouse_pos[1] + rel_coord[1]                
-                painter.drawImage(true_pos[0] * TILEWIDTH,
-                                  true_pos[1] * TILEHEIGHT,
-                                  im)
+                true_pos = mouse_pos[0] + rel_coord[0], mouse_pos[1] + rel_coord[1]
+                painter.drawPixmap(true_pos[0] * TILEWIDTH,
+                                   true_pos[1] * TILEHEIGHT,
+                                   pix)
                 # Fill with blue
                 rect = QRect(true_pos[0] * TILEWIDTH, true_pos[1] * TILEHEIGHT, TILEWIDTH, TILEHEIGHT)
                 painter.fillRect(rect, QColor(0, 255, 255, 96))
@@ -192,9 +338,9 @@ class MapEditorView(QGraphicsView):
             pix = tileset.get_pixmap(tile_sprite.tileset_position)
             if pix:
                 true_coord = mouse_pos[0] + coord[0], mouse_pos[1] + coord[1]
-                painter.drawImage(true_coord[0] * TILEWIDTH,
-                                  true_coord[1] * TILEHEIGHT,
-                                  pix.toImage())
+                painter.drawPixmap(true_coord[0] * TILEWIDTH,
+                                   true_coord[1] * TILEHEIGHT,
+                                   pix)
                 # Fill with blue
                 rect = QRect(true_coord[0] * TILEWIDTH, true_coord[1] * TILEHEIGHT, TILEWIDTH, TILEHEIGHT)
                 painter.fillRect(rect, QColor(0, 255, 255, 96))
@@ -232,14 +378,35 @@ class MapEditorView(QGraphicsView):
                 i, j = x + left, y + top
                 self.right_selection[(x, y)] = ((i, j), self.get_tile_sprite((i, j)))
 
-    def paint_terrain(self, tile_pos):
+    def get_edit(self, grid_name, name) -> tilemap_edits.TileMapEdit:
+        """
+        Returns the edit the current brush stroke is adding to,
+        starting a new one if the stroke has changed what it's doing
+        """
         current_layer = self.get_current_layer()
+        edit = self.current_edit
+        if not edit or edit.layer is not current_layer or edit.grid_name != grid_name or edit.name != name:
+            self.finish_edit()
+            self.current_edit = tilemap_edits.TileMapEdit(current_layer, grid_name, name)
+        return self.current_edit
+
+    def finish_edit(self):
+        """
+        Puts the edit in progress on the undo stack as one step
+        """
+        if self.current_edit and self.current_edit.changed:
+            self.window.undo_stack.push(TileMapEditCommand(self.current_edit, self))
+        self.current_edit = None
+
+    def paint_terrain(self, tile_pos):
         if self.tilemap.check_bounds(tile_pos):
             current_nid = self.window.terrain_painter_menu.get_current_nid()
-            current_layer.terrain_grid[tile_pos] = current_nid
+            self.get_edit('terrain_grid', "Paint Terrain").set(tile_pos, current_nid)
+            self.mark_dirty('terrain_grid', [tile_pos])
 
     def paint_tile(self, tile_pos):
-        current_layer = self.get_current_layer()
+        edit = self.get_edit('sprite_grid', "Paint Tiles")
+        painted = []
 
         if self.right_selection:
             for coord, (true_coord, tile_sprite) in self.right_selection.items():
@@ -248,9 +415,10 @@ class MapEditorView(QGraphicsView):
                     if tile_sprite:
                         tileset_nid = tile_sprite.tileset_nid
                         pos = tile_sprite.tileset_position
-                        current_layer.set_sprite(true_pos, tileset_nid, pos)
+                        edit.set_sprite(true_pos, tileset_nid, pos)
+                        painted.append(true_pos)
                     # else:
-                    #     current_layer.erase_sprite(true_pos)
+                    #     edit.erase(true_pos)
         else:
             tileset, coords = self.window.get_tileset_coords()
             if tileset and coords:
@@ -259,119 +427,75 @@ class MapEditorView(QGraphicsView):
                     rel_coord = coord[0] - topleft[0], coord[1] - topleft[1]
                     true_pos = tile_pos[0] + rel_coord[0], tile_pos[1] + rel_coord[1]
                     if self.tilemap.check_bounds(true_pos):
-                        current_layer.set_sprite(true_pos, tileset.nid, coord)
+                        edit.set_sprite(true_pos, tileset.nid, coord)
+                        painted.append(true_pos)
+        self.mark_dirty('sprite_grid', painted)
 
     def erase_terrain(self, tile_pos):
-        current_layer = self.get_current_layer()
-
         if self.tilemap.check_bounds(tile_pos):
-            current_layer.erase_terrain(tile_pos)
+            self.get_edit('terrain_grid', "Erase Terrain").erase(tile_pos)
+            self.mark_dirty('terrain_grid', [tile_pos])
 
     def erase_tile(self, tile_pos):
-        current_layer = self.get_current_layer()
-
         if self.tilemap.check_bounds(tile_pos):
-            current_layer.erase_sprite(tile_pos)
-
-    def flood_fill_terrain(self, tile_pos):
+            self.get_edit('sprite_grid', "Erase Tiles").erase(tile_pos)
+            self.mark_dirty('sprite_grid', [tile_pos])
+
+    def find_fill_coords(self, grid, tile_pos, replace_all=False) -> set:
+        """
+        The coords connected to tile_pos that hold the same thing it does,
+        or every coord on the map that does, if replace_all
+        """
+        if replace_all:
+            return tilemap_edits.find_all(grid, tile_pos, self.tilemap.width, self.tilemap.height)
+        return tilemap_edits.flood_fill(grid, tile_pos, self.tilemap.width, self.tilemap.height)
+
+    def flood_fill_terrain(self, tile_pos, replace_all=False):
         if not self.tilemap.check_bounds(tile_pos):
-            return 
-
-        coords_to_replace = set()
-
-        def find_similar(x, y, terrain_nid):
-            if not self.tilemap.check_bounds((x, y)):
-                return
-            if (x, y) in coords_to_replace:
-                return
-            other_nid = current_layer.get_terrain((x, y))
-            if terrain_nid != other_nid:
-                return
-
-            coords_to_replace.add((x, y))
-
-            # Now recur for all directions
-            find_similar(x + 1, y, terrain_nid)
-            find_similar(x - 1, y, terrain_nid)
-            find_similar(x, y + 1, terrain_nid)
-            find_similar(x, y - 1, terrain_nid)
+            return
+        self.finish_edit()
 
         current_layer = self.get_current_layer()
-
-        # Get coords like current coord in current_layer
-        terrain_nid = current_layer.get_terrain(tile_pos)
         # Determine which coords should be flood-filled
-        find_similar(tile_pos[0], tile_pos[1], terrain_nid)
+        coords_to_replace = self.find_fill_coords(current_layer.terrain_grid, tile_pos, replace_all)
 
         # Do the deed
-        for coord in coords_to_replace:
-            current_nid = self.window.terrain_painter_menu.get_current_nid()
-            current_layer.terrain_grid[coord] = current_nid
+        current_nid = self.window.terrain_painter_menu.get_current_nid()
+        self.get_edit('terrain_grid', "Replace Terrain" if replace_all else "Fill Terrain").paint(coords_to_replace, current_nid)
+        self.mark_dirty('terrain_grid', coords_to_replace)
+        self.finish_edit()
 
-    def flood_fill_tile(self, tile_pos):
+    def flood_fill_tile(self, tile_pos, replace_all=False):
         if not self.tilemap.check_bounds(tile_pos):
-            return 
-
-        coords_to_replace = set()
-
-        def find_similar(x, y, sprite):
-            if not self.tilemap.check_bounds((x, y)):
-                return
-            if (x, y) in coords_to_replace:
-                return
-            tile = current_layer.get_sprite((x, y))
-            if tile:
-                nid = tile.tileset_nid
-                coord = tile.tileset_position
-            else:
-                nid, coord = None, None
-            if sprite:
-                if nid != sprite.tileset_nid or coord != sprite.tileset_position:
-                    return
-            elif tile:
-                return
-
-            coords_to_replace.add((x, y))
-
-            # Now recur for all directions
-            find_similar(x + 1, y, sprite)
-            find_similar(x - 1, y, sprite)
-            find_similar(x, y + 1, sprite)
-            find_similar(x, y - 1, sprite)
-
-        current_layer = self.get_current_layer()
-
-        # Get coords like current coord in current_layer
-        current_tile = current_layer.get_sprite(tile_pos)
-        # Determine which coords should be flood-filled
-        find_similar(tile_pos[0], tile_pos[1], current_tile)
+            return
+        self.finish_edit()
 
         if self.right_selection:
             # Only handles the topleft tile
-            coords = list(self.right_selection.keys())
-            topleft = min(coords)
+            topleft = min(self.right_selection.keys())
             true_coord, tile_sprite = self.right_selection[topleft]
-            coords = [true_coord]
+            if not tile_sprite:
+                return
+            coords = [tile_sprite.tileset_position]
             tileset_nid = tile_sprite.tileset_nid
         else:
             tileset, coords = self.window.get_tileset_coords()
+            if not tileset:
+                return
             tileset_nid = tileset.nid
 
         if not coords:
             return
-        topleft = min(coords)
-        w = max(coord[0] for coord in coords) - topleft[0] + 1
-        h = max(coord[1] for coord in coords) - topleft[1] + 1
+
+        current_layer = self.get_current_layer()
+        # Determine which coords should be flood-filled
+        coords_to_replace = self.find_fill_coords(current_layer.sprite_grid, tile_pos, replace_all)
 
         # Do the deed
-        for x in range(self.tilemap.width):
-            for y in range(self.tilemap.height):
-                if (x, y) in coords_to_replace:
-                    new_coord_x = x%w + topleft[0]
-                    new_coord_y = y%h + topleft[1]
-                    if (new_coord_x, new_coord_y) in coords:
-                        current_layer.set_sprite(
-                            (x, y), tileset_nid, (new_coord_x, new_coord_y))
+        edit = self.get_edit('sprite_grid', "Replace Tiles" if replace_all else "Fill Tiles")
+        tilemap_edits.pattern_fill(edit, coords_to_replace, tileset_nid, set(coords))
+        self.mark_dirty('sprite_grid', coords_to_replace)
+        self.finish_edit()
 
     def mousePressEvent(self, event):
         scene_pos = self.mapToScene(event.pos())
@@ -392,10 +516,12 @@ class MapEditorView(QGraphicsView):
                     self.erase_tile(tile_pos)
                 self.left_selecting = True
             elif self.window.current_tool == PaintTool.Fill:
+                # Shift fills every matching tile on the map, not just the connected ones
+                replace_all = bool(event.modifiers() & Qt.ShiftModifier)
                 if self.window.terrain_mode:
-                    self.flood_fill_terrain(tile_pos)
+                    self.flood_fill_terrain(tile_pos, replace_all)
                 else:
-                    self.flood_fill_tile(tile_pos)
+                    self.flood_fill_tile(tile_pos, replace_all)
         elif event.button() == Qt.RightButton and self.tilemap.check_bounds(tile_pos):
             if self.window.terrain_mode:
                 current_nid = self.tilemap.get_terrain(tile_pos)
@@ -440,6 +566,10 @@ class MapEditorView(QGraphicsView):
         tile_pos = int(scene_pos.x() // TILEWIDTH), \
             int(scene_pos.y() // TILEHEIGHT)
 
+        if event.button() == Qt.LeftButton:
+            # The stroke is done
+            self.finish_edit()
+
         if self.window.terrain_mode:
             if event.button() == Qt.LeftButton:
                 self.left_selecting = False
@@ -488,6 +618,7 @@ class MapEditor(QDialog):
         self.save()
         self.current_tool = PaintTool.NoTool
         self.terrain_mode: bool = False
+        self.undo_stack = QUndoStack(self)
 
         self.tileset_menu = TileSetMenu(self, self.current)
         self.layer_menu = LayerMenu(self, self.current)
@@ -582,6 +713,13 @@ class MapEditor(QDialog):
         self.show_gridlines_action.setCheckable(True)
         self.show_gridlines_action.setChecked(True)
 
+        self.undo_action = self.undo_stack.createUndoAction(self, "Undo")
+        self.undo_action.setIcon(QIcon(f"{icon_folder}/corner-up-left.png"))
+        self.undo_action.setShortcut(QKeySequence.Undo)
+        self.redo_action = self.undo_stack.createRedoAction(self, "Redo")
+        self.redo_action.setIcon(QIcon(f"{icon_folder}/corner-up-right.png"))
+        self.redo_action.setShortcut(QKeySequence.Redo)
+
     def void_right_selection(self):
         self.view.right_selection.clear()
 
@@ -612,9 +750,12 @@ class MapEditor(QDialog):
         self.toolbar.addAction(self.export_as_png_action)
         self.toolbar.addAction(self.show_gridlines_action)
         self.toolbar.addAction(self.show_autotiles_action)
+        self.toolbar.addAction(self.undo_action)
+        self.toolbar.addAction(self.redo_action)
 
     def set_current(self, current):  # Current is a TileMapPrefab
         self.current = current
+        self.undo_stack.clear()
         self.view.set_current(current)
         self.autotile_fps_box.edit.setValue(current.autotile_fps)
         self.layer_menu.set_current(current)
@@ -622,7 +763,9 @@ class MapEditor(QDialog):
         self.view.update_view()
 
     def resize_map(self):
-        ResizeDialog.get_new_size(self.current, self)
+        if ResizeDialog.get_new_size(self.current, self):
+            # The edits on the stack are for coords from before the resize
+            self.undo_stack.clear()
 
     def terrain_mode_toggle(self, val):
         self.terrain_mode = val
@@ -659,7 +802,12 @@ class MapEditor(QDialog):
         current_layer_index = self.layer_menu.view.currentIndex()
         idx = current_layer_index.row()
         current_layer = self.current.layers[idx]
-        current_layer.terrain_grid.clear()
+        self.view.finish_edit()
+        edit = tilemap_edits.TileMapEdit(current_layer, 'terrain_grid', "Reset Terrain")
+        for coord in list(current_layer.terrain_grid):
+            edit.erase(coord)
+        if edit.changed:
+            self.undo_stack.push(TileMapEditCommand(edit, self.view))
 
     def get_tileset_coords(self):
         return self.tileset_menu.current_tileset, self.tileset_menu.get_selection_coords()
@@ -682,6 +830,7 @@ class MapEditor(QDialog):
 
     def restore(self):
         self.current.restore_edits(self.saved_data)
+        self.undo_stack.clear()
 
     def _type(self):
         return 'tilemap_editor'
@@ -1115,6 +1264,7 @@ class TileSetMenu(QWidget):
             current_tileset.autotile_full_path = fn
             pix = QPixmap(companion_tileset)
             current_tileset.autotile_pixmap = pix
+            self.window.view.tile_image.invalidate()
             QMessageBox.information(self, "Autotile Generation Complete", "Autotile generation process completed for tileset %s" % current_tileset.nid)
 
 class TileSetView(MapEditorView):
@@ -1153,6 +1303,12 @@ class TileSetView(MapEditorView):
         else:
             self.clear_scene()
 
+    def drawBackground(self, painter, rect):
+        QGraphicsView.drawBackground(self, painter, rect)
+
+    def drawForeground(self, painter, rect):
+        QGraphicsView.drawForeground(self, painter, rect)
+
     def set_current(self, current):
         self.tileset = current
         self.left_selecting = None
@@ -1168,8 +1324,7 @@ class TileSetView(MapEditorView):
         painter = QPainter()
         painter.begin(image)
         for coord, pixmap in self.tileset.subpixmaps.items():
-            im = pixmap.toImage()
-            painter.drawImage(coord[0] * self.tilewidth, coord[1] * self.tileheight, im)
+            painter.drawPixmap(coord[0] * self.tilewidth, coord[1] * self.tileheight, pixmap)
             if coord in self.current_coords:
                 color = QColor(0, 255, 255, 128)
                 rect = QRect(coord[0] * self.tilewidth, coord[1] * self.tileheight, TILEWIDTH, TILEHEIGHT)
@@ -1,6 +1,7 @@
 from PyQt5 import QtGui
 
 from app.constants import COLORKEY
+from app.utilities import image_ops
 from app.data.palettes import enemy_colors, other_colors, enemy2_colors, \
     player_dark_colors, enemy_dark_colors
 
@@ -13,80 +14,62 @@ enemy2_colors = {QtGui.qRgb(*k): QtGui.qRgb(*v) for k, v in enemy2_colors.items(
 player_dark_colors = {QtGui.qRgb(*k): QtGui.qRgb(*v) for k, v in player_dark_colors.items()}
 enemy_dark_colors = {QtGui.qRgb(*k): QtGui.qRgb(*v) for k, v in enemy_dark_colors.items()}
 
-def convert_colorkey_slow(image):
-    image.convertTo(QtGui.QImage.Format_ARGB32)
-    for x in range(image.width()):
-        for y in range(image.height()):
-            if image.pixel(x, y) == qCOLORKEY:
-                image.setPixel(x, y, qAlpha)
-    return image
+def to_argb32(image):
+    """
+    Returns:
+        image, or a copy of it in Format_ARGB32 if it wasn't already
+        a 32-bit image that image_ops can work on
+    """
+    if image.format() in (QtGui.QImage.Format_ARGB32, QtGui.QImage.Format_RGB32):
+        return image
+    return image.convertToFormat(QtGui.QImage.Format_ARGB32)
 
-def convert_colorkey(image):
-    new_image = image.convertToFormat(QtGui.QImage.Format_Indexed8)
-    num_colors = new_image.colorCount()
-    if num_colors > 192:
-        return convert_colorkey_slow(image)
-    for i in range(new_image.colorCount()):
-        if new_image.color(i) == qCOLORKEY:
-            new_image.setColor(i, qAlpha)
-            break
-    image = new_image.convertToFormat(QtGui.QImage.Format_ARGB32)
-    return image
+def image_pixels(image) -> memoryview:
+    """
+    A view onto a 32-bit image's pixels (see to_argb32), without copying them
+    Only good for as long as image is around and unchanged
 
-def color_convert_slow(image, conversion_dict):
-    image.convertTo(QtGui.QImage.Format_ARGB32)
-    for x in range(image.width()):
-        for y in range(image.height()):
-            current_color = image.pixel(x, y)
-            if current_color in conversion_dict:
-                new_color = conversion_dict[current_color]
-                image.setPixel(x, y, new_color)
-    return image
+    Returns:
+        memoryview: the image's pixels, row by row, as QRgb
+    """
+    bits = image.constBits()
+    bits.setsize(image.sizeInBytes())
+    return memoryview(bits)
+
+def image_from_pixels(pixels: bytes, width: int, height: int,
+                      image_format=QtGui.QImage.Format_ARGB32):
+    return QtGui.QImage(pixels, width, height, width * 4, image_format).copy()
+
+def convert_colorkey(image):
+    image = to_argb32(image)
+    pixels = image_ops.replace_colors(image_pixels(image), {qCOLORKEY: qAlpha})
+    return image_from_pixels(pixels, image.width(), image.height())
 
 def color_convert(image, conversion_dict):
-    new_image = image.convertToFormat(QtGui.QImage.Format_Indexed8)
-    num_colors = new_image.colorCount()
-    if num_colors > 192:
-        return color_convert_slow(image, conversion_dict)
-    for old_color, new_color in conversion_dict.items():
-        for i in range(new_image.colorCount()):
-            if new_image.color(i) == old_color:
-                new_image.setColor(i, new_color)
-    return new_image.convertToFormat(QtGui.QImage.Format_RGB32)
+    image = to_argb32(image)
+    pixels = image_ops.replace_colors(image_pixels(image), conversion_dict)
+    return image_from_pixels(pixels, image.width(), image.height(), image.format())
 
 def find_palette(image):
-    palette = []
-    for x in range(image.width()):
-        for y in range(image.height()):
-            current_color = image.pixel(x, y)
-            if current_color not in palette:
-                palette.append(current_color)
-    color_palette = [QtGui.QColor(p) for p in palette]
-    true_palette = [(c.red(), c.green(), c.blue()) for c in color_palette]
-    return true_palette
+    image = to_argb32(image)
+    palette = image_ops.unique_colors(image_pixels(image), image.width())
+    return [image_ops.to_rgb(color) for color in palette]
 
 def find_palette_from_multiple(images: list):
-    palette = []
+    palette = {}
     for image in images:
-        for x in range(image.width()):
-            for y in range(image.height()):
-                current_color = image.pixel(x, y)
-                if current_color not in palette:
-                    palette.append(current_color)
-    color_palette = [QtGui.QColor(p) for p in palette]
-    true_palette = [(c.red(), c.green(), c.blue()) for c in color_palette]
-    return true_palette
+        image = to_argb32(image)
+        palette.update(dict.fromkeys(image_ops.unique_colors(image_pixels(image), image.width())))
+    return [image_ops.to_rgb(color) for color in palette]
 
 def get_full_palette(image) -> list:
     """
     Returns list of 3-tuples
     """
-    palette = []
-    for x in range(image.width()):
-        for y in range(image.height()):
-            color = image.pixelColor(x, y)
-            palette.append((color.red(), color.green(), color.blue()))
-    return palette
+    image = to_argb32(image)
+    pixels = image_ops.column_major(image_pixels(image), image.width())
+    rgb = {color: image_ops.to_rgb(color) for color in set(pixels)}
+    return [rgb[color] for color in pixels]
 
 def convert_gba(image):
     for i in range(image.colorCount()):
@@ -96,27 +79,13 @@ def convert_gba(image):
     return image
 
 def get_bbox(image):
-    min_x, max_x = image.width(), 0
-    min_y, max_y = image.height(), 0
-
     # Assumes topleft color is exclude color
     # unless top right is qCOLORKEY, then uses qCOLORKEY
+    image = to_argb32(image)
     exclude_color = image.pixel(0, 0)
     test_color = image.pixel(image.width() - 1, 0)
     if test_color == qCOLORKEY:
         exclude_color = qCOLORKEY
 
-    for x in range(image.width()):
-        for y in range(image.height()):
-            current_color = image.pixel(x, y)
-            if current_color != exclude_color:
-                if x < min_x:
-                    min_x = x
-                if x > max_x:
-                    max_x = x
-                if y < min_y:
-                    min_y = y
-                if y > max_y:
-                    max_y = y
     # Returns x, y, width, height rect
-    return (min_x, min_y, max_x - min_x + 1, max_y - min_y + 1)
+    return image_ops.content_bbox(image_pixels(image), image.width(), exclude_color)
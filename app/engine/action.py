@@ -1,4 +1,5 @@
 import sys
+import functools
 
 from app.utilities import utils
 from app.constants import TILEWIDTH, TILEHEIGHT
@@ -15,10 +16,28 @@ from app.engine.game_state import game
 import logging
 
 
+def _invalidates_equations(func):
+    @functools.wraps(func)
+    def wrapper(self, *args, **kwargs):
+        equations.invalidate()
+        try:
+            return func(self, *args, **kwargs)
+        finally:
+            equations.invalidate()
+    return wrapper
+
 class Action():
     def __init__(self):
         pass
 
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # Any action might change what a unit's stats and equations come out to,
+        # so throw away the cached values on either side of it
+        for name in ('do', 'execute', 'reverse'):
+            if name in cls.__dict__:
+                setattr(cls, name, _invalidates_equations(cls.__dict__[name]))
+
     # When used normally
     def do(self):
         pass
@@ -2042,6 +2061,7 @@ class AddSkill(Action):
             action.execute()
         self.skill_obj.owner_nid = self.unit.nid
         self.unit.skills.append(self.skill_obj)
+        skill_system.reset_hooks(self.unit)
         skill_system.on_add(self.unit, self.skill_obj)
 
         if self.skill_obj.aura and self.unit.position:
@@ -2056,6 +2076,7 @@ class AddSkill(Action):
         self.reset_action.reverse()
         if self.skill_obj in self.unit.skills:
             self.unit.skills.remove(self.skill_obj)
+            skill_system.reset_hooks(self.unit)
             skill_system.on_remove(self.unit, self.skill_obj)
             self.skill_obj.owner_nid = None
         else:
@@ -2081,6 +2102,7 @@ class RemoveSkill(Action):
             for skill in self.unit.skills[:]:
                 if skill.nid == self.skill:
                     self.unit.skills.remove(skill)
+                    skill_system.reset_hooks(self.unit)
                     skill_system.on_remove(self.unit, skill)
                     if true_remove:
                         skill_system.on_true_remove(self.unit, skill)
@@ -2091,6 +2113,7 @@ class RemoveSkill(Action):
         else:
             if self.skill in self.unit.skills:
                 self.unit.skills.remove(self.skill)
+                skill_system.reset_hooks(self.unit)
                 skill_system.on_remove(self.unit, self.skill)
                 if true_remove:
                     skill_system.on_true_remove(self.unit, self.skill)
@@ -2119,6 +2142,7 @@ class RemoveSkill(Action):
         for skill in self.removed_skills:
             skill.owner_nid = self.unit.nid
             self.unit.skills.append(skill)
+            skill_system.reset_hooks(self.unit)
             skill_system.on_add(self.unit, skill)
             if skill.aura and self.unit.position:
                 aura_funcs.propagate_aura(self.unit, skill, game)
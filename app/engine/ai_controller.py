@@ -2,9 +2,9 @@ import logging
 import math
 
 from app.data.database import DB
-from app.engine import (action, combat_calcs, engine, equations, evaluate,
-                        item_funcs, item_system, line_of_sight, pathfinding,
-                        skill_system, target_system)
+from app.engine import (action, ai_planner, combat_calcs, engine, equations,
+                        evaluate, item_funcs, item_system, line_of_sight,
+                        pathfinding, skill_system, target_system)
 from app.engine.combat import interaction
 from app.engine.game_state import game
 from app.engine.movement import MovementManager
@@ -24,6 +24,7 @@ class AIController():
         self.inner_ai = None
 
         self.did_something = False
+        self.checked_plan = False  # Whether ai_planner has been asked for this unit's plan
 
         self.move_ai_complete = False
         self.attack_ai_complete = False
@@ -59,7 +60,7 @@ class AIController():
 
         change = False
         if not self.move_ai_complete:
-            if self.think():
+            if self.use_plan() or self.think():
                 change = self.move()
                 self.move_ai_complete = True
         elif not self.attack_ai_complete:
@@ -73,6 +74,30 @@ class AIController():
 
         return self.did_something, change
 
+    def use_plan(self) -> bool:
+        """
+        Takes the decision ai_planner worked out ahead of time, if it has one
+        Exactly what think would have decided, so think can be skipped
+        """
+        if self.checked_plan:
+            return False
+        self.checked_plan = True
+        plan = ai_planner.take(self.unit)
+        if not plan:
+            return False
+        behaviours = DB.ai.get(self.unit.ai).behaviours
+        self.behaviour_idx = plan['behaviour_idx']
+        self.behaviour = behaviours[self.behaviour_idx - 1] if self.behaviour_idx > 0 else None
+        self.goal_position = plan['goal_position']
+        self.goal_target = plan['goal_target']
+        self.goal_item = game.get_item(plan['goal_item']) if plan['goal_item'] is not None else None
+        for uid in plan['equipped']:
+            self.unit.equip(game.get_item(uid))
+        if plan['pinged']:
+            self.ai_group_ping()
+        self.did_something = plan['did_something']
+        return True
+
     def move(self):
         if self.goal_position and self.goal_position != self.unit.position:
             path = target_system.get_path(self.unit, self.goal_position)
@@ -276,6 +301,27 @@ class AIController():
     def build_secondary(self):
         return SecondaryAI(self.unit, self.behaviour)
 
+class SpeculativeAI(AIController):
+    """
+    Thinks on one of ai_planner's workers, and keeps track of
+    what the main process will have to redo or check
+    """
+    def reset(self):
+        super().reset()
+        self.pinged = False
+        self.local = True  # Whether only the PrimaryAI was used
+
+    def ai_group_ping(self):
+        self.pinged = True  # Pinged for real when the plan is used
+
+    def build_secondary(self):
+        self.local = False
+        return super().build_secondary()
+
+    def smart_retreat(self) -> bool:
+        self.local = False
+        return super().smart_retreat()
+
 class PrimaryAI():
     def __init__(self, unit, valid_moves, behaviour):
         self.max_tp = 0
@@ -308,25 +354,20 @@ class PrimaryAI():
 
         logging.info("Testing Items: %s", self.items)
 
-        self.item_index = 0
-        self.move_index = 0
-        self.target_index = 0
-
         self.valid_moves = list(valid_moves)
 
         self.best_target = None
         self.best_position = None
         self.best_item = None
 
-        self.item_setup()
-
-    def item_setup(self):
-        if self.item_index < len(self.items):
-            logging.info("Testing %s" % self.items[self.item_index])
-            self.unit.equip(self.items[self.item_index])
-            self.get_all_valid_targets()
-            self.possible_moves = self.get_possible_moves()
-            logging.info(self.possible_moves)
+        # Conditional skills and support bonuses can depend on exactly where the unit
+        # stands, so then no two moves are assumed to give the same combat numbers
+        self.position_dependent = bool(game.supports.get_bonus_pairs(self.unit.nid)) or \
+            any(skill_system.get_skill_hooks(skill, 'condition') for skill in self.unit.skills)
+        # Key: (item uid, defender nid, context of the move, distance to defender), Value: combat preview
+        self.previews = {}
+        self.arrived_pos = self.unit.position  # Where the unit last arrived, and so whose statuses it has
+        self.planner = self.plan()
 
     def get_valid_targets(self, unit, item, valid_moves) -> list:
         item_range = item_funcs.get_range(unit, item)
@@ -345,86 +386,85 @@ class PrimaryAI():
 
         return list(filtered_targets)
 
-    def get_all_valid_targets(self):
-        item = self.items[self.item_index]
+    def get_all_valid_targets(self, item) -> list:
         logging.info("Determining targets for item: %s", item)
-        self.valid_targets = self.get_valid_targets(self.unit, item, self.valid_moves)
+        valid_targets = self.get_valid_targets(self.unit, item, self.valid_moves)
         # Only if we already have some legal targets (ie, ourself)
-        if self.valid_targets and 0 in item_funcs.get_range(self.unit, item):
-            self.valid_targets += self.valid_moves  # Hack to target self in all valid positions
-            self.valid_targets = list(set(self.valid_targets))  # Only uniques
-        logging.info("Valid Targets: %s", self.valid_targets)
-
-    def get_possible_moves(self) -> list:
-        if self.target_index < len(self.valid_targets) and self.item_index < len(self.items):
-            # Given an item and a target, find all positions in valid_moves that I can strike the target at.
-            item = self.items[self.item_index]
-            target = self.valid_targets[self.target_index]
-            a = target_system.find_manhattan_spheres(item_funcs.get_range(self.unit, item), *target)
-            b = set(self.valid_moves)
-            return list(a & b)
-        else:
-            return []
+        if valid_targets and 0 in item_funcs.get_range(self.unit, item):
+            valid_targets += self.valid_moves  # Hack to target self in all valid positions
+            valid_targets = list(set(valid_targets))  # Only uniques
+        logging.info("Valid Targets: %s", valid_targets)
+        return valid_targets
+
+    def get_context(self, move) -> tuple:
+        """
+        Everything about standing at move that the unit's statuses depend on.
+        Moves with the same context only need to be arrived at once
+        """
+        if self.position_dependent:
+            return (move,)
+        regions = frozenset(region.nid for region in game.level.regions
+                            if region.region_type == 'status' and region.contains(move))
+        return (game.tilemap.get_terrain(move), regions, frozenset(game.board.get_auras(move)))
 
     def quick_move(self, move):
+        self.unit.position = self.arrived_pos
         game.leave(self.unit, test=True)
         self.unit.position = move
         game.arrive(self.unit, test=True)
+        self.arrived_pos = move
+
+    def plan(self):
+        """
+        Tries every (item, target, move), yielding after every group of moves,
+        so the search can be spread over as many frames as it needs
+
+        The unit only actually arrives (with its auras, terrain and region statuses)
+        once per group of moves with the same context, and the combat numbers against
+        each defender are previewed once per context and distance (see get_preview),
+        so only what really depends on the exact move is worked out for every move
+        """
+        valid_moves = set(self.valid_moves)
+        for item in self.items:
+            logging.info("Testing %s" % item)
+            self.unit.equip(item)
+            item_range = item_funcs.get_range(self.unit, item)
+            max_item_range = max(item_range)
+            for target in self.get_all_valid_targets(item):
+                # Given an item and a target, find all positions in valid_moves that I can strike the target at.
+                possible_moves = target_system.find_manhattan_spheres(item_range, *target) & valid_moves
+                groups = {}
+                for move in sorted(possible_moves):
+                    groups.setdefault(self.get_context(move), []).append(move)
+                for context, moves in groups.items():
+                    if self.get_context(self.arrived_pos) != context:
+                        self.quick_move(moves[0])
+                    for move in moves:
+                        # Same statuses as arrived_pos, so only the position itself needs to change
+                        self.unit.position = move
+                        # Check line of sight
+                        if DB.constants.value('line_of_sight') and \
+                                not line_of_sight.line_of_sight([move], [target], max_item_range):
+                            continue
+                        self.determine_utility(move, target, item, context)
+                    self.unit.position = self.arrived_pos
+                    yield
 
     def run(self):
-        if self.item_index >= len(self.items):
+        if next(self.planner, True):
             self.quick_move(self.orig_pos)
             if self.orig_item:
                 self.unit.equip(self.orig_item)
             return (True, self.best_target, self.best_position, self.best_item)
 
-        elif self.target_index >= len(self.valid_targets):
-            self.target_index = 0
-            self.item_index += 1
-            self.item_setup()
-
-        elif self.move_index >= len(self.possible_moves):
-            self.move_index = 0
-            self.target_index += 1
-            self.possible_moves = self.get_possible_moves()
-
-        else:
-            target = self.valid_targets[self.target_index]
-            item = self.items[self.item_index]
-            # If too many legal targets, just try for the best move first
-            # Otherwise it spends way too long trying every possible position to strike from
-            if len(self.valid_targets) > 10:
-                enemy_positions = {u.position for u in game.units if u.position and skill_system.check_enemy(self.unit, u)}
-                move = utils.farthest_away_pos(self.orig_pos, self.possible_moves, enemy_positions)
-            else:
-                move = self.possible_moves[self.move_index]
-
-            if self.unit.position != move:
-                self.quick_move(move)
-
-            # Check line of sight
-            line_of_sight_flag = True
-            if DB.constants.value('line_of_sight'):
-                max_item_range = max(item_funcs.get_range(self.unit, item))
-                valid_targets = line_of_sight.line_of_sight([move], [target], max_item_range)
-                if not valid_targets:
-                    line_of_sight_flag = False
-
-            if line_of_sight_flag:
-                self.determine_utility(move, target, item)
-            self.move_index += 1
-            # If too many legal targets, do not bother with every possible move
-            if len(self.valid_targets) > 10:
-                self.move_index = len(self.possible_moves)
-
         # Not done yet
         return (False, self.best_target, self.best_position, self.best_item)
 
-    def determine_utility(self, move, target, item):
+    def determine_utility(self, move, target, item, context):
         tp = 0
         main_target_pos, splash = item_system.splash(self.unit, item, target)
         if item_system.target_restrict(self.unit, item, main_target_pos, splash):
-            tp = self.compute_priority(main_target_pos, splash, move, item)
+            tp = self.compute_priority(main_target_pos, splash, move, item, context)
 
         unit = game.board.get_unit(target)
         if unit:
@@ -439,7 +479,28 @@ class PrimaryAI():
             self.best_item = item
             self.max_tp = tp
 
-    def compute_priority(self, main_target_pos, splash, move, item) -> float:
+    def get_preview(self, item, defender, move, context) -> dict:
+        """
+        Combat numbers of the unit, standing at move, attacking defender with item
+        Shared by every move with the same context at the same distance from defender
+        """
+        key = (item.uid, defender.nid, context, utils.calculate_distance(move, defender.position))
+        preview = self.previews.get(key)
+        if preview is None:
+            def_weapon = defender.get_weapon()
+            preview = {
+                'damage': combat_calcs.compute_damage(self.unit, defender, item, def_weapon, "attack"),
+                'crit_damage': combat_calcs.compute_damage(self.unit, defender, item, def_weapon, "attack", crit=True),
+                'hit': combat_calcs.compute_hit(self.unit, defender, item, def_weapon, "attack"),
+                'crit': combat_calcs.compute_crit(self.unit, defender, item, def_weapon, "attack"),
+                'counter_damage': combat_calcs.compute_damage(defender, self.unit, def_weapon, item, "defense"),
+                'counter_hit': combat_calcs.compute_hit(defender, self.unit, def_weapon, item, "defense"),
+                'can_counter': combat_calcs.can_counterattack(self.unit, item, defender, def_weapon),
+                'num_attacks': combat_calcs.outspeed(self.unit, defender, item, def_weapon, "attack")}
+            self.previews[key] = preview
+        return preview
+
+    def compute_priority(self, main_target_pos, splash, move, item, context) -> float:
         tp = 0
         main_target = game.board.get_unit(main_target_pos)
         # Only count main target if it's one of the legal targets
@@ -453,7 +514,7 @@ class PrimaryAI():
 
             if item_system.damage(self.unit, item) is not None and \
                     skill_system.check_enemy(self.unit, main_target):
-                ai_priority = self.default_priority(main_target, item, move)
+                ai_priority = self.default_priority(main_target, item, move, context)
                 tp += ai_priority
 
         for splash_pos in splash:
@@ -468,8 +529,9 @@ class PrimaryAI():
                 tp += ai_priority
 
             if item_system.damage(self.unit, item):
-                accuracy = utils.clamp(combat_calcs.compute_hit(self.unit, target, item, target.get_weapon(), "attack")/100., 0, 1)
-                raw_damage = combat_calcs.compute_damage(self.unit, target, item, target.get_weapon(), "attack")
+                preview = self.get_preview(item, target, move, context)
+                accuracy = utils.clamp(preview['hit']/100., 0, 1)
+                raw_damage = preview['damage']
                 lethality = utils.clamp(raw_damage / float(target.get_hp()), 0, 1)
                 ai_priority = 3 if lethality * accuracy >= 1 else lethality * accuracy
                 if skill_system.check_enemy(self.unit, target):
@@ -478,25 +540,26 @@ class PrimaryAI():
                     tp -= ai_priority
         return tp
 
-    def default_priority(self, main_target, item, move):
+    def default_priority(self, main_target, item, move, context):
         # Default method
         terms = []
         offense_term = 0
         defense_term = 1
 
-        raw_damage = combat_calcs.compute_damage(self.unit, main_target, item, main_target.get_weapon(), "attack")
-        crit_damage = combat_calcs.compute_damage(self.unit, main_target, item, main_target.get_weapon(), "attack", crit=True)
+        preview = self.get_preview(item, main_target, move, context)
+        raw_damage = preview['damage']
+        crit_damage = preview['crit_damage']
 
         # Damage I do compared to target's current hp
         lethality = utils.clamp(raw_damage / float(main_target.get_hp()), 0, 1)
         crit_lethality = utils.clamp(crit_damage / float(main_target.get_hp()), 0, 1)
         # Accuracy
-        hit_comp = combat_calcs.compute_hit(self.unit, main_target, item, main_target.get_weapon(), "attack")
+        hit_comp = preview['hit']
         if hit_comp:
             accuracy = utils.clamp(hit_comp/100., 0, 1)
         else:
             accuracy = 0
-        crit_comp = combat_calcs.compute_crit(self.unit, main_target, item, main_target.get_weapon(), "attack")
+        crit_comp = preview['crit']
         if crit_comp:
             crit_accuracy = utils.clamp(crit_comp/100., 0, 1)
         else:
@@ -504,21 +567,19 @@ class PrimaryAI():
 
         # Determine if I would get countered
         # Even if I wouldn't get countered, check anyway how much damage I would take
-        target_weapon = main_target.get_weapon()
-        target_damage = combat_calcs.compute_damage(main_target, self.unit, target_weapon, item, "defense")
+        target_damage = preview['counter_damage']
         if not target_damage:
             target_damage = 0
         target_damage = utils.clamp(target_damage/main_target.get_hp(), 0, 1)
-        target_accuracy = combat_calcs.compute_hit(main_target, self.unit, target_weapon, item, "defense")
+        target_accuracy = preview['counter_hit']
         if not target_accuracy:
             target_accuracy = 0
         target_accuracy = utils.clamp(target_accuracy/100., 0, 1)
         # If I wouldn't get counterattacked, much less important, so multiply by 10 %
-        if not combat_calcs.can_counterattack(self.unit, item, main_target, target_weapon):
+        if not preview['can_counter']:
             target_damage *= 0.3
             target_accuracy *= 0.3
-
-        num_attacks = combat_calcs.outspeed(self.unit, main_target, item, target_weapon, "attack")
+        num_attacks = preview['num_attacks']
         first_strike = lethality * accuracy if lethality >= 1 else 0
 
         if num_attacks > 1 and target_damage >= 1:
@@ -632,10 +693,12 @@ class SecondaryAI():
         movement_group = MovementManager.get_movement_group(self.unit)
         self.grid = game.board.get_grid(movement_group)
         self.pathfinder = \
-            pathfinding.AStar(self.unit.position, None, self.grid,
-                              game.tilemap.width, game.tilemap.height,
-                              self.unit.team, skill_system.pass_through(self.unit),
-                              DB.constants.value('ai_fog_of_war'))
+            pathfinding.FlatAStar(self.unit.position, None,
+                                  game.board.get_mcost_grid(movement_group),
+                                  game.board.path_buffers,
+                                  game.tilemap.width, game.tilemap.height,
+                                  self.unit.team, skill_system.pass_through(self.unit),
+                                  DB.constants.value('ai_fog_of_war'))
 
         self.widen_flag = False  # Determines if we've widened our search
         self.reset()
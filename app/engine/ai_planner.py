@@ -0,0 +1,301 @@
+import logging
+import multiprocessing
+import os
+import pickle
+
+from app.data.database import DB
+from app.engine import action, equations, target_system
+from app.engine import config as cf
+from app.engine.game_state import game
+from app.engine.objects.item import ItemObject
+from app.engine.objects.skill import SkillObject
+from app.engine.objects.unit import UnitObject
+from app.events.regions import Region
+from app.utilities import utils
+
+"""
+Speculative AI planning
+
+When an AI phase starts, the board is snapshotted (game.save()) and every
+unit that will act this phase is planned on a pool of worker processes,
+each with its own copy of the game restored from the snapshot.
+The units still act one at a time, in the usual order, and each one
+uses its plan only if nothing the plan could depend on has changed
+since the snapshot. Otherwise, or if its plan isn't back yet,
+it thinks for itself, just as it would have without the pool
+
+A plan that only ever used the PrimaryAI can only have depended on what is
+within the unit's reach (movement + item range + MARGIN), so it stays good
+until an earlier unit's move, kill, or anything else in the action log touches
+a unit or position within that reach. Plans that used the SecondaryAI or
+retreated path across the whole map, so any change at all throws them out
+
+Planning never touches static_random, and a plan is only used when thinking
+again would have come to the same decision, so the random numbers come out
+in the same order, and replays and the turnwheel match, either way
+
+Off unless the ai_workers setting is above 0
+"""
+
+MARGIN = 3  # Tiles past a unit's reach that can still change its plan (splash, default aura range)
+
+# Logged during an AI phase, but don't change anything a plan depends on
+HARMLESS_ACTIONS = ('SetPreviousPosition', 'UpdateRecords', 'ReverseRecords', 'RecordRandomState',
+                    'MarkPhase', 'LockTurnwheel', 'ChangePhaseMusic', 'Message', 'IncrementSupportPoints',
+                    'GainMoney', 'GiveBexp', 'AddLore', 'RemoveLore', 'ChangeObjective', 'OnlyOnceEvent')
+# Can change what any unit on the map would do
+GLOBAL_ACTIONS = ('AddRegion', 'RemoveRegion', 'ChangeRegionCondition')
+
+_pool = None
+_pool_failed = False  # Couldn't start the workers, so don't try again this session
+_phase_id = 0
+_pending = []  # Plans still being worked out
+_plans = {}  # Key: unit nid, Value: plan, or None if it couldn't be planned ahead
+_positions = {}  # Key: unit nid, Value: where it was when last checked
+_scanned = 0  # How much of the action log has been checked
+_touched_units = set()
+_touched_positions = set()
+_changed_everything = False
+_num_used = 0
+_num_thought = 0
+
+def _init_worker(project: str):
+    logging.basicConfig(level=logging.WARNING)
+    logging.getLogger().setLevel(logging.WARNING)
+    from app.engine import simulation
+    simulation.init(project)
+
+def _get_pool():
+    global _pool, _pool_failed
+    if _pool is None and not _pool_failed:
+        from app.resources.resources import RESOURCES
+        project = os.path.dirname(RESOURCES.main_folder)[:-len('.ltproj')]
+        try:
+            _pool = multiprocessing.Pool(cf.SETTINGS['ai_workers'], initializer=_init_worker, initargs=(project,))
+        except (OSError, ValueError) as e:
+            logging.warning("Could not start AI workers, planning ahead is off: %s", e)
+            _pool_failed = True
+    return _pool
+
+def shutdown():
+    """
+    Stops the workers. A later phase starts new ones if the setting is still on
+    """
+    global _pool
+    end_phase()
+    if _pool:
+        _pool.terminate()
+        _pool.join()
+        _pool = None
+
+def _restore_equipment(unit, weapon, accessory):
+    for current, item in ((unit.equipped_weapon, weapon), (unit.equipped_accessory, accessory)):
+        if current is not item:
+            if item:
+                unit.equip(item)
+            else:
+                unit.unequip(current)
+
+def _plan_unit(unit) -> dict:
+    """
+    Thinks for the unit, on this worker's copy of the game,
+    then puts back everything about the unit that thinking changed
+
+    Returns:
+        dict: what AIController.think decided, or None if the unit
+        can't be planned ahead (thinking made new items or skills)
+    """
+    from app.engine.ai_controller import SpeculativeAI
+    ai = SpeculativeAI()
+    weapon, accessory = unit.equipped_weapon, unit.equipped_accessory
+    previous_position = unit.previous_position
+    num_items, num_skills = len(game.item_registry), len(game.skill_registry)
+
+    unit.previous_position = unit.position
+    ai.load_unit(unit)
+    while not ai.think():
+        pass
+    equipped = [item.uid for item in (unit.equipped_weapon, unit.equipped_accessory) if item]
+
+    _restore_equipment(unit, weapon, accessory)
+    unit.previous_position = previous_position
+    if len(game.item_registry) != num_items or len(game.skill_registry) != num_skills:
+        return None
+    reach = equations.parser.movement(unit) + \
+        max(target_system.find_potential_range(unit, True, True), default=0) + MARGIN
+    return {'position': unit.position,
+            'reach': reach,
+            'local': ai.local,
+            'pinged': ai.pinged,
+            'did_something': ai.did_something,
+            'behaviour_idx': ai.behaviour_idx,
+            'goal_position': ai.goal_position,
+            'goal_target': ai.goal_target,
+            'goal_item': ai.goal_item.uid if ai.goal_item else None,
+            'equipped': equipped}
+
+_loaded_phase = None
+def _plan_units(args) -> dict:
+    """
+    Runs on a worker. Restores the snapshot, unless it already has,
+    and plans each of the units from it
+    """
+    global _loaded_phase
+    phase_id, data, unit_nids = args
+    if _loaded_phase != phase_id:
+        from app.engine import save
+        game.clear()
+        game.build_new()
+        game.load(pickle.loads(data))
+        save.set_next_uids(game)
+        _loaded_phase = phase_id
+    plans = {}
+    for nid in unit_nids:
+        try:
+            plans[nid] = _plan_unit(game.get_unit(nid))
+        except Exception as e:
+            logging.warning("Could not plan ahead for %s: %s", nid, e)
+            plans[nid] = None
+    return plans
+
+def start_phase():
+    """
+    Snapshots the board and hands every unit that will act this phase to the pool
+    Called when the AI phase starts
+    """
+    global _phase_id, _scanned, _changed_everything, _num_used, _num_thought
+    end_phase()
+    num_workers = cf.SETTINGS['ai_workers']
+    if num_workers <= 0 or DB.constants.value('initiative'):
+        return
+    team = game.phase.get_current()
+    unit_nids = [unit.nid for unit in game.units if unit.position and not unit.finished and
+                 not unit.has_run_ai and unit.team == team]
+    if not unit_nids:
+        return
+    # The snapshot is a stall on the main thread, so only take it
+    # once there are workers to hand it to
+    pool = _get_pool()
+    if not pool:
+        return
+
+    _phase_id += 1
+    s_dict, _ = game.save()
+    data = pickle.dumps(s_dict, pickle.HIGHEST_PROTOCOL)
+    chunk_size = -(-len(unit_nids) // num_workers)
+    for idx in range(0, len(unit_nids), chunk_size):
+        _pending.append(pool.apply_async(_plan_units, ((_phase_id, data, unit_nids[idx:idx + chunk_size]),)))
+    _positions.update({unit.nid: unit.position for unit in game.units})
+    _scanned = len(game.action_log.actions)
+    _changed_everything = False
+    _num_used, _num_thought = 0, 0
+
+def end_phase():
+    """
+    Drops whatever is left of this phase's plans
+    """
+    if _pending or _plans:
+        logging.info("AI plans used: %d, thought again: %d", _num_used, _num_thought)
+    _pending.clear()
+    _plans.clear()
+    _positions.clear()
+    _touched_units.clear()
+    _touched_positions.clear()
+
+def _collect(obj, units: set, positions: set, depth: int = 0) -> bool:
+    """
+    Adds the nid of every unit and every position obj refers to
+
+    Returns:
+        bool: whether it found any
+    """
+    if isinstance(obj, UnitObject):
+        units.add(obj.nid)
+        return True
+    elif isinstance(obj, (ItemObject, SkillObject)):
+        if obj.owner_nid:
+            units.add(obj.owner_nid)
+            return True
+        return False
+    elif isinstance(obj, tuple) and len(obj) == 2 and all(isinstance(i, int) for i in obj):
+        positions.add(obj)
+        return True
+    elif depth >= 3:
+        return False
+    elif isinstance(obj, action.Action):
+        values = vars(obj).values()
+    elif isinstance(obj, (list, tuple, set)):
+        values = obj
+    elif isinstance(obj, dict):
+        values = obj.values()
+    else:
+        return False
+    found = False
+    for value in values:
+        found = _collect(value, units, positions, depth + 1) or found
+    return found
+
+def _scan_action_log():
+    """
+    Works out which units and positions the actions since the last scan touched
+    """
+    global _scanned, _changed_everything
+    actions = game.action_log.actions
+    if len(actions) < _scanned:  # Actions were taken back
+        _changed_everything = True
+    ai_fog_of_war = DB.constants.value('ai_fog_of_war')
+    units = set()
+    for act in actions[_scanned:]:
+        name = act.__class__.__name__
+        if name in HARMLESS_ACTIONS:
+            continue
+        if name in GLOBAL_ACTIONS or (name == 'UpdateFogOfWar' and ai_fog_of_war) or \
+                any(isinstance(value, Region) for value in vars(act).values()) or \
+                not _collect(act, units, _touched_positions):
+            _changed_everything = True
+    _scanned = len(actions)
+    for nid in units:
+        unit = game.get_unit(nid)
+        for position in (_positions.get(nid), unit.position if unit else None):
+            if position:
+                _touched_positions.add(position)
+        _positions[nid] = unit.position if unit else None
+    _touched_units.update(units)
+
+def _is_valid(plan: dict, unit) -> bool:
+    if not plan or _changed_everything or unit.nid in _touched_units or unit.position != plan['position']:
+        return False
+    if not plan['local']:
+        return not _touched_units and not _touched_positions
+    return all(utils.calculate_distance(unit.position, position) > plan['reach']
+               for position in _touched_positions)
+
+def take(unit) -> dict:
+    """
+    Returns:
+        dict: the unit's plan, if it is back from the pool and
+        still what the unit would decide, otherwise None
+        A unit's plan can only be taken once
+    """
+    global _num_used, _num_thought
+    if not _pending and not _plans:
+        return None
+    for result in _pending[:]:
+        if result.ready():
+            _pending.remove(result)
+            try:
+                _plans.update(result.get())
+            except Exception as e:
+                logging.warning("AI planning failed: %s", e)
+    _scan_action_log()
+    plan = _plans.pop(unit.nid, None)
+    valid = _is_valid(plan, unit)
+    # Thinking can change the unit without logging it (like what it has equipped)
+    _touched_units.add(unit.nid)
+    if unit.position:
+        _touched_positions.add(unit.position)
+    if valid:
+        _num_used += 1
+        return plan
+    _num_thought += 1
+    return None
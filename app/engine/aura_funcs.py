@@ -36,6 +36,7 @@ def apply_aura(owner, unit, child_skill, target, test=False):
             # Doesn't need to use action system
             if child_skill.stack or child_skill.nid not in [skill.nid for skill in unit.skills]:
                 unit.skills.append(child_skill)
+                skill_system.reset_hooks(unit)
         else:
             act = action.AddSkill(unit, child_skill)
             action.do(act)
@@ -45,6 +46,7 @@ def remove_aura(unit, child_skill, test=False):
         logging.debug("Removing Aura %s from %s", child_skill, unit)
         if test:
             unit.skills.remove(child_skill)
+            skill_system.reset_hooks(unit)
         else:
             act = action.RemoveSkill(unit, child_skill)
             action.do(act)
@@ -1,7 +1,7 @@
 from app.constants import WINWIDTH, WINHEIGHT
 from app.resources.resources import RESOURCES
 from app.engine import engine, image_mods
-from app.engine.sprites import SPRITES
+from app.engine.sprites import SPRITES, load_panorama
 from app.utilities import utils
 
 class SpriteBackground():
@@ -41,9 +41,7 @@ class PanoramaBackground():
     def __init__(self, panorama, speed=125, loop=True, fade_out=False):
         self.counter = 0
         self.panorama = panorama
-        if not self.panorama.images:
-            for path in self.panorama.get_all_paths():
-                self.panorama.images.append(engine.image_load(path))
+        load_panorama(self.panorama)
 
         self.speed = speed
         self.loop = loop
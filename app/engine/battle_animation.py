@@ -1,3 +1,5 @@
+from collections import OrderedDict
+
 from app.constants import WINWIDTH, COLORKEY
 from app.utilities import utils
 from app.resources.resources import RESOURCES
@@ -6,6 +8,7 @@ from app.data.database import DB
 from app.engine.sprites import SPRITES
 from app.engine.sound import SOUNDTHREAD
 from app.engine import engine, image_mods, item_system, item_funcs
+import app.engine.config as cf
 
 from app.resources.combat_anims import CombatAnimation, WeaponAnimation, EffectAnimation
 from app.resources.combat_palettes import Palette
@@ -15,6 +18,105 @@ import logging
 battle_anim_speed = 1
 battle_anim_registry = {}
 
+class FrameSet():
+    def __init__(self, frames: dict, size: int):
+        self.frames = frames  # Key: frame nid, Value: image
+        self.flashes = {}  # Key: (frame nid, color), Value: image
+        self.size = size
+
+def get_size(image) -> int:
+    return image.get_width() * image.get_height() * image.get_bytesize()
+
+class FrameCache():
+    """
+    Palette swapped frames of every battle animation, shared by every combat,
+    least recently used first, kept under the frame_cache_size setting (in megabytes)
+
+    Each entry holds every frame of one animation in one palette, facing one way,
+    along with the flashed versions of those frames as they are asked for.
+    An animation's sheet is turned into palette indices once (see image_mods.make_indexed),
+    so each palette after that is a single pass over the sheet. The indexed sheet
+    counts against the budget too, and goes once the last entry for its animation does
+    """
+    def __init__(self):
+        self.entries = OrderedDict()  # Key: (anim path, palette nid, flip), Value: FrameSet
+        self.indexed = {}  # Key: anim path, Value: (indexed sheet, coords) or None
+        self.size = 0
+
+    @property
+    def budget(self) -> int:
+        return cf.SETTINGS.get('frame_cache_size', 64) * 1024 * 1024
+
+    def clear(self):
+        self.entries.clear()
+        self.indexed.clear()
+        self.size = 0
+
+    def get(self, anim_prefab, palette: Palette, flip: bool) -> FrameSet:
+        key = (anim_prefab.full_path, palette.nid, flip)
+        frame_set = self.entries.get(key)
+        if frame_set:
+            self.entries.move_to_end(key)
+            return frame_set
+        if flip:
+            frames = {nid: engine.flip_horiz(image) for nid, image in self.get(anim_prefab, palette, False).frames.items()}
+            size = sum(get_size(image) for image in frames.values())
+        else:
+            frames, size = self._convert(anim_prefab, palette)
+        frame_set = FrameSet(frames, size)
+        self._add(key, frame_set)
+        return frame_set
+
+    def get_flash(self, frame_set: FrameSet, frame_nid: str, image, color: tuple):
+        key = (frame_nid, color)
+        flash_image = frame_set.flashes.get(key)
+        if not flash_image:
+            flash_image = image_mods.change_color(image.convert_alpha(), color)
+            frame_set.flashes[key] = flash_image
+            frame_set.size += get_size(flash_image)
+            # Only counts if the frame set is still cached
+            if any(entry is frame_set for entry in reversed(self.entries.values())):
+                self.size += get_size(flash_image)
+                self._evict()
+        return flash_image
+
+    def _convert(self, anim_prefab, palette: Palette) -> tuple:
+        path = anim_prefab.full_path
+        if path not in self.indexed:
+            coords = list(palette.colors.keys())
+            indexed = image_mods.make_indexed(anim_prefab.image, coords)
+            self.indexed[path] = (indexed, coords) if indexed else None
+            if indexed:
+                self.size += get_size(indexed)
+        if self.indexed[path]:
+            indexed, coords = self.indexed[path]
+            colors = [palette.colors.get(coord, (0, coord[0], coord[1])) for coord in coords]
+            sheet = image_mods.apply_indexed_palette(indexed, colors)
+            engine.set_colorkey(sheet, anim_prefab.image.get_colorkey(), rleaccel=True)
+            frames = {frame.nid: engine.subsurface(sheet, frame.rect) for frame in anim_prefab.frames}
+            return frames, get_size(sheet)
+        # Drawn with colors that aren't palette indices, so only convert the ones that are
+        conversion_dict = {(0, coord[0], coord[1]): (color[0], color[1], color[2]) for coord, color in palette.colors.items()}
+        frames = {frame.nid: image_mods.color_convert(engine.copy_surface(frame.image), conversion_dict)
+                  for frame in anim_prefab.frames}
+        return frames, sum(get_size(image) for image in frames.values())
+
+    def _add(self, key, frame_set: FrameSet):
+        self.entries[key] = frame_set
+        self.size += frame_set.size
+        self._evict()
+
+    def _evict(self):
+        # Always keep the newest, even if it alone is over budget
+        while self.size > self.budget and len(self.entries) > 1:
+            (path, _, _), old = self.entries.popitem(last=False)
+            self.size -= old.size
+            if self.indexed.get(path) and not any(key[0] == path for key in self.entries):
+                indexed, _ = self.indexed.pop(path)
+                self.size -= get_size(indexed)
+
+FRAMES = FrameCache()
+
 class BattleAnimation():
     idle_poses = {'Stand', 'RangedStand', 'TransformStand'}
 
@@ -33,18 +135,11 @@ class BattleAnimation():
 
     @classmethod
     def get_effect_anim(cls, effect, palette_name, palette, unit, item):
-        unique_hash = effect.nid + '_' + palette_name + '_' + palette.nid
-        child_effect = battle_anim_registry.get(unique_hash)
-        if child_effect:
-            image_directory = child_effect.image_directory
-            child_effect = cls(effect, palette_name, palette, unit, item, image_directory)
-        else:
-            child_effect = cls(effect, palette_name, palette, unit, item)
-            battle_anim_registry[unique_hash] = child_effect
-        return child_effect
+        # Frames are shared through FRAMES, so a new effect costs nothing to set up
+        return cls(effect, palette_name, palette, unit, item)
 
     def __init__(self, anim_prefab: WeaponAnimation, palette_name: str,
-                 palette: Palette, unit, item, image_directory: dict = None):
+                 palette: Palette, unit, item):
         self.anim_prefab = anim_prefab
         self.palette_name = palette_name
         self.current_palette = palette
@@ -59,11 +154,7 @@ class BattleAnimation():
         if not anim_prefab.image and anim_prefab.frames:
             self.load_full_image()
 
-        # Apply palette to frames
-        if image_directory:
-            self.image_directory = image_directory
-        else:
-            self.apply_palette()
+        # Frames are palette swapped by FRAMES the first time they are drawn
 
         self.clear()
 
@@ -147,13 +238,8 @@ class BattleAnimation():
         for frame in self.anim_prefab.frames:
             frame.image = engine.subsurface(self.anim_prefab.image, frame.rect)
 
-    def apply_palette(self):
-        self.image_directory = {}
-        colors = self.current_palette.colors
-        conversion_dict = {(0, coord[0], coord[1]): (color[0], color[1], color[2]) for coord, color in colors.items()}
-        for frame in self.anim_prefab.frames:
-            converted_image = image_mods.color_convert(engine.copy_surface(frame.image), conversion_dict)
-            self.image_directory[frame.nid] = converted_image
+    def get_frame_set(self) -> FrameSet:
+        return FRAMES.get(self.anim_prefab, self.current_palette, not self.right)
 
     def pair(self, owner, partner_anim, right, at_range, entrance_frames=0, position=None, parent=None):
         self.owner = owner
@@ -650,7 +736,8 @@ class BattleAnimation():
                 offset = int(self.init_position[0] + progress * diff_x), int(self.init_position[1] + progress * diff_y)
 
             # Self flash
-            image = self.handle_flash(image)
+            # Unscaled frames keep their flashed versions for next time
+            image = self.handle_flash(image, None if self.entrance_counter else self.current_frame.nid)
 
             # Self screen dodge
             image = self.handle_screen_dodge(image)
@@ -699,9 +786,8 @@ class BattleAnimation():
             engine.blit(surf, image, offset, None, self.blend)
 
     def get_image(self, frame, shake, range_offset, pan_offset, static) -> tuple:
-        image = self.image_directory[frame.nid].copy()
-        if not self.right:
-            image = engine.flip_horiz(image)
+        # Never drawn on, so it doesn't need to be copied
+        image = self.get_frame_set().frames[frame.nid]
         offset = frame.offset
         # Handle offset (placement of the object on the screen)
         if self.lr_offset:
@@ -730,10 +816,13 @@ class BattleAnimation():
             offset = WINWIDTH - offset[0] - image.get_width() + left, offset[1] + shake[1]
         return image, offset
 
-    def handle_flash(self, image):
+    def handle_flash(self, image, frame_nid=None):
         if self.flash_color:
-            flash_color = self.flash_color[self.flash_counter % len(self.flash_color)]
-            self.flash_image = image_mods.change_color(image.convert_alpha(), flash_color)
+            flash_color = tuple(self.flash_color[self.flash_counter % len(self.flash_color)])
+            if frame_nid is None:
+                self.flash_image = image_mods.change_color(image.convert_alpha(), flash_color)
+            else:
+                self.flash_image = FRAMES.get_flash(self.get_frame_set(), frame_nid, image, flash_color)
             self.flash_counter -= 1
             image = self.flash_image
             # done
@@ -1,6 +1,10 @@
+from collections import OrderedDict
+
 from app.engine import engine
 
 class BmpFont():
+    max_rendered = 256  # How many rendered strings to keep
+
     def __init__(self, png_path, idx_path):
         self.all_uppercase = False
         self.all_lowercase = False
@@ -12,6 +16,7 @@ class BmpFont():
         self._width = 8
         self.height = 16
         self.memory = {}
+        self.rendered = OrderedDict()  # Key: string, Value: the string rendered on its own surface
 
         with open(self.idx_path, 'r', encoding='utf-8') as fp:
             for x in fp.readlines():
@@ -51,6 +56,34 @@ class BmpFont():
         return string
 
     def blit(self, string, surf, pos=(0, 0)):
+        """
+        Rendered strings are kept, least recently used first, so text that is
+        drawn every frame only costs one blit instead of one per character
+        """
+        string = self.modify_string(string)
+        if not string:
+            return
+        image = self.rendered.get(string)
+        if image:
+            self.rendered.move_to_end(string)
+        else:
+            image = self.render(string)
+            self.rendered[string] = image
+            if len(self.rendered) > self.max_rendered:
+                self.rendered.popitem(last=False)
+        engine.blit(surf, image, pos)
+
+    def render(self, string):
+        # Last character's glyph can reach past its width
+        width = max(1, self.width(string) + self.space_offset * (len(string) - 1) + self._width)
+        surf = engine.create_surface((width, self.height), transparent=True)
+        self.blit_glyphs(string, surf)
+        return surf
+
+    def blit_glyphs(self, string, surf, pos=(0, 0)):
+        """
+        Blits each character of string one by one
+        """
         def normal_render(left, top, string):
             for c in string:
                 if c not in self.memory:
@@ -101,10 +134,6 @@ class BmpFont():
                 orig_left += char_width + self.space_offset
 
         x, y = pos
-        surfwidth, surfheight = surf.get_size()
-
-        string = self.modify_string(string)
-
         if self.stacked:
             stacked_render(x, y, string)
         else:
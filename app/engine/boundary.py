@@ -1,3 +1,5 @@
+from array import array
+
 from app.constants import TILEWIDTH, TILEHEIGHT
 from app.utilities import utils
 
@@ -21,18 +23,20 @@ class BoundaryInterface():
         self.width = width
         self.height = height
         
-        # grid of sets. Each set contains the unit nids that are capable
-        # of attacking that spot
-        # The movement portion -- unit's have an area of influence
+        # Counted coverage. Each cell holds the number of units that are
+        # capable of attacking that spot
+        self.coverage = {'attack': self.init_coverage(),
+                         'spell': self.init_coverage()}
+        # grid of sets. The movement portion -- unit's have an area of influence
         # If they move, they affect all other units in their area of influence
-        self.grids = {'attack': self.init_grid(),
-                      'spell': self.init_grid(),
-                      'movement': self.init_grid()}
-        # Key: Unit NID, Value: list of positions where the unit is capable
+        self.grids = {'movement': self.init_grid()}
+        # Key: Unit NID, Value: set of positions where the unit is capable
         # of attacking
         self.dictionaries = {'attack': {},
                              'spell': {},
                              'movement': {}}
+        # Nids of units whose ranges need to be recalculated on the next flush
+        self.dirty = set()
 
         self.draw_flag = False
         self.all_on_flag = False
@@ -49,6 +53,9 @@ class BoundaryInterface():
                 cells.append(set())
         return cells
 
+    def init_coverage(self):
+        return array('I', [0]) * (self.width * self.height)
+
     def show(self):
         self.draw_flag = True
 
@@ -74,21 +81,28 @@ class BoundaryInterface():
         self.fog_of_war_surf = None
 
     def _set(self, positions, mode, nid):
-        grid = self.grids[mode]
-        self.dictionaries[mode][nid] = set()
-        for pos in positions:
-            grid[pos[0] * self.height + pos[1]].add(nid)
-            self.dictionaries[mode][nid].add(pos)
+        positions = set(positions)
+        self.dictionaries[mode][nid] = positions
+        if mode in self.coverage:
+            coverage = self.coverage[mode]
+            for pos in positions:
+                coverage[pos[0] * self.height + pos[1]] += 1
+        else:
+            grid = self.grids[mode]
+            for pos in positions:
+                grid[pos[0] * self.height + pos[1]].add(nid)
 
     def clear(self, mode=None):
         if mode:
             modes = [mode]
         else:
-            modes = list(self.grids.keys())
+            modes = list(self.coverage.keys()) + list(self.grids.keys())
         for m in modes:
-            for x in range(self.width):
-                for y in range(self.height):
-                    self.grids[m][x * self.height + y].clear()
+            if m in self.coverage:
+                self.coverage[m] = self.init_coverage()
+            else:
+                self.grids[m] = self.init_grid()
+            self.dictionaries[m].clear()
         self.surf = None
         self.fog_of_war_surf = None
 
@@ -106,65 +120,76 @@ class BoundaryInterface():
         self._set(valid_attacks, 'attack', unit.nid)
         self._set(valid_spells, 'spell', unit.nid)
 
-        area_of_influence = target_system.find_manhattan_spheres(set(range(1, equations.parser.movement(unit) + 1)), *unit.position)
-        area_of_influence = {pos for pos in area_of_influence if self.check_bounds(pos)}
+        area_of_influence = target_system.get_shell({unit.position}, range(1, equations.parser.movement(unit) + 1), self.width, self.height)
         self._set(area_of_influence, 'movement', unit.nid)
 
         self.surf = None
 
-    def _remove_unit(self, unit):
+    def _remove_unit(self, nid):
+        for mode, coverage in self.coverage.items():
+            positions = self.dictionaries[mode].pop(nid, None)
+            if positions:
+                for (x, y) in positions:
+                    coverage[x * self.height + y] -= 1
         for mode, grid in self.grids.items():
-            if unit.nid in self.dictionaries[mode]:
-                for (x, y) in self.dictionaries[mode][unit.nid]:
-                    grid[x * self.height + y].discard(unit.nid)
-                # del self.dictionaries[mode][unit.nid]
+            positions = self.dictionaries[mode].pop(nid, None)
+            if positions:
+                for (x, y) in positions:
+                    grid[x * self.height + y].discard(nid)
         self.surf = None
 
+    def _mark_dirty(self, unit):
+        self.dirty.add(unit.nid)
+
+    def flush(self):
+        """
+        Recalculates the ranges of every unit marked dirty since the last flush
+        Called once per frame by draw, but can be called whenever the
+        boundary needs to be up to date
+        """
+        if not self.dirty:
+            return
+        dirty, self.dirty = self.dirty, set()
+        for nid in dirty:
+            self._remove_unit(nid)
+        for nid in dirty:
+            unit = game.get_unit(nid)
+            if unit and unit.position and unit.team in self.enemy_teams:
+                self._add_unit(unit)
+
     def recalculate_unit(self, unit):
         if unit.team in self.enemy_teams:
-            self._remove_unit(unit)
-            if unit.position:
-                self._add_unit(unit)
+            self._mark_dirty(unit)
+
+    def _mark_influenced(self, unit):
+        # Update ranges of other units that might be affected by my arriving or leaving
+        x, y = unit.position
+        for nid in self.grids['movement'][x * self.height + y]:
+            other_unit = game.get_unit(nid)
+            if other_unit and not utils.compare_teams(unit.team, other_unit.team):
+                self._mark_dirty(other_unit)
 
     def leave(self, unit):
         if unit.team in self.enemy_teams:
-            self._remove_unit(unit)
+            self._mark_dirty(unit)
 
-        # Update ranges of other units that might be affected by my leaving
         if unit.position:
-            x, y = unit.position
-            other_units = {game.get_unit(nid) for nid in self.grids['movement'][x * self.height + y]}
-            other_units = {other_unit for other_unit in other_units if not utils.compare_teams(unit.team, other_unit.team)}
-
-            for other_unit in other_units:
-                self._remove_unit(other_unit)
-            for other_unit in other_units:
-                if other_unit.position:
-                    self._add_unit(other_unit)
+            self._mark_influenced(unit)
 
     def arrive(self, unit):
         if unit.position:
             if unit.team in self.enemy_teams:
-                self._add_unit(unit)
-
-            # Update ranges of other units that might be affected by my arrival
-            x, y = unit.position
-            # print(self.grids['movement'][x * self.height + y])
-            other_units = {game.get_unit(nid) for nid in self.grids['movement'][x * self.height + y]}
-            other_units = {other_unit for other_unit in other_units if not utils.compare_teams(unit.team, other_unit.team)}
+                self._mark_dirty(unit)
 
-            for other_unit in other_units:
-                self._remove_unit(other_unit)
-            for other_unit in other_units:
-                if other_unit.position:
-                    self._add_unit(other_unit)
+            self._mark_influenced(unit)
 
     # Called when map changes
     def reset(self):
         self.clear()
+        self.dirty.clear()
         for unit in game.units:
             if unit.position and unit.team in self.enemy_teams:
-                self._add_unit(unit)
+                self._mark_dirty(unit)
 
     def toggle_all_enemy_attacks(self):
         if self.all_on_flag:
@@ -180,7 +205,37 @@ class BoundaryInterface():
         self.all_on_flag = False
         self.surf = None
 
+    def _get_visible_coverage(self, mode):
+        """
+        Returns the coverage for the mode, minus the contribution of
+        any unit that we shouldn't be able to see
+        """
+        coverage = self.coverage[mode]
+        # Fog of War application
+        if game.level_vars.get('_fog_of_war'):
+            coverage = array('I', coverage)
+            for nid, positions in self.dictionaries[mode].items():
+                if not game.board.in_vision(game.get_unit(nid).position):
+                    for (x, y) in positions:
+                        coverage[x * self.height + y] -= 1
+        return coverage
+
+    def _get_displayed_positions(self, mode) -> set:
+        """
+        Returns every position that the units we are displaying
+        in red/green can reach in this mode
+        """
+        positions = set()
+        fog_of_war = game.level_vars.get('_fog_of_war')
+        for nid in self.displaying_units:
+            if nid in self.dictionaries[mode]:
+                if fog_of_war and not game.board.in_vision(game.get_unit(nid).position):
+                    continue
+                positions |= self.dictionaries[mode][nid]
+        return positions
+
     def draw(self, surf, full_size, cull_rect):
+        self.flush()
         if not self.draw_flag:
             return surf
 
@@ -199,48 +254,34 @@ class BoundaryInterface():
                     continue
 
                 if grid_name == 'all_attack' or grid_name == 'attack':
-                    grid = self.grids['attack']
+                    mode = 'attack'
                 else:
-                    grid = self.grids['spell']
-
-                # Remove all units that we shouldn't be able to see from the boundary
-                # Fog of War application
-                if game.level_vars.get('_fog_of_war'):
-                    new_grid = []
-                    for cell in grid:
-                        new_grid.append({nid for nid in cell if game.board.in_vision(game.get_unit(nid).position)})
-                else:
-                    new_grid = grid
+                    mode = 'spell'
 
-                for y in range(self.height):
+                # Positions that should have a red display
+                red_positions = self._get_displayed_positions(mode)
+
+                if grid_name == 'all_attack' or grid_name == 'all_spell':
+                    coverage = self._get_visible_coverage(mode)
                     for x in range(self.width):
-                        cell = new_grid[x * self.height + y]
-                        if cell:
-                            # Determine whether this tile should have a red display
-                            red_display = False
-                            for nid in cell:
-                                if nid in self.displaying_units:
-                                    red_display = True
-                                    break
-
-                            if grid_name == 'all_attack' and red_display:
-                                continue
-                            if grid_name == 'all_spell' and red_display:
-                                continue
-
-                            if grid_name == 'attack' and not red_display:
-                                continue
-                            if grid_name == 'spell' and not red_display:
-                                continue
-
-                            image = self.create_image(new_grid, x, y, grid_name)
-                            self.surf.blit(image, (x * TILEWIDTH, y * TILEHEIGHT))
+                        for y in range(self.height):
+                            if coverage[x * self.height + y] and (x, y) not in red_positions:
+                                image = self.create_image(coverage, x, y, grid_name)
+                                self.surf.blit(image, (x * TILEWIDTH, y * TILEHEIGHT))
+                else:
+                    for (x, y) in red_positions:
+                        image = self.create_image(red_positions, x, y, grid_name)
+                        self.surf.blit(image, (x * TILEWIDTH, y * TILEHEIGHT))
 
         im = engine.subsurface(self.surf, cull_rect)
         surf.blit(im, (0, 0))
         return surf
 
     def create_image(self, grid, x, y, grid_name):
+        """
+        For all_attack and all_spell, grid is the coverage array
+        For attack and spell, grid is the set of red positions
+        """
         top_pos = (x, y - 1)
         left_pos = (x - 1, y)
         right_pos = (x + 1, y)
@@ -261,10 +302,10 @@ class BoundaryInterface():
             if self.check_bounds(right_pos) and grid[(x + 1) * self.height + y]:
                 right = True
         else:
-            top = any(nid in self.displaying_units for nid in grid[x * self.height + y - 1]) if self.check_bounds(top_pos) else False
-            left = any(nid in self.displaying_units for nid in grid[(x - 1) * self.height + y]) if self.check_bounds(left_pos) else False
-            right = any(nid in self.displaying_units for nid in grid[(x + 1) * self.height + y]) if self.check_bounds(right_pos) else False
-            bottom = any(nid in self.displaying_units for nid in grid[x * self.height + y + 1]) if self.check_bounds(bottom_pos) else False
+            top = top_pos in grid
+            left = left_pos in grid
+            right = right_pos in grid
+            bottom = bottom_pos in grid
         idx = top*8 + left*4 + right*2 + bottom  # Binary logis to get correct index
         return engine.subsurface(self.modes[grid_name], (idx * TILEWIDTH, 0, TILEWIDTH, TILEHEIGHT))
 
@@ -286,10 +327,15 @@ class BoundaryInterface():
         return surf
 
     def print_grid(self, mode):
+        self.flush()
         for y in range(self.height):
             print("%02d|" % y, end="")
             for x in range(self.width):
-                cell = self.grids[mode][x * self.height + y]
+                if mode in self.coverage:
+                    cell = self.coverage[mode][x * self.height + y]
+                    cell = [str(cell)] if cell else None
+                else:
+                    cell = self.grids[mode][x * self.height + y]
                 if cell:
                     print(' %s |' % ','.join(cell), end="")
                 else:
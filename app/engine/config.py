@@ -9,6 +9,10 @@ def read_config_file():
                          ('random_seed', -1),
                          ('screen_size', 2),
                          ('sound_buffer_size', 4),
+                         ('music_cache_size', 256),
+                         ('image_warm_up', 1),
+                         ('frame_cache_size', 64),
+                         ('ai_workers', 0),
                          ('animation', 'Always'),
                          ('unit_speed', 120),
                          ('text_speed', 10),
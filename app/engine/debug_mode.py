@@ -9,7 +9,7 @@ from app.engine.input_manager import INPUT
 
 from app.engine.state import MapState
 from app.engine.game_state import game
-from app.engine import engine, config
+from app.engine import engine, config, profiler
 
 class DebugState(MapState):
     num_back = 4
@@ -50,6 +50,12 @@ class DebugState(MapState):
             SOUNDTHREAD.play_sfx('Select 4')
             game.state.back()
             return
+        elif command == 'profile':
+            profiler.toggle()
+            return
+        elif command == 'trace':
+            profiler.dump_trace()
+            return
 
         event_command = event_commands.parse_text(command)
         if not event_command:
@@ -100,6 +100,8 @@ class Dialog():
         self.text_index = 0
         self.total_num_updates = 0
         self.y_offset = 0 # How much to move lines (for when a new line is spawned)
+        # Key: index in text_lines, Value: [surface, characters drawn on it, x position after them, color after them]
+        self.line_surfs = {}
 
         # For state transitions
         self.transition_progress = 0
@@ -231,6 +233,7 @@ class Dialog():
             self.pause()
         elif command == '{clear}':
             self.text_lines.clear()
+            self.line_surfs.clear()
             self._next_line()
         elif command == ' ':  # Check to see if we should move to next line
             current_line = ''.join(self.text_lines[-1])
@@ -363,48 +366,68 @@ class Dialog():
         chunks.append(current_chunk)
         return chunks, current_color
 
+    def update_line_surf(self, idx) -> tuple:
+        """
+        Lines only ever grow at the end, so each line is kept on its own surface
+        and only the characters revealed since it was last drawn are added to it
+
+        Returns:
+            tuple: the line's surface, and the x position after its last character
+        """
+        line = self.text_lines[idx]
+        if idx not in self.line_surfs:
+            # Carry the color over from the line before
+            if idx - 1 in self.line_surfs:
+                current_color = self.line_surfs[idx - 1][3]
+            else:
+                current_color = self.font_color
+            line_surf = engine.create_surface((self.text_width, self.font.height), transparent=True)
+            self.line_surfs[idx] = [line_surf, 0, 0, current_color]
+        line_surf, num_drawn, x_pos, current_color = self.line_surfs[idx]
+        if num_drawn < len(line):
+            line_chunks, current_color = self.chunkify(line[num_drawn:], current_color)
+            for chunk in line_chunks:
+                text, color = chunk
+                font = FONT[self.font_type + '-' + color]
+                font.blit(text, line_surf, (x_pos, 0))
+                x_pos += font.width(text)
+            self.line_surfs[idx] = [line_surf, len(line), x_pos, current_color]
+        return line_surf, x_pos
+
+    def blit_line(self, surf, idx, y_pos) -> int:
+        line_surf, x_pos = self.update_line_surf(idx)
+        # Clip to the text area
+        top = max(0, -y_pos)
+        bottom = min(line_surf.get_height(), self.text_height - y_pos)
+        if bottom > top:
+            engine.blit(surf, line_surf, (self.position[0] + 8, self.position[1] + 8 + y_pos + top),
+                        (0, top, self.text_width, bottom - top))
+        return x_pos
+
     def draw_text(self, surf):
         end_x_pos, end_y_pos = 0, 0
-        text_surf = engine.create_surface((self.text_width, self.text_height), transparent=True)
+        first_line = max(0, len(self.text_lines) - self.num_lines)
 
-        current_color = self.font_color
+        # Lines that have scrolled away are never drawn again
+        for idx in [idx for idx in self.line_surfs if idx < first_line - 1]:
+            del self.line_surfs[idx]
 
         # Draw line that's disappearing
         if self.y_offset and len(self.text_lines) > self.num_lines:
-            x_pos = 0
-            y_pos = -16 + self.y_offset
-            line = self.text_lines[-self.num_lines - 1]
+            self.blit_line(surf, first_line - 1, -16 + self.y_offset)
 
-            line_chunks, current_color = self.chunkify(line, current_color)
-            for chunk in line_chunks:
-                text, color = chunk
-                font = FONT[self.font_type + '-' + color]
-                width = font.width(text)
-                font.blit(text, text_surf, (x_pos, y_pos))
-                x_pos += width
-
-        display_lines = self.text_lines[-self.num_lines:]
-        for idx, line in enumerate(display_lines):
-            x_pos = 0
-            y_pos = 16 * idx
+        for idx in range(first_line, len(self.text_lines)):
+            y_pos = 16 * (idx - first_line)
             if len(self.text_lines) > self.num_lines:
                 y_set = y_pos + self.y_offset
             else:
                 y_set = y_pos
 
-            line_chunks, current_color = self.chunkify(line, current_color)
-            for chunk in line_chunks:
-                text, color = chunk
-                font = FONT[self.font_type + '-' + color]
-                width = font.width(text)
-                font.blit(text, text_surf, (x_pos, y_set))
-                x_pos += width
-            
+            x_pos = self.blit_line(surf, idx, y_set)
+
             end_x_pos = self.position[0] + 8 + x_pos
             end_y_pos = self.position[1] + 8 + y_pos
 
-        surf.blit(text_surf, (self.position[0] + 8, self.position[1] + 8))
-
         return end_x_pos, end_y_pos
 
     def draw_tail(self, surf, portrait):
@@ -2,7 +2,7 @@ import os
 from datetime import datetime
 
 from app.constants import WINWIDTH, WINHEIGHT, VERSION
-from app.engine import engine
+from app.engine import engine, startup, profiler
 
 import app.engine.config as cf
 
@@ -13,9 +13,6 @@ def start(title, from_editor=False):
     icon = engine.image_load('favicon.ico')
     engine.set_icon(icon)
 
-    from app.engine import sprites
-    sprites.load_images()
-
     # Hack to get icon to show up in windows
     try:
         import ctypes
@@ -26,6 +23,11 @@ def start(title, from_editor=False):
     engine.DISPLAYSURF = engine.build_display(engine.SCREENSIZE)
     engine.set_title(title + ' - v' + VERSION)
     print("Version: %s" % VERSION)
+    startup.mark('display')
+
+    if cf.SETTINGS['image_warm_up']:
+        from app.engine import sprites
+        sprites.warm_up()
 
 screenshot = False
 def save_screenshot(raw_events: list, surf):
@@ -55,9 +57,9 @@ def run(game):
     SOUNDTHREAD.set_sfx_volume(cf.SETTINGS['sound_volume'])
     
     surf = engine.create_surface((WINWIDTH, WINHEIGHT))
-    # import time
+    first_frame = True
     while True:
-        # start = time.time_ns()
+        profiler.begin_frame()
         engine.update_time()
         # print(engine.get_delta())
 
@@ -72,14 +74,18 @@ def run(game):
 
         SOUNDTHREAD.update(raw_events)
 
+        surf = profiler.draw(surf)
         engine.push_display(surf, engine.SCREENSIZE, engine.DISPLAYSURF)
         
         save_screenshot(raw_events, surf)
 
         engine.update_display()
-        # milliseconds_elapsed = (end - start)/1e6
-        # if milliseconds_elapsed > 10:
-        #     print("Engine took too long: %f" % milliseconds_elapsed)
+        if first_frame:
+            first_frame = False
+            startup.mark('first frame')
+            startup.report(write=bool(cf.SETTINGS['debug']) or profiler.enabled)
+        startup.update()
+        profiler.end_frame()
 
         game.playtime += engine.tick()
 
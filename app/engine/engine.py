@@ -163,6 +163,9 @@ def set_colorkey(surf, color, rleaccel=True):
     else:
         surf.set_colorkey(color)
 
+def set_palette(surf, colors):
+    surf.set_palette(colors)
+
 def make_pixel_array(surf):
     return pygame.PixelArray(surf)
 
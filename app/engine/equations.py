@@ -1,56 +1,108 @@
-import re, functools
+import ast, functools
 
 from app.data.database import DB
 
+# Bumped whenever anything a unit's stats depend on may have changed,
+# which throws away every unit's cached stats and equation values
+_version = 0
+
+def invalidate():
+    global _version
+    _version += 1
+
+def _is_cacheable(unit) -> bool:
+    """
+    A unit's stats can only be cached if none of its stat changes are conditional,
+    since conditions can depend on anything (position, combat, evaluate strings)
+    and are not changed through actions
+    """
+    from app.engine import skill_system
+    for skill, component in skill_system.get_hooks(unit, 'stat_change'):
+        if not component.ignore_conditional and skill_system.get_skill_hooks(skill, 'condition'):
+            return False
+    return True
+
+def _get_cache(unit):
+    """
+    Returns the unit's (equation values, stat values) for the current version,
+    or None if they can't be cached
+    """
+    cache = getattr(unit, '_equation_cache', False)
+    if cache is False:  # Not a UnitObject, like the editor's test unit
+        return None
+    if cache is None or cache[0] != _version:
+        values = ({}, {}) if _is_cacheable(unit) else None
+        cache = unit._equation_cache = (_version, values)
+    return cache[1]
+
 class Parser():
     def __init__(self):
+        invalidate()
+        # Key: equation nid, Value: compiled function of unit
         self.equations = {}
-        for equation in DB.equations.values():
-            if equation.expression:
-                self.equations[equation.nid] = self.tokenize(equation.expression)
-        
-        self.replacement_dict = self.create_replacement_dict()
+        # Key: expression, Value: compiled function of unit
+        self.expressions = {}
+        self.namespace = {'stat': self.stat, 'get': self.get}
 
-        for nid in list(self.equations.keys()):
-            expression = self.equations[nid]
-            self.fix(nid, expression, self.replacement_dict)
+        expressions = {equation.nid: equation.expression for equation in DB.equations.values() if equation.expression}
+        self.stat_nids = set(DB.stats.keys())
+        self.equation_nids = set(expressions.keys())
+        for nid, expression in expressions.items():
+            self.equations[nid] = self.compile(expression)
 
         # Now add these equations as local functions
         for nid in self.equations.keys():
             if not nid.startswith('__'):
-                setattr(self, nid.lower(), functools.partial(self.equations[nid], self.equations))
+                setattr(self, nid.lower(), functools.partial(self.get, nid))
 
-    def tokenize(self, s: str) -> str:
-        return re.split('([^a-zA-Z_])', s)
+    def compile(self, expression: str):
+        """
+        Parses the expression once and turns it into a function of unit.
+        Each stat and equation it refers to is looked up only once per call,
+        and bound to a local of the same name
+        """
+        tree = ast.parse(expression.strip(), mode='eval')
+        names = sorted({node.id for node in ast.walk(tree) if isinstance(node, ast.Name)})
+        lines = ["def _equation(unit):"]
+        for name in names:
+            # Equations take precedence over stats of the same name
+            if name in self.equation_nids:
+                lines.append("    %s = get('%s', unit)" % (name, name))
+            elif name in self.stat_nids:
+                lines.append("    %s = stat(unit, '%s')" % (name, name))
+        lines.append("    return int(%s)" % expression.strip())
+        namespace = dict(self.namespace)
+        exec('\n'.join(lines), namespace)
+        return namespace['_equation']
 
-    def create_replacement_dict(self):
-        dic = {}
-        for stat in DB.stats:
-            dic[stat.nid] = ("(unit.stats['%s'] + unit.stat_bonus('%s'))" % (stat.nid, stat.nid))
-        for nid in self.equations.keys():
-            dic[nid] = ("equations['%s'](equations, unit)" % nid)
-        return dic
-
-    def fix(self, lhs, rhs, dic):
-        rhs = [dic.get(n, n) for n in rhs]
-        rhs = ''.join(rhs)
-        rhs = 'int(%s)' % rhs
-        exec("def %s(equations, unit): return %s" % (lhs, rhs), self.equations)
+    def stat(self, unit, nid):
+        cache = _get_cache(unit)
+        if cache is None:
+            return unit.stats[nid] + unit.stat_bonus(nid)
+        stats = cache[1]
+        value = stats.get(nid)
+        if value is None:
+            value = stats[nid] = unit.stats[nid] + unit.stat_bonus(nid)
+        return value
 
     def get(self, lhs, unit):
-        if lhs in self.equations:
-            return self.equations[lhs](self.equations, unit)
-        return 0
+        func = self.equations.get(lhs)
+        if func is None:
+            return 0
+        cache = _get_cache(unit)
+        if cache is None:
+            return func(unit)
+        values = cache[0]
+        value = values.get(lhs)
+        if value is None:
+            value = values[lhs] = func(unit)
+        return value
 
     def get_expression(self, expr, unit):
-        # For one time use
-        # Can't seem to be used with any sub equations
-        expr = self.tokenize(expr)
-        expr = [self.replacement_dict.get(n, n) for n in expr]
-        expr = ''.join(expr)
-        expr = 'int(%s)' % expr
-        equations = self.equations
-        return eval(expr)
+        func = self.expressions.get(expr)
+        if func is None:
+            func = self.expressions[expr] = self.compile(expr)
+        return func(unit)
 
     def get_mana(self, unit):
         if hasattr(self, 'mana'):
@@ -79,7 +131,7 @@ def __getattr__(name):
 
 def clear():
     """
-    Recreate the parser. Necessary in order to update equations after the user 
+    Recreate the parser. Necessary in order to update equations after the user
     updates them in the equation editor
     """
     global PARSER
@@ -12,6 +12,15 @@ Essentially just a repository that imports a lot of different things so that man
 will be accepted
 """
 
+# Key: string, Value: its compiled code object
+_code = {}
+
+def compile_string(string: str):
+    code = _code.get(string)
+    if code is None:
+        code = _code[string] = compile(string.strip(), '<evaluate>', 'eval')
+    return code
+
 def evaluate(string: str, unit1=None, unit2=None, item=None, position=None, region=None, mode=None, skill=None) -> bool:
     unit = unit1
     target = unit2
@@ -38,7 +47,7 @@ def evaluate(string: str, unit1=None, unit2=None, item=None, position=None, regi
         else:
             return False
 
-    return eval(string)
+    return eval(compile_string(string))
 
 def eval_string(text: str) -> str:
     to_evaluate = re.findall(r'\{eval:[^{}]*\}', text)
@@ -1,7 +1,10 @@
+from array import array
+
 from app.data.database import DB
 
-from app.engine import target_system, line_of_sight
+from app.engine import target_system, pathfinding
 from app.engine.game_state import game
+from app.utilities.algorithms import visibility
 
 class Node():
     __slots__ = ['reachable', 'cost', 'x', 'y', 'parent', 'g', 'h', 'f']
@@ -41,6 +44,12 @@ class GameBoard(object):
         self.width = tilemap.width
         self.height = tilemap.height
         self.mcost_grids = {}
+        # Flat mcost arrays, one for each movement group
+        self.mcost_arrays = {}
+        # Scratch buffers shared by the flat pathfinders
+        self.path_buffers = pathfinding.PathBuffers(self.width * self.height)
+        # Line of sight for fog of war, kept up to date as units arrive and leave
+        self.visibility = visibility.VisibilityCache(self.width, self.height)
 
         self.reset_grid(tilemap)
 
@@ -54,15 +63,13 @@ class GameBoard(object):
         for team in DB.teams:
             self.fog_of_war_grids[team] = self.init_aura_grid()
         self.fow_vantage_point = {}  # Unit: Position where the unit is that's looking
+        self.fow_positions = {}  # (Team, Unit): Positions the unit is currently lighting up
 
         # For Auras
         self.aura_grid = self.init_aura_grid()
         # Key: Aura Skill Uid, Value: Set of positions
         self.known_auras = {}
 
-        # For opacity
-        self.opacity_grid = self.init_opacity_grid(tilemap)
-
     def check_bounds(self, pos):
         return 0 <= pos[0] < self.width and 0 <= pos[1] < self.height
 
@@ -70,7 +77,10 @@ class GameBoard(object):
         # For each movement type
         for idx, mode in enumerate(DB.mcost.unit_types):
             self.mcost_grids[mode] = self.init_grid(mode, tilemap)
+            self.mcost_arrays[mode] = array('d', [cell.cost for cell in self.mcost_grids[mode]])
+        # For opacity
         self.opacity_grid = self.init_opacity_grid(tilemap)
+        self.visibility.set_opacity(self.opacity_grid)
 
     # For movement
     def init_grid(self, movement_group, tilemap):
@@ -92,6 +102,9 @@ class GameBoard(object):
     def get_grid(self, movement_group):
         return self.mcost_grids[movement_group]
 
+    def get_mcost_grid(self, movement_group) -> array:
+        return self.mcost_arrays[movement_group]
+
     def init_unit_grid(self):
         cells = []
         for x in range(self.width):
@@ -103,12 +116,14 @@ class GameBoard(object):
         idx = pos[0] * self.height + pos[1]
         self.unit_grid[idx].append(unit)
         self.team_grid[idx].append(unit.team)
+        self.visibility.add_source(unit.nid, unit.team, pos)
 
     def remove_unit(self, pos, unit):
         idx = pos[0] * self.height + pos[1]
         if unit in self.unit_grid[idx]:
             self.unit_grid[idx].remove(unit)
             self.team_grid[idx].remove(unit.team)
+            self.visibility.remove_source(unit.nid)
 
     def get_unit(self, pos):
         if not pos:
@@ -131,16 +146,16 @@ class GameBoard(object):
         grid = self.fog_of_war_grids[unit.team]
         # Remove the old vision
         self.fow_vantage_point[unit.nid] = None
-        for cell in grid:
-            cell.discard(unit.nid)
+        for position in self.fow_positions.pop((unit.team, unit.nid), ()):
+            grid[position[0] * self.height + position[1]].discard(unit.nid)
         # Add new vision
         if pos:
             self.fow_vantage_point[unit.nid] = pos
-            positions = target_system.find_manhattan_spheres(range(sight_range + 1), pos[0], pos[1])
-            positions = {pos for pos in positions if 0 <= pos[0] < self.width and 0 <= pos[1] < self.height}
+            positions = target_system.get_shell({pos}, range(sight_range + 1), self.width, self.height)
             for position in positions:
                 idx = position[0] * self.height + position[1]
                 grid[idx].add(unit.nid)
+            self.fow_positions[(unit.team, unit.nid)] = positions
 
     def in_vision(self, pos, team='player') -> bool:
         if not game.level_vars.get('_fog_of_war'):
@@ -149,8 +164,7 @@ class GameBoard(object):
         if team == 'player':
             if DB.constants.value('fog_los'):
                 fog_of_war_radius = game.level_vars.get('_fog_of_war_radius', 0)
-                valid = line_of_sight.simple_check(pos, 'player', fog_of_war_radius)
-                if not valid:
+                if not self.visibility.is_lit(pos, 'player', fog_of_war_radius):
                     return False
             player_grid = self.fog_of_war_grids['player']
             if player_grid[idx]:
@@ -161,8 +175,7 @@ class GameBoard(object):
         else:
             if DB.constants.value('fog_los'):
                 fog_of_war_radius = game.level_vars.get('_ai_fog_of_war_radius', game.level_vars.get('_fog_of_war_radius', 0))
-                valid = line_of_sight.simple_check(pos, team, fog_of_war_radius)
-                if not valid:
+                if not self.visibility.is_lit(pos, team, fog_of_war_radius):
                     return False
             grid = self.fog_of_war_grids[team]
             if grid[idx]:
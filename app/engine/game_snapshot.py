@@ -0,0 +1,130 @@
+from array import array
+from collections import deque
+from enum import Enum
+
+from app.engine import static_random
+
+"""
+In place snapshots of the game, for the turnwheel's checkpoints
+
+take() walks everything the action log can change (the registries and
+everything in them, the level, the board, the game's variables)
+and keeps a shallow copy of every container and object it finds.
+restore() copies each of those back into the very object it was taken from,
+so afterwards every object holds what it held at the snapshot, but is still
+the same object, and everything pointing at it (the actions in the log
+especially) still points at the right thing
+
+Only objects from TRACKED_MODULES are walked into. Anything else
+(prefabs, sprites, surfaces, sounds) is left as it is, as are the
+cache attributes in CACHES, the same as reversing actions would leave them
+"""
+
+# Attributes of game that actions can change
+GAME_ATTRIBUTES = ('game_vars', 'level_vars', 'unit_registry', 'item_registry', 'skill_registry',
+                   'terrain_status_registry', 'region_registry', 'parties', '_current_party', 'current_level',
+                   'current_mode', 'turncount', 'market_items', 'unlocked_lore', 'already_triggered_events',
+                   'talk_options', 'base_convos', 'supports', 'records', 'initiative', 'board')
+# Any new object in these means the snapshot can't be used any more, since it has no state for it
+REGISTRIES = ('unit_registry', 'item_registry', 'skill_registry', 'region_registry')
+TRACKED_MODULES = ('app.engine.objects.', 'app.engine.item_components.', 'app.engine.skill_components.',
+                   'app.engine.game_board', 'app.engine.supports', 'app.engine.records', 'app.engine.initiative',
+                   'app.events.regions', 'app.utilities.data', 'app.utilities.algorithms.')
+# Rebuilt from the rest of the object whenever they are out of date
+CACHES = frozenset(('_sprite', '_sound', '_battle_anim', '_skill_hooks', '_equation_cache', '_hooks',
+                    '_stack_key', '_stack_image', '_autotile_bounds', '_autotile_cells',
+                    '_autotile_overlays', '_cull_image'))
+
+# What each piece of state is, and so how to put it back
+DICT, LIST, SET, DEQUE, OBJECT = range(5)
+
+_ATOMIC = (type(None), bool, int, float, complex, str, bytes, range, type)
+_tracked_types = {}  # Key: type, Value: whether it is walked into
+
+def _is_tracked(obj) -> bool:
+    cls = type(obj)
+    tracked = _tracked_types.get(cls)
+    if tracked is None:
+        tracked = hasattr(obj, '__dict__') and not issubclass(cls, Enum) and \
+            cls.__module__.startswith(TRACKED_MODULES)
+        _tracked_types[cls] = tracked
+    return tracked
+
+class Snapshot():
+    def __init__(self, game_values: dict, states: list, random_state, registry_keys: tuple):
+        self.game_values = game_values
+        self.states = states  # (object, what it is, a copy of what it held)
+        self.random_state = random_state
+        self.registry_keys = registry_keys
+
+    def __len__(self):
+        return len(self.states)
+
+def get_registry_keys(game) -> tuple:
+    return tuple(frozenset(getattr(game, name)) for name in REGISTRIES)
+
+def take(game) -> Snapshot:
+    game_values = {name: getattr(game, name) for name in GAME_ATTRIBUTES if hasattr(game, name)}
+    states = []
+    seen = set()
+    stack = list(game_values.values())
+    while stack:
+        obj = stack.pop()
+        if isinstance(obj, _ATOMIC) or id(obj) in seen:
+            continue
+        if isinstance(obj, dict):
+            seen.add(id(obj))
+            items = list(obj.items())
+            states.append((obj, DICT, items))
+            for key, value in items:
+                stack.append(key)
+                stack.append(value)
+        elif isinstance(obj, (list, array, bytearray)):
+            seen.add(id(obj))
+            states.append((obj, LIST, obj[:]))
+            if isinstance(obj, list):
+                stack.extend(obj)
+        elif isinstance(obj, set):
+            seen.add(id(obj))
+            states.append((obj, SET, list(obj)))
+            stack.extend(obj)
+        elif isinstance(obj, deque):
+            seen.add(id(obj))
+            states.append((obj, DEQUE, list(obj)))
+            stack.extend(obj)
+        elif isinstance(obj, (tuple, frozenset)):
+            # Can't change, but can hold things that do
+            seen.add(id(obj))
+            stack.extend(obj)
+        elif _is_tracked(obj):
+            seen.add(id(obj))
+            attrs = {name: value for name, value in obj.__dict__.items() if name not in CACHES}
+            states.append((obj, OBJECT, attrs))
+            stack.extend(attrs.values())
+    return Snapshot(game_values, states, static_random.get_combat_random_state(), get_registry_keys(game))
+
+def restore(game, snapshot: Snapshot):
+    for obj, kind, state in snapshot.states:
+        if kind == DICT:
+            obj.clear()
+            if type(obj) is dict:
+                obj.update(state)
+            else:  # Counter.update adds, so set each one
+                for key, value in state:
+                    obj[key] = value
+        elif kind == LIST:
+            obj[:] = state
+        elif kind == SET:
+            obj.clear()
+            obj.update(state)
+        elif kind == DEQUE:
+            obj.clear()
+            obj.extend(state)
+        else:
+            caches = {name: value for name, value in obj.__dict__.items() if name in CACHES}
+            obj.__dict__.clear()
+            obj.__dict__.update(state)
+            obj.__dict__.update(caches)
+    for name, value in snapshot.game_values.items():
+        setattr(game, name, value)
+    static_random.set_combat_random_state(snapshot.random_state)
@@ -228,6 +228,9 @@ class GameState():
         tilemap = TileMapObject.from_prefab(tilemap_prefab)
         self.cursor = LevelCursor(self)
         self.current_level = LevelObject.from_prefab(level_prefab, tilemap, self.unit_registry)
+        # Start decoding the level's music before it's needed
+        from app.engine.sound import MUSIC
+        MUSIC.preload_level(level_nid)
         if with_party:
             self.current_party = with_party
         else:
@@ -397,6 +400,8 @@ class GameState():
             logging.info("Loading Level...")
             self.current_level = LevelObject.restore(s_dict['level'], self)
             self.set_up_game_board(self.current_level.tilemap)
+            from app.engine.sound import MUSIC
+            MUSIC.preload_level(self.current_level.nid)
 
             self.generic()
             from app.engine.level_cursor import LevelCursor
@@ -660,7 +665,7 @@ class GameState():
         # Set "test" to True when you are just testing what would happen by moving
         # to a position (generally used for AI)
         """
-        from app.engine import action, aura_funcs
+        from app.engine import action, aura_funcs, skill_system
         if unit.position:
             logging.debug("Leave %s %s", unit.nid, unit.position)
             # Auras
@@ -680,6 +685,7 @@ class GameState():
                     if skill_obj and skill_obj in unit.skills:
                         if test:
                             unit.skills.remove(skill_obj)
+                            skill_system.reset_hooks(unit)
                         else:
                             act = action.RemoveSkill(unit, skill_obj)
                             action.do(act)
@@ -691,6 +697,7 @@ class GameState():
             if skill_obj and skill_obj in unit.skills:
                 if test:
                     unit.skills.remove(skill_obj)
+                    skill_system.reset_hooks(unit)
                 else:
                     act = action.RemoveSkill(unit, skill_obj)
                     action.do(act)
@@ -740,7 +747,7 @@ class GameState():
                 self.boundary.arrive(unit)
 
     def add_terrain_status(self, unit, test):
-        from app.engine import action, item_funcs
+        from app.engine import action, item_funcs, skill_system
         layer = self.tilemap.get_layer(unit.position)
         terrain_key = (*unit.position, layer)  # Terrain position and layer
         skill_uid = self.get_terrain_status(terrain_key)
@@ -760,12 +767,13 @@ class GameState():
                 if test:
                     # Don't need to use action for test
                     unit.skills.append(skill_obj)
+                    skill_system.reset_hooks(unit)
                 else:
                     act = action.AddSkill(unit, skill_obj)
                     action.do(act)
 
     def add_region_status(self, unit, region, test):
-        from app.engine import action, item_funcs
+        from app.engine import action, item_funcs, skill_system
         skill_uid = self.get_terrain_status(region.nid)
         skill_obj = self.get_skill(skill_uid)
 
@@ -780,6 +788,7 @@ class GameState():
                 if test:
                     # Don't need to use action for test
                     unit.skills.append(skill_obj)
+                    skill_system.reset_hooks(unit)
                 else:
                     act = action.AddSkill(unit, skill_obj)
                     action.do(act)
@@ -857,11 +866,8 @@ def load_level(level_nid, save_loc):
         game = GameState()
     else:
         game.clear()
-    import pickle
-
-    from app.engine import save
-    with open(save_loc, 'rb') as fp:
-        s_dict = pickle.load(fp)
+    from app.engine import save, save_container
+    s_dict, _ = save_container.read(save_loc)
     game.load_states(['turn_change'])
     game.build_new()
     game.load(s_dict)
@@ -12,7 +12,7 @@ from app.engine.game_state import game
 from app.engine import engine, action, menus, image_mods, \
     banner, save, phase, skill_system, target_system, item_system, \
     item_funcs, ui_view, info_menu, base_surf, gui, background, dialog, \
-    text_funcs, equations, evaluate, supports
+    text_funcs, equations, evaluate, supports, ai_planner
 from app.engine.combat import interaction
 from app.engine.selection_helper import SelectionHelper
 from app.engine.abilities import ABILITIES, PRIMARY_ABILITIES, OTHER_ABILITIES
@@ -1582,6 +1582,8 @@ class AIState(MapState):
         self.cur_unit = None
         self.cur_group = None
 
+        ai_planner.start_phase()
+
     def get_next_unit(self):
         # Initiative way
         if DB.constants.value('initiative'):
@@ -1680,6 +1682,7 @@ class AIState(MapState):
         logging.info("Finishing AI State")
         for unit in game.units:
             unit.has_run_ai = False
+        ai_planner.end_phase()
 
 class ShopState(State):
     name = 'shop'
@@ -39,6 +39,8 @@ class ShimmeringMinimapMarker():
         return surf
 
 class OverworldMinimap(uif.UIComponent):
+    dynamic = True  # the markers follow the cursor and entities
+
     def __init__(self, name: str, parent: uif.UIComponent = None, overworld: OverworldManager = None, cursor: OverworldCursor = None):
         super().__init__(name=name, parent=parent)
 
@@ -88,7 +90,8 @@ class OverworldMinimap(uif.UIComponent):
             return self.convert_overworld_pos_to_minimap_pos(self.cursor.position)
         return (0, 0)
 
-    def to_surf(self) -> Surface:
+    # @overrides UIComponent._render
+    def _render(self) -> Surface:
         if not self.enabled:
             return engine.create_surface(self.size, True)
         base_surf = self._create_bg_surf().copy()
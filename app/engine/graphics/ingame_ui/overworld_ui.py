@@ -40,6 +40,7 @@ class OverworldTravelUI():
         self.base_component = uif.UIComponent.create_base_component()
         self.base_component.add_child(self.location_title)
         self.base_component.add_child(self.minimap)
+        self.base_component.set_retained(True)
 
     def _init_minimap_animations(self):
         translate_down = uif.translate_anim((0, 0), (0, WINHEIGHT))
@@ -83,7 +84,8 @@ class OverworldTravelUI():
         active = False
         if node:
             text = node.prefab.name
-            self.location_title_text.set_text(text)
+            if text != self.location_title_text.text:
+                self.location_title_text.set_text(text)
             active = True
         # logic for determining which side of the screen the title hangs out on
         # only switch sides if we aren't onscreen
@@ -128,6 +128,8 @@ class TextComponent(UIComponent):
         self.scrolled_line = 1
         self._add_line_breaks_to_text()
         self._recalculate_size()
+        # The size only changes in AUTO mode, but the text always does
+        self.mark_dirty()
 
     def _recalculate_size(self):
         """Given our formatted text and our font, we can easily determine
@@ -168,6 +170,7 @@ class TextComponent(UIComponent):
             of the text, to display
         """
         self.num_visible_chars = num_chars_visible
+        self.mark_dirty()
 
     # @overrides UIComponent._create_bg_surf()
     def _create_bg_surf(self) -> Surface:
@@ -199,6 +202,7 @@ class TextComponent(UIComponent):
 
     def scroll_to_nearest_line(self):
         self.scrolled_line = round(self.scrolled_line)
+        self.mark_dirty()
 
     def set_scroll_height(self, scroll_to: Union[int, float, str, UIMetric]):
         """crops the text component to the place you want to scroll to. This supports
@@ -217,6 +221,7 @@ class TextComponent(UIComponent):
             self.scrolled_line =  self._pixel_height_to_line(scroll_to.to_pixels(self.scrollable_height))
         else:
             self.scrolled_line = 1
+        self.mark_dirty()
 
     def is_index_at_end_of_line(self, idx: int) -> bool:
         """Is the index at the end of a line?
@@ -255,8 +260,8 @@ class TextComponent(UIComponent):
             pass
         return False
 
-    # @overrides UIComponent.to_surf
-    def to_surf(self) -> Surface:
+    # @overrides UIComponent._render
+    def _render(self) -> Surface:
         if not self.enabled:
             return engine.create_surface(self.tsize, True)
         # draw the background.
@@ -299,12 +304,18 @@ class DialogTextComponent(TextComponent):
             return True
         return self.num_visible_chars == max(len(self.wrapped_text) - 3, 0)
 
+    # @overrides UIComponent.dynamic
+    @property
+    def dynamic(self) -> bool:
+        # the waiting cursor bobs up and down
+        return self.should_display_waiting_cursor and self.is_index_at_sequence(self.num_visible_chars, '{w}')
+
     def wiggle_cursor_height(self):
         self.cursor_y_offset_index = (self.cursor_y_offset_index + 1) % len(self.cursor_y_offset)
         return self.cursor_y_offset[self.cursor_y_offset_index] + self.font_height / 3
 
-    # @overrides TextComponent.to_surf
-    def to_surf(self) -> Surface:
+    # @overrides TextComponent._render
+    def _render(self) -> Surface:
         if not self.enabled:
             return engine.create_surface(self.tsize, True)
         # draw the background.
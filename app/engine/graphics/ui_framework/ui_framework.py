@@ -21,7 +21,11 @@ class ResizeMode(Enum):
     AUTO = 1
 
 class ComponentProperties():
+    # these only change how the component itself is drawn, not where anything is
+    render_props = ('bg', 'bg_color', 'bg_resize_mode', 'opacity')
+
     def __init__(self):
+        self._owner: UIComponent = None                 # component these properties belong to
         # used by the parent to position
         self.h_alignment: HAlignment = HAlignment.LEFT  # Horizontal Alignment of Component
         self.v_alignment: VAlignment = VAlignment.TOP   # Vertical Alignment of Component
@@ -51,6 +55,17 @@ class ComponentProperties():
                                                         # NOTE: changing this from 1 will disable per-pixel alphas
                                                         # for the entire component.
 
+    def __setattr__(self, name, value):
+        super().__setattr__(name, value)
+        owner = self.__dict__.get('_owner')
+        if owner and name != '_owner':
+            if name in self.render_props:
+                if name != 'opacity':
+                    owner.cached_background = None
+                owner.mark_dirty()
+            else:
+                owner.mark_layout_dirty()
+
 
 class RootComponent():
     """Dummy component to simulate the top-level window
@@ -73,7 +88,21 @@ class UIComponent():
         self.children are UI component children.
         self.manual_surfaces are manually positioned surfaces, to support more primitive
             and direct control over the UI.
+
+        In retained mode (see set_retained()), the component keeps its last drawn surface
+        and only draws again once it is dirty. Setting any property, prop, child or animation
+        marks it dirty, along with everything above it, so a tree that isn't changing
+        is drawn once and then just handed back. Where the children go is likewise only
+        worked out again after a change to a size, a child or something else the layout uses.
+        Anything changed some other way (setting an attribute directly) must call mark_dirty()
         """
+        # retained mode state; see to_surf()
+        self.retained: bool = False
+        self._dirty: bool = True
+        self._layout_dirty: bool = True
+        self._cached_surf: Surface = None
+        self._child_positions: List[Tuple[int, int]] = []
+
         if not parent:
             self.parent = RootComponent()
         else:
@@ -86,7 +115,7 @@ class UIComponent():
         self.children: List[UIComponent] = []
         self.manual_surfaces: List[Tuple[Tuple[int, int], Surface]] = []
 
-        self.props: ComponentProperties = ComponentProperties()
+        self.props = ComponentProperties()
 
         self.isize: List[UIMetric] = [UIMetric.percent(100),
                                       UIMetric.percent(100)]
@@ -124,6 +153,57 @@ class UIComponent():
 
         self.enabled: bool = True
 
+    # Components whose surface changes every frame without any of their properties
+    # changing (a blinking cursor, a minimap) are drawn every frame even in retained mode
+    dynamic: bool = False
+
+    @property
+    def props(self) -> ComponentProperties:
+        return self._props
+
+    @props.setter
+    def props(self, props: ComponentProperties):
+        self._props = props
+        props._owner = self
+        self.mark_layout_dirty()
+
+    def set_retained(self, retained: bool):
+        """Turns retained mode on or off for this component and all its children.
+
+        Args:
+            retained (bool): whether to keep drawn surfaces and layouts between frames
+        """
+        self.retained = retained
+        self._cached_surf = None
+        self.mark_layout_dirty()
+        for child in self.children:
+            child.set_retained(retained)
+
+    def mark_dirty(self):
+        """Marks this component, and every component above it, as needing to be drawn again
+        """
+        component = self
+        while isinstance(component, UIComponent):
+            component._dirty = True
+            component = component.parent
+
+    def mark_layout_dirty(self, resized: bool = True):
+        """Marks this component's parent as needing to lay out its children again,
+        since where this component goes may have changed.
+
+        Args:
+            resized (bool): whether this component's size may have changed too,
+                in which case it and its children (whose sizes may be percentages
+                of its own) need to be laid out again as well
+        """
+        if resized:
+            self._layout_dirty = True
+            for child in self.children:
+                child.mark_layout_dirty()
+        if isinstance(self.parent, UIComponent):
+            self.parent._layout_dirty = True
+        self.mark_dirty()
+
     def set_chronometer(self, chronometer: Callable[[], int]):
         self._chronometer = chronometer
         self._last_update = self._chronometer()
@@ -208,6 +288,7 @@ class UIComponent():
         """
         self.props.max_width = max_width
         self._reset('max_width')
+        self.mark_layout_dirty()
 
     @property
     def max_height(self) -> int:
@@ -224,6 +305,7 @@ class UIComponent():
         """
         self.props.max_height = max_height
         self._reset('max_height')
+        self.mark_layout_dirty()
 
     @property
     def offset(self) -> Tuple[int, int]:
@@ -244,6 +326,7 @@ class UIComponent():
                 can be in percentages or pixels
         """
         self.ioffset = (UIMetric.parse(new_offset[0]), UIMetric.parse(new_offset[1]))
+        self.mark_layout_dirty(resized=False)
 
     @property
     def scroll(self) -> Tuple[int, int]:
@@ -272,6 +355,7 @@ class UIComponent():
         cap_scroll_x = clamp(scroll_x.to_pixels(self.width), 0, self.twidth - self.width)
         cap_scroll_y = clamp(scroll_y.to_pixels(self.height), 0, self.theight - self.height)
         self.iscroll = (UIMetric.parse(cap_scroll_x), UIMetric.parse(cap_scroll_y))
+        self.mark_dirty()
 
     @property
     def size(self) -> Tuple[int, int]:
@@ -301,6 +385,7 @@ class UIComponent():
         """
         self.isize = [UIMetric.parse(size_input[0]),
                       UIMetric.parse(size_input[1])]
+        self.mark_layout_dirty()
 
     @property
     def width(self) -> int:
@@ -332,6 +417,7 @@ class UIComponent():
             width (str): width string. Can be percentage or pixels.
         """
         self.isize[0] = UIMetric.parse(width)
+        self.mark_layout_dirty()
 
     @property
     def height(self) -> int:
@@ -363,6 +449,7 @@ class UIComponent():
             height (str): height string. Can be percentage or pixels.
         """
         self.isize[1] = UIMetric.parse(height)
+        self.mark_layout_dirty()
 
     @property
     def margin(self) -> Tuple[int, int, int, int]:
@@ -388,6 +475,7 @@ class UIComponent():
                         UIMetric.parse(margin[1]),
                         UIMetric.parse(margin[2]),
                         UIMetric.parse(margin[3])]
+        self.mark_layout_dirty(resized=False)
 
     @property
     def padding(self) -> Tuple[int, int, int, int]:
@@ -414,6 +502,7 @@ class UIComponent():
                          UIMetric.parse(padding[2]),
                          UIMetric.parse(padding[3])]
         self._reset("padding")
+        self.mark_layout_dirty()
 
     def add_child(self, child: UIComponent):
         """Add a child component to this component.
@@ -427,9 +516,11 @@ class UIComponent():
         """
         child.parent = self
         child.set_chronometer(self._chronometer)
+        child.set_retained(self.retained)
         self.children.append(child)
         if self.props.resize_mode == ResizeMode.AUTO:
             self._reset('add_child')
+        self.mark_layout_dirty()
 
     def has_child(self, child_name: str) -> bool:
         for child in self.children:
@@ -455,33 +546,7 @@ class UIComponent():
         for idx, child in enumerate(self.children):
             if child.name == child_name:
                 self.children.pop(idx)
-                return True
-        return False
-
-    def has_child(self, child_name: str) -> bool:
-        for child in self.children:
-            if child_name == child.name:
-                return True
-        return False
-
-    def get_child(self, child_name: str) -> Optional[UIComponent]:
-        for child in self.children:
-            if child_name == child.name:
-                return child
-        return None
-
-    def remove_child(self, child_name: str) -> bool:
-        """remove a child from this component.
-
-        Args:
-            child_name (str): name of child component.
-
-        Returns:
-            bool: whether or not the child existed in the first place to be removed
-        """
-        for idx, child in enumerate(self.children):
-            if child.name == child_name:
-                self.children.pop(idx)
+                self.mark_layout_dirty()
                 return True
         return False
 
@@ -493,6 +558,7 @@ class UIComponent():
             pos (Tuple[int, int]): the coordinate position of the top left of surface
         """
         self.manual_surfaces.append((pos, surf))
+        self.mark_dirty()
 
     def speed_up_animation(self, multiplier: int):
         """scales the animation of the component and its children
@@ -536,6 +602,7 @@ class UIComponent():
         for child in self.children:
             child.enter()
         self.enabled = True
+        self.mark_dirty()
 
     @animated('!exit')
     def exit(self, is_top_level=True) -> bool:
@@ -566,6 +633,7 @@ class UIComponent():
             self.queue_animation([toggle_anim(False)], force=True)
         else:
             self.enabled = False
+            self.mark_dirty()
 
     def enable(self):
         """does the same thing as enter(), except forgoes all animations
@@ -573,6 +641,7 @@ class UIComponent():
         self.enabled = True
         for child in self.children:
             child.enable()
+        self.mark_dirty()
 
     def disable(self, force=False):
         """Does the same as exit(), except forgoes all animations
@@ -583,6 +652,7 @@ class UIComponent():
         self.enabled = False
         if force:
             self.skip_all_animations()
+        self.mark_dirty()
 
     def queue_animation(self, animations: List[UIAnimation] = [], names: List[str] = [], force: bool = False):
         """Queues a series of animations for the component. This method can be called with
@@ -609,6 +679,7 @@ class UIComponent():
         for animation in animations:
             animation.component = self
             self.queued_animations.append(animation)
+        self.mark_dirty()
 
     def push_animation(self, animations: List[UIAnimation] = [], names: List[str] = []):
         """Pushes an animation onto the animation stack, effectively pausing
@@ -628,6 +699,7 @@ class UIComponent():
         for animation in animations[::-1]:
             animation.component = self
             self.queued_animations.insert(0, animation)
+        self.mark_dirty()
 
     def save_animation(self, animation: UIAnimation, name: str):
         """Adds an animation to the UIComponent's animation dict.
@@ -682,6 +754,8 @@ class UIComponent():
                                   self.name,
                                   repr(e))
                 self.queued_animations.pop(0)
+            # animations can change anything about the component
+            self.mark_dirty()
 
     def _reset(self, reason: str=None):
         """Resets internal state. Triggers on dimension change, so as to allow
@@ -712,6 +786,42 @@ class UIComponent():
             return self.cached_background
 
     def to_surf(self) -> Surface:
+        """Draws the component and its children.
+
+        In retained mode, hands back the last drawn surface
+        unless something has changed since it was drawn
+
+        Returns:
+            Surface: the component, as it is now
+        """
+        if self.retained and not self._dirty and self._cached_surf:
+            return self._cached_surf
+        self._dirty = False
+        surf = self._render()
+        if self.retained:
+            self._cached_surf = surf
+            if self.dynamic and self.enabled:
+                self.mark_dirty()
+        return surf
+
+    def get_child_positions(self) -> List[Tuple[int, int]]:
+        """
+        Returns:
+            List[Tuple[int, int]]: where each child goes. In retained mode,
+            only worked out again when something the layout uses has changed
+        """
+        if not self.retained or self._layout_dirty or len(self._child_positions) != len(self.children):
+            self._child_positions = self.layout_handler.generate_child_positions()
+            self._layout_dirty = False
+        return self._child_positions
+
+    def _render(self) -> Surface:
+        """Actually draws the component, whether or not anything has changed.
+        Subclasses that draw themselves differently override this, not to_surf().
+
+        Returns:
+            Surface: the drawn component
+        """
         if not self.enabled:
             return engine.create_surface(self.size, True)
         # draw the background.
@@ -719,7 +829,7 @@ class UIComponent():
         # position and then draw all children recursively according to our layout
         for child in self.children:
             child.update()
-        for idx, child_pos in enumerate(self.layout_handler.generate_child_positions()):
+        for idx, child_pos in enumerate(self.get_child_positions()):
             child = self.children[idx]
             base_surf.blit(child.to_surf(), child_pos)
         # draw the hard coded surfaces as well.
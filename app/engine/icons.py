@@ -4,7 +4,7 @@ from app.constants import COLORKEY
 from app.resources.resources import RESOURCES
 from app.data.database import DB
 
-from app.engine.sprites import SPRITES
+from app.engine.sprites import SPRITES, load_image
 from app.engine.fonts import FONT
 from app.engine import engine, skill_system, image_mods
 from app.engine.game_state import game
@@ -16,8 +16,7 @@ def get_icon(item):
     if not image:
         return None
 
-    if not image.image:
-        image.image = engine.image_load(image.full_path)
+    load_image('icons16', image)
     image = engine.subsurface(image.image, (item.icon_index[0] * 16, item.icon_index[1] * 16, 16, 16))
     image = image.convert()
     engine.set_colorkey(image, COLORKEY, rleaccel=True)
@@ -64,8 +63,7 @@ def draw_weapon(surf, weapon_type, topleft, gray=False):
     if not image:
         return surf
 
-    if not image.image:
-        image.image = engine.image_load(image.full_path)
+    load_image('icons16', image)
     image = engine.subsurface(image.image, (w_type_obj.icon_index[0] * 16, w_type_obj.icon_index[1] * 16, 16, 16))
     image = image.convert()
     engine.set_colorkey(image, COLORKEY, rleaccel=True)
@@ -81,8 +79,7 @@ def draw_faction(surf, faction, topleft):
     if not image:
         return surf
 
-    if not image.image:
-        image.image = engine.image_load(image.full_path)
+    load_image('icons32', image)
     image = engine.subsurface(image.image, (faction.icon_index[0] * 32, faction.icon_index[1] * 32, 32, 32))
     image = image.convert()
     engine.set_colorkey(image, COLORKEY, rleaccel=True)
@@ -93,16 +90,14 @@ def draw_faction(surf, faction, topleft):
 def get_portrait(unit):
     image = RESOURCES.portraits.get(unit.portrait_nid)
     if image:
-        if not image.image:
-            image.image = engine.image_load(image.full_path)
+        load_image('portraits', image)
         image = engine.subsurface(image.image, (0, 0, 96, 80))
     else:  # Generic class portrait
         klass = DB.classes.get(unit.klass)
         image = RESOURCES.icons80.get(klass.icon_nid)
         if not image:
             return None
-        if not image.image:
-            image.image = engine.image_load(image.full_path)
+        load_image('icons80', image)
         image = engine.subsurface(image.image, (klass.icon_index[0] * 80, klass.icon_index[1] * 72, 80, 72))
         
     image = image.convert()
@@ -113,8 +108,7 @@ def get_portrait(unit):
 def get_portrait_from_nid(portrait_nid):
     image = RESOURCES.portraits.get(portrait_nid)
     if image:
-        if not image.image:
-            image.image = engine.image_load(image.full_path)
+        load_image('portraits', image)
         image = engine.subsurface(image.image, (0, 0, 96, 80))
         image = image.convert()
         engine.set_colorkey(image, COLORKEY, rleaccel=True)
@@ -136,8 +130,7 @@ def draw_chibi(surf, nid, topleft=None, bottomright=None):
     if not image:
         return surf
 
-    if not image.image:
-        image.image = engine.image_load(image.full_path)
+    load_image('portraits', image)
     image = engine.subsurface(image.image, (96, 16, 32, 32))
     image = image.convert()
     engine.set_colorkey(image, COLORKEY, rleaccel=True)
@@ -9,6 +9,38 @@ def color_convert(image, conversion_dict):
     px_array.close()
     return image
 
+def make_indexed(image, coords: list):
+    """
+    Turns an image drawn in palette indices, (0, x, y) for each (x, y)
+    in coords, into an 8-bit image whose pixels are positions in coords,
+    so any palette can be put on it in one pass by apply_indexed_palette
+
+    Returns:
+        the indexed image, or None if there are too many coords for
+        an 8-bit image, or the image has a pixel that isn't one of them
+    """
+    if len(coords) > 256:
+        return None
+    image = engine.copy_surface(image)
+    engine.set_colorkey(image, None, rleaccel=False)
+    px_array = engine.make_pixel_array(image)
+    for idx, coord in enumerate(coords):
+        px_array.replace((0, coord[0], coord[1]), (255, 0, idx))
+    px_array.close()
+    raw = engine.surf_to_raw(image, 'RGB')
+    num_pixels = image.get_width() * image.get_height()
+    if raw[0::3].count(255) != num_pixels or raw[1::3].count(0) != num_pixels:
+        return None
+    return engine.raw_to_surf(raw[2::3], image.get_size(), 'P')
+
+def apply_indexed_palette(indexed, colors: list):
+    """
+    colors are in the same order as the coords indexed was made with
+    """
+    image = engine.copy_surface(indexed)
+    engine.set_palette(image, colors)
+    return image.convert()
+
 def color_convert_alpha(image, conversion_dict):
     px_array = engine.make_pixel_array(image)
     for old_color, new_color in conversion_dict.items():
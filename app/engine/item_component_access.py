@@ -2,7 +2,17 @@ from app.utilities.data import Data
 from app.data.components import Type
 from app.data.item_components import ItemComponent, tags
 
-def get_item_components():
+# Registry of every item component class, keyed by nid
+# Built the first time it is needed -- not at import, since
+# importing item_components pulls in most of the engine
+_item_components = None
+
+def _build_item_components():
+    """
+    Walks ItemComponent's subclasses. Component classes are all defined
+    when the component modules are imported, so this only runs once
+    """
+    global _item_components
     # Necessary for get_item_components to find all the 
     # item components defined in item_components folder
     from app.engine import item_components
@@ -10,19 +20,23 @@ def get_item_components():
     subclasses = ItemComponent.__subclasses__() 
     # Sort by tag
     subclasses = sorted(subclasses, key=lambda x: tags.index(x.tag) if x.tag in tags else 100)
-    return Data(subclasses)
+    _item_components = Data(subclasses)
+    return _item_components
+
+def get_item_components():
+    if _item_components is None:
+        return _build_item_components()
+    return _item_components
 
 def get_component(nid):
-    _item_components = get_item_components()
-    base_class = _item_components.get(nid)
+    base_class = get_item_components().get(nid)
     if base_class:
         return base_class(base_class.value)
     return None
 
 def restore_component(dat):
     nid, value = dat
-    _item_components = get_item_components()
-    base_class = _item_components.get(nid)
+    base_class = get_item_components().get(nid)
     if base_class:
         if isinstance(base_class.expose, tuple):
             if base_class.expose[0] == Type.List:
@@ -131,20 +131,29 @@ status_event_hooks = ('on_upkeep', 'on_endstep')
 
 exclusive_hooks = false_hooks + default_hooks
 
+def get_hooks(item, hook_name) -> list:
+    """
+    Returns the item's components that define the hook, in component order
+    Built on first use, since an item's components never change
+    """
+    hooks = item._hooks.get(hook_name)
+    if hooks is None:
+        hooks = [component for component in item.components if component.defines(hook_name)]
+        item._hooks[hook_name] = hooks
+    return hooks
+
 for hook in false_hooks:
     func = """def %s(unit, item):
-                  for component in item.components:
-                      if component.defines('%s'):
-                          return component.%s(unit, item)
+                  for component in get_hooks(item, '%s'):
+                      return component.%s(unit, item)
                   return False""" \
         % (hook, hook, hook)
     exec(func)
 
 for hook in default_hooks:
     func = """def %s(unit, item):
-                  for component in item.components:
-                      if component.defines('%s'):
-                          return component.%s(unit, item)
+                  for component in get_hooks(item, '%s'):
+                      return component.%s(unit, item)
                   return Defaults.%s(unit, item)""" \
         % (hook, hook, hook, hook)
     exec(func)
@@ -152,9 +161,8 @@ for hook in default_hooks:
 for hook in simple_target_hooks:
     func = """def %s(unit, item, target):
                   val = 0
-                  for component in item.components:
-                      if component.defines('%s'):
-                          val += component.%s(unit, item, target)
+                  for component in get_hooks(item, '%s'):
+                      val += component.%s(unit, item, target)
                   return val""" \
         % (hook, hook, hook)
     exec(func)
@@ -162,9 +170,8 @@ for hook in simple_target_hooks:
 for hook in target_hooks:
     func = """def %s(playback, unit, item, target):
                   val = 0
-                  for component in item.components:
-                      if component.defines('%s'):
-                          val += component.%s(playback, unit, item, target)
+                  for component in get_hooks(item, '%s'):
+                      val += component.%s(playback, unit, item, target)
                   return val""" \
         % (hook, hook, hook)
     exec(func)
@@ -172,9 +179,8 @@ for hook in target_hooks:
 for hook in modify_hooks:
     func = """def %s(unit, item):
                   val = 0
-                  for component in item.components:
-                      if component.defines('%s'):
-                          val += component.%s(unit, item)
+                  for component in get_hooks(item, '%s'):
+                      val += component.%s(unit, item)
                   return val""" \
         % (hook, hook, hook)
     exec(func)
@@ -182,54 +188,46 @@ for hook in modify_hooks:
 for hook in dynamic_hooks:
     func = """def %s(unit, item, target, mode):
                   val = 0
-                  for component in item.components:
-                      if component.defines('%s'):
-                          val += component.%s(unit, item, target, mode)
+                  for component in get_hooks(item, '%s'):
+                      val += component.%s(unit, item, target, mode)
                   return val""" \
         % (hook, hook, hook)
     exec(func)
 
 for hook in event_hooks:
     func = """def %s(unit, item):
-    for component in item.components:
-        if component.defines('%s'):
-            component.%s(unit, item)
+    for component in get_hooks(item, '%s'):
+        component.%s(unit, item)
     if item.parent_item:
-        for component in item.parent_item.components:
-            if component.defines('%s'):
-                component.%s(unit, item.parent_item)""" \
+        for component in get_hooks(item.parent_item, '%s'):
+            component.%s(unit, item.parent_item)""" \
         % (hook, hook, hook, hook, hook)
     exec(func)
 
 for hook in combat_event_hooks:
     func = """def %s(playback, unit, item, target, mode):
-    for component in item.components:
-        if component.defines('%s'):
-            component.%s(playback, unit, item, target, mode)
+    for component in get_hooks(item, '%s'):
+        component.%s(playback, unit, item, target, mode)
     if item.parent_item:
-        for component in item.parent_item.components:
-            if component.defines('%s'):
-                component.%s(playback, unit, item.parent_item, target, mode)""" \
+        for component in get_hooks(item.parent_item, '%s'):
+            component.%s(playback, unit, item.parent_item, target, mode)""" \
         % (hook, hook, hook, hook, hook)
     exec(func)
 
 for hook in status_event_hooks:
     func = """def %s(actions, playback, unit, item):
-    for component in item.components:
-        if component.defines('%s'):
-            component.%s(actions, playback, unit, item)
+    for component in get_hooks(item, '%s'):
+        component.%s(actions, playback, unit, item)
     if item.parent_item:
-        for component in item.parent_item.components:
-            if component.defines('%s'):
-                component.%s(actions, playback, unit, item.parent_item)""" \
+        for component in get_hooks(item.parent_item, '%s'):
+            component.%s(actions, playback, unit, item.parent_item)""" \
         % (hook, hook, hook, hook, hook)
     exec(func)
 
 for hook in aesthetic_combat_hooks:
     func = """def %s(unit, item, target, mode):
-    for component in item.components:
-        if component.defines('%s'):
-            return component.%s(unit, item, target, mode)
+    for component in get_hooks(item, '%s'):
+        return component.%s(unit, item, target, mode)
     return None""" \
         % (hook, hook, hook)
     exec(func)
@@ -238,83 +236,72 @@ def available(unit, item) -> bool:
     """
     If any hook reports false, then it is false
     """
-    for component in item.components:
-        if component.defines('available'):
-            if not component.available(unit, item):
-                return False
+    for component in get_hooks(item, 'available'):
+        if not component.available(unit, item):
+            return False
     if item.parent_item:
-        for component in item.parent_item.components:
-            if component.defines('available'):
-                if not component.available(unit, item.parent_item):
-                    return False
+        for component in get_hooks(item.parent_item, 'available'):
+            if not component.available(unit, item.parent_item):
+                return False
     return True
 
 def is_broken(unit, item) -> bool:
     """
     If any hook reports true, then it is true
     """
-    for component in item.components:
-        if component.defines('is_broken'):
-            if component.is_broken(unit, item):
-                return True
+    for component in get_hooks(item, 'is_broken'):
+        if component.is_broken(unit, item):
+            return True
     if item.parent_item:
-        for component in item.parent_item.components:
-            if component.defines('is_broken'):
-                if component.is_broken(unit, item.parent_item):
-                    return True
+        for component in get_hooks(item.parent_item, 'is_broken'):
+            if component.is_broken(unit, item.parent_item):
+                return True
     return False
 
 def on_broken(unit, item) -> bool:
     alert = False
-    for component in item.components:
-        if component.defines('on_broken'):
-            if component.on_broken(unit, item):
-                alert = True
+    for component in get_hooks(item, 'on_broken'):
+        if component.on_broken(unit, item):
+            alert = True
     if item.parent_item:
-        for component in item.parent_item.components:
-            if component.defines('on_broken'):
-                if component.on_broken(unit, item.parent_item):
-                    alert = True
+        for component in get_hooks(item.parent_item, 'on_broken'):
+            if component.on_broken(unit, item.parent_item):
+                alert = True
     return alert
 
 def valid_targets(unit, item) -> set:
     targets = set()
-    for component in item.components:
-        if component.defines('valid_targets'):
-            targets |= component.valid_targets(unit, item)
+    for component in get_hooks(item, 'valid_targets'):
+        targets |= component.valid_targets(unit, item)
     return targets
 
 def ai_targets(unit, item) -> set:
     targets = set()
-    for component in item.components:
-        if component.defines('ai_targets'):
-            if targets:  # If we already have targets, just make them smaller
-                targets &= component.ai_targets(unit, item)
-            else:
-                targets |= component.ai_targets(unit, item)
+    for component in get_hooks(item, 'ai_targets'):
+        if targets:  # If we already have targets, just make them smaller
+            targets &= component.ai_targets(unit, item)
+        else:
+            targets |= component.ai_targets(unit, item)
     return targets
 
 def target_restrict(unit, item, def_pos, splash) -> bool:
-    for component in item.components:
-        if component.defines('target_restrict'):
-            if not component.target_restrict(unit, item, def_pos, splash):
-                return False
+    for component in get_hooks(item, 'target_restrict'):
+        if not component.target_restrict(unit, item, def_pos, splash):
+            return False
     return True
 
 def item_restrict(unit, item, defender, def_item) -> bool:
-    for component in item.components:
-        if component.defines('item_restrict'):
-            if not component.item_restrict(unit, item, defender, def_item):
-                return False
+    for component in get_hooks(item, 'item_restrict'):
+        if not component.item_restrict(unit, item, defender, def_item):
+            return False
     return True
 
 def ai_priority(unit, item, target, move) -> float:
     custom_ai_flag: bool = False
     ai_priority = 0
-    for component in item.components:
-        if component.defines('ai_priority'):
-            custom_ai_flag = True
-            ai_priority += component.ai_priority(unit, item, target, move)
+    for component in get_hooks(item, 'ai_priority'):
+        custom_ai_flag = True
+        ai_priority += component.ai_priority(unit, item, target, move)
     if custom_ai_flag:
         return ai_priority
     else:
@@ -327,11 +314,10 @@ def splash(unit, item, position) -> tuple:
     """
     main_target = []
     splash = []
-    for component in item.components:
-        if component.defines('splash'):
-            new_target, new_splash = component.splash(unit, item, position)
-            main_target.append(new_target)
-            splash += new_splash
+    for component in get_hooks(item, 'splash'):
+        new_target, new_splash = component.splash(unit, item, position)
+        main_target.append(new_target)
+        splash += new_splash
     # Handle having multiple main targets
     if len(main_target) > 1:
         splash += main_target
@@ -355,9 +341,8 @@ def splash(unit, item, position) -> tuple:
 
 def splash_positions(unit, item, position) -> set:
     positions = set()
-    for component in item.components:
-        if component.defines('splash_positions'):
-            positions |= component.splash_positions(unit, item, position)
+    for component in get_hooks(item, 'splash_positions'):
+        positions |= component.splash_positions(unit, item, position)
     # DEFAULT
     if not positions:
         from app.engine import skill_system
@@ -378,22 +363,18 @@ def find_hp(actions, target):
     return starting_hp
 
 def after_hit(actions, playback, unit, item, target, mode):
-    for component in item.components:
-        if component.defines('after_hit'):
-            component.after_hit(actions, playback, unit, item, target, mode)
+    for component in get_hooks(item, 'after_hit'):
+        component.after_hit(actions, playback, unit, item, target, mode)
     if item.parent_item:
-        for component in item.parent_item.components:
-            if component.defines('after_hit'):
-                component.after_hit(actions, playback, unit, item.parent_item, target, mode)
+        for component in get_hooks(item.parent_item, 'after_hit'):
+            component.after_hit(actions, playback, unit, item.parent_item, target, mode)
 
 def on_hit(actions, playback, unit, item, target, target_pos, mode, first_item):
-    for component in item.components:
-        if component.defines('on_hit'):
-            component.on_hit(actions, playback, unit, item, target, target_pos, mode)
+    for component in get_hooks(item, 'on_hit'):
+        component.on_hit(actions, playback, unit, item, target, target_pos, mode)
     if item.parent_item and first_item:
-        for component in item.parent_item.components:
-            if component.defines('on_hit'):
-                component.on_hit(actions, playback, unit, item.parent_item, target, target_pos, mode)
+        for component in get_hooks(item.parent_item, 'on_hit'):
+            component.on_hit(actions, playback, unit, item.parent_item, target, target_pos, mode)
 
     # Default playback
     if target and find_hp(actions, target) <= 0:
@@ -458,35 +439,30 @@ def on_glancing_hit(actions, playback, unit, item, target, target_pos, mode, fir
         playback.append(('unit_tint_add', target, (255, 255, 255)))
 
 def on_miss(actions, playback, unit, item, target, target_pos, mode, first_item):
-    for component in item.components:
-        if component.defines('on_miss'):
-            component.on_miss(actions, playback, unit, item, target, target_pos, mode)
+    for component in get_hooks(item, 'on_miss'):
+        component.on_miss(actions, playback, unit, item, target, target_pos, mode)
     if item.parent_item and first_item:
-        for component in item.parent_item.components:
-            if component.defines('on_miss'):
-                component.on_miss(actions, playback, unit, item.parent_item, target, target_pos, mode)
+        for component in get_hooks(item.parent_item, 'on_miss'):
+            component.on_miss(actions, playback, unit, item.parent_item, target, target_pos, mode)
 
     # Default playback
     playback.append(('hit_sound', 'Attack Miss 2'))
     playback.append(('hit_anim', 'MapMiss', target))
 
 def item_icon_mod(unit, item, target, sprite):
-    for component in item.components:
-        if component.defines('item_icon_mod'):
-            sprite = component.item_icon_mod(unit, item, target, sprite)
+    for component in get_hooks(item, 'item_icon_mod'):
+        sprite = component.item_icon_mod(unit, item, target, sprite)
     return sprite
 
 def can_unlock(unit, item, region) -> bool:
-    for component in item.components:
-        if component.defines('can_unlock'):
-            if component.can_unlock(unit, item, region):
-                return True
+    for component in get_hooks(item, 'can_unlock'):
+        if component.can_unlock(unit, item, region):
+            return True
     return False
 
 def init(item):
     """
     Initializes any data on the parent item if necessary
     """
-    for component in item.components:
-        if component.defines('init'):
-            component.init(item)
+    for component in get_hooks(item, 'init'):
+        component.init(item)
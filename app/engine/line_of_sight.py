@@ -1,4 +1,5 @@
 from app.utilities import utils
+from app.utilities.algorithms import visibility
 from enum import IntEnum
 
 from app.engine.game_state import game
@@ -11,71 +12,11 @@ class Visibility(IntEnum):
 def get_line(start: tuple, end: tuple) -> bool:
     if start == end:
         return True
-    x1, y1 = start
-    x2, y2 = end
-    dx = x2 - x1
-    dy = y2 - y1
-    x, y = x1, y1
-
-    xstep, ystep = 1, 1
-    if dy < 0:
-        ystep = -1
-        dy = -dy
-    if dx < 0:
-        xstep = -1
-        dx = -dx
-    ddy, ddx = 2*dy, 2*dx
-
-    if ddx >= ddy:
-        errorprev = error = dx
-        for i in range(dx):
-            x += xstep
-            error += ddy
-            # How far off the straight line to the right are you
-            if error > ddx:
-                y += ystep
-                error -= ddx
-                if error + errorprev < ddx:  # Bottom square
-                    pos = x, y - ystep
-                    if pos != end and game.board.get_opacity(pos):
-                        return False
-                elif error + errorprev > ddx:  # Left square
-                    pos = x - xstep, y
-                    if pos != end and game.board.get_opacity(pos):
-                        return False
-                else:  # Through the middle
-                    pos1, pos2 = (x, y - ystep), (x - xstep, y)
-                    if game.board.get_opacity(pos1) and game.board.get_opacity(pos2):
-                        return False
-            pos = x, y
-            if pos != end and game.board.get_opacity(pos):
-                return False
-            errorprev = error
-    else:
-        errorprev = error = dy
-        for i in range(dy):
-            y += ystep
-            error += ddx
-            if error > ddy:
-                x += xstep
-                error -= ddy
-                if error + errorprev < ddy:  # Bottom square
-                    pos = x - xstep, y
-                    if pos != end and game.board.get_opacity(pos):
-                        return False
-                elif error + errorprev > ddy:  # Left square
-                    pos = x, y - ystep
-                    if pos != end and game.board.get_opacity(pos):
-                        return False
-                else:  # Through the middle
-                    pos1, pos2 = (x, y - ystep), (x - xstep, y)
-                    if game.board.get_opacity(pos1) and game.board.get_opacity(pos2):
-                        return False
-            pos = x, y
-            if pos != end and game.board.get_opacity(pos):
-                return False
-            errorprev = error
-    assert x == x2 and y == y2
+    x, y = start
+    get_opacity = game.board.get_opacity
+    for blocker in visibility.get_ray(end[0] - x, end[1] - y):
+        if all(get_opacity((x + dx, y + dy)) for (dx, dy) in blocker):
+            return False
     return True
 
 def line_of_sight(source_pos: list, dest_pos: list, max_range: int) -> list:
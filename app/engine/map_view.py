@@ -3,14 +3,12 @@ from app.constants import TILEWIDTH, TILEHEIGHT, WINWIDTH, WINHEIGHT
 from app.counters import generic3counter, simplecounter, movement_counter
 
 from app.utilities.utils import frames2ms
-from app.engine import engine
+from app.engine import engine, profiler
 from app.engine.game_state import game
 
-import time
-
 class MapView():
     def __init__(self):
-        pass
+        self.map_surf = None  # Reused every frame, so the map is not copied and converted each time
 
     def draw_units(self, surf, cull_rect, subsurface_rect=None):
         # Surf is always 240x160 WxH
@@ -59,7 +57,6 @@ class MapView():
             surf.blit(unit_surf, (0, 0))
 
     def draw(self, camera_cull=None, subsurface_cull=None):
-        # start = time.time_ns()
         game.tilemap.update()
         # Camera Cull
         cull_rect = camera_cull
@@ -67,8 +64,11 @@ class MapView():
 
         map_image = game.tilemap.get_full_image(cull_rect)
 
-        surf = engine.copy_surface(map_image)
-        surf = surf.convert_alpha()
+        if not self.map_surf or self.map_surf.get_size() != map_image.get_size():
+            self.map_surf = engine.create_surface(map_image.get_size(), transparent=True)
+        surf = self.map_surf
+        engine.fill(surf, (0, 0, 0, 0))
+        surf.blit(map_image, (0, 0))
 
         surf = game.boundary.draw(surf, full_size, cull_rect)
         surf = game.boundary.draw_fog_of_war(surf, full_size, cull_rect)
@@ -79,17 +79,19 @@ class MapView():
             # Make the cull rect even smaller
             if subsurface_cull[2] > 0:
                 subsurface_rect = cull_rect[0] + subsurface_cull[0], cull_rect[1] + subsurface_cull[1], subsurface_cull[2], subsurface_cull[3]
-                self.draw_units(surf, cull_rect, subsurface_rect)
+                with profiler.scope('map_view.units'):
+                    self.draw_units(surf, cull_rect, subsurface_rect)
             else:
                 pass # Don't draw units
         else:
-            self.draw_units(surf, cull_rect)
+            with profiler.scope('map_view.units'):
+                self.draw_units(surf, cull_rect)
         surf = game.cursor.draw(surf, cull_rect)
 
         for weather in game.tilemap.weather:
             weather.update()
             weather.draw(surf, cull_rect[0], cull_rect[1])
 
-        surf = game.ui_view.draw(surf)
-        # print((time.time_ns() - start)/1e6)
+        with profiler.scope('map_view.ui'):
+            surf = game.ui_view.draw(surf)
         return surf
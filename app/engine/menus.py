@@ -25,12 +25,20 @@ def draw_unit_top(surf, topleft, unit):
     FONT['text-blue'].blit_right(str(unit.level), surf, (x + 72, y - 19))
     FONT['text-blue'].blit_right(str(unit.exp), surf, (x + 97, y - 19))
 
+# Key: (shimmer, number of items), Value: background surf
+# Drawn every frame by the item menus, but only ever one of a handful of surfs
+bg_surfs = {}
+
 def make_bg_surf(shimmer):
+    key = (shimmer, DB.constants.total_items())
+    if key in bg_surfs:
+        return bg_surfs[key]
     bg_surf = create_base_surf(104, 16 * DB.constants.total_items() + 8, 'menu_bg_base')
     if shimmer:
         img = SPRITES.get('menu_shimmer%d' % shimmer)
         bg_surf.blit(img, (bg_surf.get_width() - img.get_width() - 1, bg_surf.get_height() - img.get_height() - 5))
     bg_surf = image_mods.make_translucent(bg_surf, 0.1)
+    bg_surfs[key] = bg_surf
     return bg_surf
 
 def draw_unit_face(surf, topleft, unit, right):
@@ -27,6 +27,9 @@ class ItemObject():
             # Assign parent to component
             component_value.item = self
 
+        # Components that define each hook, see item_system.get_hooks
+        self._hooks = {}
+
         self.data = {}
         
         # For subitems
@@ -25,6 +25,9 @@ class SkillObject():
             # Assign parent to component
             component_value.skill = self
 
+        # Components that define each hook, see skill_system.get_skill_hooks
+        self._hooks = {}
+
         self.data = {}
         self.initiator_nid = None
 
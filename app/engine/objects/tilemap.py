@@ -17,6 +17,7 @@ class LayerObject():
         self.terrain = {}
         self.image = None
         self.autotile_images = []
+        self.autotile_cells = set()
         self.pixel_bounds = None
 
         # For fade in
@@ -120,6 +121,14 @@ class TileMapObject(Prefab):
         self.height: int = 0
         self.nid: NID = None
 
+        # Compositor -- see get_full_image
+        self._stack_key = None  # Visibility of each layer when the stack was flattened
+        self._stack_image = None
+        self._autotile_bounds = None  # Pixel rect of the autotile cells
+        self._autotile_cells = []
+        self._autotile_overlays = []  # One for each autotile frame, built when first drawn
+        self._cull_image = None
+
     @classmethod
     def from_prefab(cls, prefab):
         self = cls()
@@ -171,6 +180,7 @@ class TileMapObject(Prefab):
                 # Handle Autotiles
                 if pos in tileset.autotiles and tileset.autotile_image:
                     has_autotiles = True
+                    new_layer.autotile_cells.add(coord)
                     column = tileset.autotiles[pos]
                     for idx, im in enumerate(autotile_images):
                         rect = (column * TILEWIDTH, idx * TILEHEIGHT, TILEWIDTH, TILEHEIGHT)
@@ -210,26 +220,110 @@ class TileMapObject(Prefab):
         return None
 
     def get_full_image(self, cull_rect):
-        image = engine.create_surface((cull_rect[2], cull_rect[3]))
-        engine.set_colorkey(image, COLORKEY)
-        for layer in self.layers:
-            if (layer.visible or layer.state == 'fade_out') and \
-                    layer.should_draw(cull_rect):
-                main_image = layer.get_image(cull_rect)
-                image.blit(main_image, (0, 0))
-                autotile_image = layer.get_autotile_image(cull_rect)
-                if autotile_image:
-                    image.blit(autotile_image, (0, 0))
+        """
+        Returns the visible layers within the cull rect
+
+        The static part of the visible layers is kept flattened into one image,
+        and the autotile cells are drawn on top of it from a small overlay for
+        each autotile frame. Only re-flattened when a layer is shown or hidden.
+        While a layer is fading, every layer is drawn separately like normal.
+        The returned image is reused every call, so copy it to keep it
+        """
+        image = self._get_cull_image(cull_rect)
+        if any(layer.state in ('fade_in', 'fade_out') for layer in self.layers):
+            engine.fill(image, COLORKEY)
+            for layer in self.layers:
+                if (layer.visible or layer.state == 'fade_out') and \
+                        layer.should_draw(cull_rect):
+                    main_image = layer.get_image(cull_rect)
+                    image.blit(main_image, (0, 0))
+                    autotile_image = layer.get_autotile_image(cull_rect)
+                    if autotile_image:
+                        image.blit(autotile_image, (0, 0))
+            return image
+
+        key = tuple(layer.visible for layer in self.layers)
+        if key != self._stack_key:
+            self._build_stack(key)
+        if cull_rect[0] < 0 or cull_rect[1] < 0 or \
+                cull_rect[0] + cull_rect[2] > self._stack_image.get_width() or \
+                cull_rect[1] + cull_rect[3] > self._stack_image.get_height():
+            engine.fill(image, COLORKEY)
+        # The stack has no colorkey, so this is a straight copy
+        image.blit(self._stack_image, (0, 0), cull_rect)
+        if self._autotile_bounds:
+            overlay = self._get_autotile_overlay()
+            left, top = self._autotile_bounds[0] - cull_rect[0], self._autotile_bounds[1] - cull_rect[1]
+            image.blit(overlay, (left, top))
         return image
 
+    def _get_cull_image(self, cull_rect):
+        size = (cull_rect[2], cull_rect[3])
+        if not self._cull_image or self._cull_image.get_size() != size:
+            self._cull_image = engine.create_surface(size)
+            engine.set_colorkey(self._cull_image, COLORKEY)
+        return self._cull_image
+
+    def _build_stack(self, key):
+        full_size = (self.width * TILEWIDTH, self.height * TILEHEIGHT)
+        if not self._stack_image:
+            self._stack_image = engine.create_surface(full_size)
+        engine.fill(self._stack_image, COLORKEY)
+        autotile_cells = set()
+        for layer in self.layers:
+            if layer.visible:
+                self._stack_image.blit(layer.image, (0, 0))
+                if layer.autotile_images:
+                    autotile_cells |= layer.autotile_cells
+        self._stack_key = key
+
+        self._autotile_cells = sorted(autotile_cells)
+        self._autotile_overlays = [None for _ in range(AUTOTILE_FRAMES)]
+        if autotile_cells:
+            left = min(coord[0] for coord in autotile_cells) * TILEWIDTH
+            top = min(coord[1] for coord in autotile_cells) * TILEHEIGHT
+            right = (max(coord[0] for coord in autotile_cells) + 1) * TILEWIDTH
+            bottom = (max(coord[1] for coord in autotile_cells) + 1) * TILEHEIGHT
+            self._autotile_bounds = (left, top, right - left, bottom - top)
+        else:
+            self._autotile_bounds = None
+
+    def _get_autotile_overlay(self):
+        """
+        Every visible layer of just the autotile cells, with the current autotile frame
+        """
+        frame = 0
+        for layer in self.layers:
+            if layer.visible and layer.autotile_images:
+                frame = layer.autotile_frame
+                break
+        overlay = self._autotile_overlays[frame]
+        if not overlay:
+            left, top, width, height = self._autotile_bounds
+            overlay = engine.create_surface((width, height))
+            engine.fill(overlay, COLORKEY)
+            for layer in self.layers:
+                if not layer.visible:
+                    continue
+                for coord in self._autotile_cells:
+                    rect = (coord[0] * TILEWIDTH, coord[1] * TILEHEIGHT, TILEWIDTH, TILEHEIGHT)
+                    pos = (rect[0] - left, rect[1] - top)
+                    overlay.blit(layer.image, pos, rect)
+                    if layer.autotile_images:
+                        overlay.blit(layer.autotile_images[frame], pos, rect)
+            engine.set_colorkey(overlay, COLORKEY, rleaccel=True)
+            self._autotile_overlays[frame] = overlay
+        return overlay
+
     def update(self):
         for layer in self.layers:
-            in_state = layer.update()
-            if in_state:
-                self.reset()
+            layer.update()
 
     def reset(self):
-        pass
+        """
+        Forces the layer stack to be flattened again next draw
+        """
+        self._stack_key = None
 
     def save(self):
         s_dict = {}
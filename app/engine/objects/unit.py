@@ -23,6 +23,11 @@ class UnitObject(Prefab):
         self.ai = None
         self.ai_group = None
 
+        # Hook index built by skill_system.get_hooks
+        self._skill_hooks = None
+        # Stats and equation values cached by equations.Parser
+        self._equation_cache = None
+
     @classmethod
     def from_prefab(cls, prefab: UnitPrefab):
         self = cls()
@@ -108,6 +113,7 @@ class UnitObject(Prefab):
         self.skills += personal_skills
         class_skills = unit_funcs.get_starting_skills(self)
         self.skills += class_skills
+        skill_system.reset_hooks(self)
 
         # Handle items
         items = item_funcs.create_items(self, prefab.starting_items)
@@ -26,6 +26,7 @@ class OverworldManager():
         # generate useful structs
         self.nodes: Dict[NID, OverworldNodeObject] = {}
         self.roads: Dict[NID, RoadObject] = {}
+        self._nodes_by_position: Dict[Point, OverworldNodeObject] = {}
 
         self.overworld_full_graph: LTGraph[NID, OverworldNodeObject, RoadObject]  = None
         self.overworld_explored_graph: LTGraph[NID, OverworldNodeObject, RoadObject] = None
@@ -48,8 +49,16 @@ class OverworldManager():
     def enable_node(self, node: OverworldNodeObject | NID):
         if isinstance(node, OverworldNodeObject):
             node = node.nid
+        if node in self._overworld.enabled_nodes:
+            return
         self._overworld.enabled_nodes.add(node)
-        self.regenerate_explored_graph()
+        self.overworld_explored_graph.add_vertex(node, self.nodes[node])
+        # roads to this node that were already revealed can now be used
+        position = self.nodes[node].position
+        for road_nid in self._overworld.enabled_roads:
+            road = self.roads[road_nid]
+            if position in (road.prefab[0], road.prefab[-1]):
+                self._add_explored_road(road)
 
     @property
     def revealed_roads(self) -> List[RoadObject]:
@@ -58,8 +67,10 @@ class OverworldManager():
     def enable_road(self, road: RoadObject | NID):
         if isinstance(road, RoadObject):
             road = road.nid
+        if road in self._overworld.enabled_roads:
+            return
         self._overworld.enabled_roads.add(road)
-        self.regenerate_explored_graph()
+        self._add_explored_road(self.roads[road])
 
     @property
     def tilemap(self) -> TileMapObject:
@@ -168,15 +179,9 @@ class OverworldManager():
         return self._overworld.node_properties.get(node, set())
 
     def node_at(self, pos: Point, force=False) -> OverworldNodeObject:
-        for node in self.nodes.values():
-            if node.position == pos:
-                if force:
-                    return node
-                else:
-                    if node.nid in self._overworld.enabled_nodes:
-                        return node
-                    else:
-                        break
+        node = self._nodes_by_position.get(pos)
+        if node and (force or node.nid in self._overworld.enabled_nodes):
+            return node
         return None
 
     def node_by_level(self, level_nid: NID) -> OverworldNodeObject:
@@ -261,6 +266,7 @@ class OverworldManager():
     def _initialize_objects(self):
         for nid, node in self._overworld.prefab.overworld_nodes.items():
             self.nodes[nid] = OverworldNodeObject.from_prefab(node)
+            self._nodes_by_position.setdefault(self.nodes[nid].position, self.nodes[nid])
         for rid, road in self._overworld.prefab.map_paths.items():
             self.roads[rid] = RoadObject.from_prefab(road, rid)
 
@@ -283,12 +289,17 @@ class OverworldManager():
         for vis_node_nid in self._overworld.enabled_nodes:
             self.overworld_explored_graph.add_vertex(vis_node_nid, self.nodes[vis_node_nid])
         for vis_road_nid in self._overworld.enabled_roads:
-            road = self.roads[vis_road_nid]
-            path = road.prefab
-            start_node = self.node_at(path[0])
-            end_node = self.node_at(path[-1])
-            if start_node and end_node:
-                self.overworld_explored_graph.add_edge(start_node.nid, end_node.nid, data=road, weight=road.tile_length)
+            self._add_explored_road(self.roads[vis_road_nid])
+
+    def _add_explored_road(self, road: RoadObject):
+        """Adds the road to the visible overworld graph, if both of its ends are visible.
+        The graph keeps its shortest paths up to date, so this is cheap.
+        """
+        path = road.prefab
+        start_node = self.node_at(path[0])
+        end_node = self.node_at(path[-1])
+        if start_node and end_node:
+            self.overworld_explored_graph.add_edge(start_node.nid, end_node.nid, data=road, weight=road.tile_length)
 
     def map_size(self) -> Tuple[int, int]:
         return (self._overworld.tilemap.width, self._overworld.tilemap.height)
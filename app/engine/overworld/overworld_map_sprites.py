@@ -19,6 +19,7 @@ from app.data.database import DB
 from app.data.overworld_node import OverworldNodePrefab
 from app.engine.overworld.overworld_road_sprite_wrapper import OverworldRoadSpriteWrapper
 from app.engine import engine, image_mods
+from app.engine.sprites import load_image
 from app.engine.animations import MapAnimation
 from app.engine.sound import SOUNDTHREAD
 from app.resources.map_icons import MapIcon
@@ -53,8 +54,7 @@ class OverworldNodeSprite():
         self.load_sprites()
 
     def load_sprites(self):
-        if not self.map_icon.image:
-            self.map_icon.image = engine.image_load(self.map_icon.full_path)
+        load_image('map_icons', self.map_icon)
 
     def set_transition(self, new_state):
         self.transition_state = new_state
@@ -4,7 +4,7 @@ import logging
 from typing import List
 from app.constants import TILEHEIGHT, TILEWIDTH
 from app.engine import engine
-from app.sprites import SPRITES
+from app.engine.sprites import SPRITES
 from app.utilities.enums import Direction
 from app.utilities.typing import Point
 from app.utilities.utils import dot_product, tmult, tuple_add, tuple_sub
@@ -25,7 +25,8 @@ class OverworldRoadSpriteWrapper():
         road_sprite = SPRITES['overworld_routes']
         self.sprite_dict = {}
         if road_sprite:
-            self.get_image(road_sprite)
+            # Decoded by the engine's sprite loader
+            SPRITES.get('overworld_routes')
         self.road_sprite = road_sprite
         if self.road_sprite:
             self.subsprites: List[Surface] = []
@@ -39,10 +40,6 @@ class OverworldRoadSpriteWrapper():
             self.diag_main = self.subsprites[6]
             self.diag_corner = self.subsprites[7]
 
-    def get_image(self, road_sprite):
-        if not road_sprite.image:
-            road_sprite.image = engine.image_load(road_sprite.full_path)
-
     def get_subimage(self, road_sprite, x):
         return engine.subsurface(road_sprite.image, (x, 0, 8, 8))
 
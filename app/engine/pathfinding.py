@@ -1,4 +1,5 @@
 import heapq
+from array import array
 
 from app.utilities import utils
 
@@ -218,3 +219,259 @@ class AStar():
                     else:  # Is blocked
                         pass
         return []
+
+class _HeapKey(int):
+    """
+    Cell index used as the last element of a heap entry.
+    Always compares equal, so ties between entries with the same
+    (g or f, cost) are left to heapq exactly like the Node based
+    pathfinders above, and both engines pop cells in the same order.
+    Never compare one with == -- use it as an index or in a set
+    """
+    __slots__ = ()
+
+    def __eq__(self, other):
+        return True
+
+    def __ne__(self, other):
+        return False
+
+    __hash__ = int.__hash__
+
+class PathBuffers():
+    """
+    Flat scratch storage shared by every flat pathfinder on a board.
+    Each query bumps the generation, and a cell's g and parent only
+    count if its stamp matches the current generation, so nothing
+    needs to be reset between queries
+    """
+    __slots__ = ['size', 'generation', 'stamp', 'closed', 'g', 'parent', 'keys']
+
+    def __init__(self, size: int):
+        self.size = size
+        self.generation = 0
+        self.stamp = array('L', [0]) * size
+        self.closed = array('L', [0]) * size
+        self.g = array('d', [0.]) * size
+        self.parent = array('l', [-1]) * size
+        self.keys = tuple(_HeapKey(idx) for idx in range(size))
+
+    def next_generation(self) -> int:
+        self.generation += 1
+        if self.generation >= 0xFFFFFFFF:
+            # Stamps would wrap around, so start over
+            self.generation = 1
+            self.stamp = array('L', [0]) * self.size
+            self.closed = array('L', [0]) * self.size
+        return self.generation
+
+class FlatDjikstra():
+    """
+    Same results as Djikstra, but works off the flat mcost array from
+    GameBoard.get_mcost_grid and the board's PathBuffers instead of
+    a list of Nodes
+    """
+    __slots__ = ['costs', 'buffers', 'width', 'height', 'start_pos',
+                 'start_idx', 'unit_team', 'pass_through', 'ai_fog_of_war']
+
+    def __init__(self, start_pos: tuple, costs: array, buffers: PathBuffers,
+                 width: int, height: int, unit_team: str,
+                 pass_through: bool, ai_fog_of_war: bool):
+        self.costs = costs
+        self.buffers = buffers
+        self.width, self.height = width, height
+        self.start_pos = start_pos
+        self.start_idx = start_pos[0] * height + start_pos[1]
+        self.unit_team = unit_team
+        self.pass_through = pass_through
+        self.ai_fog_of_war = ai_fog_of_war
+
+    def _can_move_through(self, game_board, idx: int) -> bool:
+        if self.pass_through:
+            return True
+        unit_team = next(iter(game_board.team_grid[idx]), None)
+        if not unit_team or utils.compare_teams(self.unit_team, unit_team):
+            return True
+        if self.unit_team == 'player' or self.ai_fog_of_war:
+            if not game_board.in_vision(divmod(idx, self.height), self.unit_team):
+                return True  # Can always move through what you can't see
+        return False
+
+    def process(self, game_board, movement_left: int) -> set:
+        buffers = self.buffers
+        generation = buffers.next_generation()
+        stamp, closed, g_buf, keys = buffers.stamp, buffers.closed, buffers.g, buffers.keys
+        costs = self.costs
+        width, height = self.width, self.height
+        heappush, heappop = heapq.heappush, heapq.heappop
+
+        start = self.start_idx
+        stamp[start] = generation
+        g_buf[start] = 0
+        found = []
+        open_ = [(0, costs[start], keys[start])]
+        while open_:
+            g, _, idx = heappop(open_)
+            # Always g ordered, so leaving at the first sign of trouble will always work
+            if g > movement_left:
+                break
+            if closed[idx] == generation:
+                continue  # Stale entry -- we already found a better path here
+            closed[idx] = generation
+            found.append(idx)
+            x, y = divmod(idx, height)
+            # Same neighbor order as Djikstra.get_adjacent_cells
+            adjs = []
+            if y < height - 1:
+                adjs.append(idx + 1)
+            if x < width - 1:
+                adjs.append(idx + height)
+            if x > 0:
+                adjs.append(idx - height)
+            if y > 0:
+                adjs.append(idx - 1)
+            for adj in adjs:
+                cost = costs[adj]
+                if cost < 99 and closed[adj] != generation:
+                    if self._can_move_through(game_board, adj):
+                        new_g = g_buf[idx] + cost
+                        # No decrease-key, just push again if better
+                        if stamp[adj] != generation or g_buf[adj] > new_g:
+                            stamp[adj] = generation
+                            g_buf[adj] = new_g
+                            heappush(open_, (new_g, cost, keys[adj]))
+        return {divmod(idx, height) for idx in found}
+
+class FlatAStar():
+    """
+    Same results as AStar, but works off the flat mcost array from
+    GameBoard.get_mcost_grid and the board's PathBuffers instead of
+    a list of Nodes. Resetting is free, so one instance can be reused
+    for many goals
+    """
+    def __init__(self, start_pos: tuple, goal_pos: tuple, costs: array,
+                 buffers: PathBuffers, width: int, height: int, unit_team: str,
+                 pass_through: bool = False, ai_fog_of_war: bool = False):
+        self.costs = costs
+        self.buffers = buffers
+        self.width = width
+        self.height = height
+        self.start_pos = start_pos
+        self.goal_pos = None
+        self.end_idx = None
+        self.adj_end = None
+
+        self.start_idx = start_pos[0] * height + start_pos[1]
+        if goal_pos:
+            self.set_goal_pos(goal_pos)
+
+        self.unit_team = unit_team
+        self.pass_through = pass_through
+        self.ai_fog_of_war = ai_fog_of_war
+
+    def reset(self):
+        # Nothing to do, each call to process starts a new generation
+        pass
+
+    def set_goal_pos(self, goal_pos):
+        self.goal_pos = goal_pos
+        self.end_idx = goal_pos[0] * self.height + goal_pos[1]
+        self.adj_end = set(self.get_adjacent_indices(self.end_idx))
+
+    def get_heuristic(self, x: int, y: int) -> float:
+        """
+        Compute the heuristic for this cell
+        h is the approximate distance between this cell and the goal cell
+        """
+        end_x, end_y = self.goal_pos
+        dx1 = x - end_x
+        dy1 = y - end_y
+        h = abs(dx1) + abs(dy1)
+        # Slight nudge in direction that lies along path from start to end
+        dx2 = self.start_pos[0] - end_x
+        dy2 = self.start_pos[1] - end_y
+        cross = abs(dx1 * dy2 - dx2 * dy1)
+        return h + cross * .001
+
+    def get_adjacent_indices(self, idx: int) -> list:
+        # Same neighbor order as AStar.get_adjacent_cells
+        height = self.height
+        x, y = divmod(idx, height)
+        adjs = []
+        if y < height - 1:
+            adjs.append(idx + 1)
+        if x < self.width - 1:
+            adjs.append(idx + height)
+        if x > 0:
+            adjs.append(idx - height)
+        if y > 0:
+            adjs.append(idx - 1)
+        return adjs
+
+    def return_path(self, idx: int) -> list:
+        path = []
+        parent = self.buffers.parent
+        while idx >= 0:
+            path.append(divmod(idx, self.height))
+            idx = parent[idx]
+        return path
+
+    def _can_move_through(self, game_board, idx: int, ally_block: bool) -> bool:
+        if self.pass_through:
+            return True
+        unit_team = next(iter(game_board.team_grid[idx]), None)
+        if not unit_team:
+            return True
+        if not ally_block and utils.compare_teams(self.unit_team, unit_team):
+            return True
+        if self.unit_team == 'player' or self.ai_fog_of_war:
+            if not game_board.in_vision(divmod(idx, self.height), self.unit_team):
+                return True
+        return False
+
+    def process(self, game_board, adj_good_enough: bool = False,
+                ally_block: bool = False, limit: int = None) -> list:
+        buffers = self.buffers
+        generation = buffers.next_generation()
+        stamp, closed, g_buf, parent, keys = \
+            buffers.stamp, buffers.closed, buffers.g, buffers.parent, buffers.keys
+        costs = self.costs
+        height = self.height
+        # Set membership checks the hash before equality, so it is safe with _HeapKey
+        goal = {self.end_idx} if self.end_idx is not None else set()
+        if adj_good_enough and self.adj_end:
+            goal |= self.adj_end
+        heappush, heappop = heapq.heappush, heapq.heappop
+
+        start = self.start_idx
+        stamp[start] = generation
+        g_buf[start] = 0
+        parent[start] = -1
+        open_ = [(0, costs[start], keys[start])]
+        while open_:
+            f, _, idx = heappop(open_)
+            if closed[idx] == generation:
+                continue  # Stale entry -- we already found a better path here
+            closed[idx] = generation
+            # If this cell is past the limit, just return None
+            # Uses f, not g, because g will cut off if first greedy path fails
+            # f only cuts off if all cells are bad
+            if limit is not None and f > limit + 1:
+                # limit + 1 to account for diagonal heuristic
+                return []
+            if idx in goal:
+                return self.return_path(idx)
+            cell_g = g_buf[idx]
+            for adj in self.get_adjacent_indices(idx):
+                cost = costs[adj]
+                if cost < 99 and closed[adj] != generation:
+                    if self._can_move_through(game_board, adj, ally_block):
+                        new_g = cell_g + cost
+                        # No decrease-key, just push again if better
+                        if stamp[adj] != generation or g_buf[adj] > new_g:
+                            stamp[adj] = generation
+                            g_buf[adj] = new_g
+                            parent[adj] = idx
+                            new_f = self.get_heuristic(*divmod(adj, height)) + new_g
+                            heappush(open_, (new_f, cost, keys[adj]))
+        return []
@@ -0,0 +1,219 @@
+import functools
+import json
+import logging
+import time
+from collections import defaultdict, deque
+from datetime import datetime
+
+"""
+Frame profiler
+
+Off by default, and close to free while off: scope() hands back one shared
+do-nothing context, and the hot functions in _targets (hook dispatch,
+pathfinding, the AI's think loop, map drawing, event processing) are only
+wrapped with timers while the profiler is on
+
+While on, the time spent in each named scope is added up per frame, and the
+last HISTORY frames are kept for the overlay that draw() puts on screen.
+Every scope is also recorded as a Chrome trace event, and dump_trace() writes
+the most recent ones to saves/ (open in chrome://tracing or ui.perfetto.dev)
+
+Toggled from the debug console with "profile", and dumped with "trace"
+"""
+
+HISTORY = 300  # Frames kept for the overlay
+TRACE_LIMIT = 200000  # Trace events kept for dump_trace
+REFRESH = 30  # Frames between overlay refreshes
+NUM_SHOWN = 8  # Slowest scopes shown on the overlay
+
+enabled = False
+history = deque(maxlen=HISTORY)  # (frame milliseconds, {scope name: milliseconds})
+
+_start = time.perf_counter()
+_frame_start = None
+_frame = defaultdict(float)  # Key: scope name, Value: milliseconds so far this frame
+_trace = deque(maxlen=TRACE_LIMIT)
+_originals = {}  # Key: (owner, attribute name), Value: the function before it was wrapped
+_overlay_lines = []
+_frames_since_refresh = 0
+
+def _add(name: str, start: float, end: float):
+    _frame[name] += (end - start) * 1000
+    _trace.append((name, start, end))
+
+class _Scope():
+    __slots__ = ('name', 'start')
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        _add(self.name, self.start, time.perf_counter())
+
+class _NullScope():
+    def __enter__(self):
+        pass
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        pass
+
+_null_scope = _NullScope()
+
+def scope(name: str, suffix: str = ''):
+    """
+    with profiler.scope('name'):
+        ...
+    Times the block, if the profiler is on
+    The scope is called name + suffix, joined only while on,
+    so per frame scopes don't build a string each frame while off
+    """
+    if enabled:
+        return _Scope(name + suffix)
+    return _null_scope
+
+def _timed(func, name: str):
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            _add(name, start, time.perf_counter())
+    return wrapper
+
+def _targets() -> list:
+    """
+    Returns:
+        list: (owner, attribute names, scope prefix) for every function
+        that is timed while the profiler is on
+    """
+    from app.engine import skill_system, item_system, pathfinding, map_view, boundary, ai_controller
+    from app.events import event
+    targets = [(map_view.MapView, ('draw',), 'map_view.'),
+               (boundary.BoundaryInterface, ('draw', 'draw_fog_of_war', 'flush'), 'boundary.'),
+               (ai_controller.AIController, ('think',), 'ai.'),
+               (event.Event, ('process',), 'event.')]
+    for klass in (pathfinding.Djikstra, pathfinding.AStar, pathfinding.FlatDjikstra, pathfinding.FlatAStar):
+        targets.append((klass, ('process',), 'pathfinding.%s.' % klass.__name__))
+    # Every hook is named in one of the system's tuples of hook names
+    for system, prefix in ((skill_system, 'skill_hook.'), (item_system, 'item_hook.')):
+        hooks = {name for value in vars(system).values() if isinstance(value, tuple)
+                 for name in value if isinstance(name, str) and callable(vars(system).get(name))}
+        targets.append((system, tuple(sorted(hooks)), prefix))
+    return targets
+
+def enable():
+    global enabled, _frame_start
+    if enabled:
+        return
+    for owner, names, prefix in _targets():
+        for name in names:
+            func = vars(owner)[name]
+            _originals[(owner, name)] = func
+            setattr(owner, name, _timed(func, prefix + name))
+    history.clear()
+    _frame.clear()
+    _frame_start = None
+    enabled = True
+    logging.info("Profiler on")
+
+def disable():
+    global enabled
+    for (owner, name), func in _originals.items():
+        setattr(owner, name, func)
+    _originals.clear()
+    enabled = False
+    _overlay_lines.clear()
+    logging.info("Profiler off")
+
+def toggle():
+    if enabled:
+        disable()
+    else:
+        enable()
+
+def begin_frame():
+    global _frame_start
+    if enabled:
+        _frame_start = time.perf_counter()
+
+def end_frame():
+    """
+    Closes out the frame begin_frame started. Called once a frame by the driver
+    """
+    global _frame_start, _frames_since_refresh
+    if not enabled or _frame_start is None:
+        return
+    end = time.perf_counter()
+    _trace.append(('frame', _frame_start, end))
+    history.append(((end - _frame_start) * 1000, dict(_frame)))
+    _frame.clear()
+    _frame_start = None
+    _frames_since_refresh += 1
+    if _frames_since_refresh >= REFRESH or not _overlay_lines:
+        _frames_since_refresh = 0
+        _refresh_overlay()
+
+def percentile(values: list, perc: float) -> float:
+    if not values:
+        return 0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * perc))]
+
+def _refresh_overlay():
+    frame_times = [frame_ms for frame_ms, _ in history]
+    totals = defaultdict(float)
+    for _, scopes in history:
+        for name, ms in scopes.items():
+            totals[name] += ms
+    _overlay_lines.clear()
+    _overlay_lines.append('frame %.1f p95 %.1f max %.1f' % (
+        percentile(frame_times, .5), percentile(frame_times, .95), max(frame_times)))
+    slowest = sorted(totals.items(), key=lambda kv: kv[1], reverse=True)[:NUM_SHOWN]
+    for name, total in slowest:
+        _overlay_lines.append('%s %.2f' % (name[-24:], total / len(history)))
+
+def draw(surf):
+    """
+    Draws the last HISTORY frame times as bars, with a line at 60 fps,
+    and the average milliseconds per frame of the slowest scopes
+    """
+    if not enabled:
+        return surf
+    from app.engine import engine
+    from app.engine.fonts import FONT
+    font = FONT['small-white']
+    width = 4 + max([font.width(line) for line in _overlay_lines] + [HISTORY // 2])
+    height = 4 + 34 + font.height * len(_overlay_lines)
+    bg = engine.create_surface((width, height), transparent=True)
+    engine.fill(bg, (0, 0, 0, 160))
+    # Frame time histogram, 2 frames per pixel, 1 pixel per millisecond
+    for idx, (frame_ms, _) in enumerate(list(history)[::2]):
+        bar = min(32, int(frame_ms))
+        color = (248, 80, 80) if frame_ms > 1000 / 60 else (80, 248, 80)
+        engine.fill(bg, color, (2 + idx, 34 - bar, 1, bar))
+    engine.fill(bg, (248, 248, 248), (2, 34 - 17, HISTORY // 2, 1))
+    for idx, line in enumerate(_overlay_lines):
+        font.blit(line, bg, (2, 36 + idx * font.height))
+    surf.blit(bg, (0, 0))
+    return surf
+
+def dump_trace(fn: str = None) -> str:
+    """
+    Writes the recorded scopes as Chrome trace JSON
+
+    Returns:
+        str: where it was written
+    """
+    if not fn:
+        fn = 'saves/trace_%s.json' % datetime.now().strftime('%Y-%m-%d_%H.%M.%S')
+    events = [{'name': name, 'ph': 'X', 'pid': 0, 'tid': 0,
+               'ts': (start - _start) * 1e6, 'dur': (end - start) * 1e6}
+              for name, start, end in list(_trace)]
+    with open(fn, 'w') as fp:
+        json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, fp)
+    logging.info("Wrote %d trace events to %s", len(events), fn)
+    return fn
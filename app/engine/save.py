@@ -1,16 +1,12 @@
-import os, shutil, glob, re
+import os, glob, re
 from datetime import datetime
 import threading
 
-try:
-    import cPickle as pickle
-except ImportError:
-    import pickle
-
 from app.utilities import str_utils
 from app.data.database import DB
 
 import app.engine.config as cf
+from app.engine import save_container
 from app.engine.objects.item import ItemObject
 from app.engine.objects.skill import SkillObject
 
@@ -18,13 +14,15 @@ import logging
 logger = logging.getLogger(__name__)
 
 SAVE_THREAD = None
+# Only one save is written at a time, so sections aren't collected while in use
+SAVE_LOCK = threading.Lock()
 GAME_NID = str(DB.constants.value('game_nid'))
-SUSPEND_LOC = 'saves/' + GAME_NID + '-suspend.pmeta'
+SUSPEND_LOC = 'saves/' + GAME_NID + '-suspend.p'
 
 class SaveSlot():
     no_name = '--NO DATA--'
 
-    def __init__(self, metadata_fn, idx):
+    def __init__(self, save_fn, idx):
         self.name = self.no_name
         self.playtime = 0
         self.realtime = 0
@@ -32,15 +30,14 @@ class SaveSlot():
         self.mode = None
         self.idx = idx
 
-        self.meta_loc = metadata_fn
-        self.save_loc = metadata_fn[:-4]
+        self.save_loc = save_fn
 
         self.read()
 
     def read(self):
-        if os.path.exists(self.meta_loc):
-            with open(self.meta_loc, 'rb') as fp:
-                save_metadata = pickle.load(fp)
+        # Only reads the header
+        save_metadata = save_container.read_meta(self.save_loc)
+        if save_metadata:
             self.name = save_metadata['level_title']
             self.playtime = save_metadata['playtime']
             self.realtime = save_metadata['realtime']
@@ -49,7 +46,7 @@ class SaveSlot():
 
     def get_name(self):
         if self.kind == 'turn_change':
-            turn = int(re.findall(r'\d+', self.meta_loc)[-1])
+            turn = int(re.findall(r'\d+', self.save_loc)[-1])
             return self.name + (' - Turn %d' % turn)
         elif self.kind:
             return self.name + ' - ' + self.kind
@@ -73,48 +70,41 @@ def save_io(s_dict, meta_dict, old_slot, slot, force_loc=None, name=None):
         save_loc = 'saves/' + GAME_NID + '-' + force_loc + '.p'
     elif slot is not None:
         save_loc = 'saves/' + GAME_NID + '-' + str(slot) + '.p'
-    meta_loc = save_loc + 'meta'
-
-    logger.info("Saving to %s", save_loc)
 
-    with open(save_loc, 'wb') as fp:
-        # pickle.dump(s_dict, fp, -1)
+    with SAVE_LOCK:
+        logger.info("Saving to %s", save_loc)
         try:
-            pickle.dump(s_dict, fp)
+            save_container.write(save_loc, s_dict, meta_dict)
         except TypeError as e:
             # There's a surface somewhere in the dictionary of things to save...
             dict_print(s_dict)
             print(e)
-    with open(meta_loc, 'wb') as fp:
-        pickle.dump(meta_dict, fp)
-
-    # For restart
-    if not force_loc:
-        r_save = 'saves/' + GAME_NID + '-restart' + str(slot) + '.p'
-        r_save_meta = r_save + 'meta'
-        # If the slot I'm overwriting is a start of map
-        # Then rename it to restart file
+            return
+
+        # Restart and preload saves only copy the header,
+        # and share their sections with this save
+        # For restart
+        if not force_loc:
+            r_save = 'saves/' + GAME_NID + '-restart' + str(slot) + '.p'
+            # If the slot I'm overwriting is a start of map
+            # Then rename it to restart file
+            if meta_dict['kind'] == 'start':
+                if save_loc != r_save:
+                    save_container.copy(save_loc, r_save)
+            elif old_slot is not None:
+                old_name = 'saves/' + GAME_NID + '-restart' + str(old_slot) + '.p'
+                if old_name != r_save:
+                    save_container.copy(old_name, r_save)
+
+        # For preload
         if meta_dict['kind'] == 'start':
-            if save_loc != r_save:
-                shutil.copy(save_loc, r_save)
-                shutil.copy(meta_loc, r_save_meta)
-        elif old_slot is not None:
-            old_name = 'saves/' + GAME_NID + '-restart' + str(old_slot) + '.p'
-            old_name_meta = old_name + 'meta'
-            if old_name != r_save:
-                shutil.copy(old_name, r_save)
-                shutil.copy(old_name_meta, r_save_meta)
-
-    # For preload
-    if meta_dict['kind'] == 'start':
-        preload_saves = glob.glob('saves/' + GAME_NID + '-preload-' + str(meta_dict['level_nid']) + '-*.p')
-        nids = [p.split('-')[-1][:-2] for p in preload_saves]
-        unique_nid = str(str_utils.get_next_int('0', nids))
-        preload_save = 'saves/' + GAME_NID + '-preload-' + str(meta_dict['level_nid']) + '-' + unique_nid + '.p'
-        preload_save_meta = 'saves/' + GAME_NID + '-preload-' + str(meta_dict['level_nid']) + '-' + unique_nid + '.pmeta'
-
-        shutil.copy(save_loc, preload_save)
-        shutil.copy(meta_loc, preload_save_meta)
+            preload_saves = glob.glob('saves/' + GAME_NID + '-preload-' + str(meta_dict['level_nid']) + '-*.p')
+            nids = [p.split('-')[-1][:-2] for p in preload_saves]
+            unique_nid = str(str_utils.get_next_int('0', nids))
+            preload_save = 'saves/' + GAME_NID + '-preload-' + str(meta_dict['level_nid']) + '-' + unique_nid + '.p'
+            save_container.copy(save_loc, preload_save)
+
+        save_container.collect_garbage(save_container.get_section_dir(save_loc), glob.glob('saves/*.p'))
 
 def suspend_game(game_state, kind, slot=None, name=None):
     """
@@ -146,8 +136,7 @@ def load_game(game_state, save_slot):
     """
     save_loc = save_slot.save_loc
     logging.info("Loading from %s", save_loc)
-    with open(save_loc, 'rb') as fp:
-        s_dict = pickle.load(fp)
+    s_dict, _ = save_container.read(save_loc)
     game_state.build_new()
     game_state.load(s_dict)
     game_state.current_save_slot = save_slot
@@ -169,16 +158,16 @@ def set_next_uids(game_state):
 def load_saves():
     save_slots = []
     for num in range(0, int(DB.constants.value('num_save_slots'))):
-        meta_fp = 'saves/' + GAME_NID + '-' + str(num) + '.pmeta'
-        ss = SaveSlot(meta_fp, num)
+        save_fn = 'saves/' + GAME_NID + '-' + str(num) + '.p'
+        ss = SaveSlot(save_fn, num)
         save_slots.append(ss)
     return save_slots
 
 def load_restarts():
     save_slots = []
     for num in range(0, int(DB.constants.value('num_save_slots'))):
-        meta_fp = 'saves/' + GAME_NID + '-restart' + str(num) + '.pmeta'
-        ss = SaveSlot(meta_fp, num)
+        save_fn = 'saves/' + GAME_NID + '-restart' + str(num) + '.p'
+        ss = SaveSlot(save_fn, num)
         save_slots.append(ss)
     return save_slots
 
@@ -187,16 +176,16 @@ def get_all_saves():
     Grabs all the turn_change saves
     """
     save_slots = []
-    name = 'saves/' + GAME_NID + '-turn_change-*-*.pmeta'
-    for meta_fn in glob.glob(name):
-        ss = SaveSlot(meta_fn, 0)
+    name = 'saves/' + GAME_NID + '-turn_change-*-*.p'
+    for save_fn in glob.glob(name):
+        ss = SaveSlot(save_fn, 0)
         save_slots.append(ss)
     save_slots = sorted(save_slots, key=lambda x: x.realtime, reverse=True)
     return save_slots
 
 def remove_suspend():
     if not cf.SETTINGS['debug'] and os.path.exists(SUSPEND_LOC):
-        os.remove(SUSPEND_LOC)
+        save_container.remove(SUSPEND_LOC)
 
 def get_save_title(save_slots):
     options = [save_slot.get_name() for save_slot in save_slots]
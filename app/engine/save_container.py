@@ -0,0 +1,154 @@
+import glob
+import hashlib
+import os
+import pickle
+import struct
+import zlib
+from typing import Iterable, Optional, Tuple
+
+"""
+Save file container
+
+A save file is just a small header:
+    MAGIC, format version, header length, then the pickled header,
+    which holds the save's metadata and the name, digest and size of each section
+Each section (units, items, skills, level, action log and the rest of the state)
+is pickled and compressed on its own, and stored once under its digest
+in the sections folder next to the save. Restart and preload saves are copies
+of the header, so they share every section with the save they came from
+
+Save-slot menus only ever read the header. Files written before this format
+(a pickled dict, plus a pickled .pmeta next to it) can still be read
+"""
+
+MAGIC = b'LTSAVE'
+VERSION = 1
+_prefix = struct.Struct('<HI')  # version, header length
+
+SECTION_DIR = 'sections'
+# Keys of the save dict that get their own section. The rest go in 'state'
+SECTIONS = ('units', 'items', 'skills', 'level', 'action_log')
+
+def get_section_dir(save_loc: str) -> str:
+    return os.path.join(os.path.dirname(save_loc), SECTION_DIR)
+
+def _write_atomic(path: str, data: bytes):
+    tmp = path + '.tmp'
+    with open(tmp, 'wb') as fp:
+        fp.write(data)
+    os.replace(tmp, path)
+
+def write_section(section_dir: str, value) -> Tuple[str, int]:
+    """
+    Stores the value under the digest of its pickle, unless it is already there
+
+    Returns:
+        Tuple[str, int]: digest and compressed size
+    """
+    data = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+    digest = hashlib.sha1(data).hexdigest()
+    path = os.path.join(section_dir, digest + '.z')
+    if os.path.exists(path):
+        return digest, os.path.getsize(path)
+    compressed = zlib.compress(data)
+    _write_atomic(path, compressed)
+    return digest, len(compressed)
+
+def read_section(section_dir: str, digest: str):
+    with open(os.path.join(section_dir, digest + '.z'), 'rb') as fp:
+        return pickle.loads(zlib.decompress(fp.read()))
+
+def write(save_loc: str, s_dict: dict, meta_dict: dict):
+    """
+    Writes each section as soon as it is pickled, so only one is in memory
+    at a time, then writes the header last, so a half-written save is never read
+    """
+    section_dir = get_section_dir(save_loc)
+    os.makedirs(section_dir, exist_ok=True)
+    sections = []
+    for name in SECTIONS:
+        if name in s_dict:
+            sections.append((name,) + write_section(section_dir, s_dict[name]))
+    state = {k: v for k, v in s_dict.items() if k not in SECTIONS}
+    sections.append(('state',) + write_section(section_dir, state))
+
+    header = pickle.dumps({'meta': meta_dict, 'sections': sections}, pickle.HIGHEST_PROTOCOL)
+    _write_atomic(save_loc, MAGIC + _prefix.pack(VERSION, len(header)) + header)
+
+def _read_header(save_loc: str) -> Optional[dict]:
+    with open(save_loc, 'rb') as fp:
+        if fp.read(len(MAGIC)) != MAGIC:
+            return None
+        version, length = _prefix.unpack(fp.read(_prefix.size))
+        if version > VERSION:
+            raise ValueError("%s was saved with a newer save format (%d)" % (save_loc, version))
+        return pickle.loads(fp.read(length))
+
+def read_meta(save_loc: str) -> Optional[dict]:
+    """
+    Returns:
+        the save's metadata, without reading any of its sections,
+        or None if there is no save there
+    """
+    if not os.path.exists(save_loc):
+        return None
+    header = _read_header(save_loc)
+    if header:
+        return header['meta']
+    meta_loc = save_loc + 'meta'
+    if os.path.exists(meta_loc):
+        with open(meta_loc, 'rb') as fp:
+            return pickle.load(fp)
+    return None
+
+def read(save_loc: str) -> Tuple[dict, dict]:
+    """
+    Returns:
+        Tuple[dict, dict]: the save dict and its metadata
+    """
+    header = _read_header(save_loc)
+    if header is None:
+        with open(save_loc, 'rb') as fp:
+            s_dict = pickle.load(fp)
+        return s_dict, read_meta(save_loc)
+    section_dir = get_section_dir(save_loc)
+    s_dict = {}
+    for name, digest, _ in header['sections']:
+        value = read_section(section_dir, digest)
+        if name == 'state':
+            s_dict.update(value)
+        else:
+            s_dict[name] = value
+    return s_dict, header['meta']
+
+def remove(save_loc: str):
+    for path in (save_loc, save_loc + 'meta'):
+        if os.path.exists(path):
+            os.remove(path)
+
+def copy(src: str, dst: str):
+    """
+    Copies only the header, so both saves share their sections
+    """
+    with open(src, 'rb') as fp:
+        data = fp.read()
+    _write_atomic(dst, data)
+    if os.path.exists(src + 'meta'):  # Old format
+        with open(src + 'meta', 'rb') as fp:
+            _write_atomic(dst + 'meta', fp.read())
+
+def collect_garbage(section_dir: str, save_locs: Iterable[str]):
+    """
+    Removes every section none of the save_locs refer to
+    """
+    used = set()
+    for save_loc in save_locs:
+        try:
+            header = _read_header(save_loc)
+        except (OSError, ValueError, pickle.UnpicklingError, EOFError, struct.error):
+            return  # Don't risk removing what we couldn't read
+        if header:
+            used.update(digest for _, digest, _ in header['sections'])
+    for path in glob.glob(os.path.join(section_dir, '*.z')):
+        if os.path.basename(path)[:-2] not in used:
+            os.remove(path)
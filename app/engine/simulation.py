@@ -0,0 +1,167 @@
+import os
+import random
+import logging
+from collections import Counter
+
+"""
+Headless battle simulation, for balance testing
+
+Plays a level with every team controlled by the AI, with no display and
+no sound, on a simulated clock, and returns a compact record of how it went
+Used by run_simulation.py
+"""
+
+FRAMETIME = 16  # Simulated milliseconds per frame
+NUDGE_TIME = 10000  # Press SELECT if stuck in a non-map state this long
+STALL_TIME = 300000  # Give up if stuck in one state this long
+
+# Make everything as fast as possible. Never saved
+HEADLESS_SETTINGS = {'animation': 'Never',
+                     'unit_speed': 15,
+                     'text_speed': 0,
+                     'show_terrain': 0,
+                     'show_objective': 0,
+                     'autocursor': 0,
+                     'autoend_turn': 1,
+                     'confirm_end': 0,
+                     'display_hints': 0,
+                     'talk_boop': 0,
+                     'music_volume': 0,
+                     'sound_volume': 0,
+                     'ai_workers': 0}  # Already run on a pool of their own
+
+def init(project: str):
+    """
+    Loads the project with dummy video and audio drivers
+    Must be called once per process, before simulate
+    """
+    os.environ['SDL_VIDEODRIVER'] = 'dummy'
+    os.environ['SDL_AUDIODRIVER'] = 'dummy'
+
+    from app.constants import WINWIDTH, WINHEIGHT
+    from app.resources.resources import RESOURCES
+    from app.data.database import DB
+    from app.engine import engine
+    from app.engine import config as cf
+
+    cf.SETTINGS.update(HEADLESS_SETTINGS)
+    engine.init()
+    engine.DISPLAYSURF = engine.build_display((WINWIDTH, WINHEIGHT))
+
+    RESOURCES.load(project + '.ltproj')
+    DB.load(project + '.ltproj')
+
+def _advance_time(engine):
+    engine.constants['last_time'] = engine.constants['current_time']
+    engine.constants['current_time'] += FRAMETIME
+    engine.constants['delta_t'] = FRAMETIME
+
+def _give_ai(game, player_ai: str):
+    for unit in game.units:
+        if unit.team == 'player' and unit.ai == 'None':
+            unit.ai = player_ai
+
+def _get_input(game, state_name: str, state_time: int):
+    """
+    Stands in for the player wherever the game would wait on them
+    """
+    if state_name == 'event':
+        return 'START'  # Skip
+    elif state_name == 'prep_main':
+        state = game.state.state[-1]
+        if state.menu:
+            state.menu.set_selection('Fight')
+            return 'SELECT'
+    elif state_time >= NUDGE_TIME and state_name not in ('ai', 'turn_change', 'phase_change', 'status_upkeep', 'status_endstep', 'move_camera'):
+        return 'SELECT'
+    return None
+
+def get_record(game, seed: int, level_nid: str, outcome: str) -> dict:
+    """
+    Compact summary of the game's Recordkeeper for one simulation
+    """
+    def team(nid):
+        unit = game.get_unit(nid)
+        return unit.team if unit else None
+
+    # The kill records have an entry for every strike, and the death
+    # records are for every team, so go by who is dead at the end instead
+    deaths = [unit.nid for unit in game.units if unit.dead]
+
+    damage_dealt = Counter()
+    damage_taken = Counter()
+    for record in game.records.damage:
+        damage_dealt[team(record.dealer)] += record.damage
+        damage_taken[team(record.receiver)] += record.damage
+
+    return {'seed': seed,
+            'level': level_nid,
+            'outcome': outcome,
+            'turns': game.turncount,
+            'deaths': deaths,
+            'player_deaths': [nid for nid in deaths if team(nid) == 'player'],
+            'damage_dealt': dict(damage_dealt),
+            'damage_taken': dict(damage_taken)}
+
+def simulate(level_nid: str, seed: int, max_turns: int = 30, player_ai: str = 'Pursue') -> dict:
+    """
+    Plays level_nid to the end, or until max_turns, with random seed seed
+    Every team, including the player, is run by the AI, and the player
+    is given player_ai wherever they have none
+
+    Returns:
+        dict: the outcome ('win', 'loss', 'turn_limit', 'stalled', 'error'),
+        turn count, deaths, and damage by team
+    """
+    from app.constants import WINWIDTH, WINHEIGHT
+    from app.engine import engine, game_state
+    from app.engine import config as cf
+
+    cf.SETTINGS['random_seed'] = seed
+    random.seed(seed)
+    engine.constants['current_time'] = 0
+    engine.constants['last_time'] = 0
+    game = game_state.start_level(level_nid)
+
+    surf = engine.create_surface((WINWIDTH, WINHEIGHT))
+    last_state = None
+    state_time = 0
+    outcome = None
+    try:
+        while outcome is None:
+            _advance_time(engine)
+
+            state_name = game.state.current()
+            if state_name == 'free':
+                # As the free state would, so the turnwheel can use the action log
+                if game.turncount == 1:
+                    game.action_log.set_first_free_action()
+                _give_ai(game, player_ai)
+                game.state.change('ai')
+                game.state.process_temp_state()
+                state_name = game.state.current()
+            if state_name != last_state:
+                last_state = state_name
+                state_time = 0
+            else:
+                state_time += FRAMETIME
+
+            event = _get_input(game, state_name, state_time)
+            surf, repeat = game.state.update(event, surf)
+            while repeat:
+                surf, repeat = game.state.update([], surf)
+
+            if game.level_vars.get('_win_game'):
+                outcome = 'win'
+            elif game.level_vars.get('_lose_game') or game.state.current() == 'game_over':
+                outcome = 'loss'
+            elif game.turncount > max_turns:
+                outcome = 'turn_limit'
+            elif state_time > STALL_TIME:
+                logging.warning("Simulation %d stalled in state %s", seed, state_name)
+                outcome = 'stalled'
+    except Exception as e:
+        logging.exception("Simulation %d crashed: %s", seed, e)
+        outcome = 'error'
+
+    return get_record(game, seed, level_nid, outcome)
@@ -2,25 +2,39 @@ from app.utilities.data import Data
 from app.data.components import Type
 from app.data.skill_components import SkillComponent, tags
 
-def get_skill_components():
+# Registry of every skill component class, keyed by nid
+# Built the first time it is needed -- not at import, since
+# importing skill_components pulls in most of the engine
+_skill_components = None
+
+def _build_skill_components():
+    """
+    Walks SkillComponent's subclasses. Component classes are all defined
+    when the component modules are imported, so this only runs once
+    """
+    global _skill_components
     from app.engine import skill_components
 
     subclasses = SkillComponent.__subclasses__()
     # Sort by tag
     subclasses = sorted(subclasses, key=lambda x: tags.index(x.tag) if x.tag in tags else 100)
-    return Data(subclasses)
+    _skill_components = Data(subclasses)
+    return _skill_components
+
+def get_skill_components():
+    if _skill_components is None:
+        return _build_skill_components()
+    return _skill_components
 
 def get_component(nid):
-    _skill_components = get_skill_components()
-    base_class = _skill_components.get(nid)
+    base_class = get_skill_components().get(nid)
     if base_class:
         return base_class(base_class.value)
     return None
 
 def restore_component(dat):
     nid, value = dat
-    _skill_components = get_skill_components()
-    base_class = _skill_components.get(nid)
+    base_class = get_skill_components().get(nid)
     if base_class:
         if isinstance(base_class.expose, tuple):
             if base_class.expose[0] == Type.List:
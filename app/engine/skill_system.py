@@ -157,53 +157,76 @@ subcombat_event_hooks = ('after_hit', 'after_take_hit', 'start_sub_combat', 'end
 # Takes in unit, item
 item_event_hooks = ('on_add_item', 'on_remove_item', 'on_equip_item', 'on_unequip_item')
 
+def get_hooks(unit, hook_name) -> list:
+    """
+    Returns the (skill, component) pairs on the unit that define the hook,
+    in the same order as looping over unit.skills and then skill.components
+    Built on first use and thrown away by reset_hooks whenever
+    unit.skills changes
+    """
+    cache = unit._skill_hooks
+    if cache is None or cache[0] is not unit.skills:
+        cache = unit._skill_hooks = (unit.skills, {})
+    hooks = cache[1].get(hook_name)
+    if hooks is None:
+        hooks = [(skill, component) for skill in unit.skills
+                 for component in skill.components if component.defines(hook_name)]
+        cache[1][hook_name] = hooks
+    return hooks
+
+def reset_hooks(unit):
+    unit._skill_hooks = None
+    from app.engine import equations
+    equations.invalidate()
+
+def get_skill_hooks(skill, hook_name) -> list:
+    """
+    Returns the skill's components that define the hook, in component order
+    """
+    hooks = skill._hooks.get(hook_name)
+    if hooks is None:
+        hooks = [component for component in skill.components if component.defines(hook_name)]
+        skill._hooks[hook_name] = hooks
+    return hooks
+
 def condition(skill, unit) -> bool:
-    for component in skill.components:
-        if component.defines('condition'):
-            if not component.condition(unit):
-                return False
+    for component in get_skill_hooks(skill, 'condition'):
+        if not component.condition(unit):
+            return False
     return True
 
 for behaviour in default_behaviours:
     func = """def %s(unit):
-                  for skill in unit.skills:
-                      for component in skill.components:
-                          if component.defines('%s'):
-                              if component.ignore_conditional or condition(skill, unit):
-                                  return component.%s(unit)
+                  for skill, component in get_hooks(unit, '%s'):
+                      if component.ignore_conditional or condition(skill, unit):
+                          return component.%s(unit)
                   return False""" \
         % (behaviour, behaviour, behaviour)
     exec(func)
 
 for behaviour in exclusive_behaviours:
     func = """def %s(unit):
-                  for skill in unit.skills:
-                      for component in skill.components:
-                          if component.defines('%s'):
-                              if component.ignore_conditional or condition(skill, unit):
-                                  return component.%s(unit)
+                  for skill, component in get_hooks(unit, '%s'):
+                      if component.ignore_conditional or condition(skill, unit):
+                          return component.%s(unit)
                   return Defaults.%s(unit)""" \
         % (behaviour, behaviour, behaviour, behaviour)
     exec(func)
 
 for behaviour in targeted_behaviours:
     func = """def %s(unit1, unit2):
-                  for skill in unit1.skills:
-                      for component in skill.components:
-                          if component.defines('%s'):
-                              if component.ignore_conditional or condition(skill, unit1):
-                                  return component.%s(unit1, unit2)
+                  for skill, component in get_hooks(unit1, '%s'):
+                      if component.ignore_conditional or condition(skill, unit1):
+                          return component.%s(unit1, unit2)
                   return Defaults.%s(unit1, unit2)""" \
         % (behaviour, behaviour, behaviour, behaviour)
     exec(func)
 
 for behaviour in item_behaviours:
     func = """def %s(unit, item):
-                  for skill in unit.skills:
-                      for component in skill.components:
-                          if component.defines('%s'):
-                              if component.ignore_conditional or condition(skill, unit):
-                                  return component.%s(unit, item)
+                  for skill, component in get_hooks(unit, '%s'):
+                      if component.ignore_conditional or condition(skill, unit):
+                          return component.%s(unit, item)
                   return Defaults.%s(unit, item)""" \
         % (behaviour, behaviour, behaviour, behaviour)
     exec(func)
@@ -211,11 +234,9 @@ for behaviour in item_behaviours:
 for hook in modify_hooks:
     func = """def %s(unit, item):
                   val = 0
-                  for skill in unit.skills:
-                      for component in skill.components:
-                          if component.defines('%s'):
-                              if component.ignore_conditional or condition(skill, unit):
-                                  val += component.%s(unit, item)
+                  for skill, component in get_hooks(unit, '%s'):
+                      if component.ignore_conditional or condition(skill, unit):
+                          val += component.%s(unit, item)
                   return val""" \
         % (hook, hook, hook)
     exec(func)
@@ -223,11 +244,9 @@ for hook in modify_hooks:
 for hook in dynamic_hooks:
     func = """def %s(unit, item, target, mode):
                   val = 0
-                  for skill in unit.skills:
-                      for component in skill.components:
-                          if component.defines('%s'):
-                              if component.ignore_conditional or condition(skill, unit):
-                                  val += component.%s(unit, item, target, mode)
+                  for skill, component in get_hooks(unit, '%s'):
+                      if component.ignore_conditional or condition(skill, unit):
+                          val += component.%s(unit, item, target, mode)
                   return val""" \
         % (hook, hook, hook)
     exec(func)
@@ -235,11 +254,9 @@ for hook in dynamic_hooks:
 for hook in multiply_hooks:
     func = """def %s(unit, item, target, mode):
                   val = 1
-                  for skill in unit.skills:
-                      for component in skill.components:
-                          if component.defines('%s'):
-                              if component.ignore_conditional or condition(skill, unit):
-                                  val *= component.%s(unit, item, target, mode)
+                  for skill, component in get_hooks(unit, '%s'):
+                      if component.ignore_conditional or condition(skill, unit):
+                          val *= component.%s(unit, item, target, mode)
                   return val""" \
         % (hook, hook, hook)
     exec(func)
@@ -286,51 +303,41 @@ def available(unit, item) -> bool:
     """
     If any hook reports false, then it is false
     """
-    for skill in unit.skills:
-        for component in skill.components:
-            if component.defines('available'):
-                if component.ignore_conditional or condition(skill, unit):
-                    if not component.available(unit, item):
-                        return False
+    for skill, component in get_hooks(unit, 'available'):
+        if component.ignore_conditional or condition(skill, unit):
+            if not component.available(unit, item):
+                return False
     return True
 
 def stat_change(unit, stat_nid) -> int:
     bonus = 0
-    for skill in unit.skills:
-        for component in skill.components:
-            if component.defines('stat_change'):
-                if component.ignore_conditional or condition(skill, unit):
-                    d = component.stat_change(unit)
-                    bonus += d.get(stat_nid, 0)
+    for skill, component in get_hooks(unit, 'stat_change'):
+        if component.ignore_conditional or condition(skill, unit):
+            d = component.stat_change(unit)
+            bonus += d.get(stat_nid, 0)
     return bonus
 
 def growth_change(unit, stat_nid) -> int:
     bonus = 0
-    for skill in unit.skills:
-        for component in skill.components:
-            if component.defines('growth_change'):
-                if component.ignore_conditional or condition(skill, unit):
-                    d = component.growth_change(unit)
-                    bonus += d.get(stat_nid, 0)
+    for skill, component in get_hooks(unit, 'growth_change'):
+        if component.ignore_conditional or condition(skill, unit):
+            d = component.growth_change(unit)
+            bonus += d.get(stat_nid, 0)
     return bonus
 
 def mana(playback, unit, item, target) -> int:
     mana = 0
-    for skill in unit.skills:
-        for component in skill.components:
-            if component.defines('mana'):
-                if component.ignore_conditional or condition(skill, unit):
-                    d = component.mana(playback, unit, item, target)
-                    mana += d
+    for skill, component in get_hooks(unit, 'mana'):
+        if component.ignore_conditional or condition(skill, unit):
+            d = component.mana(playback, unit, item, target)
+            mana += d
     return mana
 
 def can_unlock(unit, region) -> bool:
-    for skill in unit.skills:
-        for component in skill.components:
-            if component.defines('can_unlock'):
-                if component.ignore_conditional or condition(skill, unit):
-                    if component.can_unlock(unit, region):
-                        return True
+    for skill, component in get_hooks(unit, 'can_unlock'):
+        if component.ignore_conditional or condition(skill, unit):
+            if component.can_unlock(unit, region):
+                return True
     return False
 
 def on_upkeep(actions, playback, unit) -> tuple:  # actions, playback
@@ -412,13 +419,11 @@ def trigger_charge(unit, skill):
 
 def get_extra_abilities(unit):
     abilities = {}
-    for skill in unit.skills:
-        for component in skill.components:
-            if component.defines('extra_ability'):
-                if component.ignore_conditional or condition(skill, unit):
-                    new_item = component.extra_ability(unit)
-                    ability_name = new_item.name
-                    abilities[ability_name] = new_item
+    for skill, component in get_hooks(unit, 'extra_ability'):
+        if component.ignore_conditional or condition(skill, unit):
+            new_item = component.extra_ability(unit)
+            ability_name = new_item.name
+            abilities[ability_name] = new_item
     return abilities
 
 def get_combat_arts(unit):
@@ -1,46 +1,156 @@
 import os
+import queue
+import threading
+from collections import OrderedDict
 import pygame
 
 from app.utilities import utils
+from app.data.database import DB
 from app.resources.resources import RESOURCES
 from app.engine import engine
+from app.engine import config as cf
 
 import logging
 
+def get_size(sound) -> int:
+    """
+    Bytes of decoded PCM held by the sound
+    """
+    frequency, size, channels = pygame.mixer.get_init()
+    return int(sound.get_length() * frequency) * channels * abs(size) // 8
+
 class Song():
     def __init__(self, prefab):
         self.nid = prefab.nid
         self.song = pygame.mixer.Sound(prefab.full_path)
         self.battle = pygame.mixer.Sound(prefab.battle_full_path) if prefab.battle_full_path else None
         self.intro = pygame.mixer.Sound(prefab.intro_full_path) if prefab.intro_full_path else None
+        self.size = sum(get_size(sound) for sound in (self.song, self.battle, self.intro) if sound)
 
         self.channel = None
 
-class MusicDict(dict):
-    def preload(self, nids):
-        for nid in nids:
-            self.get(nid)
+class MusicDict():
+    """
+    Decoded songs, least recently used first, kept under the
+    music_cache_size setting (in megabytes)
+
+    Songs handed to preload are decoded in order on a worker thread.
+    Anything asked for before then is decoded on the spot by get, or waited on
+    if the worker is decoding that very song, never on the songs queued before it. Songs that are on a channel or
+    on the song stack are never evicted, so the same nid always gives back
+    the same Song while it is in use
+    """
+    def __init__(self):
+        self.songs = OrderedDict()  # Key: nid, Value: Song
+        self.size = 0
+        # Key: nid, Value: set once the worker is done with it
+        self.loading = {}
+        self.current = None  # The nid the worker is decoding
+        self.lock = threading.Lock()
+        self.queue = queue.Queue()
+        self.thread = None
 
-    def full_preload(self):
-        try:
-            for prefab in RESOURCES.music:
-                if prefab.nid not in self and os.path.exists(prefab.full_path):
-                    self[prefab.nid] = Song(prefab)
-        except pygame.error as e:
-            logging.warning(e)
+    @property
+    def budget(self) -> int:
+        return cf.SETTINGS.get('music_cache_size', 256) * 1024 * 1024
+
+    def preload(self, nids):
+        with self.lock:
+            for nid in nids:
+                if nid and nid not in self.songs and nid not in self.loading:
+                    self.loading[nid] = threading.Event()
+                    self.queue.put(nid)
+            if not self.thread or not self.thread.is_alive():
+                logging.debug('Starting up music preload thread')
+                self.thread = threading.Thread(target=self._work, daemon=True)
+                self.thread.start()
+
+    def preload_level(self, level_nid):
+        """
+        Queues the level's phase music and every song its events play
+        """
+        nids = []
+        level = DB.levels.get(level_nid)
+        if level:
+            nids += [nid for nid in level.music.values() if nid]
+        for event in DB.events:
+            if event.level_nid == level_nid:
+                for command in event.commands:
+                    if command.nid == 'music' and command.values:
+                        nids.append(command.values[0])
+                    elif command.nid == 'change_music' and len(command.values) > 1:
+                        nids.append(command.values[1])
+        self.preload(nids)
+
+    def _work(self):
+        while True:
+            nid = self.queue.get()
+            with self.lock:
+                if nid not in self.loading:
+                    # get already decoded it
+                    continue
+                self.current = nid
+            self._load(nid)
+            with self.lock:
+                self.current = None
+
+    def _load(self, nid):
+        prefab = RESOURCES.music.get(nid)
+        song = None
+        if prefab and os.path.exists(prefab.full_path):
+            try:
+                song = Song(prefab)
+            except pygame.error as e:
+                logging.warning(e)
+        with self.lock:
+            if song:
+                song = self._add(song)
+            done = self.loading.pop(nid, None)
+        if done:
+            done.set()
+        return song
+
+    def _add(self, song):
+        # Another thread may have gotten here first
+        if song.nid in self.songs:
+            return self.songs[song.nid]
+        self.songs[song.nid] = song
+        self.size += song.size
+        in_use = list(SOUNDTHREAD.song_stack)
+        for nid, old_song in list(self.songs.items())[:-1]:
+            if self.size <= self.budget:
+                break
+            if old_song.channel or any(old_song is s for s in in_use):
+                continue
+            logging.debug("Evicting %s from MusicDict", nid)
+            del self.songs[nid]
+            self.size -= old_song.size
+        return song
 
     def clear(self):
         pass
 
     def get(self, val):
-        if val not in self:
-            logging.debug("%s was not preloaded in MusicDict", val)
-            prefab = RESOURCES.music.get(val)
-            if prefab:
-                self[val] = Song(prefab)
+        with self.lock:
+            song = self.songs.get(val)
+            if song:
+                self.songs.move_to_end(val)
+                return song
+            if val == self.current:
+                done = self.loading.get(val)
             else:
-                return None
-        return self[val]
+                # Still in the queue, so take it from the worker
+                done = None
+                self.loading.pop(val, None)
+        if done:
+            done.wait()
+            with self.lock:
+                song = self.songs.get(val)
+                if song:
+                    self.songs.move_to_end(val)
+                    return song
+        logging.debug("%s was not preloaded in MusicDict", val)
+        return self._load(val)
 
 class SoundDict(dict):
     def get(self, val):
@@ -303,8 +413,6 @@ class SoundController():
 
         self.reset_timers()
 
-        self.PRELOADTHREAD = None
-
     def reset_timers(self):
         self.fade_out_start = 0
         self.fade_out_stop = 0
@@ -532,19 +640,6 @@ class SoundController():
         so if the main editor runs the engine again
         we can reload everything like new
         """
-        # MUSIC.clear()
-        # Threading is required because loading in the sound objects takes
-        # so damn long. If you do it at start, your staring at a black screen
-        # for >20 seconds. If you do it on the fly, you get 500 ms hiccups everytime
-        # you load a new sound.
-        # Threading solves these issues
-        # WARNING: I have no thread locks at all on the music dictionary
-        # It *might* be possible for both threads to try to touch the music dictionary
-        # at the same time and break everything
-        import threading
-        logging.debug('Starting up preload thread')
-        self.PRELOADTHREAD = threading.Thread(target=MUSIC.full_preload)
-        self.PRELOADTHREAD.start()
         SFX.clear()
         self.__init__()
 
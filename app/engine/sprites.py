@@ -1,9 +1,82 @@
+import threading
+
 from app.sprites import SPRITES
+from app.resources.resources import RESOURCES
+
+from app.engine import engine, startup
+
+import logging
 
-from app.engine import engine
+"""
+Images are decoded the first time they are asked for, and kept from then on
+Every access is handed to startup.record, which keeps the ones in the first
+few seconds for the next run's warm-up. The warm-up thread and the main thread
+only ever assign fully decoded images, so the worst that can happen
+is the same image being decoded twice
+"""
 
-def load_images():
-    for sprite in SPRITES.values():
+def _load_sprite(nid, sprite, record=True):
+    if record:
+        startup.record('sprites', nid)
+    if not sprite.image:
         sprite.image = engine.image_load(sprite.full_path)
 
-load_images()
+SPRITES.loader = _load_sprite
+
+def load_image(catalog: str, prefab, record=True):
+    """
+    Decodes the image of prefab, from RESOURCES' catalog, if it hasn't been yet
+
+    Returns:
+        the decoded image
+    """
+    if record:
+        startup.record(catalog, prefab.nid)
+    if not prefab.image:
+        prefab.image = engine.image_load(prefab.full_path)
+    return prefab.image
+
+def load_map_sprite(map_sprite, record=True):
+    if record:
+        startup.record('map_sprites', map_sprite.nid)
+    if not map_sprite.standing_image:
+        map_sprite.standing_image = engine.image_load(map_sprite.stand_full_path)
+    if not map_sprite.moving_image:
+        map_sprite.moving_image = engine.image_load(map_sprite.move_full_path)
+
+def load_panorama(panorama, record=True):
+    if record:
+        startup.record('panoramas', panorama.nid)
+    if not panorama.images:
+        panorama.images = [engine.image_load(path) for path in panorama.get_all_paths()]
+
+def _warm(catalog: str, nid: str):
+    if catalog == 'sprites':
+        if nid in SPRITES:
+            _load_sprite(nid, SPRITES[nid], record=False)
+        return
+    prefab = getattr(RESOURCES, catalog).get(nid)
+    if not prefab:
+        return
+    if catalog == 'map_sprites':
+        load_map_sprite(prefab, record=False)
+    elif catalog == 'panoramas':
+        load_panorama(prefab, record=False)
+    else:
+        load_image(catalog, prefab, record=False)
+
+def _warm_up(profile):
+    for catalog, nid in profile:
+        try:
+            _warm(catalog, nid)
+        except Exception as e:
+            logging.warning("Could not warm up %s %s: %s", catalog, nid, e)
+
+def warm_up():
+    """
+    Starts decoding every image the last run needed early on, in the order it needed them
+    """
+    profile = startup.load_profile()
+    if profile:
+        logging.debug('Warming up %d images', len(profile))
+        threading.Thread(target=_warm_up, args=(profile,), daemon=True).start()
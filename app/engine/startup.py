@@ -0,0 +1,73 @@
+import os
+import time
+import logging
+
+"""
+Startup timing and image access profile
+
+mark() splits the time since the engine was first imported into stages
+(import, resource index, DB load, display, first frame), and report()
+logs them. With debug or the profiler on, they are also appended to
+saves/startup_times.csv, so time to the title screen can be tracked
+from run to run
+
+Every image that is asked for in the first PROFILE_TIME seconds is recorded,
+in order of first use, to saves/startup_profile.txt, so the next run can decode
+them ahead of time on a background thread (see sprites.warm_up)
+"""
+
+TIMES_FILE = 'saves/startup_times.csv'
+PROFILE_FILE = 'saves/startup_profile.txt'
+PROFILE_TIME = 10  # Seconds of image accesses to record
+
+_start = time.perf_counter()
+_last = _start
+times = []  # (stage, milliseconds)
+
+_profile = []  # (catalog, nid), in order of first use
+_profiled = set()
+_recording = True
+
+def mark(stage: str):
+    global _last
+    now = time.perf_counter()
+    times.append((stage, (now - _last) * 1000))
+    _last = now
+
+def report(write: bool = False):
+    total = sum(ms for _, ms in times)
+    logging.info("Startup: %s, total %d ms", ', '.join('%s %d ms' % (stage, ms) for stage, ms in times), total)
+    if not write:
+        return
+    try:
+        new_file = not os.path.exists(TIMES_FILE)
+        with open(TIMES_FILE, 'a') as fp:
+            if new_file:
+                fp.write(','.join([stage for stage, _ in times] + ['total']) + '\n')
+            fp.write(','.join(['%d' % ms for _, ms in times] + ['%d' % total]) + '\n')
+    except OSError as e:
+        logging.warning("Could not write startup times: %s", e)
+
+def record(catalog: str, nid: str):
+    if _recording and (catalog, nid) not in _profiled:
+        _profiled.add((catalog, nid))
+        _profile.append((catalog, nid))
+
+def update():
+    """
+    Saves the profile once PROFILE_TIME has passed. Called every frame
+    """
+    global _recording
+    if _recording and time.perf_counter() - _start > PROFILE_TIME:
+        _recording = False
+        try:
+            with open(PROFILE_FILE, 'w') as fp:
+                fp.write('\n'.join('%s;%s' % entry for entry in _profile))
+        except OSError as e:
+            logging.warning("Could not write startup profile: %s", e)
+
+def load_profile() -> list:
+    if not os.path.exists(PROFILE_FILE):
+        return []
+    with open(PROFILE_FILE) as fp:
+        return [tuple(line.strip().split(';', 1)) for line in fp if ';' in line]
@@ -1,5 +1,7 @@
 import logging
 
+from app.engine import profiler
+
 class SimpleStateMachine():
     def __init__(self, starting_state):
         self.state = []
@@ -204,12 +206,14 @@ class StateMachine():
                 repeat_flag = True
         # Take Input
         if not repeat_flag:
-            input_output = state.take_input(event)
+            with profiler.scope(state.name, '.take_input'):
+                input_output = state.take_input(event)
             if input_output == 'repeat':
                 repeat_flag = True
         # Update
         if not repeat_flag:
-            update_output = state.update()
+            with profiler.scope(state.name, '.update'):
+                update_output = state.update()
             if update_output == 'repeat':
                 repeat_flag = True
         # Draw
@@ -222,7 +226,8 @@ class StateMachine():
                 else:
                     break
             while idx <= -1:
-                surf = self.state[idx].draw(surf)
+                with profiler.scope(self.state[idx].name, '.draw'):
+                    surf = self.state[idx].draw(surf)
                 idx += 1
         # End
         if self.temp_state and state.processed:
@@ -3,27 +3,14 @@ from app.engine import (equations, item_funcs, item_system, line_of_sight,
                         pathfinding, skill_system)
 from app.engine.game_state import game
 from app.utilities import utils
+from app.utilities.algorithms import manhattan
 
 
-# Consider making these sections faster
 def get_shell(valid_moves: set, potential_range: set, width: int, height: int) -> set:
-    valid_attacks = set()
-    for valid_move in valid_moves:
-        valid_attacks |= find_manhattan_spheres(potential_range, valid_move[0], valid_move[1])
-    return {pos for pos in valid_attacks if 0 <= pos[0] < width and 0 <= pos[1] < height}
+    return manhattan.get_shell(valid_moves, potential_range, width, height)
 
-# Consider making these sections faster -- use memory?
 def find_manhattan_spheres(rng: set, x: int, y: int) -> set:
-    _range = range
-    _abs = abs
-    main_set = set()
-    for r in rng:
-        # Finds manhattan spheres of radius r
-        for i in _range(-r, r + 1):
-            magn = _abs(i)
-            main_set.add((x + i, y + r - magn))
-            main_set.add((x + i, y - r + magn))
-    return main_set
+    return manhattan.find_manhattan_spheres(rng, x, y)
 
 def get_nearest_open_tile(unit, position):
     r = 0
@@ -137,11 +124,11 @@ def get_valid_moves(unit, force=False) -> set:
         return set()
     from app.engine.movement import MovementManager
     mtype = MovementManager.get_movement_group(unit)
-    grid = game.board.get_grid(mtype)
+    grid = game.board.get_mcost_grid(mtype)
     width, height = game.tilemap.width, game.tilemap.height
     pass_through = skill_system.pass_through(unit)
     ai_fog_of_war = DB.constants.value('ai_fog_of_war')
-    pathfinder = pathfinding.Djikstra(unit.position, grid, width, height, unit.team, pass_through, ai_fog_of_war)
+    pathfinder = pathfinding.FlatDjikstra(unit.position, grid, game.board.path_buffers, width, height, unit.team, pass_through, ai_fog_of_war)
 
     movement_left = equations.parser.movement(unit) if force else unit.movement_left
 
@@ -152,12 +139,12 @@ def get_valid_moves(unit, force=False) -> set:
 def get_path(unit, position, ally_block=False) -> list:
     from app.engine.movement import MovementManager
     mtype = MovementManager.get_movement_group(unit)
-    grid = game.board.get_grid(mtype)
+    grid = game.board.get_mcost_grid(mtype)
 
     width, height = game.tilemap.width, game.tilemap.height
     pass_through = skill_system.pass_through(unit)
     ai_fog_of_war = DB.constants.value('ai_fog_of_war')
-    pathfinder = pathfinding.AStar(unit.position, position, grid, width, height, unit.team, pass_through, ai_fog_of_war)
+    pathfinder = pathfinding.FlatAStar(unit.position, position, grid, game.board.path_buffers, width, height, unit.team, pass_through, ai_fog_of_war)
 
     path = pathfinder.process(game.board, ally_block=ally_block)
     if path is None:
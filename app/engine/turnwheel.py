@@ -1,3 +1,4 @@
+from bisect import bisect_left
 from dataclasses import dataclass
 from app.constants import WINWIDTH, WINHEIGHT
 
@@ -11,9 +12,17 @@ import app.engine.action as Action
 from app.engine.background import SpriteBackground
 from app.engine.state import MapState
 from app.engine import engine, base_surf, image_mods, gui
+from app.engine import game_snapshot, skill_system
 
 import logging
 
+# Actions between the turnwheel's checkpoints, to start with
+CHECKPOINT_INTERVAL = 50
+# Once there are more than this, every other one is thrown away and the interval doubles
+MAX_CHECKPOINTS = 16
+# Loading a checkpoint takes about as long as running this many actions
+RESTORE_COST = 20
+
 class ActionLog():
     def __init__(self):
         self.actions = []
@@ -30,15 +39,39 @@ class ActionLog():
         self.current_move_index = 0
         self.unique_moves = []
 
+        # Kept up to date as actions are added and removed
+        # Action indices of every MarkPhase and LockTurnwheel
+        self.phase_checkpoints = []
+        self.lock_checkpoints = []
+        # Moves, phases and locks since the first free action, for the turnwheel to step through
+        # Each is stored with the index of the action that completed it
+        self.move_index = []
+        self.open_move = None  # Move that has not been completed yet
+
+        # Snapshots of the game every so often since the first free action,
+        # so the turnwheel can jump most of the way instead of running every action
+        # Each is stored with the index of the last action done before it was taken
+        self.checkpoints = []
+        self.checkpoint_interval = CHECKPOINT_INTERVAL
+
     def append(self, action):
         logging.debug("Add Action %d: %s", self.action_index + 1, action.__class__.__name__)
         self.actions.append(action)
         self.action_index += 1
+        self.index_action(len(self.actions) - 1)
+        if self.first_free_action >= 0:
+            self.add_checkpoint()
 
     def remove(self, action):
         logging.debug("Remove Action %d: %s", self.action_index, action.__class__.__name__)
+        idx = self.actions.index(action)
         self.actions.remove(action)
         self.action_index -= 1
+        self.unindex_actions(idx)
+        # Every checkpoint still has the removed action's changes undone
+        self.checkpoints.clear()
+        for action_index in range(idx, len(self.actions)):
+            self.index_action(action_index)
 
     def hard_remove(self, action):
         """
@@ -49,6 +82,7 @@ class ActionLog():
         diff = len(self.actions) - idx
         self.action_index -= diff
         self.actions = self.actions[:idx]
+        self.unindex_actions(idx)
         logging.debug("New Action Index: %d", self.action_index)
 
     def run_action_backward(self):
@@ -63,6 +97,76 @@ class ActionLog():
         action.execute()
         return action
 
+    def run_backward_to(self, action_index):
+        """
+        Reverses actions until action_index is the last action done
+        """
+        if action_index < self.action_index:
+            self.seek(action_index)
+
+    def run_forward_to(self, action_index):
+        """
+        Runs actions until action_index is the last action done
+
+        Returns:
+            the last action run, or None if there were none to run
+        """
+        if action_index > self.action_index:
+            self.seek(action_index)
+            return self.actions[self.action_index]
+        return None
+
+    def seek(self, action_index):
+        """
+        Makes action_index the last action done, by loading the nearest
+        checkpoint at or before it and running forward from there, if that is
+        quicker than running every action between here and there
+        """
+        checkpoint = self.get_checkpoint(action_index)
+        if checkpoint and RESTORE_COST + action_index - checkpoint[0] < abs(self.action_index - action_index):
+            self.load_checkpoint(checkpoint)
+        while self.action_index > action_index:
+            self.run_action_backward()
+        while self.action_index < action_index:
+            self.run_action_forward()
+
+    def add_checkpoint(self):
+        last_index = self.checkpoints[-1][0] if self.checkpoints else self.first_free_action
+        if self.action_index - last_index < self.checkpoint_interval:
+            return
+        logging.debug("Checkpoint at Action %d", self.action_index)
+        self.checkpoints.append((self.action_index, game_snapshot.take(game)))
+        if len(self.checkpoints) > MAX_CHECKPOINTS:
+            # Keeps the newest
+            self.checkpoints = self.checkpoints[::-2][::-1]
+            self.checkpoint_interval *= 2
+
+    def get_checkpoint(self, action_index):
+        """
+        Returns the last checkpoint at or before action_index that can still be loaded.
+        A checkpoint can't be loaded once a unit, item, skill or region has been
+        registered since it was taken, since it knows nothing about them
+        """
+        registry_keys = None
+        for checkpoint in reversed(self.checkpoints):
+            if checkpoint[0] <= action_index:
+                if registry_keys is None:
+                    registry_keys = game_snapshot.get_registry_keys(game)
+                if checkpoint[1].registry_keys == registry_keys:
+                    return checkpoint
+        return None
+
+    def load_checkpoint(self, checkpoint):
+        action_index, snapshot = checkpoint
+        logging.debug("Load Checkpoint at Action %d", action_index)
+        game_snapshot.restore(game, snapshot)
+        self.action_index = action_index
+        # Throw away what was worked out from the state before
+        for unit in game.units:
+            skill_system.reset_hooks(unit)
+        if game.boundary:
+            game.boundary.reset()
+
     def at_far_past(self):
         return not self.actions or self.action_index <= self.first_free_action
 
@@ -78,38 +182,67 @@ class ActionLog():
         def __repr__(self):
             return "Move: %s (%s %s)" % (self.unit.nid, self.begin, self.end)
 
-    def set_up(self):
-        def finalize(move):
-            if isinstance(move, self.Move) and move.end is None:
-                move.end = move.begin
-            self.unique_moves.append(move)
-        
+    def index_action(self, action_index):
+        action = self.actions[action_index]
+        if isinstance(action, Action.MarkPhase):
+            self.phase_checkpoints.append(action_index)
+        elif isinstance(action, Action.LockTurnwheel):
+            self.lock_checkpoints.append(action_index)
+
         # Pay attention to which actions the turnwheel actually has to know about
-        self.unique_moves.clear()
-        current_move = None
-
-        for action_index in range(self.first_free_action, len(self.actions)):
-            action = self.actions[action_index]
-            # Only regular moves, not CantoMove or other nonsense gets counted
-            if type(action) == Action.Move or type(action) == Action.Teleport:
-                if current_move:
-                    finalize(current_move)
-                current_move = self.Move(action.unit, action_index)
-            elif isinstance(action, Action.Wait) or isinstance(action, Action.Die):
-                if current_move and action.unit == current_move.unit:
-                    current_move.end = action_index
-                    finalize(current_move)
-                    current_move = None
-            elif isinstance(action, Action.MarkPhase):
-                if current_move:
-                    finalize(current_move)
-                    current_move = None
-                self.unique_moves.append(('Phase', action_index, action.phase_name))
-            elif isinstance(action, Action.LockTurnwheel):
-                if current_move:
-                    finalize(current_move)
-                    current_move = None
-                self.unique_moves.append(('Lock', action_index, action.lock))
+        if self.first_free_action < 0 or action_index < self.first_free_action:
+            return
+        # Only regular moves, not CantoMove or other nonsense gets counted
+        if type(action) == Action.Move or type(action) == Action.Teleport:
+            self.close_move(action_index)
+            self.open_move = self.Move(action.unit, action_index)
+        elif isinstance(action, Action.Wait) or isinstance(action, Action.Die):
+            if self.open_move and action.unit == self.open_move.unit:
+                self.open_move.end = action_index
+                self.close_move(action_index)
+        elif isinstance(action, Action.MarkPhase):
+            self.close_move(action_index)
+            self.move_index.append((action_index, ('Phase', action_index, action.phase_name)))
+        elif isinstance(action, Action.LockTurnwheel):
+            self.close_move(action_index)
+            self.move_index.append((action_index, ('Lock', action_index, action.lock)))
+
+    def close_move(self, action_index):
+        move = self.open_move
+        if move:
+            if move.end is None:
+                move.end = move.begin
+            self.move_index.append((action_index, move))
+            self.open_move = None
+
+    def unindex_actions(self, start):
+        """
+        Forgets every action from start onwards
+        """
+        while self.phase_checkpoints and self.phase_checkpoints[-1] >= start:
+            self.phase_checkpoints.pop()
+        while self.lock_checkpoints and self.lock_checkpoints[-1] >= start:
+            self.lock_checkpoints.pop()
+        if self.open_move and self.open_move.begin >= start:
+            self.open_move = None
+        while self.move_index and self.move_index[-1][0] >= start:
+            _, move = self.move_index.pop()
+            # Was completed by an action that is now gone
+            if isinstance(move, self.Move) and move.begin < start:
+                self.open_move = self.Move(move.unit, move.begin)
+        while self.checkpoints and self.checkpoints[-1][0] >= start:
+            self.checkpoints.pop()
+
+    def reindex(self):
+        self.phase_checkpoints.clear()
+        self.lock_checkpoints.clear()
+        self.move_index.clear()
+        self.open_move = None
+        for action_index in range(len(self.actions)):
+            self.index_action(action_index)
+
+    def set_up(self):
+        self.unique_moves = [move for _, move in self.move_index]
 
         # Handles having extra actions off the right of the action log
         if self.unique_moves:
@@ -147,12 +280,10 @@ class ActionLog():
         self.current_move = self.unique_moves[self.current_move_index - 1]
         logging.debug("Backward %s %s %s", self.current_move_index, self.current_move, self.action_index)
         self.current_move_index -= 1
-        action = None
 
         if isinstance(self.current_move, self.Move):
             if self.current_unit:
-                while self.action_index >= self.current_move.begin:
-                    action = self.run_action_backward()
+                self.run_backward_to(self.current_move.begin - 1)
                 game.cursor.set_pos(self.current_unit.position)
                 self.current_unit = None
                 return []
@@ -161,8 +292,7 @@ class ActionLog():
                     self.hover_off()
                 self.current_unit = self.current_move.unit
                 if self.current_move.end:
-                    while self.action_index > self.current_move.end:
-                        action = self.run_action_backward()
+                    self.run_backward_to(self.current_move.end)
                     prev_action = None
                     if self.action_index >= 1:
                         prev_action = self.actions[self.action_index]
@@ -179,15 +309,13 @@ class ActionLog():
                     logging.debug("In Backward %s %s %s %s", text_list, self.current_unit.nid, self.current_unit.position, prev_action)
                     return text_list
                 else:
-                    while self.action_index >= self.current_move.begin:
-                        action = self.run_action_backward()
+                    self.run_backward_to(self.current_move.begin - 1)
                     game.cursor.set_pos(self.current_unit.position)
                     self.hover_on(self.current_unit)
                     return []
 
         elif self.current_move[0] == 'Phase':
-            while self.action_index > self.current_move[1]:
-                action = self.run_action_backward()
+            self.run_backward_to(self.current_move[1])
             if self.hovered_unit:
                 self.hover_off()
             if self.current_move[2] == 'player':
@@ -195,14 +323,12 @@ class ActionLog():
             return ["Start of %s phase" % self.current_move[2].capitalize()]
 
         elif self.current_move[0] == 'Lock':
-            while self.action_index >= self.current_move[1]:
-                action = self.run_action_backward()
+            self.run_backward_to(self.current_move[1] - 1)
             self.locked = self.get_last_lock()
             return self.backward()  # Go again
 
         elif self.current_move[0] == 'Extra':
-            while self.action_index >= self.current_move[1]:
-                action = self.run_action_backward()
+            self.run_backward_to(self.current_move[1] - 1)
             return self.backward()  # Go again
 
     def forward(self):
@@ -212,12 +338,10 @@ class ActionLog():
         self.current_move = self.unique_moves[self.current_move_index]
         logging.debug("Forward %s %s %s", self.current_move_index, self.current_move, self.action_index)
         self.current_move_index += 1
-        action = None
 
         if isinstance(self.current_move, self.Move):
             if self.current_unit:
-                while self.action_index < self.current_move.end:
-                    action = self.run_action_forward()
+                action = self.run_forward_to(self.current_move.end)
                 if self.current_unit.position:
                     game.cursor.set_pos(self.current_unit.position)
                 elif isinstance(action, Action.Die):
@@ -235,17 +359,15 @@ class ActionLog():
                 if self.hovered_unit:
                     self.hover_off()
                 self.current_unit = self.current_move.unit
-                while self.action_index < self.current_move.begin - 1:
-                    # Does next action, so -1 is necessary
-                    action = self.run_action_forward()
+                # Does next action, so -1 is necessary
+                self.run_forward_to(self.current_move.begin - 1)
                 game.cursor.set_pos(self.current_unit.position)
                 self.hover_on(self.current_unit)
                 self.current_move_index -= 1  # Make sure we don't skip second half of this
                 return []
 
         elif self.current_move[0] == 'Phase':
-            while self.action_index < self.current_move[1]:
-                action = self.run_action_forward()
+            self.run_forward_to(self.current_move[1])
             if self.hovered_unit:
                 self.hover_off()
             if self.current_move[2] == 'player':
@@ -253,14 +375,12 @@ class ActionLog():
             return ["Start of %s phase" % self.current_move[2].capitalize()]
 
         elif self.current_move[0] == 'Lock':
-            while self.action_index < self.current_move[1]:
-                action = self.run_action_forward()
+            self.run_forward_to(self.current_move[1])
             self.locked = self.current_move[2]
             return self.forward()  # Go again
 
         elif self.current_move[0] == 'Extra':
-            while self.action_index < self.current_move[1]:
-                action = self.run_action_forward()
+            self.run_forward_to(self.current_move[1])
             return []
 
     def finalize(self):
@@ -271,6 +391,7 @@ class ActionLog():
         if self.hovered_unit:
             self.hover_off()
         self.actions = self.actions[:self.action_index + 1]
+        self.unindex_actions(self.action_index + 1)
 
     def reset(self):
         """
@@ -279,25 +400,19 @@ class ActionLog():
         self.current_unit = None
         if self.hovered_unit:
             self.hover_off()
-        while not self.at_far_future():
-            self.run_action_forward()
+        self.run_forward_to(len(self.actions) - 1)
 
     def get_last_lock(self):
-        cur_index = self.action_index
-        while cur_index > self.first_free_action:
-            cur_index -= 1
-            cur_action = self.actions[cur_index]
-            if isinstance(cur_action, Action.LockTurnwheel):
-                return cur_action.lock
+        # Last lock before the current action, but not before the first free action
+        idx = bisect_left(self.lock_checkpoints, self.action_index) - 1
+        if idx >= 0 and self.lock_checkpoints[idx] >= self.first_free_action:
+            return self.actions[self.lock_checkpoints[idx]].lock
         return False  # Assume not locked
 
     def get_current_phase(self):
-        cur_index = self.action_index
-        while cur_index > 0:
-            cur_index -= 1
-            cur_action = self.actions[cur_index]
-            if isinstance(cur_action, Action.MarkPhase):
-                return cur_action.phase_name
+        idx = bisect_left(self.phase_checkpoints, self.action_index) - 1
+        if idx >= 0:
+            return self.actions[self.phase_checkpoints[idx]].phase_name
         return 'player'
 
     def is_turned_back(self):
@@ -328,6 +443,7 @@ class ActionLog():
         if self.first_free_action == -1:
             logging.debug("*** First Free Action ***")
             self.first_free_action = self.action_index
+            self.reindex()
 
     def hover_on(self, unit):
         game.cursor.set_turnwheel_sprite()
@@ -347,6 +463,7 @@ class ActionLog():
         for name, action in actions:
             self.append(getattr(Action, name).restore(action))
         self.first_free_action = first_free_action
+        self.reindex()
         return self
 
 class TurnwheelDisplay():
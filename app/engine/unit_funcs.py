@@ -1,7 +1,7 @@
 from app.utilities import utils
 from app.data.database import DB
 
-from app.engine import static_random, item_funcs
+from app.engine import static_random, item_funcs, equations
 
 from app.engine.game_state import game
 
@@ -165,6 +165,7 @@ def auto_level(unit, num_levels, starting_level=1, difficulty_growths=False):
     # Make sure we don't exceed max
     klass = DB.classes.get(unit.klass)
     unit.stats = {k: utils.clamp(v, 0, klass.max_stats.get(k, 30)) for (k, v) in unit.stats.items()}
+    equations.invalidate()
     unit.set_hp(1000)  # Go back to full hp
     unit.set_mana(1000)  # Go back to full mana
 
@@ -178,6 +179,7 @@ def apply_stat_changes(unit, stat_changes: dict):
     # Actually apply changes
     for nid, value in stat_changes.items():
         unit.stats[nid] += value
+    equations.invalidate()
 
     current_max_hp = unit.get_max_hp()
     current_max_mana = unit.get_max_mana()
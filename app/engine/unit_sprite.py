@@ -10,7 +10,7 @@ from app.data.database import DB
 
 from app.utilities import utils
 
-from app.engine.sprites import SPRITES
+from app.engine.sprites import SPRITES, load_map_sprite as load_map_sprite_images
 from app.engine.sound import SOUNDTHREAD
 from app.engine import engine, image_mods, health_bar, equations
 from app.engine import item_funcs, item_system, skill_system, particles
@@ -23,11 +23,8 @@ class MapSprite():
         self.nid = map_sprite.nid
         self.team = team
         self.resource = map_sprite
-        if not map_sprite.standing_image:
-            map_sprite.standing_image = engine.image_load(map_sprite.stand_full_path)
+        load_map_sprite_images(map_sprite)
         gray_stand = map_sprite.standing_image.copy()
-        if not map_sprite.moving_image:
-            map_sprite.moving_image = engine.image_load(map_sprite.move_full_path)
         stand, move = self.convert_to_team_colors(map_sprite)
         engine.set_colorkey(stand, COLORKEY, rleaccel=True)
         engine.set_colorkey(move, COLORKEY, rleaccel=True)
@@ -74,6 +74,7 @@ class Event():
         self.text_boxes = []
         self.other_boxes = []
         self.overlay_ui = uif.UIComponent.create_base_component()
+        self.overlay_ui.set_retained(True)
 
         self.prev_state = None
         self.state = 'processing'
@@ -90,6 +91,11 @@ class Event():
 
         self.if_stack = [] # Keeps track of how many ifs we've encountered while searching for the bad ifs 'end'.
         self.parse_stack = [] # Keeps track of whether we've encountered a truth this level or not
+        # Key: idx of an if, elif or else, Value: idx of the next elif, else or end at the same depth
+        self.jumps: Dict[int, int] = {}
+        self.link_conditionals()
+        for command in self.commands:
+            event_commands.parse(command)
 
         # For transition
         self.transition_state = None
@@ -270,6 +276,25 @@ class Event():
     def end(self):
         self.state = 'complete'
 
+    def link_conditionals(self):
+        """
+        Links each if, elif and else to the next elif, else or end at the same depth,
+        so a false branch can be skipped in one step instead of command by command
+        """
+        self.jumps.clear()
+        self.num_linked = len(self.commands)
+        stack = []
+        for idx, command in enumerate(self.commands):
+            if command.nid == 'if':
+                stack.append(idx)
+            elif command.nid in ('elif', 'else'):
+                if stack:
+                    self.jumps[stack[-1]] = idx
+                    stack[-1] = idx
+            elif command.nid == 'end':
+                if stack:
+                    self.jumps[stack.pop()] = idx
+
     def process(self):
         while self.command_idx < len(self.commands) and self.state == 'processing':
             command = self.commands[self.command_idx]
@@ -278,6 +303,15 @@ class Event():
                     pass
                 else:
                     self.run_command(command)
+            elif self.if_stack and not self.if_stack[-1] and command.nid in ('if', 'elif', 'else'):
+                # Commands may have been inserted since
+                if self.num_linked != len(self.commands):
+                    self.link_conditionals()
+                # Go straight to the next branch of this conditional
+                # Anything in between would have been skipped anyway
+                target = self.jumps.get(self.command_idx)
+                if target is not None:
+                    self.command_idx = target - 1
             self.command_idx += 1
 
     def handle_conditional(self, command) -> bool:
@@ -359,876 +393,720 @@ class Event():
 
     def run_command(self, command):
         logging.info('%s: %s', command.nid, command.values)
-        current_time = engine.get_time()
+        handler = COMMAND_HANDLERS.get(command.nid)
+        if handler:
+            handler(self, command)
 
-        if command.nid == 'break':
-            self.end()
+    def break_command(self, command):
+        self.end()
 
-        elif command.nid == 'wait':
-            self.wait_time = current_time + int(command.values[0])
-            self.state = 'waiting'
+    def wait(self, command):
+        current_time = engine.get_time()
+        self.wait_time = current_time + int(command.values[0])
+        self.state = 'waiting'
 
-        elif command.nid == 'end_skip':
-            if not self.super_skip:
-                self.do_skip = False
-
-        elif command.nid == 'music':
-            music = command.values[0]
-            fade = 400
-            if len(command.values) > 1 and command.values[1]:
-                fade = int(command.values[1])
-            if self.do_skip:
-                fade = 0
-            if music == 'None':
-                SOUNDTHREAD.fade_to_pause(fade_out=fade)
-            else:
-                SOUNDTHREAD.fade_in(music, fade_in=fade)
+    def end_skip(self, command):
+        if not self.super_skip:
+            self.do_skip = False
 
-        elif command.nid == 'music_clear':
+    def music(self, command):
+        music = command.values[0]
+        fade = 400
+        if len(command.values) > 1 and command.values[1]:
+            fade = int(command.values[1])
+        if self.do_skip:
             fade = 0
-            if len(command.values) > 0 and command.values[0]:
-                fade = int(command.values[0])
-            if self.do_skip:
-                fade = 0
-            if fade > 0:
-                SOUNDTHREAD.fade_clear(fade)
-            else:
-                SOUNDTHREAD.clear()
+        if music == 'None':
+            SOUNDTHREAD.fade_to_pause(fade_out=fade)
+        else:
+            SOUNDTHREAD.fade_in(music, fade_in=fade)
+
+    def music_clear(self, command):
+        fade = 0
+        if len(command.values) > 0 and command.values[0]:
+            fade = int(command.values[0])
+        if self.do_skip:
+            fade = 0
+        if fade > 0:
+            SOUNDTHREAD.fade_clear(fade)
+        else:
+            SOUNDTHREAD.clear()
 
-        elif command.nid == 'sound':
-            sound = command.values[0]
-            SOUNDTHREAD.play_sfx(sound)
+    def sound(self, command):
+        sound = command.values[0]
+        SOUNDTHREAD.play_sfx(sound)
 
-        elif command.nid == 'change_music':
-            phase = command.values[0]
-            music = command.values[1]
-            if music == 'None':
-                action.do(action.ChangePhaseMusic(phase, None))
-            else:
-                action.do(action.ChangePhaseMusic(phase, music))
-
-        elif command.nid == 'change_background':
-            values, flags = event_commands.parse(command)
-            if len(values) > 0 and values[0]:
-                panorama = values[0]
-                panorama = RESOURCES.panoramas.get(panorama)
-                if not panorama:
-                    return
-                self.background = background.PanoramaBackground(panorama)
-            else:
-                self.background = None
-            if 'keep_portraits' in flags:
-                pass
-            else:
-                self.portraits.clear()
-
-        elif command.nid == 'transition':
-            values, flags = event_commands.parse(command)
-            if len(values) > 0 and values[0]:
-                self.transition_state = values[0].lower()
-            elif self.transition_state == 'close':
-                self.transition_state = 'open'
+    def change_music(self, command):
+        phase = command.values[0]
+        music = command.values[1]
+        if music == 'None':
+            action.do(action.ChangePhaseMusic(phase, None))
+        else:
+            action.do(action.ChangePhaseMusic(phase, music))
+
+    def change_background(self, command):
+        values, flags = event_commands.parse(command)
+        if len(values) > 0 and values[0]:
+            panorama = values[0]
+            panorama = RESOURCES.panoramas.get(panorama)
+            if not panorama:
+                return
+            self.background = background.PanoramaBackground(panorama)
+        else:
+            self.background = None
+        if 'keep_portraits' in flags:
+            pass
+        else:
+            self.portraits.clear()
+
+    def transition(self, command):
+        current_time = engine.get_time()
+        values, flags = event_commands.parse(command)
+        if len(values) > 0 and values[0]:
+            self.transition_state = values[0].lower()
+        elif self.transition_state == 'close':
+            self.transition_state = 'open'
+        else:
+            self.transition_state = 'close'
+        if len(values) > 1 and values[1]:
+            self.transition_speed = max(1, int(values[1]))
+        else:
+            self.transition_speed = self._transition_speed
+        if len(values) > 2 and values[2]:
+            self.transition_color = tuple(int(_) for _ in values[2].split(','))
+        else:
+            self.transition_color = self._transition_color
+        self.transition_update = current_time
+        self.wait_time = current_time + int(self.transition_speed * 1.33)
+        self.state = 'waiting'
+
+    def multi_add_portrait(self, command):
+        values, flags = event_commands.parse(command)
+        commands = []
+        for idx in range(len(values)//2):
+            portrait = values[idx*2]
+            if idx*2 + 1 < len(values):
+                position = values[idx*2 + 1]
             else:
-                self.transition_state = 'close'
-            if len(values) > 1 and values[1]:
-                self.transition_speed = max(1, int(values[1]))
+                logging.error('No Portrait position given')
+                break
+            if idx >= len(values)//2 - 1:  # If last command, don't need no_block flag
+                add_portrait_command = event_commands.AddPortrait([portrait, position])
             else:
-                self.transition_speed = self._transition_speed
-            if len(values) > 2 and values[2]:
-                self.transition_color = tuple(int(_) for _ in values[2].split(','))
+                add_portrait_command = event_commands.AddPortrait([portrait, position, 'no_block'])
+            commands.append(add_portrait_command)
+        for command in reversed(commands):
+            # Done backwards to preserve order upon insertion
+            self.commands.insert(self.command_idx + 1, command)
+
+    def multi_remove_portrait(self, command):
+        values, flags = event_commands.parse(command)
+        commands = []
+        for idx, portrait in enumerate(values):
+            if idx >= len(values) - 1:
+                remove_portrait_command = event_commands.RemovePortrait([portrait])
             else:
-                self.transition_color = self._transition_color
-            self.transition_update = current_time
-            self.wait_time = current_time + int(self.transition_speed * 1.33)
+                remove_portrait_command = event_commands.RemovePortrait([portrait, 'no_block'])
+            commands.append(remove_portrait_command)
+        for command in reversed(commands):
+            # Done backwards to preserve order upon insertion
+            self.commands.insert(self.command_idx + 1, command)
+
+    def bop_portrait(self, command):
+        values, flags = event_commands.parse(command)
+        name = values[0]
+        portrait = self.portraits.get(name)
+        if not portrait:
+            return False
+        portrait.bop()
+        if 'no_block' in flags:
+            pass
+        else:
+            self.wait_time = engine.get_time() + 666
             self.state = 'waiting'
 
-        elif command.nid == 'speak':
-            self.speak(command)
+    def expression(self, command):
+        values, flags = event_commands.parse(command)
+        name = values[0]
+        portrait = self.portraits.get(name)
+        if not portrait:
+            return False
+        expression_list = values[1].split(',')
+        portrait.set_expression(expression_list)
 
-        elif command.nid == 'add_portrait':
-            self.add_portrait(command)
+    def disp_cursor(self, command):
+        b = command.values[0]
+        if b.lower() in self.true_vals:
+            game.cursor.show()
+        else:
+            game.cursor.hide()
 
-        elif command.nid == 'multi_add_portrait':
-            values, flags = event_commands.parse(command)
-            commands = []
-            for idx in range(len(values)//2):
-                portrait = values[idx*2]
-                if idx*2 + 1 < len(values):
-                    position = values[idx*2 + 1]
-                else:
-                    logging.error('No Portrait position given')
-                    break
-                if idx >= len(values)//2 - 1:  # If last command, don't need no_block flag
-                    add_portrait_command = event_commands.AddPortrait([portrait, position])
-                else:
-                    add_portrait_command = event_commands.AddPortrait([portrait, position, 'no_block'])
-                commands.append(add_portrait_command)
-            for command in reversed(commands):
-                # Done backwards to preserve order upon insertion
-                self.commands.insert(self.command_idx + 1, command)
-
-        elif command.nid == 'remove_portrait':
-            self.remove_portrait(command)
-
-        elif command.nid == 'multi_remove_portrait':
-            values, flags = event_commands.parse(command)
-            commands = []
-            for idx, portrait in enumerate(values):
-                if idx >= len(values) - 1:
-                    remove_portrait_command = event_commands.RemovePortrait([portrait])
-                else:
-                    remove_portrait_command = event_commands.RemovePortrait([portrait, 'no_block'])
-                commands.append(remove_portrait_command)
-            for command in reversed(commands):
-                # Done backwards to preserve order upon insertion
-                self.commands.insert(self.command_idx + 1, command)
-
-        elif command.nid == 'move_portrait':
-            self.move_portrait(command)
-
-        elif command.nid == 'bop_portrait':
-            values, flags = event_commands.parse(command)
-            name = values[0]
-            portrait = self.portraits.get(name)
-            if not portrait:
-                return False
-            portrait.bop()
-            if 'no_block' in flags:
-                pass
-            else:
-                self.wait_time = engine.get_time() + 666
-                self.state = 'waiting'
+    def move_cursor(self, command):
+        values, flags = event_commands.parse(command)
+        position = self.parse_pos(values[0])
+        if not position:
+            logging.error("Could not determine position from %s" % values[0])
+            return
 
-        elif command.nid == 'expression':
-            values, flags = event_commands.parse(command)
-            name = values[0]
-            portrait = self.portraits.get(name)
-            if not portrait:
-                return False
-            expression_list = values[1].split(',')
-            portrait.set_expression(expression_list)
+        game.cursor.set_pos(position)
+        if 'immediate' in flags or self.do_skip:
+            game.camera.force_xy(*position)
+        else:
+            if len(values) > 1:
+                # we are using a custom camera speed
+                duration = int(values[1])
+                game.camera.do_slow_pan(duration)
+            game.camera.set_center(*position)
+            game.state.change('move_camera')
+            self.state = 'paused'  # So that the message will leave the update loop
 
-        elif command.nid == 'disp_cursor':
-            b = command.values[0]
-            if b.lower() in self.true_vals:
-                game.cursor.show()
-            else:
-                game.cursor.hide()
+    def center_cursor(self, command):
+        values, flags = event_commands.parse(command)
+        position = self.parse_pos(values[0])
+        game.cursor.set_pos(position)
+        if 'immediate' in flags or self.do_skip:
+            game.camera.force_center(*position)
+        else:
+            game.camera.set_center(*position)
+            game.state.change('move_camera')
+            self.state = 'paused'  # So that the message will leave the update loop
 
-        elif command.nid == 'move_cursor':
-            values, flags = event_commands.parse(command)
-            position = self.parse_pos(values[0])
-            if not position:
-                logging.error("Could not determine position from %s" % values[0])
-                return
+    def flicker_cursor(self, command):
+        # This is a macro that just adds new commands to command list
+        move_cursor_command = event_commands.MoveCursor(command.values)
+        disp_cursor_command1 = event_commands.DispCursor(['1'])
+        wait_command = event_commands.Wait(['1000'])
+        disp_cursor_command2 = event_commands.DispCursor(['0'])
+        # Done backwards to presever order upon insertion
+        self.commands.insert(self.command_idx + 1, disp_cursor_command2)
+        self.commands.insert(self.command_idx + 1, wait_command)
+        self.commands.insert(self.command_idx + 1, disp_cursor_command1)
+        self.commands.insert(self.command_idx + 1, move_cursor_command)
+
+    def game_var(self, command):
+        values, flags = event_commands.parse(command)
+        nid = values[0]
+        to_eval = values[1]
+        try:
+            val = evaluate.evaluate(to_eval, self.unit, self.unit2, self.item, self.position, self.region)
+            action.do(action.SetGameVar(nid, val))
+        except:
+            logging.error("Could not evaluate {%s}" % to_eval)
 
-            game.cursor.set_pos(position)
-            if 'immediate' in flags or self.do_skip:
-                game.camera.force_xy(*position)
-            else:
-                if len(values) > 1:
-                    # we are using a custom camera speed
-                    duration = int(values[1])
-                    game.camera.do_slow_pan(duration)
-                game.camera.set_center(*position)
-                game.state.change('move_camera')
-                self.state = 'paused'  # So that the message will leave the update loop
-
-        elif command.nid == 'center_cursor':
-            values, flags = event_commands.parse(command)
-            position = self.parse_pos(values[0])
-            game.cursor.set_pos(position)
-            if 'immediate' in flags or self.do_skip:
-                game.camera.force_center(*position)
-            else:
-                game.camera.set_center(*position)
-                game.state.change('move_camera')
-                self.state = 'paused'  # So that the message will leave the update loop
-
-        elif command.nid == 'flicker_cursor':
-            # This is a macro that just adds new commands to command list
-            move_cursor_command = event_commands.MoveCursor(command.values)
-            disp_cursor_command1 = event_commands.DispCursor(['1'])
-            wait_command = event_commands.Wait(['1000'])
-            disp_cursor_command2 = event_commands.DispCursor(['0'])
-            # Done backwards to presever order upon insertion
-            self.commands.insert(self.command_idx + 1, disp_cursor_command2)
-            self.commands.insert(self.command_idx + 1, wait_command)
-            self.commands.insert(self.command_idx + 1, disp_cursor_command1)
-            self.commands.insert(self.command_idx + 1, move_cursor_command)
-
-        elif command.nid == 'game_var':
-            values, flags = event_commands.parse(command)
-            nid = values[0]
+    def inc_game_var(self, command):
+        values, flags = event_commands.parse(command)
+        nid = values[0]
+        if len(values) > 1 and values[1]:
             to_eval = values[1]
             try:
                 val = evaluate.evaluate(to_eval, self.unit, self.unit2, self.item, self.position, self.region)
-                action.do(action.SetGameVar(nid, val))
+                action.do(action.SetGameVar(nid, game.game_vars.get(nid, 0) + val))
             except:
                 logging.error("Could not evaluate {%s}" % to_eval)
+        else:
+            action.do(action.SetGameVar(nid, game.game_vars.get(nid, 0) + 1))
 
-        elif command.nid == 'inc_game_var':
-            values, flags = event_commands.parse(command)
-            nid = values[0]
-            if len(values) > 1 and values[1]:
-                to_eval = values[1]
-                try:
-                    val = evaluate.evaluate(to_eval, self.unit, self.unit2, self.item, self.position, self.region)
-                    action.do(action.SetGameVar(nid, game.game_vars.get(nid, 0) + val))
-                except:
-                    logging.error("Could not evaluate {%s}" % to_eval)
-            else:
-                action.do(action.SetGameVar(nid, game.game_vars.get(nid, 0) + 1))
+    def level_var(self, command):
+        values, flags = event_commands.parse(command)
+        nid = values[0]
+        to_eval = values[1]
+        try:
+            val = evaluate.evaluate(to_eval, self.unit, self.unit2, self.item, self.position, self.region)
+            action.do(action.SetLevelVar(nid, val))
+        except:
+            logging.error("Could not evaluate {%s}" % to_eval)
+            return
+        # Need to update fog of war when we change it
+        if nid in ('_fog_of_war', '_fog_of_war_radius', '_ai_fog_of_war_radius'):
+            for unit in game.units:
+                if unit.position:
+                    action.do(action.UpdateFogOfWar(unit))
 
-        elif command.nid == 'level_var':
-            values, flags = event_commands.parse(command)
-            nid = values[0]
+    def inc_level_var(self, command):
+        values, flags = event_commands.parse(command)
+        nid = values[0]
+        if len(values) > 1 and values[1]:
             to_eval = values[1]
             try:
                 val = evaluate.evaluate(to_eval, self.unit, self.unit2, self.item, self.position, self.region)
-                action.do(action.SetLevelVar(nid, val))
+                action.do(action.SetLevelVar(nid, game.level_vars.get(nid, 0) + val))
             except:
                 logging.error("Could not evaluate {%s}" % to_eval)
-                return
-            # Need to update fog of war when we change it
-            if nid in ('_fog_of_war', '_fog_of_war_radius', '_ai_fog_of_war_radius'):
-                for unit in game.units:
-                    if unit.position:
-                        action.do(action.UpdateFogOfWar(unit))
-
-        elif command.nid == 'inc_level_var':
-            values, flags = event_commands.parse(command)
-            nid = values[0]
-            if len(values) > 1 and values[1]:
-                to_eval = values[1]
-                try:
-                    val = evaluate.evaluate(to_eval, self.unit, self.unit2, self.item, self.position, self.region)
-                    action.do(action.SetLevelVar(nid, game.level_vars.get(nid, 0) + val))
-                except:
-                    logging.error("Could not evaluate {%s}" % to_eval)
-            else:
-                action.do(action.SetLevelVar(nid, game.level_vars.get(nid, 0) + 1))
-
-        elif command.nid == 'win_game':
-            game.level_vars['_win_game'] = True
-
-        elif command.nid == 'lose_game':
-            game.level_vars['_lose_game'] = True
-
-        elif command.nid == 'activate_turnwheel':
-            values, flags = event_commands.parse(command)
-            if len(values) > 0 and values[0] and values[0].lower() not in self.true_vals:
-                self.turnwheel_flag = 1
-            else:
-                self.turnwheel_flag = 2
-
-        elif command.nid == 'battle_save':
-            self.battle_save_flag = True
-
-        elif command.nid == 'change_tilemap':
-            self.change_tilemap(command)
-
-        elif command.nid == 'load_unit':
-            self.load_unit(command)
-
-        elif command.nid == 'make_generic':
-            self.make_generic(command)
-
-        elif command.nid == 'create_unit':
-            self.create_unit(command)
-
-        elif command.nid == 'add_unit':
-            self.add_unit(command)
-
-        elif command.nid == 'remove_unit':
-            self.remove_unit(command)
-
-        elif command.nid == 'kill_unit':
-            self.kill_unit(command)
-
-        elif command.nid == 'remove_all_units':
-            for unit in game.units:
-                if unit.position:
-                    action.do(action.LeaveMap(unit))
-
-        elif command.nid == 'remove_all_enemies':
-            for unit in game.units:
-                if unit.position and unit.team.startswith('enemy'):
-                    action.do(action.FadeOut(unit))
-
-        elif command.nid == 'move_unit':
-            self.move_unit(command)
-
-        elif command.nid == 'interact_unit':
-            self.interact_unit(command)
-
-        elif command.nid == 'add_group':
-            self.add_group(command)
-
-        elif command.nid == 'spawn_group':
-            self.spawn_group(command)
-
-        elif command.nid == 'move_group':
-            self.move_group(command)
-
-        elif command.nid == 'remove_group':
-            self.remove_group(command)
-
-        elif command.nid == 'give_item':
-            self.give_item(command)
-
-        elif command.nid == 'remove_item':
-            self.remove_item(command)
-
-        elif command.nid == 'change_item_name':
-            self.change_item_name(command)
-
-        elif command.nid == 'change_item_desc':
-            self.change_item_desc(command)
-
-        elif command.nid == 'add_item_to_multiitem':
-            self.add_item_to_multiitem(command)
-
-        elif command.nid == 'remove_item_from_multiitem':
-            self.remove_item_from_multiitem(command)
-
-        elif command.nid == 'give_money':
-            self.give_money(command)
-
-        elif command.nid == 'give_bexp':
-            self.give_bexp(command)
-
-        elif command.nid == 'give_exp':
-            self.give_exp(command)
-
-        elif command.nid == 'set_exp':
-            self.set_exp(command)
-
-        elif command.nid == 'give_wexp':
-            self.give_wexp(command)
+        else:
+            action.do(action.SetLevelVar(nid, game.level_vars.get(nid, 0) + 1))
 
-        elif command.nid == 'give_skill':
-            self.give_skill(command)
+    def win_game(self, command):
+        game.level_vars['_win_game'] = True
 
-        elif command.nid == 'remove_skill':
-            self.remove_skill(command)
+    def lose_game(self, command):
+        game.level_vars['_lose_game'] = True
 
-        elif command.nid == 'change_ai':
-            values, flags = event_commands.parse(command)
-            unit = self.get_unit(values[0])
-            if not unit:
-                logging.error("Couldn't find unit %s" % values[0])
-                return
-            if values[1] in DB.ai.keys():
-                action.do(action.ChangeAI(unit, values[1]))
-            else:
-                logging.error("Couldn't find AI %s" % values[1])
-                return
+    def activate_turnwheel(self, command):
+        values, flags = event_commands.parse(command)
+        if len(values) > 0 and values[0] and values[0].lower() not in self.true_vals:
+            self.turnwheel_flag = 1
+        else:
+            self.turnwheel_flag = 2
 
-        elif command.nid == 'change_party':
-            values, flags = event_commands.parse(command)
-            unit = self.get_unit(values[0])
-            if not unit:
-                logging.error("Couldn't find unit %s" % values[0])
-                return
-            if values[1] in DB.parties.keys():
-                action.do(action.ChangeParty(unit, values[1]))
-            else:
-                logging.error("Couldn't find Party %s" % values[1])
-                return
+    def battle_save(self, command):
+        self.battle_save_flag = True
 
-        elif command.nid == 'change_team':
-            values, flags = event_commands.parse(command)
-            unit = self.get_unit(values[0])
-            if not unit:
-                logging.error("Couldn't find unit %s" % values[0])
-                return
-            if values[1] in DB.teams:
-                action.do(action.ChangeTeam(unit, values[1]))
-                if unit.position:
-                    action.do(action.UpdateFogOfWar(unit))
-            else:
-                logging.error("Not a valid team: %s" % values[1])
-                return
+    def remove_all_units(self, command):
+        for unit in game.units:
+            if unit.position:
+                action.do(action.LeaveMap(unit))
 
-        elif command.nid == 'change_portrait':
-            values, flags = event_commands.parse(command)
-            unit = self.get_unit(values[0])
-            if not unit:
-                logging.error("Couldn't find unit %s" % values[0])
-                return
-            portrait = RESOURCES.portraits.get(values[1])
-            if not portrait:
-                logging.error("Couldn't find portrat %s" % values[1])
-                return
-            action.do(action.ChangePortrait(unit, values[1]))
+    def remove_all_enemies(self, command):
+        for unit in game.units:
+            if unit.position and unit.team.startswith('enemy'):
+                action.do(action.FadeOut(unit))
 
-        elif command.nid == 'change_stats':
-            self.change_stats(command)
+    def change_ai(self, command):
+        values, flags = event_commands.parse(command)
+        unit = self.get_unit(values[0])
+        if not unit:
+            logging.error("Couldn't find unit %s" % values[0])
+            return
+        if values[1] in DB.ai.keys():
+            action.do(action.ChangeAI(unit, values[1]))
+        else:
+            logging.error("Couldn't find AI %s" % values[1])
+            return
 
-        elif command.nid == 'set_stats':
-            self.set_stats(command)
+    def change_party(self, command):
+        values, flags = event_commands.parse(command)
+        unit = self.get_unit(values[0])
+        if not unit:
+            logging.error("Couldn't find unit %s" % values[0])
+            return
+        if values[1] in DB.parties.keys():
+            action.do(action.ChangeParty(unit, values[1]))
+        else:
+            logging.error("Couldn't find Party %s" % values[1])
+            return
 
-        elif command.nid == 'autolevel_to':
-            self.autolevel_to(command)
+    def change_team(self, command):
+        values, flags = event_commands.parse(command)
+        unit = self.get_unit(values[0])
+        if not unit:
+            logging.error("Couldn't find unit %s" % values[0])
+            return
+        if values[1] in DB.teams:
+            action.do(action.ChangeTeam(unit, values[1]))
+            if unit.position:
+                action.do(action.UpdateFogOfWar(unit))
+        else:
+            logging.error("Not a valid team: %s" % values[1])
+            return
 
-        elif command.nid == 'set_mode_autolevels':
-            self.set_mode_autolevels(command)
+    def change_portrait(self, command):
+        values, flags = event_commands.parse(command)
+        unit = self.get_unit(values[0])
+        if not unit:
+            logging.error("Couldn't find unit %s" % values[0])
+            return
+        portrait = RESOURCES.portraits.get(values[1])
+        if not portrait:
+            logging.error("Couldn't find portrat %s" % values[1])
+            return
+        action.do(action.ChangePortrait(unit, values[1]))
 
-        elif command.nid == 'promote':
-            self.promote(command)
+    def add_tag(self, command):
+        values, flags = event_commands.parse(command)
+        unit = self.get_unit(values[0])
+        if not unit:
+            logging.error("Couldn't find unit %s" % values[0])
+            return
+        if values[1] in DB.tags.keys():
+            action.do(action.AddTag(unit, values[1]))
 
-        elif command.nid == 'change_class':
-            self.class_change(command)
+    def remove_tag(self, command):
+        values, flags = event_commands.parse(command)
+        unit = self.get_unit(values[0])
+        if not unit:
+            logging.error("Couldn't find unit %s" % values[0])
+            return
+        if values[1] in DB.tags.keys():
+            action.do(action.RemoveTag(unit, values[1]))
 
-        elif command.nid == 'add_tag':
-            values, flags = event_commands.parse(command)
-            unit = self.get_unit(values[0])
-            if not unit:
-                logging.error("Couldn't find unit %s" % values[0])
-                return
-            if values[1] in DB.tags.keys():
-                action.do(action.AddTag(unit, values[1]))
+    def set_current_hp(self, command):
+        values, flags = event_commands.parse(command)
+        unit = self.get_unit(values[0])
+        if not unit:
+            logging.error("Couldn't find unit %s" % values[0])
+            return
+        hp = int(values[1])
+        action.do(action.SetHP(unit, hp))
 
-        elif command.nid == 'remove_tag':
-            values, flags = event_commands.parse(command)
-            unit = self.get_unit(values[0])
-            if not unit:
-                logging.error("Couldn't find unit %s" % values[0])
-                return
-            if values[1] in DB.tags.keys():
-                action.do(action.RemoveTag(unit, values[1]))
+    def set_current_mana(self, command):
+        values, flags = event_commands.parse(command)
+        unit = self.get_unit(values[0])
+        if not unit:
+            logging.error("Couldn't find unit %s" % values[0])
+            return
+        mana = int(values[1])
+        action.do(action.SetMana(unit, mana))
 
-        elif command.nid == 'set_current_hp':
-            values, flags = event_commands.parse(command)
-            unit = self.get_unit(values[0])
-            if not unit:
-                logging.error("Couldn't find unit %s" % values[0])
-                return
-            hp = int(values[1])
-            action.do(action.SetHP(unit, hp))
+    def resurrect(self, command):
+        values, flags = event_commands.parse(command)
+        unit = self.get_unit(values[0])
+        if not unit:
+            logging.error("Couldn't find unit %s" % values[0])
+            return
+        if unit.dead:
+            action.do(action.Resurrect(unit))
+        action.do(action.Reset(unit))
+        action.do(action.SetHP(unit, 1000))
 
-        elif command.nid == 'set_current_mana':
-            values, flags = event_commands.parse(command)
-            unit = self.get_unit(values[0])
-            if not unit:
-                logging.error("Couldn't find unit %s" % values[0])
-                return
-            mana = int(values[1])
-            action.do(action.SetMana(unit, mana))
+    def reset(self, command):
+        values, flags = event_commands.parse(command)
+        unit = self.get_unit(values[0])
+        if not unit:
+            logging.error("Couldn't find unit %s" % values[0])
+            return
+        action.do(action.Reset(unit))
 
+    def has_attacked(self, command):
+        values, flags = event_commands.parse(command)
+        unit = self.get_unit(values[0])
+        if not unit:
+            logging.error("Couldn't find unit %s" % values[0])
+            return
+        action.do(action.HasAttacked(unit))
 
-        elif command.nid == 'resurrect':
-            values, flags = event_commands.parse(command)
-            unit = self.get_unit(values[0])
-            if not unit:
-                logging.error("Couldn't find unit %s" % values[0])
-                return
-            if unit.dead:
-                action.do(action.Resurrect(unit))
-            action.do(action.Reset(unit))
-            action.do(action.SetHP(unit, 1000))
+    def has_traded(self, command):
+        values, flags = event_commands.parse(command)
+        unit = self.get_unit(values[0])
+        if not unit:
+            logging.error("Couldn't find unit %s" % values[0])
+            return
+        action.do(action.HasTraded(unit))
 
-        elif command.nid == 'reset':
-            values, flags = event_commands.parse(command)
-            unit = self.get_unit(values[0])
-            if not unit:
-                logging.error("Couldn't find unit %s" % values[0])
-                return
-            action.do(action.Reset(unit))
+    def add_talk(self, command):
+        values, flags = event_commands.parse(command)
+        action.do(action.AddTalk(values[0], values[1]))
 
-        elif command.nid == 'has_attacked':
-            values, flags = event_commands.parse(command)
-            unit = self.get_unit(values[0])
-            if not unit:
-                logging.error("Couldn't find unit %s" % values[0])
-                return
-            action.do(action.HasAttacked(unit))
+    def remove_talk(self, command):
+        values, flags = event_commands.parse(command)
+        action.do(action.RemoveTalk(values[0], values[1]))
 
-        elif command.nid == 'has_traded':
-            values, flags = event_commands.parse(command)
-            unit = self.get_unit(values[0])
-            if not unit:
-                logging.error("Couldn't find unit %s" % values[0])
-                return
-            action.do(action.HasTraded(unit))
-
-        elif command.nid == 'add_talk':
-            values, flags = event_commands.parse(command)
-            action.do(action.AddTalk(values[0], values[1]))
-
-        elif command.nid == 'remove_talk':
-            values, flags = event_commands.parse(command)
-            action.do(action.RemoveTalk(values[0], values[1]))
-
-        elif command.nid == 'add_lore':
-            values, flags = event_commands.parse(command)
-            action.do(action.AddLore(values[0]))
-
-        elif command.nid == 'remove_lore':
-            values, flags = event_commands.parse(command)
-            action.do(action.RemoveLore(values[0]))
-
-        elif command.nid == 'add_base_convo':
-            values, flags = event_commands.parse(command)
-            game.base_convos[values[0]] = False
-
-        elif command.nid == 'remove_base_convo':
-            values, flags = event_commands.parse(command)
-            if values[0] in game.base_convos:
-                del game.base_convos[values[0]]
-
-        elif command.nid == 'ignore_base_convo':
-            values, flags = event_commands.parse(command)
-            if values[0] in game.base_convos:
-                game.base_convos[values[0]] = True
-
-        elif command.nid == 'increment_support_points':
-            values, flags = event_commands.parse(command)
-            unit1 = self.get_unit(values[0])
-            if not unit1:
-                unit1 = DB.units.get(values[0])
-            if not unit1:
-                logging.error("Couldn't find unit %s" % values[0])
-                return
-            unit2 = self.get_unit(values[1])
-            if not unit2:
-                unit2 = DB.units.get(values[1])
-            if not unit2:
-                logging.error("Couldn't find unit %s" % values[1])
-                return
-            inc = int(values[2])
-            prefabs = DB.support_pairs.get_pairs(unit1.nid, unit2.nid)
-            if prefabs:
-                prefab = prefabs[0]
-                action.do(action.IncrementSupportPoints(prefab.nid, inc))
-            else:
-                logging.error("Couldn't find prefab for units %s and %s" % (unit1.nid, unit2.nid))
-                return
+    def add_lore(self, command):
+        values, flags = event_commands.parse(command)
+        action.do(action.AddLore(values[0]))
 
-        elif command.nid == 'unlock_support_rank':
-            values, flags = event_commands.parse(command)
-            unit1 = self.get_unit(values[0])
-            if not unit1:
-                unit1 = DB.units.get(values[0])
-            if not unit1:
-                logging.error("Couldn't find unit %s" % values[0])
-                return
-            unit2 = self.get_unit(values[1])
-            if not unit2:
-                unit2 = DB.units.get(values[1])
-            if not unit2:
-                logging.error("Couldn't find unit %s" % values[1])
-                return
-            rank = values[2]
-            if rank not in DB.support_ranks.keys():
-                logging.error("Support rank %s not a valid rank!" % rank)
-                return
-            prefabs = DB.support_pairs.get_pairs(unit1.nid, unit2.nid)
-            if prefabs:
-                prefab = prefabs[0]
-                action.do(action.UnlockSupportRank(prefab.nid, rank))
-            else:
-                logging.error("Couldn't find prefab for units %s and %s" % (unit1.nid, unit2.nid))
-                return
+    def remove_lore(self, command):
+        values, flags = event_commands.parse(command)
+        action.do(action.RemoveLore(values[0]))
 
-        elif command.nid == 'add_market_item':
-            values, flags = event_commands.parse(command)
-            item = values[0]
-            if item in DB.items.keys():
-                game.market_items.add(item)
-            else:
-                logging.warning("%s is not a legal item nid", item)
-
-        elif command.nid == 'remove_market_item':
-            values, flags = event_commands.parse(command)
-            item = values[0]
-            game.market_items.discard(item)
-
-        elif command.nid == 'add_region':
-            self.add_region(command)
-
-        elif command.nid == 'region_condition':
-            values, flags = event_commands.parse(command)
-            nid = values[0]
-            if nid in game.level.regions.keys():
-                region = game.level.regions.get(nid)
-                action.do(action.ChangeRegionCondition(region, values[1]))
-            else:
-                logging.error("Couldn't find Region %s" % nid)
-
-        elif command.nid == 'remove_region':
-            values, flags = event_commands.parse(command)
-            nid = values[0]
-            if nid in game.level.regions.keys():
-                region = game.level.regions.get(nid)
-                action.do(action.RemoveRegion(region))
-            else:
-                logging.error("Couldn't find Region %s" % nid)
+    def add_base_convo(self, command):
+        values, flags = event_commands.parse(command)
+        game.base_convos[values[0]] = False
 
-        elif command.nid == 'show_layer':
-            values, flags = event_commands.parse(command)
-            nid = values[0]
-            if nid not in game.level.tilemap.layers.keys():
-                logging.error("Could not find layer %s in tilemap" % nid)
-                return
-            if len(values) > 1 and values[1]:
-                transition = values[1]
-            else:
-                transition = 'fade'
+    def remove_base_convo(self, command):
+        values, flags = event_commands.parse(command)
+        if values[0] in game.base_convos:
+            del game.base_convos[values[0]]
 
-            action.do(action.ShowLayer(nid, transition))
+    def ignore_base_convo(self, command):
+        values, flags = event_commands.parse(command)
+        if values[0] in game.base_convos:
+            game.base_convos[values[0]] = True
 
-        elif command.nid == 'hide_layer':
-            values, flags = event_commands.parse(command)
-            nid = values[0]
-            if nid not in game.level.tilemap.layers.keys():
-                logging.error("Could not find layer %s in tilemap" % nid)
-                return
-            if len(values) > 1 and values[1]:
-                transition = values[1]
-            else:
-                transition = 'fade'
-
-            action.do(action.HideLayer(nid, transition))
-
-        elif command.nid == 'add_weather':
-            values, flags = event_commands.parse(command)
-            nid = values[0].lower()
-            action.do(action.AddWeather(nid))
-
-        elif command.nid == 'remove_weather':
-            values, flags = event_commands.parse(command)
-            nid = values[0].lower()
-            action.do(action.RemoveWeather(nid))
-
-        elif command.nid == 'change_objective_simple':
-            values, flags = event_commands.parse(command)
-            action.do(action.ChangeObjective('simple', values[0]))
-
-        elif command.nid == 'change_objective_win':
-            values, flags = event_commands.parse(command)
-            action.do(action.ChangeObjective('win', values[0]))
-
-        elif command.nid == 'change_objective_loss':
-            values, flags = event_commands.parse(command)
-            action.do(action.ChangeObjective('loss', values[0]))
-
-        elif command.nid == 'set_position':
-            values, flags = event_commands.parse(command)
-            pos = self.parse_pos(values[0])
-            self.position = pos
-
-        elif command.nid == 'map_anim':
-            values, flags = event_commands.parse(command)
-            nid = values[0]
-            if nid not in RESOURCES.animations.keys():
-                logging.error("Could not find map animtion %s" % nid)
-                return
-            pos = self.parse_pos(values[1])
-            if len(values) > 2:
-                speed_mult = int(values[2])
-            else:
-                speed_mult = 1
-            anim = RESOURCES.animations.get(nid)
-            anim = MapAnimation(anim, pos, speed_adj=speed_mult)
-            self.animations.append(anim)
+    def increment_support_points(self, command):
+        values, flags = event_commands.parse(command)
+        unit1 = self.get_unit(values[0])
+        if not unit1:
+            unit1 = DB.units.get(values[0])
+        if not unit1:
+            logging.error("Couldn't find unit %s" % values[0])
+            return
+        unit2 = self.get_unit(values[1])
+        if not unit2:
+            unit2 = DB.units.get(values[1])
+        if not unit2:
+            logging.error("Couldn't find unit %s" % values[1])
+            return
+        inc = int(values[2])
+        prefabs = DB.support_pairs.get_pairs(unit1.nid, unit2.nid)
+        if prefabs:
+            prefab = prefabs[0]
+            action.do(action.IncrementSupportPoints(prefab.nid, inc))
+        else:
+            logging.error("Couldn't find prefab for units %s and %s" % (unit1.nid, unit2.nid))
+            return
 
-            if 'no_block' in flags or self.do_skip:
-                pass
-            else:
-                self.wait_time = engine.get_time() + anim.get_wait()
-                self.state = 'waiting'
+    def unlock_support_rank(self, command):
+        values, flags = event_commands.parse(command)
+        unit1 = self.get_unit(values[0])
+        if not unit1:
+            unit1 = DB.units.get(values[0])
+        if not unit1:
+            logging.error("Couldn't find unit %s" % values[0])
+            return
+        unit2 = self.get_unit(values[1])
+        if not unit2:
+            unit2 = DB.units.get(values[1])
+        if not unit2:
+            logging.error("Couldn't find unit %s" % values[1])
+            return
+        rank = values[2]
+        if rank not in DB.support_ranks.keys():
+            logging.error("Support rank %s not a valid rank!" % rank)
+            return
+        prefabs = DB.support_pairs.get_pairs(unit1.nid, unit2.nid)
+        if prefabs:
+            prefab = prefabs[0]
+            action.do(action.UnlockSupportRank(prefab.nid, rank))
+        else:
+            logging.error("Couldn't find prefab for units %s and %s" % (unit1.nid, unit2.nid))
+            return
 
-        elif command.nid == 'merge_parties':
-            self.merge_parties(command)
+    def add_market_item(self, command):
+        values, flags = event_commands.parse(command)
+        item = values[0]
+        if item in DB.items.keys():
+            game.market_items.add(item)
+        else:
+            logging.warning("%s is not a legal item nid", item)
 
-        elif command.nid == 'arrange_formation':
-            self.arrange_formation()
+    def remove_market_item(self, command):
+        values, flags = event_commands.parse(command)
+        item = values[0]
+        game.market_items.discard(item)
 
-        elif command.nid == 'prep':
-            values, flags = event_commands.parse(command)
-            if values and values[0].lower() in self.true_vals:
-                b = True
-            else:
-                b = False
-            action.do(action.SetLevelVar('_prep_pick', b))
-            if len(values) > 1 and values[1]:
-                action.do(action.SetGameVar('_prep_music', values[1]))
-            game.state.change('prep_main')
-            self.state = 'paused'  # So that the message will leave the update loop
+    def region_condition(self, command):
+        values, flags = event_commands.parse(command)
+        nid = values[0]
+        if nid in game.level.regions.keys():
+            region = game.level.regions.get(nid)
+            action.do(action.ChangeRegionCondition(region, values[1]))
+        else:
+            logging.error("Couldn't find Region %s" % nid)
 
-        elif command.nid == 'base':
-            values, flags = event_commands.parse(command)
-            panorama_nid = values[0]
-            action.do(action.SetGameVar('_base_bg_name', panorama_nid))
-            if len(values) > 1 and values[1]:
-                action.do(action.SetGameVar('_base_music', values[1]))
-            game.state.change('base_main')
-            self.state = 'paused'
+    def remove_region(self, command):
+        values, flags = event_commands.parse(command)
+        nid = values[0]
+        if nid in game.level.regions.keys():
+            region = game.level.regions.get(nid)
+            action.do(action.RemoveRegion(region))
+        else:
+            logging.error("Couldn't find Region %s" % nid)
 
-        elif command.nid == 'shop':
-            values, flags = event_commands.parse(command)
-            unit = self.get_unit(values[0])
-            if not unit:
-                logging.error("Must have a unit visit the shop!")
-                return
-            game.memory['current_unit'] = unit
-            item_list = values[1].split(',')
-            shop_items = item_funcs.create_items(unit, item_list)
-            game.memory['shop_items'] = shop_items
+    def show_layer(self, command):
+        values, flags = event_commands.parse(command)
+        nid = values[0]
+        if nid not in game.level.tilemap.layers.keys():
+            logging.error("Could not find layer %s in tilemap" % nid)
+            return
+        if len(values) > 1 and values[1]:
+            transition = values[1]
+        else:
+            transition = 'fade'
 
-            if len(values) > 2 and values[2]:
-                game.memory['shop_flavor'] = values[2].lower()
-            else:
-                game.memory['shop_flavor'] = 'armory'
-            game.state.change('shop')
-            self.state = 'paused'
+        action.do(action.ShowLayer(nid, transition))
 
-        elif command.nid == 'choice':
-            values, flags = event_commands.parse(command)
-            nid = values[0]
-            header = values[1]
-            options_list = values[2].split(',')
+    def hide_layer(self, command):
+        values, flags = event_commands.parse(command)
+        nid = values[0]
+        if nid not in game.level.tilemap.layers.keys():
+            logging.error("Could not find layer %s in tilemap" % nid)
+            return
+        if len(values) > 1 and values[1]:
+            transition = values[1]
+        else:
+            transition = 'fade'
 
-            orientation = 'vertical'
-            if len(values) > 3 and values[3]:
-                if values[3].lower() in ('h', 'horiz', 'horizontal'):
-                    orientation = 'horizontal'
+        action.do(action.HideLayer(nid, transition))
 
-            game.memory['player_choice'] = (nid, header, options_list, orientation)
-            game.state.change('player_choice')
-            self.state = 'paused'
+    def add_weather(self, command):
+        values, flags = event_commands.parse(command)
+        nid = values[0].lower()
+        action.do(action.AddWeather(nid))
 
-        elif command.nid == 'chapter_title':
-            values, flags = event_commands.parse(command)
-            if len(values) > 0 and values[0]:
-                music = values[0]
-            else:
-                music = None
-            if len(values) > 1 and values[1]:
-                custom_string = values[1]
-            else:
-                custom_string = None
-            game.memory['chapter_title_music'] = music
-            game.memory['chapter_title_title'] = custom_string
-            # End the skip here
-            self.do_skip = False
-            self.super_skip = False
-            game.state.change('chapter_title')
-            self.state = 'paused'
+    def remove_weather(self, command):
+        values, flags = event_commands.parse(command)
+        nid = values[0].lower()
+        action.do(action.RemoveWeather(nid))
 
-        elif command.nid == 'alert':
-            values, flags = event_commands.parse(command)
-            custom_string = values[0]
-            game.alerts.append(banner.Custom(custom_string))
-            game.state.change('alert')
-            self.state = 'paused'
+    def change_objective_simple(self, command):
+        values, flags = event_commands.parse(command)
+        action.do(action.ChangeObjective('simple', values[0]))
 
-        elif command.nid == 'victory_screen':
-            game.state.change('victory')
-            self.state = 'paused'
+    def change_objective_win(self, command):
+        values, flags = event_commands.parse(command)
+        action.do(action.ChangeObjective('win', values[0]))
 
-        elif command.nid == 'records_screen':
-            game.state.change('base_records')
-            self.state = 'paused'
+    def change_objective_loss(self, command):
+        values, flags = event_commands.parse(command)
+        action.do(action.ChangeObjective('loss', values[0]))
 
-        elif command.nid == 'location_card':
-            values, flags = event_commands.parse(command)
-            custom_string = values[0]
+    def set_position(self, command):
+        values, flags = event_commands.parse(command)
+        pos = self.parse_pos(values[0])
+        self.position = pos
 
-            new_location_card = dialog.LocationCard(custom_string)
-            self.other_boxes.append(new_location_card)
+    def map_anim(self, command):
+        values, flags = event_commands.parse(command)
+        nid = values[0]
+        if nid not in RESOURCES.animations.keys():
+            logging.error("Could not find map animtion %s" % nid)
+            return
+        pos = self.parse_pos(values[1])
+        if len(values) > 2:
+            speed_mult = int(values[2])
+        else:
+            speed_mult = 1
+        anim = RESOURCES.animations.get(nid)
+        anim = MapAnimation(anim, pos, speed_adj=speed_mult)
+        self.animations.append(anim)
 
-            self.wait_time = engine.get_time() + new_location_card.exist_time
+        if 'no_block' in flags or self.do_skip:
+            pass
+        else:
+            self.wait_time = engine.get_time() + anim.get_wait()
             self.state = 'waiting'
 
-        elif command.nid == 'credits':
-            values, flags = event_commands.parse(command)
-            title = values[0]
-            credits = values[1].split(',') if 'no_split' not in flags else [values[1]]
-            wait = 'wait' in flags
-            center = 'center' in flags
+    def arrange_formation_command(self, command):
+        self.arrange_formation()
 
-            new_credits = dialog.Credits(title, credits, wait, center)
-            self.other_boxes.append(new_credits)
+    def prep(self, command):
+        values, flags = event_commands.parse(command)
+        if values and values[0].lower() in self.true_vals:
+            b = True
+        else:
+            b = False
+        action.do(action.SetLevelVar('_prep_pick', b))
+        if len(values) > 1 and values[1]:
+            action.do(action.SetGameVar('_prep_music', values[1]))
+        game.state.change('prep_main')
+        self.state = 'paused'  # So that the message will leave the update loop
 
-            self.wait_time = engine.get_time() + new_credits.wait_time()
-            self.state = 'waiting'
+    def base(self, command):
+        values, flags = event_commands.parse(command)
+        panorama_nid = values[0]
+        action.do(action.SetGameVar('_base_bg_name', panorama_nid))
+        if len(values) > 1 and values[1]:
+            action.do(action.SetGameVar('_base_music', values[1]))
+        game.state.change('base_main')
+        self.state = 'paused'
 
-        elif command.nid == 'ending':
-            values, flags = event_commands.parse(command)
-            name = values[0]
-            unit = self.get_unit(name)
-            if unit and unit.portrait_nid:
-                portrait = icons.get_portrait(unit)
-                portrait = portrait.convert_alpha()
-                portrait = image_mods.make_translucent(portrait, 0.2)
-            else:
-                logging.error("Couldn't find unit or portrait %s" % name)
-                return False
-            title = values[1]
-            text = values[2]
+    def shop(self, command):
+        values, flags = event_commands.parse(command)
+        unit = self.get_unit(values[0])
+        if not unit:
+            logging.error("Must have a unit visit the shop!")
+            return
+        game.memory['current_unit'] = unit
+        item_list = values[1].split(',')
+        shop_items = item_funcs.create_items(unit, item_list)
+        game.memory['shop_items'] = shop_items
 
-            new_ending = dialog.Ending(portrait, title, text, unit)
-            self.text_boxes.append(new_ending)
-            self.state = 'dialog'
+        if len(values) > 2 and values[2]:
+            game.memory['shop_flavor'] = values[2].lower()
+        else:
+            game.memory['shop_flavor'] = 'armory'
+        game.state.change('shop')
+        self.state = 'paused'
 
-        elif command.nid == 'pop_dialog':
-            self.text_boxes.pop()
+    def choice(self, command):
+        values, flags = event_commands.parse(command)
+        nid = values[0]
+        header = values[1]
+        options_list = values[2].split(',')
 
-        elif command.nid == 'unlock':
-            # This is a macro that just adds new commands to command list
-            find_unlock_command = event_commands.FindUnlock(command.values)
-            spend_unlock_command = event_commands.SpendUnlock(command.values)
-            # Done backwards to presever order upon insertion
-            self.commands.insert(self.command_idx + 1, spend_unlock_command)
-            self.commands.insert(self.command_idx + 1, find_unlock_command)
+        orientation = 'vertical'
+        if len(values) > 3 and values[3]:
+            if values[3].lower() in ('h', 'horiz', 'horizontal'):
+                orientation = 'horizontal'
 
-        elif command.nid == 'find_unlock':
-            self.find_unlock(command)
+        game.memory['player_choice'] = (nid, header, options_list, orientation)
+        game.state.change('player_choice')
+        self.state = 'paused'
 
-        elif command.nid == 'spend_unlock':
-            self.spend_unlock(command)
+    def chapter_title(self, command):
+        values, flags = event_commands.parse(command)
+        if len(values) > 0 and values[0]:
+            music = values[0]
+        else:
+            music = None
+        if len(values) > 1 and values[1]:
+            custom_string = values[1]
+        else:
+            custom_string = None
+        game.memory['chapter_title_music'] = music
+        game.memory['chapter_title_title'] = custom_string
+        # End the skip here
+        self.do_skip = False
+        self.super_skip = False
+        game.state.change('chapter_title')
+        self.state = 'paused'
 
-        elif command.nid == 'trigger_script':
-            self.trigger_script(command)
+    def alert(self, command):
+        values, flags = event_commands.parse(command)
+        custom_string = values[0]
+        game.alerts.append(banner.Custom(custom_string))
+        game.state.change('alert')
+        self.state = 'paused'
 
-        elif command.nid == 'change_roaming':
-            self.change_roaming(command)
+    def victory_screen(self, command):
+        game.state.change('victory')
+        self.state = 'paused'
 
-        elif command.nid == 'change_roaming_unit':
-            self.change_roaming_unit(command)
+    def records_screen(self, command):
+        game.state.change('base_records')
+        self.state = 'paused'
 
-        elif command.nid == 'overworld_cinematic':
-            self.start_overworld_cinematic(command)
+    def location_card(self, command):
+        values, flags = event_commands.parse(command)
+        custom_string = values[0]
 
-        elif command.nid == 'set_overworld_position':
-            self.set_overworld_position(command)
+        new_location_card = dialog.LocationCard(custom_string)
+        self.other_boxes.append(new_location_card)
 
-        elif command.nid == 'reveal_overworld_node':
-            self.reveal_overworld_node(command)
+        self.wait_time = engine.get_time() + new_location_card.exist_time
+        self.state = 'waiting'
 
-        elif command.nid == 'reveal_overworld_road':
-            self.reveal_overworld_road(command)
+    def credits(self, command):
+        values, flags = event_commands.parse(command)
+        title = values[0]
+        credits = values[1].split(',') if 'no_split' not in flags else [values[1]]
+        wait = 'wait' in flags
+        center = 'center' in flags
 
-        elif command.nid == 'overworld_move_unit':
-            self.overworld_move_unit(command)
+        new_credits = dialog.Credits(title, credits, wait, center)
+        self.other_boxes.append(new_credits)
 
-        elif command.nid == 'toggle_narration_mode':
-            self.toggle_narration(command)
+        self.wait_time = engine.get_time() + new_credits.wait_time()
+        self.state = 'waiting'
 
-        elif command.nid == 'narrate':
-            self.overworld_speak(command)
+    def ending(self, command):
+        values, flags = event_commands.parse(command)
+        name = values[0]
+        unit = self.get_unit(name)
+        if unit and unit.portrait_nid:
+            portrait = icons.get_portrait(unit)
+            portrait = portrait.convert_alpha()
+            portrait = image_mods.make_translucent(portrait, 0.2)
+        else:
+            logging.error("Couldn't find unit or portrait %s" % name)
+            return False
+        title = values[1]
+        text = values[2]
 
-        elif command.nid == 'clean_up_roaming':
-            self.clean_up_roaming(command)
+        new_ending = dialog.Ending(portrait, title, text, unit)
+        self.text_boxes.append(new_ending)
+        self.state = 'dialog'
 
-        elif command.nid == 'add_to_initiative':
-            self.add_to_initiative(command)
+    def pop_dialog(self, command):
+        self.text_boxes.pop()
 
-        elif command.nid == 'move_in_initiative':
-            self.move_in_initiative(command)
+    def unlock(self, command):
+        # This is a macro that just adds new commands to command list
+        find_unlock_command = event_commands.FindUnlock(command.values)
+        spend_unlock_command = event_commands.SpendUnlock(command.values)
+        # Done backwards to presever order upon insertion
+        self.commands.insert(self.command_idx + 1, spend_unlock_command)
+        self.commands.insert(self.command_idx + 1, find_unlock_command)
 
     def add_portrait(self, command):
         values, flags = event_commands.parse(command)
@@ -2839,4 +2717,136 @@ class Event():
                 node_at_nid = game.overworld_controller.nodes[text]
                 if node_at_nid:
                     return node_at_nid
-        return None
\ No newline at end of file
+        return None
+
+# Key: command nid, Value: the Event method that runs it
+COMMAND_HANDLERS = {
+    'break': Event.break_command,
+    'wait': Event.wait,
+    'end_skip': Event.end_skip,
+    'music': Event.music,
+    'music_clear': Event.music_clear,
+    'sound': Event.sound,
+    'change_music': Event.change_music,
+    'change_background': Event.change_background,
+    'transition': Event.transition,
+    'speak': Event.speak,
+    'add_portrait': Event.add_portrait,
+    'multi_add_portrait': Event.multi_add_portrait,
+    'remove_portrait': Event.remove_portrait,
+    'multi_remove_portrait': Event.multi_remove_portrait,
+    'move_portrait': Event.move_portrait,
+    'bop_portrait': Event.bop_portrait,
+    'expression': Event.expression,
+    'disp_cursor': Event.disp_cursor,
+    'move_cursor': Event.move_cursor,
+    'center_cursor': Event.center_cursor,
+    'flicker_cursor': Event.flicker_cursor,
+    'game_var': Event.game_var,
+    'inc_game_var': Event.inc_game_var,
+    'level_var': Event.level_var,
+    'inc_level_var': Event.inc_level_var,
+    'win_game': Event.win_game,
+    'lose_game': Event.lose_game,
+    'activate_turnwheel': Event.activate_turnwheel,
+    'battle_save': Event.battle_save,
+    'change_tilemap': Event.change_tilemap,
+    'load_unit': Event.load_unit,
+    'make_generic': Event.make_generic,
+    'create_unit': Event.create_unit,
+    'add_unit': Event.add_unit,
+    'remove_unit': Event.remove_unit,
+    'kill_unit': Event.kill_unit,
+    'remove_all_units': Event.remove_all_units,
+    'remove_all_enemies': Event.remove_all_enemies,
+    'move_unit': Event.move_unit,
+    'interact_unit': Event.interact_unit,
+    'add_group': Event.add_group,
+    'spawn_group': Event.spawn_group,
+    'move_group': Event.move_group,
+    'remove_group': Event.remove_group,
+    'give_item': Event.give_item,
+    'remove_item': Event.remove_item,
+    'change_item_name': Event.change_item_name,
+    'change_item_desc': Event.change_item_desc,
+    'add_item_to_multiitem': Event.add_item_to_multiitem,
+    'remove_item_from_multiitem': Event.remove_item_from_multiitem,
+    'give_money': Event.give_money,
+    'give_bexp': Event.give_bexp,
+    'give_exp': Event.give_exp,
+    'set_exp': Event.set_exp,
+    'give_wexp': Event.give_wexp,
+    'give_skill': Event.give_skill,
+    'remove_skill': Event.remove_skill,
+    'change_ai': Event.change_ai,
+    'change_party': Event.change_party,
+    'change_team': Event.change_team,
+    'change_portrait': Event.change_portrait,
+    'change_stats': Event.change_stats,
+    'set_stats': Event.set_stats,
+    'autolevel_to': Event.autolevel_to,
+    'set_mode_autolevels': Event.set_mode_autolevels,
+    'promote': Event.promote,
+    'change_class': Event.class_change,
+    'add_tag': Event.add_tag,
+    'remove_tag': Event.remove_tag,
+    'set_current_hp': Event.set_current_hp,
+    'set_current_mana': Event.set_current_mana,
+    'resurrect': Event.resurrect,
+    'reset': Event.reset,
+    'has_attacked': Event.has_attacked,
+    'has_traded': Event.has_traded,
+    'add_talk': Event.add_talk,
+    'remove_talk': Event.remove_talk,
+    'add_lore': Event.add_lore,
+    'remove_lore': Event.remove_lore,
+    'add_base_convo': Event.add_base_convo,
+    'remove_base_convo': Event.remove_base_convo,
+    'ignore_base_convo': Event.ignore_base_convo,
+    'increment_support_points': Event.increment_support_points,
+    'unlock_support_rank': Event.unlock_support_rank,
+    'add_market_item': Event.add_market_item,
+    'remove_market_item': Event.remove_market_item,
+    'add_region': Event.add_region,
+    'region_condition': Event.region_condition,
+    'remove_region': Event.remove_region,
+    'show_layer': Event.show_layer,
+    'hide_layer': Event.hide_layer,
+    'add_weather': Event.add_weather,
+    'remove_weather': Event.remove_weather,
+    'change_objective_simple': Event.change_objective_simple,
+    'change_objective_win': Event.change_objective_win,
+    'change_objective_loss': Event.change_objective_loss,
+    'set_position': Event.set_position,
+    'map_anim': Event.map_anim,
+    'merge_parties': Event.merge_parties,
+    'arrange_formation': Event.arrange_formation_command,
+    'prep': Event.prep,
+    'base': Event.base,
+    'shop': Event.shop,
+    'choice': Event.choice,
+    'chapter_title': Event.chapter_title,
+    'alert': Event.alert,
+    'victory_screen': Event.victory_screen,
+    'records_screen': Event.records_screen,
+    'location_card': Event.location_card,
+    'credits': Event.credits,
+    'ending': Event.ending,
+    'pop_dialog': Event.pop_dialog,
+    'unlock': Event.unlock,
+    'find_unlock': Event.find_unlock,
+    'spend_unlock': Event.spend_unlock,
+    'trigger_script': Event.trigger_script,
+    'change_roaming': Event.change_roaming,
+    'change_roaming_unit': Event.change_roaming_unit,
+    'overworld_cinematic': Event.start_overworld_cinematic,
+    'set_overworld_position': Event.set_overworld_position,
+    'reveal_overworld_node': Event.reveal_overworld_node,
+    'reveal_overworld_road': Event.reveal_overworld_road,
+    'overworld_move_unit': Event.overworld_move_unit,
+    'toggle_narration_mode': Event.toggle_narration,
+    'narrate': Event.overworld_speak,
+    'clean_up_roaming': Event.clean_up_roaming,
+    'add_to_initiative': Event.add_to_initiative,
+    'move_in_initiative': Event.move_in_initiative,
+}
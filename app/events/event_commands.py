@@ -1073,17 +1073,26 @@ class ToggleNarrationMode(EventCommand):
 def get_commands():
     return EventCommand.__subclasses__()
 
+# Key: nid, Value: command class
+commands_by_nid = {}
+# Key: nid or nickname, Value: command class. The first command to claim a name keeps it
+commands_by_name = {}
+for command in EventCommand.__subclasses__():
+    commands_by_nid.setdefault(command.nid, command)
+    commands_by_name.setdefault(command.nid, command)
+    if command.nickname:
+        commands_by_name.setdefault(command.nickname, command)
+
 def restore_command(dat):
     if len(dat) == 2:
         nid, values = dat
         display_values = None
     elif len(dat) == 3:
         nid, values, display_values = dat
-    subclasses = EventCommand.__subclasses__()
-    for command in subclasses:
-        if command.nid == nid:
-            copy = command(values, display_values)
-            return copy
+    command = commands_by_nid.get(nid)
+    if command:
+        copy = command(values, display_values)
+        return copy
     print("Couldn't restore event command!")
     print(nid, values, display_values)
     if not display_values:
@@ -1107,37 +1116,44 @@ def parse_text(text: str, strict=False) -> EventCommand:
         return Comment([text])
     arguments = text.split(';')
     command_nid = arguments[0]
-    subclasses = EventCommand.__subclasses__()
-    for command in subclasses:
-        if command.nid == command_nid or command.nickname == command_nid:
-            cmd_args = arguments[1:]
-            true_cmd_args = []
-            command_info = command()
-            for idx, arg in enumerate(cmd_args):
-                if idx < len(command_info.keywords):
-                    cmd_keyword = command_info.keywords[idx]
-                elif idx - len(command_info.keywords) < len(command_info.optional_keywords):
-                    cmd_keyword = command_info.optional_keywords[idx - len(command_info.keywords)]
-                else:
-                    cmd_keyword = "N/A"
-                # if parentheses exists, then they contain the "true" arg, with everything outside parens essentially as comments
-                if '(' in arg and ')' in arg and not cmd_keyword == 'Condition':
-                    true_arg = arg[arg.find("(")+1:arg.find(")")]
-                    true_cmd_args.append(true_arg)
-                else:
-                    true_cmd_args.append(arg)
-            copy = command(true_cmd_args, cmd_args)
-            return copy
+    command = commands_by_name.get(command_nid)
+    if command:
+        cmd_args = arguments[1:]
+        true_cmd_args = []
+        command_info = command()
+        for idx, arg in enumerate(cmd_args):
+            if idx < len(command_info.keywords):
+                cmd_keyword = command_info.keywords[idx]
+            elif idx - len(command_info.keywords) < len(command_info.optional_keywords):
+                cmd_keyword = command_info.optional_keywords[idx - len(command_info.keywords)]
+            else:
+                cmd_keyword = "N/A"
+            # if parentheses exists, then they contain the "true" arg, with everything outside parens essentially as comments
+            if '(' in arg and ')' in arg and not cmd_keyword == 'Condition':
+                true_arg = arg[arg.find("(")+1:arg.find(")")]
+                true_cmd_args.append(true_arg)
+            else:
+                true_cmd_args.append(arg)
+        copy = command(true_cmd_args, cmd_args)
+        return copy
     if strict:
         return None
     else:
         return Comment([text])
 
 def parse(command):
+    """
+    Splits the command's values into its keyword values and its flags
+    Kept on the command, since events run the same command objects every time,
+    so both are returned immutable (a tuple and a frozenset)
+    """
     values = command.values
+    parsed = command.__dict__.get('_parsed')
+    if parsed and parsed[0] is values:
+        return parsed[1], parsed[2]
     num_keywords = len(command.keywords)
-    true_values = values[:num_keywords]
-    flags = {v for v in values[num_keywords:] if v in command.flags}
+    flags = frozenset(v for v in values[num_keywords:] if v in command.flags)
     optional_keywords = [v for v in values[num_keywords:] if v not in flags]
-    true_values += optional_keywords
+    true_values = tuple(values[:num_keywords]) + tuple(optional_keywords)
+    command._parsed = (values, true_values, flags)
     return true_values, flags
@@ -27,8 +27,8 @@ class EventManager():
                 logging.error("Condition {%s} could not be evaluated" % event_prefab.condition)
 
         new_event = False
-        sorted_events = sorted(triggered_events, key=lambda x: x.priority)
-        for event_prefab in sorted_events:
+        # Already sorted by priority
+        for event_prefab in triggered_events:
             self.add_event(event_prefab.nid, event_prefab.commands, unit, unit2, item, position, region)
             new_event = True
             if event_prefab.only_once:
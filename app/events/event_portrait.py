@@ -7,6 +7,7 @@ from app.utilities import utils
 from app.constants import COLORKEY
 
 from app.engine import engine, image_mods
+from app.engine.sprites import load_image
 
 class EventPortrait():
     width, height = 128, 112
@@ -28,9 +29,7 @@ class EventPortrait():
 
     def __init__(self, portrait: Portrait, position: Point, priority, transition=False, slide=None, mirror=False, expressions=None):
         self.portrait = portrait
-        if not self.portrait.image:
-            self.portrait.image = engine.image_load(self.portrait.full_path)
-        self.portrait.image = self.portrait.image.convert()
+        self.portrait.image = load_image('portraits', self.portrait).convert()
         engine.set_colorkey(self.portrait.image, COLORKEY, rleaccel=True)
         self.position = position
         self.priority = priority
@@ -33,6 +33,10 @@ all_triggers = Data([
 ])
 
 class EventPrefab(Prefab):
+    # Bumped whenever any event's trigger, level or priority changes,
+    # so EventCatalog knows to rebuild its index
+    index_version = 0
+
     def __init__(self, name):
         self.name = name
         self.trigger = None
@@ -42,6 +46,11 @@ class EventPrefab(Prefab):
         self.only_once = False
         self.priority: int = 20
 
+    def __setattr__(self, name, value):
+        if name in ('trigger', 'level_nid', 'priority'):
+            EventPrefab.index_version += 1
+        super().__setattr__(name, value)
+
     @property
     def nid(self):
         if not self.name:
@@ -78,9 +87,61 @@ class EventPrefab(Prefab):
 class EventCatalog(Data[EventPrefab]):
     datatype = EventPrefab
 
+    def __init__(self, vals=None):
+        super().__init__(vals)
+        # Key: (trigger, level_nid), Value: matching events sorted by priority
+        self._index = {}
+        self._index_version = EventPrefab.index_version
+
     def get(self, trigger, level_nid):
-        return [event for event in self._list if event.trigger == trigger and
-                (not event.level_nid or event.level_nid == level_nid)]
+        """
+        Returns the events with this trigger that can happen in this level,
+        sorted by priority (ties keep their order in the catalog)
+        Each (trigger, level_nid) is looked up once, and the index is thrown away
+        whenever an event is added, removed, moved, or changes trigger, level or priority
+        """
+        if self._index_version != EventPrefab.index_version:
+            self._reset_index()
+        key = (trigger, level_nid)
+        events = self._index.get(key)
+        if events is None:
+            events = [event for event in self._list if event.trigger == trigger and
+                      (not event.level_nid or event.level_nid == level_nid)]
+            events = sorted(events, key=lambda event: event.priority)
+            self._index[key] = events
+        return events
+
+    def _reset_index(self):
+        self._index.clear()
+        self._index_version = EventPrefab.index_version
+
+    def append(self, val):
+        super().append(val)
+        self._reset_index()
+
+    def delete(self, val):
+        super().delete(val)
+        self._reset_index()
+
+    def remove_key(self, key):
+        super().remove_key(key)
+        self._reset_index()
+
+    def pop(self, idx=None):
+        super().pop(idx)
+        self._reset_index()
+
+    def insert(self, idx, val):
+        super().insert(idx, val)
+        self._reset_index()
+
+    def clear(self):
+        super().clear()
+        self._index = {}
+
+    def move_index(self, old_index, new_index):
+        super().move_index(old_index, new_index)
+        self._reset_index()
 
     def get_from_nid(self, key, fallback=None):
         return self._dict.get(key, fallback)
@@ -8,9 +8,15 @@ class BasicSprite(object):
     image: str = None
 
 class SpriteDict(dict):
+    # Set by the engine to decode images the first time they are asked for
+    loader = None
+
     def get(self, val):
         if val in self:
-            return self[val].image
+            sprite = self[val]
+            if self.loader:
+                self.loader(val, sprite)
+            return sprite.image
         return None
 
 def load_sprites(root):
@@ -1,6 +1,8 @@
 from __future__ import annotations
+import heapq
+import itertools
 import math
-from typing import Dict, Generic, Iterable, List, Set, Tuple, TypeVar
+from typing import Dict, Generic, Iterable, List, Optional, Set, Tuple, TypeVar
 
 V = TypeVar("V")
 D = TypeVar("D")
@@ -31,17 +33,60 @@ class LTVertex(Generic[V, D, E]):
     def __repr__(self):
         return repr(self.edges.keys())
 
+class DisjointSet(Generic[V]):
+    """Union-find over vertices, for telling whether two vertices are connected
+    in (almost) constant time. Only ever merges; nothing can be split back apart.
+    """
+    def __init__(self):
+        self.parent: Dict[V, V] = {}
+        self.rank: Dict[V, int] = {}
+
+    def add(self, value: V):
+        if value not in self.parent:
+            self.parent[value] = value
+            self.rank[value] = 0
+
+    def find(self, value: V) -> V:
+        parent = self.parent
+        while parent[value] != value:
+            # path halving
+            parent[value] = parent[parent[value]]
+            value = parent[value]
+        return value
+
+    def union(self, v1: V, v2: V):
+        root1, root2 = self.find(v1), self.find(v2)
+        if root1 == root2:
+            return
+        if self.rank[root1] < self.rank[root2]:
+            root1, root2 = root2, root1
+        self.parent[root2] = root1
+        if self.rank[root1] == self.rank[root2]:
+            self.rank[root1] += 1
+
+    def clear(self):
+        self.parent.clear()
+        self.rank.clear()
+
 class LTGraph(Generic[V, D, E]):
     """An undirected graph implementation for the LT engine, since installing
     external dependencies is extremely cringe.
 
     Does not support negative edge weights.
+
+    Shortest paths come from a shortest path tree per start vertex, each found once
+    with a heap-based Dijkstra and then kept. Adding an edge can only ever shorten paths,
+    so instead of throwing the trees away, only the part of each tree that the new
+    edge improves is updated. Whether two vertices are connected at all
+    is answered from a union-find of the graph's connected components.
     """
 
     def __init__(self, vertices: Iterable[V]=None, edges: Iterable[Tuple[V, V]] = None):
         self.vertices: Dict[V, LTVertex] = {}
         self.adj: Dict[V, Set[V]] = {}
-        self._path_dict: Dict[V, Dict[V, List[Tuple[V, V]]]] = {}
+        # Key: start vertex, Value: (distance to each reachable vertex, previous vertex on the way there)
+        self._trees: Dict[V, Tuple[Dict[V, float], Dict[V, V]]] = {}
+        self._components: DisjointSet[V] = DisjointSet()
         if vertices:
             for vertex in vertices:
                 self.add_vertex(vertex)
@@ -51,9 +96,18 @@ class LTGraph(Generic[V, D, E]):
                 self.add_edge(v1, v2)
 
     def add_vertex(self, vertex_val: V, vertex_data: D = None):
+        replaced = vertex_val in self.vertices
         self[vertex_val] = LTVertex(vertex_val, vertex_data)
         self.adj[vertex_val] = set()
-        self.clear_cache()
+        if replaced:
+            # its edges are gone, which is the one thing the caches can't follow
+            for neighbor in self.adj:
+                self.adj[neighbor].discard(vertex_val)
+                self[neighbor].edges.pop(vertex_val, None)
+            self.clear_cache()
+        else:
+            # a new vertex, with no edges yet, doesn't change any paths
+            self._components.add(vertex_val)
 
     def add_edge(self, v1: V, v2: V, data: E = None, weight: float = 1):
         """Add edge to graph between two vertices (they do not necessarily have to be predefined)
@@ -69,27 +123,65 @@ class LTGraph(Generic[V, D, E]):
             return
 
         if v1 not in self.vertices:
-            self[v1] = LTVertex(v1)
-            self.adj[v1] = set()
+            self.add_vertex(v1)
         if v2 not in self.vertices:
-            self[v2] = LTVertex(v2)
-            self.adj[v2] = set()
+            self.add_vertex(v2)
 
+        old_edge: LTEdge = self[v1].edges.get(v2)
         self[v1][v2] = LTEdge((v1, v2), data, weight)
         self[v2][v1] = LTEdge((v2, v1), data, weight)
 
         self.adj[v1].add(v2)
         self.adj[v2].add(v1)
-        self.clear_cache()
+        self._components.union(v1, v2)
+
+        if old_edge and old_edge.weight < self[v1][v2].weight:
+            # a longer edge than before can make paths longer
+            self._trees.clear()
+            return
+        weight = self[v1][v2].weight
+        for dist, prev in self._trees.values():
+            if v1 in dist:
+                self._relax(dist, prev, v2, dist[v1] + weight, v1)
+            if v2 in dist:
+                self._relax(dist, prev, v1, dist[v2] + weight, v2)
 
     def has_path(self, v1: V, v2: V) -> bool:
         """Determines whether or not a path exists between the two nodes.
-        NOTE: I don't give a rat's ass about performance, but
-        if you, reader, do, turn this into bfs or use a cache or something.
         """
-        if self.shortest_path(v1, v2):
-            return True
-        return False
+        if v1 not in self.vertices or v2 not in self.vertices:
+            return False
+        return self._components.find(v1) == self._components.find(v2)
+
+    def _relax(self, dist: Dict[V, float], prev: Dict[V, V], start: V, start_dist: float, via: Optional[V]):
+        """Dijkstra from start, which can now be reached in start_dist (via the given vertex),
+        only going as far as the vertices whose distances that makes shorter.
+        From the start vertex alone, this is just Dijkstra.
+        """
+        if start_dist >= dist.get(start, math.inf):
+            return
+        dist[start] = start_dist
+        if via is not None:
+            prev[start] = via
+        counter = itertools.count()  # vertices themselves may not be comparable
+        heap = [(start_dist, next(counter), start)]
+        while heap:
+            vert_dist, _, vert = heapq.heappop(heap)
+            if vert_dist > dist[vert]:
+                continue  # already found a shorter way here
+            for neighbor, edge in self[vert].edges.items():
+                neighbor_dist = vert_dist + edge.weight
+                if neighbor_dist < dist.get(neighbor, math.inf):
+                    dist[neighbor] = neighbor_dist
+                    prev[neighbor] = vert
+                    heapq.heappush(heap, (neighbor_dist, next(counter), neighbor))
+
+    def _get_tree(self, v1: V) -> Tuple[Dict[V, float], Dict[V, V]]:
+        if v1 not in self._trees:
+            dist, prev = {}, {}
+            self._relax(dist, prev, v1, 0, None)
+            self._trees[v1] = (dist, prev)
+        return self._trees[v1]
 
     def shortest_path(self, v1: V, v2: V) -> List[V]:
         """Fetches the shortest path between two vertices.
@@ -107,58 +199,33 @@ class LTGraph(Generic[V, D, E]):
         if v1 == v2:
             return []
 
-        # if shortest path cached
-        if v1 in self._path_dict and v2 in self._path_dict[v1]:
-            return self._path_dict[v1][v2]
-
-        # else, initialize shortest paths dict if not initialized
-        if v1 not in self._path_dict:
-            self._path_dict[v1] = {}
-        if v2 not in self._path_dict:
-            self._path_dict[v2] = {}
-
-        # and run djikstra from v1 to v2
-        visited: Dict[V, float] = {}
-        prev_step: Dict[V, V] = {}
-        dist_from_v1 = {vert_id: math.inf for vert_id in self.vertices.keys()}
-        dist_from_v1[v1] = 0
-        while len(dist_from_v1.keys()) != 0:
-            min_dist = min(dist_from_v1.values())
-            min_vert = [vert for vert in dist_from_v1 if dist_from_v1[vert] == min_dist][0]
-            visited[min_vert] = min_dist
-            next_verts = self.adj[min_vert]
-            for neighbor in next_verts:
-                if neighbor not in visited.keys():
-                    neighbor_dist = min_dist + self[min_vert][neighbor].weight
-                    if neighbor_dist < dist_from_v1[neighbor]:
-                        prev_step[neighbor] = min_vert
-                        dist_from_v1[neighbor] = neighbor_dist
-            dist_from_v1.pop(min_vert)
-
-        # does a path exist
-        if v2 not in visited.keys():
-            self._path_dict[v1][v2] = None
-            self._path_dict[v2][v1] = None
+        # a path back from v2 is just as good, if that's already been worked out
+        if v2 in self._trees and v1 not in self._trees:
+            path = self._path_from_tree(v2, v1)
+            return path[::-1] if path else None
+        return self._path_from_tree(v1, v2)
+
+    def _path_from_tree(self, v1: V, v2: V) -> Optional[List[V]]:
+        dist, prev = self._get_tree(v1)
+        if v2 not in dist:
             return None
-        # reconstruct it
-        path = []
-        reverse_path = []
-        curr_vert = v2
-        while curr_vert != v1:
-            best_neighbor = prev_step[curr_vert]
-            reverse_path.append(curr_vert)
-            path.insert(0, curr_vert)
-            curr_vert = best_neighbor
-        reverse_path.append(curr_vert)
-        path.insert(0, curr_vert)
-
-        self._path_dict[v1][v2] = path
-        self._path_dict[v2][v1] = reverse_path
+        path = [v2]
+        while path[-1] != v1:
+            path.append(prev[path[-1]])
+        path.reverse()
         return path
 
     def clear_cache(self):
-        # usually we want to regenerate all paths after adding nodes
-        self._path_dict.clear()
+        """Throws away every shortest path tree, and works out the connected components again.
+        Only needed when paths can get longer; adding vertices and edges keeps the caches up to date.
+        """
+        self._trees.clear()
+        self._components.clear()
+        for vertex in self.vertices:
+            self._components.add(vertex)
+        for vertex, neighbors in self.adj.items():
+            for neighbor in neighbors:
+                self._components.union(vertex, neighbor)
 
     def __getitem__(self, value: V) -> LTVertex[V, D, E]:
         return self.vertices[value]
@@ -0,0 +1,124 @@
+from typing import Dict, FrozenSet, Iterable, Set, Tuple
+
+Pos = Tuple[int, int]
+
+# Key: frozen range set, Value: (dx, dy) offsets of the union of the manhattan spheres
+_templates: Dict[FrozenSet[int], Tuple[Pos, ...]] = {}
+# Key: (frozen range set, stride), Value: (dy shifts, row shifts) for get_shell's bitmask
+_shifts: Dict[Tuple[FrozenSet[int], int], tuple] = {}
+# Key: (width, height, pad), Value: bitmask of every in-bounds position
+_bounds: Dict[Tuple[int, int, int], int] = {}
+# Bit positions that are set in each byte
+_bits = tuple(tuple(bit for bit in range(8) if byte & (1 << bit)) for byte in range(256))
+
+# Below this many (move, offset) pairs it is faster to just loop over them
+DIRECT_LIMIT = 512
+
+def get_template(rng: Iterable[int]) -> Tuple[Pos, ...]:
+    """Offsets that make up the manhattan spheres of every radius in rng
+
+    Args:
+        rng (Iterable[int]): radii to include
+
+    Returns:
+        Tuple[Pos, ...]: (dx, dy) offsets, each one only once
+    """
+    key = rng if isinstance(rng, frozenset) else frozenset(rng)
+    template = _templates.get(key)
+    if template is None:
+        offsets = set()
+        for r in key:
+            # Finds manhattan spheres of radius r
+            for i in range(-r, r + 1):
+                magn = abs(i)
+                offsets.add((i, r - magn))
+                offsets.add((i, -r + magn))
+        template = tuple(sorted(offsets))
+        _templates[key] = template
+    return template
+
+def find_manhattan_spheres(rng: Iterable[int], x: int, y: int) -> Set[Pos]:
+    return {(x + dx, y + dy) for (dx, dy) in get_template(rng)}
+
+def _get_shifts(rng: FrozenSet[int], template: Tuple[Pos, ...], stride: int) -> tuple:
+    """Splits the template into vertical shifts shared by several columns,
+    so each distinct set of dy only needs to be applied once
+    """
+    key = (rng, stride)
+    shifts = _shifts.get(key)
+    if shifts is None:
+        dys_by_dx: Dict[int, list] = {}
+        for dx, dy in template:
+            dys_by_dx.setdefault(dx, []).append(dy)
+        dxs_by_dys: Dict[Tuple[int, ...], list] = {}
+        for dx, dys in dys_by_dx.items():
+            dxs_by_dys.setdefault(tuple(dys), []).append(dx * stride)
+        shifts = tuple(dxs_by_dys.items())
+        _shifts[key] = shifts
+    return shifts
+
+def _get_bounds(width: int, height: int, pad: int) -> int:
+    key = (width, height, pad)
+    bounds = _bounds.get(key)
+    if bounds is None:
+        stride = height + 2 * pad
+        column = ((1 << height) - 1) << pad
+        bounds = 0
+        for x in range(width):
+            bounds |= column << ((x + pad) * stride)
+        _bounds[key] = bounds
+    return bounds
+
+def get_shell(valid_moves: Iterable[Pos], potential_range: Iterable[int], width: int, height: int) -> Set[Pos]:
+    """Every in-bounds position within potential_range of any of the valid_moves
+
+    Large inputs are handled by dilating a bitmask of the valid moves by
+    the template, and clipping to the map bounds once at the end
+
+    Args:
+        valid_moves (Iterable[Pos]): positions to measure from
+        potential_range (Iterable[int]): radii to include
+        width, height (int): size of the map
+
+    Returns:
+        Set[Pos]: positions in range
+    """
+    rng = potential_range if isinstance(potential_range, frozenset) else frozenset(potential_range)
+    template = get_template(rng)
+    if not template or not valid_moves:
+        return set()
+    valid_moves = valid_moves if isinstance(valid_moves, (set, frozenset, list, tuple)) else list(valid_moves)
+
+    in_bounds = all(0 <= x < width and 0 <= y < height for (x, y) in valid_moves)
+    if not in_bounds or len(valid_moves) * len(template) <= DIRECT_LIMIT:
+        return {(x + dx, y + dy) for (x, y) in valid_moves for (dx, dy) in template
+                if 0 <= x + dx < width and 0 <= y + dy < height}
+
+    # Pad every side by the largest radius, so shifting never wraps around
+    # into the next column and never falls off the low end
+    pad = max(rng)
+    stride = height + 2 * pad
+    num_bytes = ((width + 2 * pad) * stride + 7) // 8
+    move_bytes = bytearray(num_bytes)
+    for (x, y) in valid_moves:
+        idx = (x + pad) * stride + y + pad
+        move_bytes[idx >> 3] |= 1 << (idx & 7)
+    mask = int.from_bytes(move_bytes, 'little')
+
+    shell = 0
+    for dys, row_shifts in _get_shifts(rng, template, stride):
+        column = 0
+        for dy in dys:
+            column |= mask << dy if dy >= 0 else mask >> -dy
+        for row_shift in row_shifts:
+            shell |= column << row_shift if row_shift >= 0 else column >> -row_shift
+    shell &= _get_bounds(width, height, pad)
+
+    positions = set()
+    for i, byte in enumerate(shell.to_bytes(num_bytes, 'little')):
+        if byte:
+            base = i << 3
+            for bit in _bits[byte]:
+                x, y = divmod(base + bit, stride)
+                positions.add((x - pad, y - pad))
+    return positions
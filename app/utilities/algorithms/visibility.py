@@ -0,0 +1,154 @@
+from array import array
+from typing import Dict, List, Tuple
+
+from app.utilities.algorithms import manhattan
+
+Pos = Tuple[int, int]
+
+# Key: (dx, dy), Value: blockers of the line from (0, 0) to (dx, dy)
+_rays: Dict[Pos, Tuple[Tuple[Pos, ...], ...]] = {}
+
+def get_ray(dx: int, dy: int) -> Tuple[Tuple[Pos, ...], ...]:
+    """Offsets that can block the line of sight from (0, 0) to (dx, dy)
+    Walks the same line as line_of_sight.get_line did
+
+    Args:
+        dx, dy (int): offset of the end of the line
+
+    Returns:
+        Tuple[Tuple[Pos, ...], ...]: each entry is one or two offsets.
+        The line is blocked if every offset of any one entry is opaque
+    """
+    ray = _rays.get((dx, dy))
+    if ray is not None:
+        return ray
+    end = (dx, dy)
+    blockers = []
+
+    def block(*positions):
+        if len(positions) > 1 or positions[0] != end:
+            blockers.append(positions)
+
+    x, y = 0, 0
+    xstep, ystep = 1, 1
+    adx, ady = dx, dy
+    if ady < 0:
+        ystep = -1
+        ady = -ady
+    if adx < 0:
+        xstep = -1
+        adx = -adx
+    ddy, ddx = 2*ady, 2*adx
+
+    if ddx >= ddy:
+        errorprev = error = adx
+        for i in range(adx):
+            x += xstep
+            error += ddy
+            # How far off the straight line to the right are you
+            if error > ddx:
+                y += ystep
+                error -= ddx
+                if error + errorprev < ddx:  # Bottom square
+                    block((x, y - ystep))
+                elif error + errorprev > ddx:  # Left square
+                    block((x - xstep, y))
+                else:  # Through the middle
+                    block((x, y - ystep), (x - xstep, y))
+            block((x, y))
+            errorprev = error
+    else:
+        errorprev = error = ady
+        for i in range(ady):
+            y += ystep
+            error += ddx
+            if error > ddy:
+                x += xstep
+                error -= ddy
+                if error + errorprev < ddy:  # Bottom square
+                    block((x - xstep, y))
+                elif error + errorprev > ddy:  # Left square
+                    block((x, y - ystep))
+                else:  # Through the middle
+                    block((x, y - ystep), (x - xstep, y))
+            block((x, y))
+            errorprev = error
+    assert x == dx and y == dy
+    ray = tuple(blockers)
+    _rays[(dx, dy)] = ray
+    return ray
+
+class VisibilityCache():
+    """
+    Which tiles each team can see with line of sight, for GameBoard.in_vision
+
+    Keeps the visibility field of every source position and radius it has been asked about,
+    and a count for each tile of how many of a team's units can see it.
+    The counts are updated as units are added and removed, so a lookup is just an index.
+    Any change to the opacity grid throws everything but the sources away
+    """
+    def __init__(self, width: int, height: int):
+        self.width = width
+        self.height = height
+        self.opacity = [False] * (width * height)
+        # Key: (source idx, radius), Value: idx of every tile that source can see
+        self.fields: Dict[Tuple[int, int], Tuple[int, ...]] = {}
+        # Key: unit nid, Value: (team, source idx)
+        self.sources: Dict[str, Tuple[str, int]] = {}
+        # Key: (team, radius), Value: number of that team's sources that can see each tile
+        self.lit: Dict[Tuple[str, int], array] = {}
+
+    def set_opacity(self, opacity_grid: List[bool]):
+        opacity = [bool(opaque) for opaque in opacity_grid]
+        if opacity != self.opacity:
+            self.opacity = opacity
+            self.fields.clear()
+            self.lit.clear()
+
+    def get_field(self, idx: int, radius: int) -> Tuple[int, ...]:
+        key = (idx, radius)
+        field = self.fields.get(key)
+        if field is None:
+            width, height, opacity = self.width, self.height, self.opacity
+            x, y = divmod(idx, height)
+            lit = []
+            for dx, dy in manhattan.get_template(range(max(radius, 0) + 1)):
+                if 0 <= x + dx < width and 0 <= y + dy < height:
+                    for blocker in get_ray(dx, dy):
+                        if all(opacity[(x + bx) * height + y + by] for (bx, by) in blocker):
+                            break
+                    else:
+                        lit.append((x + dx) * height + y + dy)
+            field = tuple(lit)
+            self.fields[key] = field
+        return field
+
+    def add_source(self, nid: str, team: str, pos: Pos):
+        self.remove_source(nid)
+        idx = pos[0] * self.height + pos[1]
+        self.sources[nid] = (team, idx)
+        for (lit_team, radius), counts in self.lit.items():
+            if lit_team == team:
+                for i in self.get_field(idx, radius):
+                    counts[i] += 1
+
+    def remove_source(self, nid: str):
+        if nid not in self.sources:
+            return
+        team, idx = self.sources.pop(nid)
+        for (lit_team, radius), counts in self.lit.items():
+            if lit_team == team:
+                for i in self.get_field(idx, radius):
+                    counts[i] -= 1
+
+    def is_lit(self, pos: Pos, team: str, radius: int) -> bool:
+        key = (team, radius)
+        counts = self.lit.get(key)
+        if counts is None:
+            counts = array('I', [0]) * (self.width * self.height)
+            for source_team, idx in self.sources.values():
+                if source_team == team:
+                    for i in self.get_field(idx, radius):
+                        counts[i] += 1
+            self.lit[key] = counts
+        return counts[pos[0] * self.height + pos[1]] > 0
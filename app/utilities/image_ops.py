@@ -0,0 +1,124 @@
+import functools
+import sys
+from array import array
+
+"""
+Whole image operations on raw 32-bit pixel buffers
+
+Pixels are native byte order 32-bit ints, which is how QImage stores
+Format_ARGB32 and Format_RGB32 images, so a buffer can be a view straight
+onto a QImage's bits (see app.editor.utilities.image_pixels) without copying
+
+Nothing here loops over pixels in Python. Colors are looked up with map
+over the whole buffer, rows and columns are strided slices, and
+content_bbox finds the background color in every pixel at once by reading
+the buffer as one big int, xor-ing it with the color repeated in every
+32-bit lane and checking which lanes came out zero
+"""
+
+BYTEORDER = sys.byteorder
+_LOW_BYTE = 0 if BYTEORDER == 'little' else 3  # Where each pixel's lowest byte is in the buffer
+
+def _as_ints(pixels) -> memoryview:
+    view = memoryview(pixels)
+    if view.format == 'I':
+        return view
+    return view.cast('B').cast('I')
+
+@functools.lru_cache(maxsize=32)
+def _lanes(value: int, num_pixels: int) -> int:
+    """
+    Returns:
+        int: value repeated in each of num_pixels 32-bit lanes
+    """
+    return int.from_bytes(value.to_bytes(4, BYTEORDER) * num_pixels, BYTEORDER)
+
+def _match_mask(big: int, color: int, num_pixels: int) -> int:
+    """
+    Returns:
+        int: 0xffffffff in every lane where big has color, 0 in every other lane
+    """
+    diff = big ^ _lanes(color, num_pixels)
+    low = _lanes(0x7fffffff, num_pixels)
+    high = _lanes(0x80000000, num_pixels)
+    # The top bit of each lane is set if any bit of the lane is
+    # Can't carry into the next lane, since 0x7fffffff + 0x7fffffff < 2**32
+    nonzero = (((diff & low) + low) | diff) & high
+    return ((nonzero ^ high) >> 31) * 0xffffffff
+
+def to_rgb(color: int) -> tuple:
+    return ((color >> 16) & 255, (color >> 8) & 255, color & 255)
+
+def unique_colors(pixels, width: int) -> list:
+    """
+    Returns:
+        list: each color in the image once, in the order they're first
+        seen going down each column from left to right
+    """
+    ints = _as_ints(pixels)
+    num_colors = len(set(ints))
+    colors = {}
+    for x in range(width):
+        colors.update(dict.fromkeys(ints[x::width]))
+        if len(colors) == num_colors:
+            break
+    return list(colors)
+
+def column_major(pixels, width: int) -> list:
+    """
+    Returns:
+        list: every pixel, going down each column from left to right
+    """
+    ints = _as_ints(pixels)
+    colors = []
+    for x in range(width):
+        colors.extend(ints[x::width])
+    return colors
+
+def replace_colors(pixels, conversion_dict: dict) -> bytes:
+    """
+    Every pixel whose color is a key of conversion_dict becomes its value
+    Each pixel is converted at most once, so {a: b, b: a} swaps a and b
+
+    Returns:
+        bytes: the new pixels
+    """
+    ints = _as_ints(pixels)
+    if not conversion_dict.keys() & set(ints):
+        return bytes(ints)
+    return array('I', map(conversion_dict.get, ints, ints)).tobytes()
+
+def content_bbox(pixels, width: int, exclude: int) -> tuple:
+    """
+    Returns:
+        tuple: x, y, width, height of the smallest rect holding every pixel
+        that isn't exclude. If every pixel is exclude, the width and height
+        come out less than 1 (width, height, 1 - width, 1 - height)
+    """
+    num_pixels = len(_as_ints(pixels))
+    height = num_pixels // width
+    big = int.from_bytes(pixels, BYTEORDER)
+    # 0xff for each excluded pixel, 0 for everything else
+    excluded = _match_mask(big, exclude, num_pixels).to_bytes(num_pixels * 4, BYTEORDER)[_LOW_BYTE::4]
+    empty_row = b'\xff' * width
+    rows = [y for y in range(height) if excluded[y * width:(y + 1) * width] != empty_row]
+    if not rows:
+        return (width, height, 1 - width, 1 - height)
+    empty_column = b'\xff' * height
+    columns = [x for x in range(width) if excluded[x::width] != empty_column]
+    return (columns[0], rows[0], columns[-1] - columns[0] + 1, rows[-1] - rows[0] + 1)
+
+def crop(pixels, width: int, rect: tuple) -> bytes:
+    x, y, w, h = rect
+    data = memoryview(pixels).cast('B')
+    row_size = width * 4
+    return b''.join(data[(y + row) * row_size + x * 4:(y + row) * row_size + (x + w) * 4] for row in range(h))
+
+def xor_difference(pixels1, pixels2) -> int:
+    """
+    Returns:
+        int: the sum over every pixel of pixel1 ^ pixel2.
+        0 if the two are the same
+    """
+    diff = int.from_bytes(pixels1, BYTEORDER) ^ int.from_bytes(pixels2, BYTEORDER)
+    return sum(_as_ints(diff.to_bytes(len(memoryview(pixels1).cast('B')), BYTEORDER)))
@@ -1,5 +1,6 @@
 import os
 
+from app.engine import startup
 from app.constants import VERSION
 from app.resources.resources import RESOURCES
 from app.data.database import DB
@@ -9,8 +10,11 @@ from app.engine import driver
 from app.engine import game_state
 
 def main(name: str):
+    startup.mark('import')
     RESOURCES.load(name + '.ltproj')
+    startup.mark('resource index')
     DB.load(name + '.ltproj')
+    startup.mark('db load')
     title = DB.constants.value('title')
     driver.start(title)
     game = game_state.start_game()
@@ -41,7 +45,8 @@ def find_and_run_project():
                 main(name)
 
 if __name__ == '__main__':
-    import logging, traceback
+    import logging, traceback, multiprocessing
+    multiprocessing.freeze_support()  # For the AI planner's workers (ai_workers setting)
     from app import lt_log
     success = lt_log.create_logger()
     if not success:
@@ -0,0 +1,63 @@
+import json
+import multiprocessing
+import sys
+import time
+from collections import Counter
+
+"""
+Plays a level many times with every team run by the AI, for balance testing
+Each seed is one headless simulation (see app/engine/simulation.py),
+spread across every core. Writes one json record per seed
+
+Run from the main directory:
+    python run_simulation.py [project] [level nid] [num seeds] [max turns] [output file]
+e.g.
+    python run_simulation.py lion_throne 1 1000 30 results.jsonl
+"""
+
+def init_worker(project: str):
+    import logging
+    logging.basicConfig(level=logging.WARNING)
+    from app.engine import simulation
+    simulation.init(project)
+
+def run_seed(args) -> dict:
+    from app.engine import simulation
+    level_nid, seed, max_turns = args
+    return simulation.simulate(level_nid, seed, max_turns)
+
+def summarize(records: list):
+    outcomes = Counter(record['outcome'] for record in records)
+    print("Simulations: %d" % len(records))
+    for outcome, count in outcomes.most_common():
+        print("  %s: %d (%.1f%%)" % (outcome, count, 100 * count / len(records)))
+    wins = [record['turns'] for record in records if record['outcome'] == 'win']
+    if wins:
+        print("Average turns to win: %.2f" % (sum(wins) / len(wins)))
+    deaths = Counter(nid for record in records for nid in record['player_deaths'])
+    if deaths:
+        print("Most common player deaths:")
+        for nid, count in deaths.most_common(10):
+            print("  %s: %d (%.1f%%)" % (nid, count, 100 * count / len(records)))
+
+def main(project='lion_throne', level_nid='0', num_seeds=100, max_turns=30, output='simulation.jsonl'):
+    tasks = [(level_nid, seed, max_turns) for seed in range(num_seeds)]
+    records = []
+    start = time.time()
+    with multiprocessing.Pool(initializer=init_worker, initargs=(project,)) as pool, \
+            open(output, 'w') as fp:
+        for record in pool.imap_unordered(run_seed, tasks):
+            records.append(record)
+            fp.write(json.dumps(record) + '\n')
+            if len(records) % 10 == 0:
+                print("%d / %d simulations done (%.1f s)" % (len(records), num_seeds, time.time() - start))
+    summarize(records)
+
+if __name__ == '__main__':
+    args = sys.argv[1:]
+    project = args[0] if len(args) > 0 else 'lion_throne'
+    level_nid = args[1] if len(args) > 1 else '0'
+    num_seeds = int(args[2]) if len(args) > 2 else 100
+    max_turns = int(args[3]) if len(args) > 3 else 30
+    output = args[4] if len(args) > 4 else 'simulation.jsonl'
+    main(project, level_nid, num_seeds, max_turns, output)
@@ -0,0 +1,35 @@
+import pytest
+
+pytest.importorskip('pygame')
+
+from app.engine import ai_planner, simulation
+from app.engine import config as cf
+
+"""
+Plays the first few turns of lion_throne's first level headless,
+with and without the AI planner's workers, and checks every unit
+made the same decisions, in the same order, both ways
+Run with pytest
+"""
+
+def play(seed: int, ai_workers: int) -> tuple:
+    from app.engine.game_state import game
+    cf.SETTINGS['ai_workers'] = ai_workers
+    try:
+        record = simulation.simulate('0', seed, max_turns=3)
+    finally:
+        cf.SETTINGS['ai_workers'] = 0
+        ai_planner.shutdown()
+    assert record['outcome'] != 'error'
+    actions = [act.__class__.__name__ for act in game.action_log.actions]
+    units = {unit.nid: (unit.position, unit.get_hp(), unit.dead) for unit in game.units}
+    return record, actions, units
+
+def test_workers_match():
+    simulation.init('lion_throne')
+    for seed in (1, 2):
+        alone = play(seed, 0)
+        with_pool = play(seed, 2)
+        assert with_pool == alone
+        # And the pool gives the same answer every time
+        assert play(seed, 2) == with_pool
@@ -0,0 +1,19 @@
+from app.events import event_commands
+
+"""
+Checks that the values and flags parse keeps on a command
+come out the same each time, and can't be changed by a caller
+Run with pytest
+"""
+
+def test_parse_cached():
+    command = event_commands.parse_text('add_portrait;Eirika;Left;right;no_block;mirror')
+    values, flags = event_commands.parse(command)
+    assert values == ('Eirika', 'Left', 'right')
+    assert flags == {'no_block', 'mirror'}
+    assert isinstance(values, tuple) and isinstance(flags, frozenset)
+    assert event_commands.parse(command) == (values, flags)
+
+    # New values are parsed again
+    command.values = ['Seth', 'Right']
+    assert event_commands.parse(command) == (('Seth', 'Right'), frozenset())
@@ -0,0 +1,63 @@
+import random
+import struct
+
+from app.utilities import image_ops
+
+"""
+Checks the buffer based image operations against the pixel by pixel
+loops the editor used to run
+Run with pytest
+"""
+
+def make_image(rng, width, height, colors):
+    pixels = [rng.choice(colors) for _ in range(width * height)]
+    return pixels, struct.pack('=%dI' % len(pixels), *pixels)
+
+def pixel_loop_palette(pixels, width, height):
+    palette = []
+    for x in range(width):
+        for y in range(height):
+            if pixels[y * width + x] not in palette:
+                palette.append(pixels[y * width + x])
+    return palette
+
+def pixel_loop_bbox(pixels, width, height, exclude):
+    min_x, max_x = width, 0
+    min_y, max_y = height, 0
+    for x in range(width):
+        for y in range(height):
+            if pixels[y * width + x] != exclude:
+                min_x, max_x = min(min_x, x), max(max_x, x)
+                min_y, max_y = min(min_y, y), max(max_y, y)
+    return (min_x, min_y, max_x - min_x + 1, max_y - min_y + 1)
+
+def test_matches_pixel_loops():
+    rng = random.Random(0)
+    colors = [0xff000000 | rng.randrange(1 << 24) for _ in range(20)] + [0xff80a0c0, 0x00000000, 0xffffffff]
+    for width, height in ((1, 1), (7, 3), (40, 25)):
+        pixels, data = make_image(rng, width, height, colors)
+        assert image_ops.unique_colors(data, width) == pixel_loop_palette(pixels, width, height)
+        assert image_ops.column_major(data, width) == [pixels[y * width + x] for x in range(width) for y in range(height)]
+
+        conversion = {color: rng.choice(colors) for color in rng.sample(colors, 8)}
+        new_data = image_ops.replace_colors(data, conversion)
+        assert list(struct.unpack('=%dI' % len(pixels), new_data)) == [conversion.get(p, p) for p in pixels]
+
+        rect = (width // 3, height // 3, width - width // 3, height - height // 3)
+        x, y, w, h = rect
+        assert image_ops.crop(data, width, rect) == \
+            struct.pack('=%dI' % (w * h), *[pixels[(y + j) * width + x + i] for j in range(h) for i in range(w)])
+        new_pixels = struct.unpack('=%dI' % len(pixels), new_data)
+        assert image_ops.xor_difference(data, new_data) == sum(p ^ q for p, q in zip(pixels, new_pixels))
+
+def test_bbox():
+    rng = random.Random(1)
+    background, sprite = 0xff80a0c0, [0xff000000, 0xffffffff]
+    for width, height in ((1, 1), (9, 4), (30, 20)):
+        pixels = [background] * (width * height)
+        empty = struct.pack('=%dI' % len(pixels), *pixels)
+        assert image_ops.content_bbox(empty, width, background) == pixel_loop_bbox(pixels, width, height, background)
+        for _ in range(3):
+            pixels[rng.randrange(len(pixels))] = rng.choice(sprite)
+            data = struct.pack('=%dI' % len(pixels), *pixels)
+            assert image_ops.content_bbox(data, width, background) == pixel_loop_bbox(pixels, width, height, background)
@@ -0,0 +1,60 @@
+import math
+import random
+
+from app.utilities.algorithms.ltgraph import LTGraph
+
+"""
+Checks that LTGraph's kept shortest path trees and connected components
+stay right as vertices and edges are added, against a fresh Floyd-Warshall
+Run with pytest
+"""
+
+def all_distances(graph: LTGraph) -> dict:
+    dist = {(v1, v2): 0 if v1 == v2 else math.inf for v1 in graph.vertices for v2 in graph.vertices}
+    for v1 in graph.vertices:
+        for v2, edge in graph[v1].edges.items():
+            dist[(v1, v2)] = min(dist[(v1, v2)], edge.weight)
+    for k in graph.vertices:
+        for i in graph.vertices:
+            for j in graph.vertices:
+                if dist[(i, k)] + dist[(k, j)] < dist[(i, j)]:
+                    dist[(i, j)] = dist[(i, k)] + dist[(k, j)]
+    return dist
+
+def path_length(graph: LTGraph, path: list) -> float:
+    return sum(graph[path[i]][path[i + 1]].weight for i in range(len(path) - 1))
+
+def check(graph: LTGraph, rng):
+    dist = all_distances(graph)
+    vertices = list(graph.vertices)
+    for _ in range(40):
+        v1, v2 = rng.choice(vertices), rng.choice(vertices)
+        path = graph.shortest_path(v1, v2)
+        assert graph.has_path(v1, v2) == (dist[(v1, v2)] < math.inf)
+        if v1 == v2:
+            assert path == []
+        elif dist[(v1, v2)] == math.inf:
+            assert path is None
+        else:
+            assert path[0] == v1 and path[-1] == v2
+            assert path_length(graph, path) == dist[(v1, v2)]
+
+def test_incremental_paths():
+    rng = random.Random(0)
+    for _ in range(10):
+        graph = LTGraph()
+        for i in range(25):
+            graph.add_vertex('node %d' % i)
+        for _ in range(40):
+            v1, v2 = rng.sample(list(graph.vertices), 2)
+            graph.add_edge(v1, v2, weight=rng.randint(1, 20))
+            check(graph, rng)
+
+def test_longer_edge():
+    graph = LTGraph(edges=[(0, 1), (1, 2)])
+    assert graph.shortest_path(0, 2) == [0, 1, 2]
+    graph.add_edge(0, 2, weight=1)
+    assert graph.shortest_path(0, 2) == [0, 2]
+    graph.add_edge(0, 2, weight=5)
+    assert graph.shortest_path(0, 2) == [0, 1, 2]
+    assert not graph.has_path(0, 3)
@@ -0,0 +1,120 @@
+import random
+
+from app.engine import pathfinding
+
+"""
+Checks that the flat pathfinders (FlatDjikstra, FlatAStar) give
+exactly the same answers as the original Node based ones (Djikstra, AStar)
+Run with pytest, or directly with python -m tests.test_pathfinding
+"""
+
+try:
+    from app.engine.game_board import Node
+except ImportError:  # game_board needs pygame and the database
+    class Node():
+        # Same as game_board.Node
+        __slots__ = ['reachable', 'cost', 'x', 'y', 'parent', 'g', 'h', 'f']
+
+        def __init__(self, x, y, reachable, cost):
+            self.reachable = reachable
+            self.cost = cost
+            self.x = x
+            self.y = y
+            self.reset()
+
+        def reset(self):
+            self.parent = None
+            self.g = 0
+            self.h = 0
+            self.f = 0
+
+        def __gt__(self, n):
+            return self.cost > n
+
+        def __lt__(self, n):
+            return self.cost < n
+
+class FakeBoard():
+    """
+    Just enough of GameBoard for the pathfinders
+    """
+    def __init__(self, width, height, units, vision=None):
+        self.width, self.height = width, height
+        self.team_grid = [[] for _ in range(width * height)]
+        for (x, y), team in units.items():
+            self.team_grid[x * height + y].append(team)
+        self.vision = vision
+
+    def in_vision(self, pos, team='player') -> bool:
+        if self.vision is None:
+            return True
+        return pos in self.vision
+
+def make_map(rng, width, height):
+    costs = [rng.choice((1, 1, 1, 1, 2, 2, 3, 5, 99)) for _ in range(width * height)]
+    nodes = []
+    for x in range(width):
+        for y in range(height):
+            cost = costs[x * height + y]
+            nodes.append(Node(x, y, cost < 99, cost))
+    units = {}
+    for _ in range(rng.randint(0, width * height // 8)):
+        pos = (rng.randrange(width), rng.randrange(height))
+        units[pos] = rng.choice(('player', 'enemy', 'other', 'enemy2'))
+    vision = None
+    if rng.random() < 0.3:
+        vision = {(x, y) for x in range(width) for y in range(height) if rng.random() < 0.5}
+    board = FakeBoard(width, height, units, vision)
+    return nodes, pathfinding.array('d', costs), board
+
+def test_djikstra_parity():
+    rng = random.Random(0)
+    for _ in range(200):
+        width, height = rng.randint(1, 30), rng.randint(1, 30)
+        nodes, costs, board = make_map(rng, width, height)
+        buffers = pathfinding.PathBuffers(width * height)
+        for _ in range(5):
+            start = (rng.randrange(width), rng.randrange(height))
+            team = rng.choice(('player', 'enemy', 'other'))
+            pass_through = rng.random() < 0.1
+            fog = rng.random() < 0.5
+            movement = rng.randint(0, 15)
+            old = pathfinding.Djikstra(start, nodes, width, height, team, pass_through, fog)
+            new = pathfinding.FlatDjikstra(start, costs, buffers, width, height, team, pass_through, fog)
+            assert old.process(board, movement) == new.process(board, movement)
+
+def test_astar_parity():
+    rng = random.Random(1)
+    for _ in range(200):
+        width, height = rng.randint(1, 30), rng.randint(1, 30)
+        nodes, costs, board = make_map(rng, width, height)
+        buffers = pathfinding.PathBuffers(width * height)
+        start = (rng.randrange(width), rng.randrange(height))
+        team = rng.choice(('player', 'enemy', 'other'))
+        # Reuse the pathfinders for several goals, like SecondaryAI does
+        old = pathfinding.AStar(start, None, nodes, width, height, team, False, True)
+        new = pathfinding.FlatAStar(start, None, costs, buffers, width, height, team, False, True)
+        for _ in range(5):
+            goal = (rng.randrange(width), rng.randrange(height))
+            adj_good_enough = rng.random() < 0.5
+            ally_block = rng.random() < 0.3
+            limit = rng.choice((None, rng.randint(0, 40)))
+            old.set_goal_pos(goal)
+            new.set_goal_pos(goal)
+            old_path = old.process(board, adj_good_enough, ally_block, limit)
+            new_path = new.process(board, adj_good_enough, ally_block, limit)
+            assert old_path == new_path
+            old.reset()
+            new.reset()
+
+def test_buffer_generation_wrap():
+    buffers = pathfinding.PathBuffers(4)
+    buffers.generation = 0xFFFFFFFE
+    assert buffers.next_generation() == 1
+    assert not any(buffers.stamp) and not any(buffers.closed)
+
+if __name__ == '__main__':
+    test_djikstra_parity()
+    test_astar_parity()
+    test_buffer_generation_wrap()
+    print("Flat pathfinders match")
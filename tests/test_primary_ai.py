@@ -0,0 +1,64 @@
+import pytest
+
+pytest.importorskip('pygame')
+
+from app.engine import simulation
+
+"""
+Checks that PrimaryAI's grouped search, with its shared combat previews,
+chooses the same move, target and item as trying every move on its own,
+for each enemy on lion_throne's first level, moved up next to the player
+Run with pytest
+"""
+
+def exhaustive_ai():
+    from app.engine.ai_controller import PrimaryAI
+
+    class ExhaustiveAI(PrimaryAI):
+        """
+        Fully arrives at every move, and works out every combat preview again
+        """
+        def get_context(self, move) -> tuple:
+            return (move,)
+
+        def get_preview(self, item, defender, move, context) -> dict:
+            self.previews.clear()
+            return super().get_preview(item, defender, move, context)
+
+    return ExhaustiveAI
+
+def search(ai) -> tuple:
+    while True:
+        done, target, position, item = ai.run()
+        if done:
+            return target, position, item.uid if item else None, ai.max_tp
+
+def test_same_choice():
+    simulation.init('lion_throne')
+    from app.data.database import DB
+    from app.engine import game_state
+    from app.utilities import utils
+    from app.engine.ai_controller import AIController, PrimaryAI
+    ExhaustiveAI = exhaustive_ai()
+
+    game = game_state.start_level('0')
+    players = [unit for unit in game.units if unit.position and unit.team == 'player']
+    num_found = 0
+    for unit in [unit for unit in game.units if unit.position and unit.team == 'enemy']:
+        behaviours = [behaviour for behaviour in DB.ai.get(unit.ai).behaviours if behaviour.action == 'Attack']
+        if not behaviours:
+            continue
+        # Every free tile near the closest player unit
+        closest = min(players, key=lambda player: utils.calculate_distance(player.position, unit.position))
+        valid_moves = {(x, y) for x in range(game.tilemap.width) for y in range(game.tilemap.height)
+                       if utils.calculate_distance((x, y), closest.position) <= 4 and not game.board.get_unit((x, y))}
+        AIController().load_unit(unit)
+        position = unit.position
+        for behaviour in behaviours:
+            grouped = search(PrimaryAI(unit, valid_moves, behaviour))
+            # Puts the unit back where it was
+            assert unit.position == position
+            exhaustive = search(ExhaustiveAI(unit, valid_moves, behaviour))
+            assert grouped == exhaustive
+            num_found += grouped[0] is not None
+    assert num_found
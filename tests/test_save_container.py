@@ -0,0 +1,58 @@
+import os
+import pickle
+
+from app.engine import save_container
+
+"""
+Checks that saves round trip, share sections with their copies,
+and that old pickled saves can still be read
+Run with pytest
+"""
+
+def make_save(turncount=1):
+    s_dict = {'units': [{'nid': 'Eirika'}, {'nid': 'Seth'}],
+              'items': [{'uid': 100}],
+              'skills': [],
+              'level': {'nid': '0'},
+              'action_log': [('Move', i) for i in range(100)],
+              'turncount': turncount}
+    meta_dict = {'level_title': 'Prologue', 'kind': 'start'}
+    return s_dict, meta_dict
+
+def test_round_trip(tmp_path):
+    save_loc = str(tmp_path / 'game-0.p')
+    s_dict, meta_dict = make_save()
+    save_container.write(save_loc, s_dict, meta_dict)
+    assert save_container.read_meta(save_loc) == meta_dict
+    assert save_container.read(save_loc) == (s_dict, meta_dict)
+
+def test_copies_share_sections(tmp_path):
+    save_loc = str(tmp_path / 'game-0.p')
+    restart_loc = str(tmp_path / 'game-restart0.p')
+    section_dir = save_container.get_section_dir(save_loc)
+    s_dict, meta_dict = make_save()
+    save_container.write(save_loc, s_dict, meta_dict)
+    save_container.copy(save_loc, restart_loc)
+    num_sections = len(os.listdir(section_dir))
+
+    # Only the state section changes
+    new_s_dict, _ = make_save(turncount=2)
+    save_container.write(save_loc, new_s_dict, meta_dict)
+    assert len(os.listdir(section_dir)) == num_sections + 1
+
+    save_container.collect_garbage(section_dir, [save_loc, restart_loc])
+    assert save_container.read(restart_loc)[0] == s_dict
+    os.remove(restart_loc)
+    save_container.collect_garbage(section_dir, [save_loc])
+    assert len(os.listdir(section_dir)) == num_sections
+    assert save_container.read(save_loc)[0] == new_s_dict
+
+def test_old_format(tmp_path):
+    save_loc = str(tmp_path / 'game-0.p')
+    s_dict, meta_dict = make_save()
+    with open(save_loc, 'wb') as fp:
+        pickle.dump(s_dict, fp)
+    with open(save_loc + 'meta', 'wb') as fp:
+        pickle.dump(meta_dict, fp)
+    assert save_container.read_meta(save_loc) == meta_dict
+    assert save_container.read(save_loc) == (s_dict, meta_dict)
@@ -0,0 +1,24 @@
+import pytest
+
+pytest.importorskip('pygame')
+
+from app.engine import simulation
+
+"""
+Plays a few turns of lion_throne's first level headless, and checks the
+record lists each dead unit once, with only the player's in player_deaths
+Run with pytest
+"""
+
+def test_short_run():
+    simulation.init('lion_throne')
+    from app.engine.game_state import game
+
+    record = simulation.simulate('0', 1, max_turns=3)
+    assert record['outcome'] != 'error'
+    assert len(record['deaths']) == len(set(record['deaths']))
+    assert set(record['player_deaths']) <= set(record['deaths'])
+    for nid in record['deaths']:
+        unit = game.get_unit(nid)
+        assert unit.dead
+        assert (nid in record['player_deaths']) == (unit.team == 'player')
@@ -0,0 +1,60 @@
+import random
+
+from app.editor.tile_editor import tilemap_edits
+from app.resources.tiles import TileMapPrefab
+
+"""
+Checks the scanline flood fill against a plain breadth first fill,
+and that bulk edits undo and redo as one step
+Run with pytest
+"""
+
+def reference_fill(grid, start, width, height):
+    target = grid.get(start)
+    filled, frontier = {start}, [start]
+    while frontier:
+        x, y = frontier.pop()
+        for pos in ((x + 1, y), (x - 1, y), (x, y + 1), (x, y - 1)):
+            if 0 <= pos[0] < width and 0 <= pos[1] < height and pos not in filled and grid.get(pos) == target:
+                filled.add(pos)
+                frontier.append(pos)
+    return filled
+
+def test_flood_fill():
+    rng = random.Random(0)
+    for width, height in ((1, 1), (15, 10), (60, 40)):
+        grid = {(x, y): rng.choice(('Plains', 'Forest', None)) for x in range(width) for y in range(height)}
+        grid = {coord: nid for coord, nid in grid.items() if nid}
+        for _ in range(20):
+            start = (rng.randrange(width), rng.randrange(height))
+            assert tilemap_edits.flood_fill(grid, start, width, height) == reference_fill(grid, start, width, height)
+
+def test_large_fill():
+    # Would blow the recursion limit if the fill recursed
+    filled = tilemap_edits.flood_fill({}, (0, 0), 200, 200)
+    assert len(filled) == 200 * 200
+
+def test_undo_redo():
+    tilemap = TileMapPrefab('test')
+    layer = tilemap.layers[0]
+    layer.terrain_grid.update({(x, y): 'Plains' for x in range(tilemap.width) for y in range(tilemap.height)})
+    layer.terrain_grid[(3, 3)] = 'Forest'
+    original = dict(layer.terrain_grid)
+
+    edit = tilemap_edits.TileMapEdit(layer, 'terrain_grid')
+    coords = tilemap_edits.find_all(layer.terrain_grid, (0, 0), tilemap.width, tilemap.height)
+    edit.paint(coords, 'Sea')
+    assert edit.changed and set(edit.coords) == coords
+    assert layer.terrain_grid[(3, 3)] == 'Forest' and layer.terrain_grid[(0, 0)] == 'Sea'
+    edit.undo()
+    assert layer.terrain_grid == original
+    edit.redo()
+    assert sum(nid == 'Sea' for nid in layer.terrain_grid.values()) == len(original) - 1
+
+    sprites = tilemap_edits.TileMapEdit(layer, 'sprite_grid')
+    tilemap_edits.pattern_fill(sprites, tilemap_edits.rect_coords((0, 0), (3, 1)), 'tileset', {(5, 5), (6, 5)})
+    assert {coord: sprite.tileset_position for coord, sprite in layer.sprite_grid.items()} == \
+        {(0, 0): (5, 5), (1, 0): (6, 5), (2, 0): (5, 5), (3, 0): (6, 5),
+         (0, 1): (5, 5), (1, 1): (6, 5), (2, 1): (5, 5), (3, 1): (6, 5)}
+    sprites.undo()
+    assert not layer.sprite_grid
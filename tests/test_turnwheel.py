@@ -0,0 +1,58 @@
+import pytest
+
+pytest.importorskip('pygame')
+
+from app.engine import simulation
+
+"""
+Plays the first few turns of lion_throne's first level headless,
+then turns the turnwheel a long way back, which loads a checkpoint
+and runs forward from it, and checks the game ends up the same
+as reversing every action one at a time
+Run with pytest
+"""
+
+def get_state(game) -> tuple:
+    units = [unit.save() for unit in game.units]
+    items = [item.save() for item in game.item_registry.values()]
+    skills = [skill.save() for skill in game.skill_registry.values()]
+    board = {unit.nid: game.board.get_unit(unit.position).nid for unit in game.units if unit.position}
+    return units, items, skills, dict(game.level_vars), dict(game.game_vars), game.turncount, board
+
+def test_long_seek(monkeypatch):
+    simulation.init('lion_throne')
+    from app.engine import game_snapshot, turnwheel
+    from app.engine.game_state import game
+
+    monkeypatch.setattr(turnwheel, 'CHECKPOINT_INTERVAL', 10)
+    record = simulation.simulate('0', 1, max_turns=3)
+    assert record['outcome'] != 'error'
+    log = game.action_log
+    registry_keys = game_snapshot.get_registry_keys(game)
+    usable = [index for index, snapshot in log.checkpoints if snapshot.registry_keys == registry_keys]
+    assert usable
+
+    loaded = []
+    load_checkpoint = log.load_checkpoint
+    def spy(checkpoint):
+        loaded.append(checkpoint[0])
+        load_checkpoint(checkpoint)
+    monkeypatch.setattr(log, 'load_checkpoint', spy)
+
+    end = log.action_index
+    at_end = get_state(game)
+    target = usable[0] + 3
+    assert end - target > turnwheel.RESTORE_COST + 3
+    log.seek(target)
+    assert loaded == [usable[0]]
+    assert log.action_index == target
+    from_checkpoint = get_state(game)
+
+    # Back to where we were
+    log.seek(end)
+    assert get_state(game) == at_end
+
+    # And now the long way
+    while log.action_index > target:
+        log.run_action_backward()
+    assert get_state(game) == from_checkpoint
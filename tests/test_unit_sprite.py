@@ -0,0 +1,27 @@
+import os
+
+import pytest
+
+pygame = pytest.importorskip('pygame')
+
+from app.resources.map_sprites import MapSprite as MapSpritePrefab
+
+"""
+Builds a MapSprite for each team from one of lion_throne's map sprites,
+the same way the engine does when a level or the overworld starts
+Run with pytest
+"""
+
+FOLDER = 'lion_throne.ltproj/resources/map_sprites'
+
+def test_map_sprite():
+    os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+    pygame.init()
+    from app.engine.unit_sprite import MapSprite
+
+    for team in ('player', 'enemy', 'enemy2', 'other'):
+        prefab = MapSpritePrefab('Archer', os.path.join(FOLDER, 'Archer-stand.png'), os.path.join(FOLDER, 'Archer-move.png'))
+        sprite = MapSprite(prefab, team)
+        assert prefab.standing_image and prefab.moving_image
+        assert len(sprite.passive) == 3 and len(sprite.gray) == 3 and len(sprite.active) == 3
+        assert all(len(frames) == 4 for frames in (sprite.down, sprite.left, sprite.right, sprite.up))
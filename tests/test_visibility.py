@@ -0,0 +1,146 @@
+import random
+
+from app.utilities.algorithms import visibility
+
+"""
+Checks that the cached ray table and VisibilityCache give
+exactly the same answers as line_of_sight.get_line and simple_check did
+Run with pytest, or directly with python -m tests.test_visibility
+"""
+
+def old_get_line(start, end, get_opacity) -> bool:
+    # Same as the original line_of_sight.get_line, with the board passed in
+    if start == end:
+        return True
+    x1, y1 = start
+    x2, y2 = end
+    dx = x2 - x1
+    dy = y2 - y1
+    x, y = x1, y1
+
+    xstep, ystep = 1, 1
+    if dy < 0:
+        ystep = -1
+        dy = -dy
+    if dx < 0:
+        xstep = -1
+        dx = -dx
+    ddy, ddx = 2*dy, 2*dx
+
+    if ddx >= ddy:
+        errorprev = error = dx
+        for i in range(dx):
+            x += xstep
+            error += ddy
+            if error > ddx:
+                y += ystep
+                error -= ddx
+                if error + errorprev < ddx:
+                    pos = x, y - ystep
+                    if pos != end and get_opacity(pos):
+                        return False
+                elif error + errorprev > ddx:
+                    pos = x - xstep, y
+                    if pos != end and get_opacity(pos):
+                        return False
+                else:
+                    pos1, pos2 = (x, y - ystep), (x - xstep, y)
+                    if get_opacity(pos1) and get_opacity(pos2):
+                        return False
+            pos = x, y
+            if pos != end and get_opacity(pos):
+                return False
+            errorprev = error
+    else:
+        errorprev = error = dy
+        for i in range(dy):
+            y += ystep
+            error += ddx
+            if error > ddy:
+                x += xstep
+                error -= ddy
+                if error + errorprev < ddy:
+                    pos = x - xstep, y
+                    if pos != end and get_opacity(pos):
+                        return False
+                elif error + errorprev > ddy:
+                    pos = x, y - ystep
+                    if pos != end and get_opacity(pos):
+                        return False
+                else:
+                    pos1, pos2 = (x, y - ystep), (x - xstep, y)
+                    if get_opacity(pos1) and get_opacity(pos2):
+                        return False
+            pos = x, y
+            if pos != end and get_opacity(pos):
+                return False
+            errorprev = error
+    return True
+
+def new_get_line(start, end, get_opacity) -> bool:
+    x, y = start
+    for blocker in visibility.get_ray(end[0] - x, end[1] - y):
+        if all(get_opacity((x + dx, y + dy)) for (dx, dy) in blocker):
+            return False
+    return True
+
+def old_simple_check(dest_pos, sources, max_range, get_opacity) -> bool:
+    for s_pos in sources:
+        if s_pos == dest_pos:
+            return True
+        elif abs(dest_pos[0] - s_pos[0]) + abs(dest_pos[1] - s_pos[1]) <= max_range and \
+                old_get_line(s_pos, dest_pos, get_opacity):
+            return True
+    return False
+
+def make_opacity(rng, width, height):
+    density = rng.choice((0.1, 0.3, 0.5))
+    return [rng.random() < density for _ in range(width * height)]
+
+def test_ray_parity():
+    rng = random.Random(0)
+    for _ in range(50):
+        width, height = rng.randint(1, 20), rng.randint(1, 20)
+        opacity = make_opacity(rng, width, height)
+        get_opacity = lambda pos: opacity[pos[0] * height + pos[1]]
+        for _ in range(100):
+            start = (rng.randrange(width), rng.randrange(height))
+            end = (rng.randrange(width), rng.randrange(height))
+            assert old_get_line(start, end, get_opacity) == new_get_line(start, end, get_opacity)
+
+def test_visibility_cache_parity():
+    rng = random.Random(1)
+    for _ in range(30):
+        width, height = rng.randint(1, 20), rng.randint(1, 20)
+        opacity = make_opacity(rng, width, height)
+        cache = visibility.VisibilityCache(width, height)
+        cache.set_opacity(opacity)
+        units = {}
+        for step in range(40):
+            # Move, add or remove a unit
+            nid = 'unit%d' % rng.randrange(8)
+            if rng.random() < 0.2:
+                units.pop(nid, None)
+                cache.remove_source(nid)
+            else:
+                team = rng.choice(('player', 'enemy'))
+                pos = (rng.randrange(width), rng.randrange(height))
+                units[nid] = (team, pos)
+                cache.add_source(nid, team, pos)
+            if step % 10 == 9:
+                # Toggle a tile, like showing or hiding a layer
+                opacity[rng.randrange(width * height)] ^= True
+                cache.set_opacity(opacity)
+            get_opacity = lambda pos: opacity[pos[0] * height + pos[1]]
+            team = rng.choice(('player', 'enemy'))
+            radius = rng.randint(0, 8)
+            sources = [pos for (t, pos) in units.values() if t == team]
+            for x in range(width):
+                for y in range(height):
+                    assert cache.is_lit((x, y), team, radius) == \
+                        old_simple_check((x, y), sources, radius, get_opacity)
+
+if __name__ == '__main__':
+    test_ray_parity()
+    test_visibility_cache_parity()
+    print("Visibility cache matches")
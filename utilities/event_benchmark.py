@@ -0,0 +1,59 @@
+import random
+import timeit
+
+from app.events.event_prefab import EventPrefab, EventCatalog, all_triggers
+from app.engine.evaluate import compile_string
+
+"""
+Microbenchmark for EventManager.trigger's event lookup
+Compares the old scan of every event and eval of every condition string
+against EventCatalog's (trigger, level_nid) index and the conditions
+compiled by evaluate.compile_string, on a made up project with thousands of events, and checks they agree
+
+Run from the main directory:
+    python -m utilities.event_benchmark
+"""
+
+CONDITIONS = ('True', "unit and unit.team == 'player'", 'len(targets) > 2',
+              "game_vars.get('chest_opened')", 'turncount % 3 == 0 and not unit')
+
+def make_catalog(rng, num_events: int, num_levels: int) -> EventCatalog:
+    triggers = [trigger.nid for trigger in all_triggers]
+    catalog = EventCatalog()
+    for i in range(num_events):
+        event = EventPrefab('Event %d' % i)
+        event.trigger = rng.choice(triggers)
+        event.level_nid = None if rng.random() < 0.1 else str(rng.randrange(num_levels))
+        event.condition = rng.choice(CONDITIONS)
+        event.priority = rng.randrange(40)
+        catalog.append(event)
+    return catalog
+
+def old_trigger(catalog, trigger, level_nid, scope):
+    events = [event for event in catalog if event.trigger == trigger and
+              (not event.level_nid or event.level_nid == level_nid)]
+    triggered = [event for event in events if eval(event.condition, {}, scope)]
+    return sorted(triggered, key=lambda event: event.priority)
+
+def new_trigger(catalog, trigger, level_nid, scope):
+    triggered = []
+    for event in catalog.get(trigger, level_nid):
+        if eval(compile_string(event.condition), {}, scope):
+            triggered.append(event)
+    return triggered
+
+def main():
+    rng = random.Random(0)
+    scope = {'unit': None, 'targets': [1, 2, 3], 'game_vars': {}, 'turncount': 3}
+    print("%8s %14s %12s %12s %8s" % ('events', 'trigger', 'old (ms)', 'new (ms)', 'speedup'))
+    for num_events in (100, 1000, 5000):
+        catalog = make_catalog(rng, num_events, 30)
+        for trigger in ('turn_change', 'unit_wait', 'combat_end'):
+            assert old_trigger(catalog, trigger, '5', scope) == new_trigger(catalog, trigger, '5', scope)
+            number = 200
+            old = timeit.timeit(lambda: old_trigger(catalog, trigger, '5', scope), number=number)
+            new = timeit.timeit(lambda: new_trigger(catalog, trigger, '5', scope), number=number)
+            print("%8d %14s %12.3f %12.3f %7.1fx" % (num_events, trigger, old / number * 1000, new / number * 1000, old / new))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,66 @@
+import random
+import sys
+import time
+
+from app.data.database import DB
+import app.engine.item_component_access as ICA
+import app.engine.skill_component_access as SCA
+from app.engine.objects.item import ItemObject
+from app.engine.objects.skill import SkillObject
+from app.engine import save_container
+
+"""
+Times restoring the item and skill registries of a large save, the way
+GameState.load does, with the cached component registry ("after") and
+with the registry rebuilt on every component lookup ("before")
+
+Run from the main directory:
+    python -m utilities.restore_benchmark [project] [save file] [num]
+With no save file, a save with num (default 5000) items and skills
+is made from random prefabs in the project
+"""
+
+def make_fake_save(num: int) -> dict:
+    rng = random.Random(0)
+    items = [ItemObject.from_prefab(rng.choice(DB.items)).save() for _ in range(num)]
+    skills = [SkillObject.from_prefab(rng.choice(DB.skills)).save() for _ in range(num)]
+    return {'items': items, 'skills': skills}
+
+def restore(s_dict) -> float:
+    start = time.perf_counter()
+    item_registry = {item['uid']: ItemObject.restore(item) for item in s_dict['items']}
+    skill_registry = {skill['uid']: SkillObject.restore(skill) for skill in s_dict['skills']}
+    end = time.perf_counter()
+    assert len(item_registry) + len(skill_registry) > 0
+    return end - start
+
+def main(project='default', save_fn=None, num=5000):
+    DB.load(project + '.ltproj')
+    if save_fn:
+        s_dict, _ = save_container.read(save_fn)
+    else:
+        s_dict = make_fake_save(num)
+    print("Restoring %d items and %d skills" % (len(s_dict['items']), len(s_dict['skills'])))
+
+    # Before: rebuild the registry on every lookup, like get_*_components used to
+    get_items, get_skills = ICA.get_item_components, SCA.get_skill_components
+    ICA.get_item_components = ICA._build_item_components
+    SCA.get_skill_components = SCA._build_skill_components
+    try:
+        before = restore(s_dict)
+    finally:
+        ICA.get_item_components, SCA.get_skill_components = get_items, get_skills
+
+    # After: the cached registry
+    after = restore(s_dict)
+
+    print("Before: %.3f s" % before)
+    print("After:  %.3f s" % after)
+    print("Speedup: %.1fx" % (before / after))
+
+if __name__ == '__main__':
+    args = sys.argv[1:]
+    project = args[0] if len(args) > 0 else 'default'
+    save_fn = args[1] if len(args) > 1 and args[1] != '-' else None
+    num = int(args[2]) if len(args) > 2 else 5000
+    main(project, save_fn, num)
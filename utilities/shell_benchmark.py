@@ -0,0 +1,60 @@
+import random
+import timeit
+
+from app.utilities.algorithms import manhattan
+
+"""
+Microbenchmark for target_system.get_shell
+Compares the old set-union implementation against the cached template
+and bitmask dilation in app.utilities.algorithms.manhattan, over move sets
+of 1 - 400 tiles and ranges of 1 - 15, and checks they agree
+
+Run from the main directory:
+    python -m utilities.shell_benchmark
+"""
+
+def old_find_manhattan_spheres(rng: set, x: int, y: int) -> set:
+    main_set = set()
+    for r in rng:
+        for i in range(-r, r + 1):
+            magn = abs(i)
+            main_set.add((x + i, y + r - magn))
+            main_set.add((x + i, y - r + magn))
+    return main_set
+
+def old_get_shell(valid_moves: set, potential_range: set, width: int, height: int) -> set:
+    valid_attacks = set()
+    for valid_move in valid_moves:
+        valid_attacks |= old_find_manhattan_spheres(potential_range, valid_move[0], valid_move[1])
+    return {pos for pos in valid_attacks if 0 <= pos[0] < width and 0 <= pos[1] < height}
+
+def make_moves(rng, num, width, height) -> set:
+    # Grow a connected blob from the middle, like a movement range
+    start = (width // 2, height // 2)
+    moves = {start}
+    frontier = [start]
+    while len(moves) < num and frontier:
+        x, y = frontier.pop(rng.randrange(len(frontier)))
+        for adj in ((x + 1, y), (x - 1, y), (x, y + 1), (x, y - 1)):
+            if adj not in moves and 0 <= adj[0] < width and 0 <= adj[1] < height:
+                moves.add(adj)
+                frontier.append(adj)
+    return moves
+
+def main():
+    rng = random.Random(0)
+    width, height = 40, 40
+    print("%6s %10s %12s %12s %8s" % ('moves', 'range', 'old (ms)', 'new (ms)', 'speedup'))
+    for num_moves in (1, 10, 50, 100, 200, 400):
+        moves = make_moves(rng, num_moves, width, height)
+        for item_range in ({1}, {1, 2}, {2}, {1, 2, 3}, set(range(1, 6)), set(range(3, 11)), set(range(1, 16))):
+            assert old_get_shell(moves, item_range, width, height) == \
+                manhattan.get_shell(moves, item_range, width, height)
+            number = 20
+            old = timeit.timeit(lambda: old_get_shell(moves, item_range, width, height), number=number)
+            new = timeit.timeit(lambda: manhattan.get_shell(moves, item_range, width, height), number=number)
+            range_name = '%d-%d' % (min(item_range), max(item_range))
+            print("%6d %10s %12.3f %12.3f %7.1fx" % (len(moves), range_name, old / number * 1000, new / number * 1000, old / new))
+
+if __name__ == '__main__':
+    main()
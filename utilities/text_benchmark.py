@@ -0,0 +1,121 @@
+import sys
+import time
+
+from app.engine import simulation
+
+"""
+Frame times of a text heavy base conversation and of the unit item menu,
+with BmpFont's rendered string cache, Dialog's persistent line surfaces
+and the cached menu backgrounds ("after"), and with every string blitted
+glyph by glyph, the dialog redrawn from scratch and the menu background
+rebuilt every frame, as they were before ("before")
+
+Run from the main directory:
+    python -m utilities.text_benchmark [project] [level nid] [num frames]
+e.g.
+    python -m utilities.text_benchmark lion_throne 0 2000
+"""
+
+CONVERSATION = ("Welcome back to the base, everyone. The scouts have returned from the north "
+                "with news of the {red}Grado{/red} army.{w}{br}They say at least three battalions "
+                "are camped along the river, and more are on the way.{w}{br}We leave at dawn. "
+                "Check your weapons, visit the armory, and get some rest tonight.{w}{br}"
+                "Any questions before we go over the plan one more time?{w}")
+
+def old_blit(self, string, surf, pos=(0, 0)):
+    self.blit_glyphs(self.modify_string(string), surf, pos)
+
+def old_draw_text(self, surf):
+    from app.engine import engine
+    from app.engine.fonts import FONT
+    end_x_pos, end_y_pos = 0, 0
+    text_surf = engine.create_surface((self.text_width, self.text_height), transparent=True)
+    current_color = self.font_color
+    if self.y_offset and len(self.text_lines) > self.num_lines:
+        x_pos = 0
+        line_chunks, current_color = self.chunkify(self.text_lines[-self.num_lines - 1], current_color)
+        for text, color in line_chunks:
+            font = FONT[self.font_type + '-' + color]
+            font.blit(text, text_surf, (x_pos, -16 + self.y_offset))
+            x_pos += font.width(text)
+    for idx, line in enumerate(self.text_lines[-self.num_lines:]):
+        x_pos = 0
+        y_pos = 16 * idx
+        y_set = y_pos + self.y_offset if len(self.text_lines) > self.num_lines else y_pos
+        line_chunks, current_color = self.chunkify(line, current_color)
+        for text, color in line_chunks:
+            font = FONT[self.font_type + '-' + color]
+            font.blit(text, text_surf, (x_pos, y_set))
+            x_pos += font.width(text)
+        end_x_pos = self.position[0] + 8 + x_pos
+        end_y_pos = self.position[1] + 8 + y_pos
+    surf.blit(text_surf, (self.position[0] + 8, self.position[1] + 8))
+    return end_x_pos, end_y_pos
+
+def old_make_bg_surf(shimmer):
+    from app.data.database import DB
+    from app.engine import image_mods
+    from app.engine.base_surf import create_base_surf
+    from app.engine.sprites import SPRITES
+    bg_surf = create_base_surf(104, 16 * DB.constants.total_items() + 8, 'menu_bg_base')
+    if shimmer:
+        img = SPRITES.get('menu_shimmer%d' % shimmer)
+        bg_surf.blit(img, (bg_surf.get_width() - img.get_width() - 1, bg_surf.get_height() - img.get_height() - 5))
+    return image_mods.make_translucent(bg_surf, 0.1)
+
+def swap_in(funcs: tuple):
+    from app.engine import bmpfont, dialog, menus
+    bmpfont.BmpFont.blit, dialog.Dialog.draw_text, menus.make_bg_surf = funcs
+
+def time_conversation(num_frames: int) -> float:
+    from app.constants import WINWIDTH, WINHEIGHT
+    from app.engine import engine, dialog
+    surf = engine.create_surface((WINWIDTH, WINHEIGHT))
+    total, frames = 0, 0
+    while frames < num_frames:
+        convo = dialog.Dialog(CONVERSATION, background='message_bg_base', speaker='Seth')
+        while not convo.is_done() and frames < num_frames:
+            simulation._advance_time(engine)
+            if convo.state == 'wait':
+                convo.hurry_up()
+            start = time.perf_counter()
+            convo.update()
+            convo.draw(surf)
+            total += time.perf_counter() - start
+            frames += 1
+    return total / frames * 1000
+
+def time_item_menu(num_frames: int) -> float:
+    from app.constants import WINWIDTH, WINHEIGHT
+    from app.engine import engine, menus
+    from app.engine.game_state import game
+    surf = engine.create_surface((WINWIDTH, WINHEIGHT))
+    unit = max(game.units, key=lambda unit: len(unit.items))
+    start = time.perf_counter()
+    for _ in range(num_frames):
+        menus.draw_unit_items(surf, (6, 72), unit, include_top=True, include_face=True, shimmer=2)
+    return (time.perf_counter() - start) / num_frames * 1000
+
+def main():
+    project = sys.argv[1] if len(sys.argv) > 1 else 'lion_throne'
+    level_nid = sys.argv[2] if len(sys.argv) > 2 else '0'
+    num_frames = int(sys.argv[3]) if len(sys.argv) > 3 else 2000
+    simulation.init(project)
+    from app.engine import config as cf, game_state
+    cf.SETTINGS['text_speed'] = 10
+    game_state.start_level(level_nid)
+    from app.engine import bmpfont, dialog, menus
+    new_funcs = (bmpfont.BmpFont.blit, dialog.Dialog.draw_text, menus.make_bg_surf)
+    old_funcs = (old_blit, old_draw_text, old_make_bg_surf)
+
+    print("%16s %12s %12s %8s" % ('scene', 'before (ms)', 'after (ms)', 'speedup'))
+    for name, func in (('base convo', time_conversation), ('unit items', time_item_menu)):
+        swap_in(old_funcs)
+        before = func(num_frames)
+        swap_in(new_funcs)
+        func(num_frames // 10)  # Fill the caches
+        after = func(num_frames)
+        print("%16s %12.3f %12.3f %7.1fx" % (name, before, after, before / after))
+
+if __name__ == '__main__':
+    main()